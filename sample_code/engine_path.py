@@ -0,0 +1,22 @@
+# Maps the `engine` package onto world_modules_demo/ so the tests here can
+# `import engine.<module>` from a checkout (the modules live in topic folders
+# but import each other as engine.*). Import it before any engine module.
+import importlib
+import os
+import sys
+import types
+
+_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "world_modules_demo")
+_ALIASES = {"engine.terrain_noise": "engine.terrian_noise"}   # file name kept from upstream
+
+if "engine" not in sys.modules:
+    pkg = types.ModuleType("engine")
+    pkg.__path__ = sorted(
+        os.path.normpath(os.path.join(_ROOT, d))
+        for d in os.listdir(_ROOT)
+        if os.path.isdir(os.path.join(_ROOT, d)) and not d.startswith((".", "_"))
+    )
+    sys.modules["engine"] = pkg
+    for alias, target in _ALIASES.items():
+        mod = sys.modules[alias] = importlib.import_module(target)
+        setattr(pkg, alias.split(".", 1)[1], mod)
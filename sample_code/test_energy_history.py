@@ -0,0 +1,41 @@
+import engine_path  # noqa: F401  (maps engine.* onto world_modules_demo/)
+import engine.world_util as wu
+
+
+def make_world():
+    return {"features": {"calm": 0.1}, "zones": {f"z{i}": {"energy": 0.1 * i} for i in range(40)}}
+
+
+def test_delta_entries_cover_touched_zones():
+    w = make_world()
+    wu.apply_world_delta(w, {"features": {"calm": 0.2}})        # first entry: full snapshot
+    for step in range(1, 6):
+        wu.apply_world_delta(w, {"zones": {"z3": {"energy": 0.5 + step}, f"new{step}": {"energy": 1.0}}})
+        entry = w["symbolic_energy_history"][-1]
+        assert entry["sparse"] and set(entry["zones"]) == {"z3", f"new{step}"}
+    dense = wu.energy_history_entry(w, -1)
+    assert {k: v["energy"] for k, v in dense["zones"].items()} == {k: z["energy"] for k, z in w["zones"].items()}
+    assert list(wu.iter_energy_history(w))[-1] == dense
+
+
+def test_compaction_marks_only_trimmed_sections():
+    w = make_world()
+    w["metrics"] = {"max_history": 5, "agi_index_history": [0.1] * 3}
+    w["symbolic_energy_history"] = []
+    marked = []
+    real = wu._mark_dirty
+    wu._mark_dirty = lambda world, section=None, zone=None: marked.append(section)
+    try:
+        wu._compact_world_inplace(w)
+        assert marked == []
+        w["metrics"]["agi_index_history"] += [0.2] * 5
+        wu._compact_world_inplace(w)
+        assert marked == ["metrics"] and len(w["metrics"]["agi_index_history"]) == 5
+    finally:
+        wu._mark_dirty = real
+
+
+if __name__ == "__main__":
+    for fn in (test_delta_entries_cover_touched_zones, test_compaction_marks_only_trimmed_sections):
+        fn()
+        print(fn.__name__, "ok")
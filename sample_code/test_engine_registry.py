@@ -0,0 +1,119 @@
+import sys
+import threading
+import types
+
+import engine_path  # noqa: F401  (maps engine.* onto world_modules_demo/)
+import engine.engine_registry as er
+from engine.engine_registry import EngineRegistry
+
+
+class CountingImport:
+    """Stands in for importlib.import_module and counts attempts per module."""
+
+    def __init__(self):
+        self.calls = {}
+        self.real = er.importlib.import_module
+
+    def __call__(self, name):
+        self.calls[name] = self.calls.get(name, 0) + 1
+        return self.real(name)
+
+    def __enter__(self):
+        er.importlib.import_module = self
+        return self
+
+    def __exit__(self, *exc):
+        er.importlib.import_module = self.real
+
+
+def noop(w, *a, **k):
+    return w
+
+
+def test_nothing_imports_until_first_use():
+    reg = EngineRegistry()
+    with CountingImport() as imp:
+        dumps = reg.lazy("dumps", "json", "dumps")
+        mod = reg.lazy("json_mod", "json")
+        assert reg.status()["dumps"]["state"] == "pending" and imp.calls == {}
+        assert dumps({"a": 1}) == '{"a": 1}'
+        assert imp.calls == {"json": 1}
+        assert mod.resolve() is sys.modules["json"]
+        dumps([1])
+    st = reg.status()
+    assert st["dumps"]["state"] == "loaded" and st["dumps"]["target"] == "json:dumps"
+    assert st["dumps"]["error"] is None and st["dumps"]["import_ms"] is not None
+
+
+def test_missing_module_falls_back_and_is_tried_once():
+    reg = EngineRegistry()
+    with CountingImport() as imp:
+        step = reg.lazy("step", "engine.no_such_engine", "step", fallback=noop)
+        apply = reg.lazy("apply", "engine.no_such_engine", "apply", fallback=noop)
+        for _ in range(3):
+            assert step({"w": 1}) == {"w": 1} and apply({"w": 2}) == {"w": 2}
+        assert not step.available() and not reg.available("apply")
+        assert imp.calls == {"engine.no_such_engine": 1}       # one ImportError per module
+    st = reg.status()["step"]
+    assert st["state"] == "missing" and "ModuleNotFoundError" in st["error"]
+
+    bare = reg.lazy("bare", "engine.no_such_engine", "step")
+    try:
+        bare({})
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("an engine without a fallback should raise when missing")
+
+
+def test_missing_attribute_uses_fallback():
+    reg = EngineRegistry()
+    step = reg.lazy("step", "json", "no_such_attr", fallback=noop)
+    assert step(5) == 5
+    assert reg.state("step") == "missing" and "AttributeError" in reg.status()["step"]["error"]
+    assert reg.available("step") is False
+
+
+def test_reset_retries_after_the_module_appears():
+    reg = EngineRegistry()
+    step = reg.lazy("step", "engine_registry_test_late", "step", fallback=noop)
+    assert step(1) == 1 and reg.state("step") == "missing"
+
+    late = types.ModuleType("engine_registry_test_late")
+    late.step = lambda x: x + 1
+    sys.modules[late.__name__] = late
+    try:
+        assert step(1) == 1                                       # cached failure until reset
+        reg.reset("step")
+        assert reg.state("step") == "pending"
+        assert step(1) == 2 and reg.state("step") == "loaded"    # same proxy, re-resolved
+    finally:
+        del sys.modules[late.__name__]
+
+
+def test_concurrent_first_use_imports_once():
+    reg = EngineRegistry()
+    with CountingImport() as imp:
+        step = reg.lazy("step", "engine_registry_test_slow", "step")
+        slow = types.ModuleType("engine_registry_test_slow")
+        slow.step = lambda x: x * 2
+        sys.modules[slow.__name__] = slow
+        try:
+            out = []
+            threads = [threading.Thread(target=lambda: out.append(step(21))) for _ in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        finally:
+            del sys.modules[slow.__name__]
+    assert out == [42] * 8
+    assert imp.calls == {"engine_registry_test_slow": 1}
+
+
+if __name__ == "__main__":
+    for fn in (test_nothing_imports_until_first_use, test_missing_module_falls_back_and_is_tried_once,
+               test_missing_attribute_uses_fallback, test_reset_retries_after_the_module_appears,
+               test_concurrent_first_use_imports_once):
+        fn()
+        print(fn.__name__, "ok")
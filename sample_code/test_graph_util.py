@@ -0,0 +1,140 @@
+import random
+
+import engine_path  # noqa: F401  (maps engine.* onto world_modules_demo/)
+from engine.graph_util import ZoneGraph, graph_for, mark_links_changed
+
+
+def make_zones(n=12):
+    return {f"z{i}": {"links": [f"z{(i + 1) % n}"]} for i in range(n)}
+
+
+def random_zones(seed, n=50):
+    rng = random.Random(seed)
+    zones = {}
+    for i in range(n):
+        links = [f"z{rng.randrange(n)}" for _ in range(rng.randrange(0, 4))]
+        if i % 7 == 0:
+            links += [f"z{i}", links[0] if links else "z1", f"lost{i % 3}"]   # self, duplicate, unknown
+        zones[f"z{i}"] = {"links": links}
+    zones["z5"] = {"energy": 1.0}                                         # no links key
+    return zones
+
+
+def clean_links(zones, zid):
+    out = []
+    for n in zones[zid].get("links", []):
+        if n in zones and n != zid and n not in out:
+            out.append(n)
+    return out
+
+
+def brute_hops(zones, sources, max_hops, reverse=False):
+    adj = {z: clean_links(zones, z) for z in zones}
+    if reverse:
+        radj = {z: [] for z in zones}
+        for a, out in adj.items():
+            for b in out:
+                radj[b].append(a)
+        for a, z in zones.items():                                      # walks may start at dangling names
+            for n in z.get("links", []):
+                if n not in zones:
+                    radj.setdefault(n, []).append(a)
+        adj = radj
+    dist = {s: 0 for s in sources}
+    for d in range(1, max_hops + 1):
+        for a in [a for a, v in dist.items() if v == d - 1]:
+            for b in adj.get(a, ()):
+                if b not in dist:
+                    dist[b] = d
+    return dist
+
+
+def test_csr_neighbors_and_predecessors():
+    zones = random_zones(1)
+    g = ZoneGraph(zones)
+    indptr, indices = g.csr()
+    assert len(indptr) == len(zones) + 1 and indptr[-1] == g.edges == len(indices)
+    for zid in zones:
+        assert g.neighbors(zid) == clean_links(zones, zid), zid
+        assert g.degree(zid) == len(g.neighbors(zid))
+        preds = [a for a in zones if zid in clean_links(zones, a)]
+        assert g.predecessors(zid) == preds and g.in_degree(zid) == len(preds), zid
+    for name in ("lost0", "lost1", "lost2"):
+        assert g.predecessors(name) == [a for a in zones if name in zones[a].get("links", [])]
+    assert g.neighbors("nowhere") == [] and g.degree("nowhere") == 0
+    np_ptr, np_ind = g.csr(numpy=True)
+    assert np_ptr.tolist() == list(indptr) and np_ind.tolist() == list(indices)
+
+
+def test_hops_match_brute_force():
+    zones = random_zones(2)
+    g = ZoneGraph(zones)
+    for reverse in (False, True):
+        for max_hops in range(5):
+            for sources in (["z0"], ["z3", "z9"], ["lost1"], ["z4", "lost2", "z4"]):
+                got = g.hops(sources, max_hops, reverse=reverse)
+                want = brute_hops(zones, list(dict.fromkeys(sources)), max_hops, reverse)
+                assert got == want, (sources, max_hops, reverse)
+                assert list(got.values()) == sorted(got.values())           # BFS order
+                assert g.hops(sources, max_hops, reverse=reverse) is got     # cached
+    assert g.hops("z0", 2) == g.hops(["z0"], 2)
+
+
+def test_components_match_brute_force():
+    zones = random_zones(3, n=80)
+    g = ZoneGraph(zones)
+    und = {z: set(clean_links(zones, z)) for z in zones}
+    for a in zones:
+        for b in clean_links(zones, a):
+            und[b].add(a)
+    seen, groups = set(), []
+    for z in zones:                                                     # first-seen order
+        if z in seen:
+            continue
+        stack, group = [z], []
+        seen.add(z)
+        while stack:
+            a = stack.pop()
+            group.append(a)
+            for b in und[a]:
+                if b not in seen:
+                    seen.add(b)
+                    stack.append(b)
+        groups.append(group)
+    assert len(set(g.components())) == len(groups)
+    for label, group in enumerate(groups):
+        assert {g.component_of(z) for z in group} == {label}
+    assert [sorted(m) for m in g.component_members()] == sorted(
+        (sorted(m) for m in groups), key=len, reverse=True)
+    assert g.component_of("lost0") is None
+
+
+def test_in_place_links_edits_refresh_the_graph():
+    zones = make_zones()
+    g = graph_for(zones)
+    assert graph_for(zones) is g
+
+    zones["z0"]["links"].append("z5")                 # append: no mark needed
+    g = graph_for(zones)
+    assert g.neighbors("z0") == ["z1", "z5"]
+
+    zones["z0"]["links"].remove("z1")                 # removal
+    assert graph_for(zones).neighbors("z0") == ["z5"]
+
+    zones["z3"]["links"] = ["z7"]                     # replaced list, same length
+    assert graph_for(zones).neighbors("z3") == ["z7"]
+
+    zones["z40"] = zones.pop("z4")                    # renamed zone, same count
+    g = graph_for(zones)
+    assert "z4" not in g.index and g.neighbors("z40") == ["z5"]
+
+    zones["z2"]["links"][0] = "z8"                    # same length in place: explicit mark
+    mark_links_changed(zones)
+    assert graph_for(zones).neighbors("z2") == ["z8"]
+
+
+if __name__ == "__main__":
+    for fn in (test_csr_neighbors_and_predecessors, test_hops_match_brute_force,
+               test_components_match_brute_force, test_in_place_links_edits_refresh_the_graph):
+        fn()
+        print(fn.__name__, "ok")
@@ -0,0 +1,54 @@
+import math
+
+import engine_path  # noqa: F401  (maps engine.* onto world_modules_demo/)
+import engine.world_util as wu
+
+
+def eager_decay(buckets, lam):
+    for zid in list(buckets):
+        b = buckets[zid]
+        b["density"] *= lam
+        b["m"] = {k: v * lam for k, v in b["m"].items() if v * lam > wu.RESONANCE_MARKER_FLOOR}
+        if zid is not None and b["density"] < wu.RESONANCE_DENSITY_FLOOR and not b["m"]:
+            del buckets[zid]
+
+
+def eager_add(buckets, zone, markers, w, d):
+    b = buckets.setdefault(zone, {"m": {}, "density": 0.0})
+    for k in markers:
+        b["m"][k] = b["m"].get(k, 0.0) + w
+    b["density"] += d
+
+
+def close(a, b):
+    return math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-12)
+
+
+def same_bucket(lazy, eager):
+    return lazy["m"].keys() == eager["m"].keys() and close(lazy["density"], eager["density"]) and all(
+        close(lazy["m"][k], v) for k, v in eager["m"].items())
+
+
+def test_lazy_decay_equals_eager_decay():
+    lam = wu.RESONANCE_DECAY_LAM
+    world = {"zones": {f"z{i}": {} for i in range(6)}}
+    eager = {None: {"m": {}, "density": 0.0}}
+    plan = {0: [("z0", ["ash"], 1.0, 0.02)], 3: [(None, ["echo"], 2.0, 0.05), ("z1", ["ash", "salt"], 0.5, 0.01)],
+            10: [("z0", ["ash"], 1.5, 0.02)], 25: [("z2", ["glass"], 0.3, 0.004)], 70: [("z3", ["ash"], 4.0, 0.1)]}
+    for tick in range(160):
+        for zone, markers, w, d in plan.get(tick, []):
+            scope = "zone" if zone else "global"
+            wu.add_resonance(world, scope=scope, zone=zone, markers=markers, w=w, d=d)
+            eager_add(eager, zone, markers, w, d)
+        wu.decay_resonance(world)
+        eager_decay(eager, lam)
+        for zone in [None] + list(world["zones"]):
+            expect = eager.get(zone, {"m": {}, "density": 0.0})
+            assert same_bucket(wu.resonance_bucket(world, zone), expect), (tick, zone)
+    # expired zone buckets are dropped from the stored overlay too
+    assert set(world["resonance"]["zones"]) == {z for z in eager if z is not None}
+
+
+if __name__ == "__main__":
+    test_lazy_decay_equals_eager_decay()
+    print("test_lazy_decay_equals_eager_decay ok")
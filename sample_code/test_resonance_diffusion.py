@@ -0,0 +1,103 @@
+import math
+import random
+
+import numpy as np
+
+import engine_path  # noqa: F401  (maps engine.* onto world_modules_demo/)
+import engine.world_util as wu
+from engine.graph_util import graph_for
+from engine.resonance_diffusion import ResonanceDiffusion
+
+LAM = 0.93
+
+
+def make_zones(rng, n=60):
+    zones = {f"z{i}": {"links": [f"z{(i + 1) % n}", f"z{rng.randrange(n)}"]} for i in range(n)}
+    zones["z0"]["links"] = []                                       # no links: keeps its bucket
+    zones["z1"]["links"] = ["z2", "z2", "z1", "elsewhere"]          # duplicates, self, unknown
+    return zones
+
+
+def make_buckets(rng, zones, now=5, aged=False):
+    return {z: {"m": {f"m{rng.randrange(6)}": rng.uniform(1.0, 4.0) for _ in range(3)},
+                "density": rng.uniform(0.5, 2.0), "at": now - (rng.randrange(4) if aged else 0)}
+            for z in rng.sample(sorted(zones), 25) + ["z0", "z1"]}
+
+
+def totals(updates):
+    density = sum(d for _m, d in updates.values())
+    markers = {}
+    for m, _d in updates.values():
+        for k, v in m.items():
+            markers[k] = markers.get(k, 0.0) + v
+    return density, markers
+
+
+def test_leak_zero_conserves_mass():
+    rng = random.Random(21)
+    zones = make_zones(rng)
+    buckets = make_buckets(rng, zones)
+    before = totals({z: (b["m"], b["density"]) for z, b in buckets.items()})
+    out = ResonanceDiffusion(rate=0.3, leak=0.0).step(buckets, graph_for(zones), now=5, lam=LAM)
+    after = totals(out)
+    assert math.isclose(after[0], before[0], rel_tol=1e-12)
+    assert sorted(after[1]) == sorted(before[1])
+    for k, v in before[1].items():
+        assert math.isclose(after[1][k], v, rel_tol=1e-12), k
+    assert out["z0"][1] >= buckets["z0"]["density"]                  # sends nothing, may receive
+
+
+def test_step_matches_dense_formula():
+    rng = random.Random(22)
+    zones = make_zones(rng)
+    buckets = make_buckets(rng, zones, aged=True)
+    g = graph_for(zones)
+    rate, leak, now = 0.25, 0.2, 5
+    out = ResonanceDiffusion(rate=rate, leak=leak).step(buckets, g, now=now, lam=LAM, marker_floor=0.0)
+
+    n = len(g.ids)
+    P = np.zeros((n, n))
+    for z in g.ids:
+        nb = g.neighbors(z)
+        for t in nb:
+            P[g.index[z], g.index[t]] = 1.0 / len(nb)
+    x = np.zeros(n)
+    for z, b in buckets.items():
+        x[g.index[z]] = b["density"] * LAM ** (now - b["at"])
+    keep = np.array([0.0 if g.neighbors(z) else rate for z in g.ids])      # no links: nothing sent
+    want = (1 - rate + keep) * x + rate * (1 - leak) * (P.T @ x)
+
+    for i, z in enumerate(g.ids):
+        if z in out:
+            assert math.isclose(out[z][1], want[i], rel_tol=1e-12, abs_tol=1e-15), z
+        else:
+            assert want[i] == 0.0, z
+
+
+def test_tick_stage_conserves_settled_density():
+    rng = random.Random(23)
+    w = wu._hydrate_world({"time": 0, "session_seed": 2, "zones": make_zones(rng)})
+    for z in rng.sample(sorted(w["zones"]), 20):
+        wu.add_resonance(w, scope="zone", zone=z, markers=["echo"], w=3.0, d=5.0)
+
+    def total():
+        return sum(wu.resonance_bucket(w, z)["density"] for z in w["resonance"]["zones"])
+
+    start = total()
+    assert wu.enable_resonance_diffusion(rate=0.3, leak=0.0) is not None
+    try:
+        for k in range(1, 6):
+            wu._resonance_diffusion_stage(w)
+            assert math.isclose(total(), start * LAM ** (k - 1), rel_tol=1e-9), k
+            wu.decay_resonance(w)
+            assert math.isclose(total(), start * LAM ** k, rel_tol=1e-9), k
+    finally:
+        wu.disable_resonance_diffusion()
+    assert len(w["resonance"]["zones"]) > 20                    # it did spread
+
+
+if __name__ == "__main__":
+    for fn in (test_leak_zero_conserves_mass, test_step_matches_dense_formula,
+               test_tick_stage_conserves_settled_density):
+        fn()
+        print(fn.__name__, "ok")
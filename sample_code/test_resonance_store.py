@@ -0,0 +1,82 @@
+import math
+import random
+
+import engine_path  # noqa: F401  (maps engine.* onto world_modules_demo/)
+import engine.resonance_store as rs
+import engine.world_util as wu
+
+MARKERS = [f"m{i}" for i in range(12)]
+
+
+def make_world(n=40):
+    return wu._hydrate_world({"time": 0, "session_seed": 4,
+                              "zones": {f"z{i}": {"energy": 0.1} for i in range(n)}})
+
+
+def assert_same(world, ids=None, **kw):
+    ids = list(world["zones"]) + ["nowhere"] if ids is None else ids
+    got = wu.resonance_overlay_all(world, ids, **kw)
+    assert sorted(got) == sorted(set(ids))
+    for z in ids:
+        want = wu.resonance_overlay(world, z, **kw)
+        assert sorted(got[z]["markers"]) == sorted(want["markers"]), z
+        assert math.isclose(got[z]["density"], want["density"], rel_tol=1e-12, abs_tol=1e-15), z
+
+
+def churn(world, rng, steps):
+    """Bumps, global bumps, decay steps and clears, checking the batch view after each."""
+    for step in range(steps):
+        for _ in range(rng.randrange(1, 6)):
+            z = f"z{rng.randrange(len(world['zones']))}"
+            wu.add_resonance(world, scope="zone", zone=z, markers=rng.sample(MARKERS, 3),
+                             w=rng.uniform(0.2, 3.0), d=rng.uniform(0.0, 0.5))
+        if step % 4 == 0:
+            wu.add_resonance(world, markers=[rng.choice(MARKERS)], w=rng.uniform(1.0, 4.0))
+        if step % 7 == 3:
+            wu.clear_resonance(world, scope="zone", zone=f"z{rng.randrange(len(world['zones']))}")
+        for _ in range(rng.randrange(0, 4)):
+            wu.decay_resonance(world)
+        assert_same(world)
+
+
+def test_overlay_all_matches_per_zone_overlay():
+    churn(make_world(), random.Random(8), 30)
+
+
+def test_overlay_all_after_replaced_section_and_custom_weights():
+    rng = random.Random(9)
+    w = make_world()
+    churn(w, rng, 5)
+    wu.clear_resonance(w)                                  # section dict replaced
+    assert_same(w)
+    churn(w, rng, 5)
+    assert_same(w, beta=0.4, gamma=0.9)
+    assert_same(w, ids=["z3", "z3", "z7"])
+    wu.decay_resonance(w, lam=0.5)                         # eager decay of every bucket
+    assert_same(w)
+
+
+def test_loop_fallback_matches_dense():
+    rng = random.Random(10)
+    w = make_world()
+    churn(w, rng, 10)
+    section, now = w["resonance"], wu._resonance_clock(w)
+    dense = rs.ResonanceStore(wu.RESONANCE_DECAY_LAM, wu.RESONANCE_MARKER_FLOOR).overlay_all(section, now)
+    saved = rs.np, rs.DENSE_MAX_CELLS
+    for np_mod, cells in ((None, saved[1]), (saved[0], 1)):   # no numpy; matrix over the memory guard
+        rs.np, rs.DENSE_MAX_CELLS = np_mod, cells
+        try:
+            loop = rs.ResonanceStore(wu.RESONANCE_DECAY_LAM, wu.RESONANCE_MARKER_FLOOR).overlay_all(section, now)
+        finally:
+            rs.np, rs.DENSE_MAX_CELLS = saved
+        assert sorted(loop) == sorted(dense)
+        for z in dense:
+            assert sorted(loop[z]["markers"]) == sorted(dense[z]["markers"]), z
+            assert math.isclose(loop[z]["density"], dense[z]["density"], rel_tol=1e-12, abs_tol=1e-15), z
+
+
+if __name__ == "__main__":
+    for fn in (test_overlay_all_matches_per_zone_overlay,
+               test_overlay_all_after_replaced_section_and_custom_weights, test_loop_fallback_matches_dense):
+        fn()
+        print(fn.__name__, "ok")
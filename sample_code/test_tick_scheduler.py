@@ -0,0 +1,130 @@
+import copy
+import random
+import threading
+import time
+
+import engine_path  # noqa: F401  (maps engine.* onto world_modules_demo/)
+import engine.world_util as wu
+from engine.tick_scheduler import StageRegistry, sections_overlap
+
+
+STAMPS = ("last_update", "last_weather_update", "timestamp", "ts", "created")
+
+
+def bump(key, delay=0.0):
+    def f(w):
+        time.sleep(delay)
+        w[key] = w.get(key, 0) + 1
+        return w
+    return f
+
+
+def replace_world(w):
+    return dict(w, seen=sorted(w))                                   # exclusive stages may swap the world
+
+
+def strip(v):
+    if isinstance(v, dict):
+        return {k: strip(x) for k, x in v.items() if k not in STAMPS}
+    if isinstance(v, list):
+        return [strip(x) for x in v]
+    return v
+
+
+def total(w):
+    w["c"] = w.get("a", 0) * 10 + w.get("b", 0)
+    return w
+
+
+def build():
+    reg = StageRegistry()
+    reg.register("a", bump("a", 0.02), reads=("time",), writes=("a",))
+    reg.register("b", bump("b", 0.02), reads=("time",), writes=("b",))
+    reg.register("c", total, reads=("a", "b"), writes=("c",))
+    reg.register("weather", bump("zw"), reads=("zones.*.micro",), writes=("zones.*.weather", "zw"))
+    reg.register("micro", bump("zm"), reads=(), writes=("zones.*.micro", "zm"))
+    reg.register("all", replace_world)                                # undeclared: exclusive
+    return reg
+
+
+def test_sections_and_plan():
+    assert sections_overlap("zones", "zones.*.micro")
+    assert sections_overlap("zones.*.weather", "zones.gate.weather")
+    assert not sections_overlap("zones.*.weather", "zones.*.micro")
+    reg = build()
+    assert reg.plan() == [["a", "b", "weather"], ["c", "micro"], ["all"]]
+    reg.register("first", bump("f"), reads=(), writes=("f",), before="a")
+    reg.register("b", bump("b"), reads=("time",), writes=("b",))      # replaced in place
+    assert reg.names() == ["first", "a", "b", "c", "weather", "micro", "all"]
+    assert reg.unregister("first") and "first" not in reg
+
+
+def test_executors_agree_and_respect_dependencies():
+    for mode in ("serial", "thread"):
+        reg = build()
+        w = reg.run({"time": 1}, executor=mode)
+        assert w == {"time": 1, "a": 1, "b": 1, "c": 11, "zw": 1, "zm": 1,
+                     "seen": ["a", "b", "c", "time", "zm", "zw"]}, mode
+        assert reg.run({"time": 1}, executor=mode, skip=("a",))["c"] == 1
+        reg.close()
+
+
+def test_thread_executor_overlaps_independent_stages():
+    seen, lock = [], threading.Lock()
+
+    def tracked(key):
+        def f(w):
+            with lock:
+                seen.append(threading.current_thread().name)
+            time.sleep(0.05)
+            w[key] = 1
+            return w
+        return f
+
+    reg = StageRegistry(executor="thread", workers=2)
+    reg.register("x", tracked("x"), reads=(), writes=("x",))
+    reg.register("y", tracked("y"), reads=(), writes=("y",))
+    t0 = time.perf_counter()
+    w = reg.run({})
+    assert w == {"x": 1, "y": 1} and time.perf_counter() - t0 < 0.095
+    assert all(name.startswith("tick-stage") for name in seen)
+    reg.close()
+
+
+def test_first_stage_error_is_raised():
+    reg = StageRegistry(executor="thread")
+    reg.register("ok", bump("ok"), reads=(), writes=("ok",))
+    reg.register("bad", lambda w: 1 / 0, reads=(), writes=("bad",))
+    reg.register("after", bump("after"), reads=("bad",), writes=("after",))
+    w = {}
+    try:
+        reg.run(w)
+    except ZeroDivisionError:
+        pass
+    else:
+        raise AssertionError("stage error was swallowed")
+    assert "after" not in w
+    reg.close()
+
+
+def test_world_ticks_match_across_executors():
+    base = {"time": 0, "session_seed": 4,
+            "zones": {f"z{i}": {"type": "ruin", "energy": 0.1 * (i % 5), "links": [f"z{(i + 1) % 8}"]}
+                      for i in range(8)}}
+    out = {}
+    try:
+        for mode in ("serial", "thread"):
+            assert wu.set_tick_executor(mode) == mode
+            random.seed(11)
+            out[mode] = strip(wu.autorun_world_ticks(copy.deepcopy(base), 6, save=False))
+    finally:
+        wu.set_tick_executor("serial")
+    assert out["serial"] == out["thread"]
+
+
+if __name__ == "__main__":
+    for fn in (test_sections_and_plan, test_executors_agree_and_respect_dependencies,
+               test_thread_executor_overlaps_independent_stages, test_first_stage_error_is_raised,
+               test_world_ticks_match_across_executors):
+        fn()
+        print(fn.__name__, "ok")
@@ -0,0 +1,160 @@
+import asyncio
+import os
+import tempfile
+import time
+
+import engine_path  # noqa: F401  (maps engine.* onto world_modules_demo/)
+import engine.world_util as wu
+from engine.tick_service import TickService
+
+
+class ScriptedService(TickService):
+    """Skips the world: each tick job records its plan and sleeps the scripted time."""
+
+    def __init__(self, costs, **kw):
+        super().__init__({}, **kw)
+        self.costs = list(costs)
+        self.plans = []
+
+    def _tick_job(self, prompt, deltas, n, ff):
+        self.plans.append((n, ff, prompt, len(deltas)))
+        time.sleep(self.costs.pop(0) if self.costs else 0.0)
+        self._gen += n + ff
+        return n + ff, 0.0
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_plan_per_policy():
+    for policy, want in (("skip", (1, 0)), ("burst", (4, 0)), ("fast_forward", (1, 5))):
+        svc = TickService({}, policy=policy, burst_max=4, ff_max=5)
+        assert svc._plan(0) == (1, 0)
+        assert svc._plan(7) == want, policy
+    st = {p: TickService({}, policy=p, burst_max=4, ff_max=5) for p in ("skip", "burst", "fast_forward")}
+    for svc in st.values():
+        svc._plan(7)
+    assert st["skip"].stats["skipped"] == 7
+    assert (st["burst"].stats["burst"], st["burst"].stats["skipped"]) == (3, 4)
+    assert (st["fast_forward"].stats["fast_forwarded"], st["fast_forward"].stats["skipped"]) == (5, 2)
+    try:
+        TickService({}, policy="warp")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("unknown policy should raise")
+
+
+def test_catch_up_after_a_stall():
+    async def main(policy):
+        period = 0.02
+        svc = ScriptedService([period * 5.5], rate_hz=1 / period, policy=policy, burst_max=3, ff_max=8)
+        await svc.start()
+        await svc.wait_tick(2)
+        await svc.stop()
+        return svc
+
+    for policy in ("skip", "burst", "fast_forward"):
+        svc = run(main(policy))
+        n, ff = svc.plans[1][:2]                      # the wake-up right after the stall
+        behind = svc.stats["skipped"] + svc.stats["burst"] + svc.stats["fast_forwarded"]
+        assert behind >= 3, (policy, svc.stats)
+        if policy == "skip":
+            assert (n, ff) == (1, 0) and svc.stats["burst"] == svc.stats["fast_forwarded"] == 0
+        elif policy == "burst":
+            assert (n, ff) == (3, 0) and svc.stats["burst"] == 2
+        else:
+            assert n == 1 and ff >= 3 and svc.stats["fast_forwarded"] == ff
+        assert svc.tick_count == sum(p[0] + p[1] for p in svc.plans)
+
+
+def test_full_queues_push_back():
+    events = []
+
+    async def main():
+        svc = ScriptedService([], rate_hz=0.5, prompt_queue=5, delta_queue=5,
+                              on_pressure=lambda hot, info: events.append((hot, info["prompt_fill"])))
+        await svc.start()
+        for k in range(5):
+            assert await svc.submit_prompt(f"p{k}", wait=False)
+        assert not await svc.submit_prompt("dropped", wait=False)
+        assert svc.overloaded.is_set() and svc.pressure()["prompt_fill"] == 1.0
+
+        blocked = asyncio.ensure_future(svc.submit_prompt("late"))    # waits for room
+        await asyncio.sleep(0.05)
+        assert not blocked.done()
+        svc._prompts.get_nowait()                                      # a tick takes one
+        await asyncio.wait_for(blocked, 1.0)
+        while not svc._prompts.empty():
+            svc._prompts.get_nowait()
+        svc._check_pressure()
+        assert not svc.overloaded.is_set()
+        await svc.stop()
+
+    run(main())
+    assert events == [(True, 0.8), (False, 0.0)]                       # raised at the high-water mark
+
+
+def test_overruns_raise_and_clear_pressure():
+    events = []
+
+    class Slow(TickService):
+        def __init__(self, **kw):
+            super().__init__({}, **kw)
+            self.costs = [1.0] * 3 + [0.0] * 3          # share of the period each tick takes
+
+        def _tick_job(self, prompt, deltas, n, ff):
+            share = self.costs.pop(0) if self.costs else 0.0
+            self._gen += n + ff
+            return n + ff, share * self.period
+
+    async def main():
+        svc = Slow(rate_hz=100.0, budget=0.5, pressure_after=3, policy="skip",
+                   on_pressure=lambda hot, info: events.append((hot, info["overruns"])))
+        await svc.start()
+        await svc.wait_tick(6)
+        await svc.stop()
+        return svc
+
+    svc = run(main())
+    assert events == [(True, 3), (False, 0)]
+    assert svc.stats["overruns"] == 3
+
+
+def test_real_world_consumes_inputs():
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            w = {"time": 0, "session_seed": 3,
+                 "zones": {f"z{i}": {"energy": 0.1, "links": [f"z{(i + 1) % 4}"]} for i in range(4)}}
+            wu.save_world(w)
+
+            async def main():
+                svc = TickService(w, rate_hz=50.0)
+                await svc.start()
+                await svc.submit_prompt("rain over the gate")
+                await svc.submit_delta({"zones": {"z1": {"markers": ["echo"]}}})
+                start = svc.tick_count
+                snap = await svc.snapshot(fresh=True)
+                while "echo" not in snap["zones"]["z1"].get("markers", []):
+                    snap = await svc.snapshot(fresh=True)
+                await svc.wait_tick(start + 3)
+                await svc.stop()
+                return svc, snap
+
+            svc, snap = run(main())
+            assert svc.stats["deltas"] == 1 and svc.stats["errors"] == 0
+            assert svc.stats["ticks"] == svc.tick_count >= 3
+            assert svc.world["zones"]["z1"]["markers"] == ["echo"]
+            assert snap is not svc.world
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    for fn in (test_plan_per_policy, test_catch_up_after_a_stall, test_full_queues_push_back,
+               test_overruns_raise_and_clear_pressure, test_real_world_consumes_inputs):
+        fn()
+        print(fn.__name__, "ok")
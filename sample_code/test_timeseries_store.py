@@ -0,0 +1,63 @@
+import tempfile
+from pathlib import Path
+
+import engine_path  # noqa: F401  (maps engine.* onto world_modules_demo/)
+from engine.timeseries_store import Series, SeriesStore
+
+
+def test_ring_buffer_wraps_and_keeps_newest_points():
+    with tempfile.TemporaryDirectory() as d:
+        s = Series(Path(d) / "x.ts", capacity=8)
+        ref = []
+        for t in range(27):                           # wraps the 8-slot buffer three times
+            s.append(t * 0.5, tick=10 + t)
+            ref.append((10 + t, t * 0.5))
+            assert s.points() == ref[-8:]
+            assert len(s) == min(len(ref), 8) and s.total == len(ref)
+        assert s.last(3) == [v for _, v in ref[-3:]]
+        assert s.values(-5, -2) == [v for _, v in ref[-5:-2]]
+        assert s.range_by_tick(30, 34) == [p for p in ref if 30 <= p[0] < 34]
+        assert s.index_of_tick(0) == 0 and s.index_of_tick(10**9) == len(s)
+        s.close()
+
+        reopened = Series(Path(d) / "x.ts")           # capacity comes from the header
+        assert reopened.capacity == 8 and reopened.points() == ref[-8:]
+        assert reopened.append(99.0) == 28 and reopened.ticks(-1) == [37]
+        reopened.close()
+
+
+def test_truncate_to_across_the_wrap():
+    with tempfile.TemporaryDirectory() as d:
+        s = Series(Path(d) / "y.ts", capacity=5)
+        for t in range(12):
+            s.append(float(t), tick=t)
+        s.truncate_to(10)                             # undo two appends
+        assert s.values() == [7.0, 8.0, 9.0]          # slots 5 and 6 were reused: excluded
+        s.append(10.0, tick=10)
+        assert s.points() == [(7, 7.0), (8, 8.0), (9, 9.0), (10, 10.0)]
+        s.truncate_to(3)                              # before everything retained
+        assert len(s) == 0 and s.values() == []
+        s.close()
+
+
+def test_downsample_buckets():
+    with tempfile.TemporaryDirectory() as d:
+        store = SeriesStore(Path(d), capacity=64)
+        s = store.series(store.handle_for("metrics/agi index"))
+        for t in range(100):
+            s.append(float(t % 10), tick=t)
+        assert store.handles() == ["metrics_agi_index"]
+        assert len(s) == 64
+        assert s.downsample(8, how="last") == [(43, 3.0), (51, 1.0), (59, 9.0), (67, 7.0),
+                                               (75, 5.0), (83, 3.0), (91, 1.0), (99, 9.0)]
+        mm = s.downsample(4, how="minmax")
+        assert all(v in (0.0, 9.0) for _, v in mm) and [t for t, _ in mm] == sorted(t for t, _ in mm)
+        assert s.downsample(1000) == s.points()
+        store.close()
+
+
+if __name__ == "__main__":
+    for fn in (test_ring_buffer_wraps_and_keeps_newest_points, test_truncate_to_across_the_wrap,
+               test_downsample_buckets):
+        fn()
+        print(fn.__name__, "ok")
@@ -0,0 +1,115 @@
+import copy
+import random
+
+import engine_path  # noqa: F401  (maps engine.* onto world_modules_demo/)
+import engine.weather_engine as we
+from engine.graph_util import graph_for
+
+INF = float("inf")
+
+
+def make_zones(rng, n=40):
+    zones = {}
+    for i in range(n):
+        links = [f"z{rng.randrange(n)}" for _ in range(rng.randrange(0, 3))]
+        if i % 9 == 0:
+            links.append(f"gone{i}")                               # dangling link
+        zones[f"z{i}"] = {"type": rng.choice(["ruin", "market", "gate", "wild"]), "energy": 0.5, "links": links}
+    return zones
+
+
+def all_pairs(zones):
+    """Floyd-Warshall hop counts over the links, unknown targets included as sinks."""
+    nodes = sorted(set(zones) | {t for z in zones.values() for t in z["links"]})
+    d = {a: {b: (0 if a == b else INF) for b in nodes} for a in nodes}
+    for a, z in zones.items():
+        for b in z["links"]:
+            if a != b:
+                d[a][b] = 1
+    for k in nodes:
+        dk = d[k]
+        for a in nodes:
+            dak = d[a][k]
+            if dak == INF:
+                continue
+            da = d[a]
+            for b in nodes:
+                if dak + dk[b] < da[b]:
+                    da[b] = dak + dk[b]
+    return d
+
+
+def test_distance_fields_match_brute_force():
+    rng = random.Random(31)
+    zones = make_zones(rng)
+    d = all_pairs(zones)
+    links = we._LazyLinks(zones)
+    rev = we._reverse_links({zid: links.get(zid, []) for zid in zones})
+    g = graph_for(zones)
+    for limit in (1, 2, we.FRONT_RANGE, 5):
+        for origin in list(zones) + ["gone0"]:
+            want_in = {a: d[a][origin] for a in zones if d[a][origin] < limit}     # who reaches origin
+            got = we._distance_field(origin, rev, limit)
+            assert {a: v for a, v in got.items() if a in zones} == want_in, (origin, limit)
+            hops = g.hops(origin, limit - 1, reverse=True)
+            assert {a: v for a, v in hops.items() if a in zones} == want_in, (origin, limit)
+        for zid in zones:
+            want_out = {b: d[zid][b] for b in d[zid] if d[zid][b] < limit}
+            assert we._distance_field(zid, links, limit) == want_out, (zid, limit)
+
+
+def run_steps(zones, ticks, zone_ids=None, graph=True, prompt=""):
+    saved = we._graph_for
+    if not graph:
+        we._graph_for = None
+    try:
+        w = {"time": 0, "session_seed": 13, "zones": copy.deepcopy(zones)}
+        for t in range(ticks):
+            w["time"] = t
+            w = we.step(w, prompt, zone_ids=zone_ids)
+            w.pop("last_weather_update", None)
+        return w
+    finally:
+        we._graph_for = saved
+
+
+def test_step_paths_agree():
+    rng = random.Random(32)
+    zones = make_zones(rng, n=80)
+    ref = run_steps(zones, 20)
+    assert ref["weather"]["fronts"]
+    every = list(zones)
+    for kw in ({"graph": False}, {"zone_ids": every}, {"zone_ids": every, "graph": False}):
+        assert run_steps(zones, 20, **kw) == ref, kw
+    storm = run_steps(zones, 12, prompt="storm over the gate")
+    assert run_steps(zones, 12, zone_ids=every, graph=False, prompt="storm over the gate") == storm
+
+
+def test_step_matches_brute_force_distances():
+    rng = random.Random(33)
+    zones = make_zones(rng, n=50)
+    d = all_pairs(zones)
+
+    def brute(src, adj, limit):
+        if not src:
+            return {}
+        if isinstance(adj, we._LazyLinks):                          # forward walk from a zone
+            return {b: v for b, v in d.get(src, {src: 0}).items() if v < limit}
+        return {a: d[a][src] for a in d if d[a][src] < limit}      # reversed walk from an origin
+
+    ref = run_steps(zones, 15, graph=False)
+    lod = run_steps(zones, 15, zone_ids=list(zones), graph=False)
+    saved = we._distance_field
+    we._distance_field = brute
+    try:
+        assert run_steps(zones, 15, graph=False) == ref
+        assert run_steps(zones, 15, zone_ids=list(zones), graph=False) == lod
+    finally:
+        we._distance_field = saved
+    assert ref == lod
+
+
+if __name__ == "__main__":
+    for fn in (test_distance_fields_match_brute_force, test_step_paths_agree, test_step_matches_brute_force_distances):
+        fn()
+        print(fn.__name__, "ok")
@@ -0,0 +1,56 @@
+import copy
+import random
+
+import engine_path  # noqa: F401  (maps engine.* onto world_modules_demo/)
+from engine.world_delta import apply_world_delta, calculate_world_delta
+
+
+def round_trip(old, new):
+    ops = calculate_world_delta(old, new, epsilon=0.0)
+    out = apply_world_delta(copy.deepcopy(old), copy.deepcopy(ops))
+    assert out == new, ops
+    return ops
+
+
+def test_ring_buffer_is_one_shift_op():
+    old = {"density_log": [0.1 * i for i in range(300)]}
+    new = {"density_log": old["density_log"][5:] + [9.0, 9.5, 10.0, 10.5, 11.0]}
+    ops = round_trip(old, new)
+    assert [op["op"] for op in ops] == ["shift"]
+    assert ops[0]["drop"] == 5 and ops[0]["add"] == [9.0, 9.5, 10.0, 10.5, 11.0]
+    assert round_trip({"log": [1, 2]}, {"log": [1, 2, 3]})[0]["op"] == "shift"     # append only
+    assert round_trip({"log": [1, 2, 3]}, {"log": [2, 3]})[0]["op"] == "shift"     # trim only
+
+
+def test_records_diff_by_key():
+    old = {"events": [{"id": i, "text": f"e{i}", "n": i} for i in range(50)]}
+    new = copy.deepcopy(old)
+    del new["events"][10]                                 # removal shifts every later index
+    new["events"].insert(3, {"id": 100, "text": "new"})
+    new["events"][20]["n"] = -1
+    ops = round_trip(old, new)
+    assert len(ops) == 1 and ops[0]["op"] == "keyed" and ops[0]["key"] == "id"
+    assert ops[0]["remove"] == [10] and ops[0]["insert"] == [[3, {"id": 100, "text": "new"}]]
+    assert [k for k, _ in ops[0]["update"]] == [new["events"][20]["id"]]
+
+
+def test_random_list_edits_round_trip():
+    rng = random.Random(6)
+    for _ in range(300):
+        old_log = [rng.randrange(5) for _ in range(rng.randrange(12))]
+        old_recs = [{"name": f"r{i}", "v": rng.randrange(3)} for i in range(rng.randrange(8))]
+        new_log = old_log[rng.randrange(len(old_log) + 1):] + [rng.randrange(5) for _ in range(rng.randrange(4))]
+        new_recs = [dict(r, v=rng.randrange(3)) for r in old_recs if rng.random() < 0.7]
+        for _ in range(rng.randrange(3)):
+            new_recs.insert(rng.randrange(len(new_recs) + 1), {"name": f"n{rng.randrange(10**6)}", "v": 0})
+        if rng.random() < 0.2:
+            rng.shuffle(new_recs)                          # reordered: falls back to index ops
+        old = {"log": old_log, "recs": old_recs, "zones": {"a": {"markers": old_log[:3]}}}
+        new = {"log": new_log, "recs": new_recs, "zones": {"a": {"markers": new_log[-3:]}}}
+        round_trip(old, new)
+
+
+if __name__ == "__main__":
+    for fn in (test_ring_buffer_is_one_shift_op, test_records_diff_by_key, test_random_list_edits_round_trip):
+        fn()
+        print(fn.__name__, "ok")
@@ -0,0 +1,85 @@
+import copy
+import json
+import os
+import random
+import tempfile
+
+import engine_path  # noqa: F401  (maps engine.* onto world_modules_demo/)
+import engine.world_util as wu
+from engine.world_farm import FARM_KEY, SimFarm, clone_worlds, normalize_world
+
+PROMPT = "storm over the ring"
+STAMPS = ("last_update", "last_weather_update", "timestamp")
+
+
+def make_worlds():
+    ring = {f"r{i}": {"energy": 0.1 * i, "links": [f"r{(i + 1) % 6}"]} for i in range(6)}
+    base = {
+        "ring": normalize_world({"zones": ring}, "ring"),
+        "regions": normalize_world({"world_traits": {"spiritual_noise": 0.3},
+                                    "regions": [{"name": "Old Gate"}, {"name": "Salt Market"}]}, "regions"),
+    }
+    return clone_worlds(base, 3)
+
+
+def direct(w, wid, start, ticks, seed):
+    """The farm's per-world computation, run in this process."""
+    w = copy.deepcopy(w)
+    for t in range(start, start + ticks):
+        random.seed(f"{seed}:{wid}:{t}")
+        w = wu.replay_tick(w, PROMPT)
+        w[FARM_KEY]["tick"] = t + 1
+    return w
+
+
+def strip(v):
+    if isinstance(v, dict):
+        return {k: strip(x) for k, x in v.items() if k not in STAMPS}
+    if isinstance(v, list):
+        return [strip(x) for x in v]
+    return v
+
+
+def plain(w):
+    return strip(json.loads(json.dumps(w, default=wu._json_default)))
+
+
+def checkpoint(directory, wid):
+    with open(os.path.join(directory, f"{wid}.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_farm_matches_direct_runs_and_resumes():
+    worlds = make_worlds()
+    start = copy.deepcopy(worlds)
+    with tempfile.TemporaryDirectory() as tmp:
+        farm = SimFarm(worlds, tmp, workers=2, slice_ticks=3, checkpoint_every=4, prompt=PROMPT, seed=7)
+        rows = []
+        out = farm.run(10, on_metrics=rows.append)
+        assert farm.stats["ticks"] == 10 * len(worlds)
+        assert sorted(out) == sorted(worlds)
+        for wid, s in out.items():
+            assert s["error"] is None and s["tick"] == 10 and s["ticks"] == 10, (wid, s)
+            assert [r["tick"] for r in rows if r["world"] == wid] == list(range(1, 11))
+            assert plain(checkpoint(tmp, wid)) == plain(direct(start[wid], wid, 0, 10, 7)), wid
+
+        # a new farm over the same directory resumes from the checkpoints
+        res = SimFarm(make_worlds(), tmp, workers=2, prompt=PROMPT, seed=7).run(5)
+        for wid in worlds:
+            assert res[wid]["tick"] == 15
+            assert plain(checkpoint(tmp, wid)) == plain(direct(start[wid], wid, 0, 15, 7)), wid
+
+
+def test_clones_get_their_own_seed():
+    worlds = make_worlds()
+    assert sorted(worlds) == [f"{b}.{i}" for b in ("regions", "ring") for i in range(3)]
+    seeds = {w["session_seed"] for w in worlds.values()}
+    assert len(seeds) == len(worlds)
+    assert all(w[FARM_KEY] == {"id": wid, "tick": 0} for wid, w in worlds.items())
+    assert sorted(worlds["regions.0"]["zones"]) == ["old_gate", "salt_market"]
+
+
+if __name__ == "__main__":
+    for fn in (test_farm_matches_direct_runs_and_resumes, test_clones_get_their_own_seed):
+        fn()
+        print(fn.__name__, "ok")
@@ -0,0 +1,47 @@
+import copy
+import os
+import tempfile
+
+import engine_path  # noqa: F401  (maps engine.* onto world_modules_demo/)
+import engine.world_util as wu
+
+STAMPS = ("last_update", "last_weather_update", "timestamp", "ts", "created")
+
+
+def make_world():
+    return {
+        "time": 0,
+        "session_seed": 9,
+        "zones": {
+            f"z{i}": {"type": "ruin" if i % 3 else "market", "energy": 0.1 * (i % 7), "links": [f"z{(i + 1) % 10}"]}
+            for i in range(10)
+        },
+    }
+
+
+def strip(v):
+    if isinstance(v, dict):
+        return {k: strip(x) for k, x in v.items() if k not in STAMPS}
+    if isinstance(v, list):
+        return [strip(x) for x in v]
+    return v
+
+
+def test_fast_forward_equals_single_ticks():
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            ref = copy.deepcopy(make_world())
+            wu.save_world(ref)
+            for _ in range(12):
+                ref = wu.autorun_world_tick(ref)
+            ff = wu.autorun_world_ticks(make_world(), 12, save=False, compact_every=5)
+            assert strip(ff) == strip(ref)
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    test_fast_forward_equals_single_ticks()
+    print("test_fast_forward_equals_single_ticks ok")
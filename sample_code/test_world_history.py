@@ -0,0 +1,82 @@
+import copy
+import os
+import tempfile
+
+import engine_path  # noqa: F401  (maps engine.* onto world_modules_demo/)
+import engine.world_save_api as save_api
+
+
+def clock_world(tick):
+    return {
+        "WORLD_NAME": "hist_test",
+        "time": {"tick": tick, "day": tick // 24, "hours_per_tick": 1.0},
+        "zones": {"gate": {"energy": 0.1 * tick}, "market": {"energy": 0.5}},
+        "density_log": [0.1 * i for i in range(tick)],
+    }
+
+
+def test_restore_world_at_with_clock_time():
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            save_api._HISTORIES.clear()
+            assert save_api.WorldHistory is not None
+            states = {}
+            prev = {}
+            for tick in range(1, 8):
+                w = clock_world(tick)
+                save_api.save_world_delta(w, prev, "hist_test")
+                states[tick] = copy.deepcopy(w)
+                prev = w
+            assert save_api._history("hist_test").ticks == list(range(1, 8))
+            for tick in (1, 4, 7):
+                assert save_api.restore_world_at("hist_test", tick) == states[tick]
+            assert save_api.restore_world_at("hist_test", 100) == states[7]
+        finally:
+            save_api._HISTORIES.clear()
+            os.chdir(cwd)
+
+
+def test_reloading_an_older_save_starts_a_new_segment():
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            save_api._HISTORIES.clear()
+            old, new = {}, {}
+            prev = {}
+            for tick in range(1, 6):
+                w = clock_world(tick)
+                save_api.save_world_delta(w, prev, "hist_test")
+                old[tick] = copy.deepcopy(w)
+                prev = w
+            # reload the tick-3 save and play on from there
+            for tick in (3, 4):
+                w = clock_world(tick)
+                w["zones"]["gate"]["branch"] = "reloaded"
+                save_api.save_world_delta(w, prev, "hist_test")
+                new[tick] = copy.deepcopy(w)
+                prev = w
+            assert os.path.exists(os.path.join(save_api.SAVE_DIR, "hist_test_delta.json"))
+            hist = save_api._history("hist_test")
+            assert hist.stats()["segments"] == 2
+
+            for h in (hist, save_api.WorldHistory(hist.log_path.with_suffix(""))):   # live, reopened
+                assert h.restore_world_at(2) == old[2]
+                assert h.restore_world_at(3) == new[3]
+                assert h.restore_world_at(100) == new[4]
+
+            hist.idx_path.unlink()                       # index lost: rebuilt from the log
+            rebuilt = save_api.WorldHistory(hist.log_path.with_suffix(""))
+            assert rebuilt.restore_world_at(4) == new[4] and rebuilt.restore_world_at(5) == new[4]
+            assert rebuilt.restore_world_at(1) == old[1]
+        finally:
+            save_api._HISTORIES.clear()
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    for fn in (test_restore_world_at_with_clock_time, test_reloading_an_older_save_starts_a_new_segment):
+        fn()
+        print(fn.__name__, "ok")
@@ -0,0 +1,63 @@
+import json
+import os
+import tempfile
+import threading
+
+import engine_path  # noqa: F401  (maps engine.* onto world_modules_demo/)
+import engine.world_util as wu
+from engine.topology_viewer import get_topological_summary
+from engine.zone_viewer import list_zones
+
+
+def make_world():
+    return {
+        "time": 0,
+        "zones": {"gate": {"type": "gate", "energy": 0.4}, "market": {"type": "market", "energy": 0.6}},
+        "density_log": [0.1, 0.2, 0.3],
+    }
+
+
+def test_viewers_inside_tick_and_nested_reads():
+    w = make_world()
+    with wu._WORLD_LOCK:                       # a stage rendering mid-tick
+        assert "gate [gate]" in list_zones(w)
+        assert get_topological_summary(w)["stats"]["latest"] == 0.3
+
+    done = threading.Event()
+    with wu.world_read_lock():
+        writer = threading.Thread(target=lambda: (wu._WORLD_LOCK.acquire(), wu._WORLD_LOCK.release(), done.set()))
+        writer.start()
+        while not wu._WORLD_LOCK._writers_waiting:
+            pass
+        assert list_zones(w, summary=True) == "gate\nmarket"   # nested read, writer queued
+    writer.join(5.0)
+    assert done.is_set()
+
+
+def test_switch_persist_mode_with_queued_saves():
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            wu.start_background_saver(linger_s=0.01)
+            assert wu.set_persist_mode("journal", checkpoint_every=50, fsync=False) == "journal"
+            w = make_world()
+            wu.save_world(w)
+            for _ in range(3):
+                w = wu.autorun_world_tick(w)
+            assert wu.set_persist_mode("full") == "full"
+            assert wu.flush_world(timeout=5.0)
+            on_disk = json.loads(wu.WORLD_FILE.read_text(encoding="utf-8"))
+            on_disk.pop("journal_seq", None)
+            assert on_disk == json.loads(json.dumps(w))
+            assert not wu.JOURNAL_FILE.exists() or wu.JOURNAL_FILE.read_text(encoding="utf-8") == ""
+        finally:
+            wu.stop_background_saver()
+            wu.set_persist_mode("full")
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    for fn in (test_viewers_inside_tick_and_nested_reads, test_switch_persist_mode_with_queued_saves):
+        fn()
+        print(fn.__name__, "ok")
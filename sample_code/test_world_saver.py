@@ -0,0 +1,57 @@
+import threading
+
+import engine_path  # noqa: F401  (maps engine.* onto world_modules_demo/)
+import engine.world_util as wu
+from engine.world_saver import WorldSaver
+
+
+def test_failed_write_does_not_stop_saver():
+    calls = []
+
+    def write(job):
+        calls.append(job)
+        if len(calls) == 1:
+            raise OSError("disk full")
+
+    saver = WorldSaver(write, linger_s=0.0)
+    try:
+        gen = saver.submit("a")
+        assert saver.wait_durable(gen, timeout=5.0) is False   # attempted, not durable
+        assert saver.stats["errors"] == 1
+        gen = saver.submit("b")
+        assert saver.flush(timeout=5.0)
+        assert saver.durable_gen == gen
+        assert calls == ["a", "b"]
+    finally:
+        saver.stop(timeout=5.0)
+
+
+def test_coalesced_jobs_keep_checkpoint_flag():
+    started, release = threading.Event(), threading.Event()
+    written = []
+
+    def write(job):
+        written.append(job)
+        started.set()
+        release.wait(5.0)
+
+    saver = WorldSaver(write, merge=wu._saver_merge, linger_s=0.0)
+    try:
+        saver.submit(("t0", False, 1))
+        assert started.wait(5.0)              # writer is busy with t0
+        saver.submit(("full", True, 2))       # save_world checkpoint
+        saver.submit(("t3", False, 3))        # tick job coalesces over it
+        last = saver.submit(("t4", False, 4))
+        release.set()
+        assert saver.wait_durable(last, timeout=5.0)
+        assert written == [("t0", False, 1), ("t4", True, 4)]
+        assert saver.stats["coalesced"] == 2
+    finally:
+        release.set()
+        saver.stop(timeout=5.0)
+
+
+if __name__ == "__main__":
+    for fn in (test_failed_write_does_not_stop_saver, test_coalesced_jobs_keep_checkpoint_flag):
+        fn()
+        print(fn.__name__, "ok")
@@ -0,0 +1,110 @@
+import json
+import os
+import tempfile
+
+import engine_path  # noqa: F401  (maps engine.* onto world_modules_demo/)
+import engine.world_util as wu
+from engine.world_serializer import IncrementalWorldEncoder, is_tracked, mark_dirty, mark_zones_dirty
+
+
+def dumps(w):
+    return json.dumps(w, indent=2, ensure_ascii=False)
+
+
+def make_world():
+    return {
+        "time": 1,
+        "session_seed": 11,
+        "features": {"individualism": 0.2},
+        "zones": {f"z{i}": {"energy": 0.1 * i, "links": [f"z{(i + 1) % 20}"]} for i in range(20)},
+        "density_log": [0.1, 0.2],
+    }
+
+
+def test_encoder_matches_json_dumps_after_marked_edits():
+    w = make_world()
+    enc = IncrementalWorldEncoder(indent=2)
+    assert enc.encode(w) == dumps(w)
+
+    w["time"] = 2
+    w["zones"]["z3"]["energy"] = 9.0
+    mark_dirty(w, "zones", "z3")
+    w["zones"]["z4"]["links"].append("z9")
+    w["zones"]["z5"]["energy"] = 5.0
+    mark_zones_dirty(w, ["z4", "z5"])
+    w["features"]["collectivism"] = 0.4
+    mark_dirty(w, "features")
+    w["density_log"] = w["density_log"] + [0.3]    # replaced: caught by identity
+    w["zones"]["z20"] = {"energy": 1.0}
+    assert enc.encode(w) == dumps(w)
+    assert enc.stats["zones_reused"] >= 17
+
+    del w["zones"]["z0"]
+    mark_dirty(w)
+    assert enc.encode(w) == dumps(w)
+
+
+def test_verify_catches_unmarked_edits():
+    w = make_world()
+    enc = IncrementalWorldEncoder(indent=2, verify=True)
+    enc.encode(w)
+    w["zones"]["z7"]["energy"] = 7.0
+    assert enc.encode(w) == dumps(w)
+
+
+def test_release_forgets_world():
+    w = make_world()
+    enc = IncrementalWorldEncoder(indent=2)
+    enc.encode(w)
+    assert is_tracked(w)
+    enc.release()
+    assert not is_tracked(w)
+    assert not is_tracked(make_world())
+
+
+def test_tick_snapshots_match_full_encode():
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            w = make_world()
+            wu.save_world(w)
+            for i in range(5):
+                w = wu.autorun_world_tick(w, "rain over the gate" if i % 2 else "")
+                wu.update_zone_density(w, "z1", 0.25)
+                wu.modify_symbolic_energy(w, "calm", 0.5)
+                wu.add_resonance(w, scope="zone", zone="z2", markers=["echo"], w=1.0)
+                w = wu.autorun_world_tick(w)
+                wu.wait_world_durable()
+                assert wu.WORLD_FILE.read_text(encoding="utf-8") == dumps(w) + "\n"
+        finally:
+            os.chdir(cwd)
+
+
+def test_unmarked_edits_between_ticks_are_saved():
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            w = make_world()
+            wu.save_world(w)
+            w = wu.autorun_world_tick(w)
+            w.setdefault("events", []).append({"type": "ui_note", "text": "hello"})   # no mark_dirty
+            w["features"]["courage"] = 1.0
+            w["zones"]["z6"]["label"] = "edited"
+            w = wu.autorun_world_tick(w)
+            saved = json.loads(wu.WORLD_FILE.read_text(encoding="utf-8"))
+            assert {"type": "ui_note", "text": "hello"} in saved["events"]
+            assert saved["features"]["courage"] == w["features"]["courage"]
+            assert saved["zones"]["z6"]["label"] == "edited"
+            assert wu.WORLD_FILE.read_text(encoding="utf-8") == dumps(w) + "\n"
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    for fn in (test_encoder_matches_json_dumps_after_marked_edits, test_verify_catches_unmarked_edits,
+               test_release_forgets_world, test_tick_snapshots_match_full_encode,
+               test_unmarked_edits_between_ticks_are_saved):
+        fn()
+        print(fn.__name__, "ok")
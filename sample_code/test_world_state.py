@@ -0,0 +1,140 @@
+import copy
+import json
+import os
+import tempfile
+
+import engine_path  # noqa: F401  (maps engine.* onto world_modules_demo/)
+from engine.world_delta_map import map_world_deltas
+from engine.world_state import track_world
+import engine.world_util as wu
+from engine.world_util import add_resonance, apply_world_delta, resonance_bucket
+from engine.weather_engine import step as weather_step
+
+
+def make_world():
+    return {
+        "time": 3,
+        "session_seed": 7,
+        "zones": {
+            "gate": {"type": "gate", "energy": 0.4, "links": ["market"]},
+            "market": {"type": "market", "energy": 0.6, "links": ["gate", "ruin"]},
+            "ruin": {"type": "ruin", "energy": 0.2, "links": ["market"]},
+        },
+    }
+
+
+def plain(w):
+    w = copy.deepcopy(w)
+    w.pop("last_weather_update", None)
+    w.pop("last_update", None)
+    for entry in w.get("symbolic_energy_history", []):
+        entry.pop("timestamp", None)
+    return w
+
+
+def test_add_resonance_matches_plain_dict():
+    ref = make_world()
+    ws = track_world(make_world())
+    for w in (ref, ws):
+        add_resonance(w, scope="zone", zone="a", markers=["m"], w=2.0)
+        add_resonance(w, scope="global", markers=["echo"], w=1.0)
+    assert resonance_bucket(ws, "a")["m"] == {"m": 2.0}
+    assert plain(ws) == plain(ref)
+    assert "/resonance" in ws.changed_paths()
+
+
+def test_world_delta_matches_plain_dict():
+    ref = make_world()
+    ws = track_world(make_world())
+    delta = {"zones": {"new_zone": {"energy": 0.3, "markers": ["ash"]}}, "symbolic_density": 0.5}
+    for w in (ref, ws):
+        apply_world_delta(w, delta)
+    assert plain(ws) == plain(ref)
+
+
+def test_weather_step_matches_plain_dict():
+    ref = make_world()
+    ws = track_world(make_world())
+    ws.mark_clean()
+    for t in range(4):
+        for w in (ref, ws):
+            w["time"] = t
+            weather_step(w, "rain")
+    assert plain(ws) == plain(ref)
+    assert ws["zones"]["gate"]["weather"]["state"] == ref["zones"]["gate"]["weather"]["state"]
+    assert "/weather" in ws.changed_paths()
+
+
+def test_writes_through_assigned_reference_stick():
+    ws = track_world(make_world())
+    z = {}
+    ws["zones"]["n"] = z
+    z["energy"] = 1.0
+    events = []
+    ws["events"] = events
+    note = {"text": "hi"}
+    events.append(note)
+    note["seen"] = True
+    assert ws["zones"]["n"] is z and ws["zones"]["n"]["energy"] == 1.0
+    assert ws["events"] == [{"text": "hi", "seen": True}]
+    assert {"/zones/n", "/events"} <= set(ws.changed_paths())
+
+    # the caller's references keep reporting in later epochs
+    base = copy.deepcopy(ws.to_plain())
+    ws.mark_clean()
+    assert not ws.is_dirty()
+    z["energy"] = 1.5
+    note["seen"] = False
+    ws["zones"]["gate"]["energy"] = 0.9
+    assert ws.is_dirty()
+    assert set(ws.changed_paths()) == {"/zones/n", "/events", "/zones/gate/energy"}
+    assert ws.numeric_deltas() == map_world_deltas(base, ws)
+
+    # a container that left the tree stops being reported
+    del ws["zones"]["n"]
+    ws.mark_clean()
+    z["energy"] = 2.0
+    assert "/zones/n" not in ws.changed_paths()
+
+
+def test_moved_subtree_is_reattached_in_place():
+    ws = track_world(make_world())
+    ws.mark_clean()
+    gate = ws["zones"].pop("gate")
+    ws["zones"]["portal"] = gate
+    gate["energy"] = 0.8
+    assert ws["zones"]["portal"] is gate and ws["zones"]["portal"]["energy"] == 0.8
+    assert "/zones/portal" in ws.changed_paths()
+
+
+def test_tick_saves_edits_recorded_by_world_state():
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            ws = track_world(make_world())
+            notes = []
+            ws["notes"] = notes
+            wu.save_world(ws)
+            ws = wu.autorun_world_tick(ws)
+            assert isinstance(ws, type(track_world({})))
+            ws.mark_clean()
+            notes.append("through the caller's reference")   # never marked dirty
+            ws["sky"] = {"hue": "red"}
+            ws = wu.autorun_world_tick(ws)
+            ws["sky"]["hue"] = "blue"
+            ws = wu.autorun_world_tick(ws)
+            saved = json.loads(wu.WORLD_FILE.read_text(encoding="utf-8"))
+            assert saved["notes"] == ["through the caller's reference"]
+            assert saved["sky"] == {"hue": "blue"}
+            assert saved == json.loads(json.dumps(ws))
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    for fn in (test_add_resonance_matches_plain_dict, test_world_delta_matches_plain_dict,
+               test_weather_step_matches_plain_dict, test_writes_through_assigned_reference_stick,
+               test_moved_subtree_is_reattached_in_place, test_tick_saves_edits_recorded_by_world_state):
+        fn()
+        print(fn.__name__, "ok")
@@ -0,0 +1,38 @@
+import copy
+
+import engine_path  # noqa: F401  (maps engine.* onto world_modules_demo/)
+from engine.terrain_noise import lod_catch_up, step as terrain_step
+
+
+def make_world():
+    zones = {f"z{i}": {"energy": round(0.013 * i, 3), "markers": []} for i in range(60)}
+    zones["hot"] = {"energy": 0.999}
+    zones["cold"] = {"energy": 0.001}
+    return {"session_seed": 21, "zones": zones}
+
+
+def test_terrain_catch_up_equals_per_tick_steps():
+    base = terrain_step(make_world())          # seeds + micro-features
+    for n in (1, 2, 3, 7, 16, 40):
+        ref = copy.deepcopy(base)
+        for _ in range(n):
+            terrain_step(ref)
+        lod = copy.deepcopy(base)
+        for zid, z in lod["zones"].items():
+            lod_catch_up(lod, zid, z, n)
+        for zid in ref["zones"]:
+            assert lod["zones"][zid]["energy"] == ref["zones"][zid]["energy"], (n, zid)
+
+
+def test_zone_ids_limits_terrain_step():
+    w = terrain_step(make_world())
+    before = copy.deepcopy(w)
+    terrain_step(w, zone_ids=["z1", "missing"])
+    changed = [zid for zid in w["zones"] if w["zones"][zid] != before["zones"][zid]]
+    assert set(changed) <= {"z1"}
+
+
+if __name__ == "__main__":
+    for fn in (test_terrain_catch_up_equals_per_tick_steps, test_zone_ids_limits_terrain_step):
+        fn()
+        print(fn.__name__, "ok")
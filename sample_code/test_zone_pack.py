@@ -0,0 +1,80 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import engine_path  # noqa: F401  (maps engine.* onto world_modules_demo/)
+from engine.zone_pack import ZoneDirLoader
+
+
+def prep(z, stem):
+    z.setdefault("name", stem)
+    z.setdefault("links", [])
+    return z
+
+
+def write_zone(zd, i, energy, mtime_ns=None):
+    p = zd / f"z{i:03d}.json"
+    p.write_text(json.dumps({"name": f"z{i}", "energy": energy}), encoding="utf-8")
+    if mtime_ns is not None:
+        os.utime(p, ns=(mtime_ns, mtime_ns))
+
+
+def test_pack_serves_unchanged_files_and_reparses_changed_ones():
+    with tempfile.TemporaryDirectory() as d:
+        zd, pack = Path(d) / "zones", Path(d) / "zones.pack"
+        zd.mkdir()
+        for i in range(40):
+            write_zone(zd, i, i * 0.01, mtime_ns=1_000_000_000)
+        first = ZoneDirLoader(zd, prep, pack_path=pack).load()
+        assert len(first) == 40 and first["z3"]["links"] == []
+
+        warm = ZoneDirLoader(zd, prep, pack_path=pack)                 # new process: pack is warm
+        assert warm.load() == first
+        assert warm.stats["from_pack"] == 40 and warm.stats["parsed"] == 0
+
+        write_zone(zd, 7, 0.5, mtime_ns=1_000_000_000)                 # same mtime, new size
+        write_zone(zd, 8, 0.09, mtime_ns=2_000_000_000)                # same size, new mtime
+        (zd / "z009.json").unlink()
+        ld = ZoneDirLoader(zd, prep, pack_path=pack)
+        out = ld.load()
+        assert out["z7"]["energy"] == 0.5 and out["z8"]["energy"] == 0.09 and "z9" not in out
+        assert ld.stats["parsed"] == 2 and ld.stats["from_pack"] == 37
+
+        again = ZoneDirLoader(zd, prep, pack_path=pack)                 # pack was rewritten
+        assert again.load() == out and again.stats["parsed"] == 0
+        assert again.pack.get("z8")["energy"] == 0.09
+
+
+def test_truncated_pack_falls_back_to_files():
+    with tempfile.TemporaryDirectory() as d:
+        zd, pack = Path(d) / "zones", Path(d) / "zones.pack"
+        zd.mkdir()
+        for i in range(10):
+            write_zone(zd, i, float(i))
+        ref = ZoneDirLoader(zd, prep, pack_path=pack).load()
+        with pack.open("r+b") as f:
+            f.truncate(pack.stat().st_size // 2)
+        ld = ZoneDirLoader(zd, prep, pack_path=pack)
+        assert ld.load() == ref
+        assert 0 < ld.stats["parsed"] < 10
+
+
+def test_in_memory_manifest_skips_unchanged_files():
+    with tempfile.TemporaryDirectory() as d:
+        zd = Path(d)
+        for i in range(5):
+            write_zone(zd, i, float(i), mtime_ns=1_000_000_000)
+        ld = ZoneDirLoader(zd, prep)
+        a = ld.load()
+        a["z1"]["energy"] = 99.0                                        # returned zones are fresh copies
+        b = ld.load(skip={"z0"})
+        assert "z0" not in b and b["z1"]["energy"] == 1.0
+        assert ld.stats["parsed"] == 5 and ld.stats["cached"] == 5
+
+
+if __name__ == "__main__":
+    for fn in (test_pack_serves_unchanged_files_and_reparses_changed_ones, test_truncated_pack_falls_back_to_files,
+               test_in_memory_manifest_skips_unchanged_files):
+        fn()
+        print(fn.__name__, "ok")
@@ -0,0 +1,94 @@
+import copy
+import json
+import random
+
+import engine_path  # noqa: F401  (maps engine.* onto world_modules_demo/)
+import engine.world_util as wu
+from engine.zone_record import ZONE_FIELDS, ZoneRecord, compact_zones, expand_zones, json_default
+
+
+def raw_zone(i):
+    return {"name": f"z{i}", "energy": "0.5", "links": [f"z{i + 1}"], "seed": i, "micro": {"a": 1}}
+
+
+def test_from_mapping_matches_zone_defaults():
+    for src in (raw_zone(1), {"id": "old_gate", "symbolic_density": 0.3}, {}):
+        want = wu._zone_defaults(copy.deepcopy(src), "fallback")
+        z = ZoneRecord.from_mapping(src, fallback_name="fallback")
+        assert z.to_dict() == want
+        assert dict(z) == want
+        assert json.loads(json.dumps(z, default=json_default)) == json.loads(json.dumps(want))
+    z = ZoneRecord.from_mapping(raw_zone(1))
+    assert ZoneRecord.from_mapping(z) is z
+
+
+def test_mapping_protocol():
+    z = ZoneRecord.from_mapping(raw_zone(2))
+    assert z["energy"] == 0.5 and z.energy == 0.5
+    z["energy"] = "0.75"                               # typed fields coerce
+    assert z.energy == 0.75 and isinstance(z["energy"], float)
+
+    assert z.items_ is None                            # lazy until first read
+    z["items"].append("lantern")
+    assert z.get("items") == ["lantern"] and z.items_ == ["lantern"]
+
+    assert z.get("missing", 3) == 3 and "missing" not in z
+    assert z.setdefault("resonance", {"echo": 1.0}) == {"echo": 1.0}
+    assert z["resonance"] == {"echo": 1.0} and "resonance" in z
+    assert list(z) == [*ZONE_FIELDS, "seed", "micro", "resonance"]
+    assert len(z) == len(ZONE_FIELDS) + 3
+
+    del z["energy"]                                    # typed: reset, not removed
+    assert "energy" in z and z["energy"] == 0.0
+    del z["links"]
+    assert z["links"] == []
+    assert z.pop("seed") == 2 and "seed" not in z
+    try:
+        del z["seed"]
+    except KeyError:
+        pass
+    else:
+        raise AssertionError("deleting a missing extra key should raise KeyError")
+
+    c = z.copy()
+    c["energy"] = 9.0
+    c["seed"] = 1
+    assert z["energy"] == 0.0 and "seed" not in z
+
+
+def test_compact_expand_round_trip():
+    w = {"zones": {f"z{i}": wu._zone_defaults(raw_zone(i), f"z{i}") for i in range(5)}}
+    before = copy.deepcopy(w)
+    assert compact_zones(w) == 5 and compact_zones(w) == 0
+    assert all(type(z) is ZoneRecord for z in w["zones"].values())
+    assert json.loads(json.dumps(w, default=json_default)) == before      # key order may differ
+    assert expand_zones(w) == 5
+    assert w == before
+
+
+def test_ticks_match_with_zone_records():
+    base = wu._hydrate_world({"time": 0, "session_seed": 5,
+                              "zones": {f"z{i}": wu._zone_defaults(raw_zone(i), f"z{i}")
+                                        for i in range(8)}})
+    out = {}
+    try:
+        for records in (False, True):
+            w = copy.deepcopy(base)
+            if records:
+                wu.enable_zone_records(w)
+            else:
+                wu.disable_zone_records(w)
+            random.seed(3)
+            w = wu.autorun_world_ticks(w, 4, save=False)
+            w.pop("last_update", None)
+            out[records] = json.loads(json.dumps(w, default=json_default))
+    finally:
+        wu.disable_zone_records()
+    assert out[True] == out[False]
+
+
+if __name__ == "__main__":
+    for fn in (test_from_mapping_matches_zone_defaults, test_mapping_protocol,
+               test_compact_expand_round_trip, test_ticks_match_with_zone_records):
+        fn()
+        print(fn.__name__, "ok")
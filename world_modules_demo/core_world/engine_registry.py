@@ -0,0 +1,206 @@
+# engine/engine_registry.py
+# Lazy optional-engine registry: each engine is imported on first use; failures are cached.
+from __future__ import annotations
+
+import importlib
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+__all__ = [
+    "EngineRegistry",
+    "LazyEngine",
+]
+
+_PENDING = "pending"
+_LOADED = "loaded"
+_MISSING = "missing"
+
+class LazyEngine:
+    """
+    Callable stand-in for an optional engine attribute. The first call (or
+    resolve()) imports the module; afterwards calls go straight to the target,
+    or to the fallback if the import failed.
+    """
+
+    __slots__ = ("registry", "name", "_fn")
+
+    def __init__(self, registry: "EngineRegistry", name: str):
+        self.registry = registry
+        self.name = name
+        self._fn: Optional[Callable[..., Any]] = None
+
+    def resolve(self) -> Any:
+        fn = self._fn
+        if fn is None:
+            fn = self._fn = self.registry.resolve(self.name)
+        return fn
+
+    def available(self) -> bool:
+        return self.registry.available(self.name)
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        fn = self._fn
+        if fn is None:
+            fn = self.resolve()
+        if fn is None:
+            raise RuntimeError(f"engine {self.name!r} is unavailable and has no fallback")
+        return fn(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        return f"<LazyEngine {self.name} ({self.registry.state(self.name)})>"
+
+
+class EngineRegistry:
+    """
+    name -> (module, attribute, fallback). Nothing is imported until the
+    engine is first resolved. A failed import is remembered per module, so
+    a missing module costs one ImportError for the whole process, not one
+    per use (reset() retries, e.g. after sys.path changes).
+
+      engines = EngineRegistry()
+      weather_step = engines.lazy("weather", "engine.weather_engine", "step", fallback=noop)
+      weather_step(world)        # imports engine.weather_engine here
+      engines.status()           # {"weather": {"state": "loaded", "import_ms": 4.1, ...}}
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._specs: Dict[str, Tuple[str, Optional[str], Any]] = {}
+        self._proxies: Dict[str, LazyEngine] = {}
+        self._resolved: Dict[str, Any] = {}
+        self._state: Dict[str, str] = {}
+        self._errors: Dict[str, str] = {}
+        self._import_ms: Dict[str, float] = {}
+        self._module_errors: Dict[str, str] = {}
+
+    # -------- registration --------
+    def register(self, name: str, module: str, attr: Optional[str] = None, *, fallback: Any = None) -> LazyEngine:
+        """Declare an engine; attr=None resolves to the module itself. Re-registering resets it."""
+        with self._lock:
+            self._specs[name] = (module, attr, fallback)
+            self._resolved.pop(name, None)
+            self._state[name] = _PENDING
+            self._errors.pop(name, None)
+            self._import_ms.pop(name, None)
+            proxy = self._proxies.get(name)
+            if proxy is None:
+                proxy = self._proxies[name] = LazyEngine(self, name)
+            proxy._fn = None
+            return proxy
+
+    lazy = register
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._specs
+
+    def names(self):
+        return list(self._specs)
+
+    # -------- resolution --------
+    def _import(self, module: str) -> Any:
+        err = self._module_errors.get(module)
+        if err is not None:
+            raise ImportError(err)
+        try:
+            return importlib.import_module(module)
+        except Exception as e:
+            self._module_errors[module] = f"{type(e).__name__}: {e}"
+            raise
+
+    def resolve(self, name: str) -> Any:
+        """The engine's target (importing it now if needed), else its fallback."""
+        if self._state.get(name) == _LOADED:
+            return self._resolved[name]
+        with self._lock:
+            spec = self._specs.get(name)
+            if spec is None:
+                raise KeyError(name)
+            state = self._state[name]
+            if state == _LOADED:
+                return self._resolved[name]
+            module, attr, fallback = spec
+            if state == _MISSING:
+                return fallback
+            t0 = time.perf_counter()
+            try:
+                mod = self._import(module)
+                target = mod if attr is None else getattr(mod, attr)
+            except Exception as e:
+                self._state[name] = _MISSING
+                self._errors[name] = self._module_errors.get(module) or f"{type(e).__name__}: {e}"
+                return fallback
+            finally:
+                self._import_ms[name] = round((time.perf_counter() - t0) * 1000.0, 3)
+            self._resolved[name] = target
+            self._state[name] = _LOADED
+            return target
+
+    def available(self, name: str) -> bool:
+        """Resolve if needed; True when the real engine (not its fallback) loaded."""
+        self.resolve(name)
+        return self._state.get(name) == _LOADED
+
+    def state(self, name: str) -> str:
+        return self._state.get(name, _MISSING)
+
+    def resolve_all(self) -> Dict[str, bool]:
+        return {name: self.available(name) for name in list(self._specs)}
+
+    def reset(self, name: Optional[str] = None) -> None:
+        """Forget resolutions (one engine or all) so the next use imports again."""
+        with self._lock:
+            names = [name] if name is not None else list(self._specs)
+            for n in names:
+                spec = self._specs.get(n)
+                if spec is None:
+                    continue
+                self._module_errors.pop(spec[0], None)
+                self.register(n, *spec[:2], fallback=spec[2])
+
+    # -------- reporting --------
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """{name: {"target", "state": pending|loaded|missing, "import_ms", "error"}} without resolving."""
+        with self._lock:
+            out: Dict[str, Dict[str, Any]] = {}
+            for name, (module, attr, _fb) in self._specs.items():
+                out[name] = {
+                    "target": module if attr is None else f"{module}:{attr}",
+                    "state": self._state[name],
+                    "import_ms": self._import_ms.get(name),
+                    "error": self._errors.get(name),
+                }
+            return out
+
+
+# ---------------------- Quick self-test / import benchmark ----------------------
+if __name__ == "__main__":
+    import statistics
+    import subprocess
+    import sys
+
+    reg = EngineRegistry()
+    dumps = reg.lazy("dumps", "json", "dumps")
+    nope = reg.lazy("nope", "engine.no_such_engine", "step", fallback=lambda w, *a, **k: w)
+    print("BEFORE:", {n: s["state"] for n, s in reg.status().items()})
+    assert dumps({"a": 1}) == '{"a": 1}' and nope({"w": 1}) == {"w": 1}
+    print("AFTER:", {n: (s["state"], s["import_ms"]) for n, s in reg.status().items()})
+
+    # Cold-start cost of engine.world_util: lazy (default) vs every engine resolved up front.
+    # Run from the directory that holds the engine package.
+    def _cold(code: str, runs: int = 7) -> float:
+        times = []
+        for _ in range(runs):
+            out = subprocess.run(
+                [sys.executable, "-c", "import time; t=time.perf_counter(); " + code +
+                 "; print((time.perf_counter()-t)*1000)"],
+                capture_output=True, text=True,
+            )
+            if out.returncode != 0:
+                raise SystemExit(out.stderr.strip().splitlines()[-1])
+            times.append(float(out.stdout.strip().splitlines()[-1]))
+        return statistics.median(times)
+
+    lazy_ms = _cold("import engine.world_util")
+    eager_ms = _cold("import engine.world_util as wu; wu.resolve_engines()")
+    print(f"IMPORT world_util: lazy {lazy_ms:.1f} ms, all engines resolved {eager_ms:.1f} ms")
@@ -0,0 +1,290 @@
+# engine/graph_util.py
+# Compiled zone-link graph (CSR adjacency) shared by the graph-walking engines.
+from __future__ import annotations
+
+import threading
+from array import array
+from collections import OrderedDict, deque
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+__all__ = [
+    "ZoneGraph",
+    "graph_for",
+    "graph_stats",
+    "links_version",
+    "mark_links_changed",
+]
+
+# --- Tunables (safe defaults) ---
+HOPS_CACHE_SIZE: int = 256     # k-hop neighborhoods kept per compiled graph (LRU)
+GRAPH_CACHE_SIZE: int = 16     # zones dicts with a compiled graph kept at once
+
+class ZoneGraph:
+    """
+    A zones dict's `links` compiled once: zone ids <-> ints (zones order),
+    CSR out- and in-neighbor arrays, cached k-hop neighborhoods and weakly
+    connected components. Links to unknown zones, self links and duplicates
+    are dropped from the CSR (first occurrence order kept); links to unknown
+    names are remembered in `dangling` so walks can still start from them.
+
+      g = graph_for(world["zones"])
+      g.neighbors("gate_1")                   # ["market", "ruin_2"]
+      g.hops("gate_1", 2)                     # {"gate_1": 0, "market": 1, ...}
+      g.hops(origin, 2, reverse=True)         # zones that reach origin in <= 2 hops
+      g.component_of("gate_1")                # int label, same for linked zones
+
+    Treat returned dicts/lists as read-only: they are shared through the caches.
+    """
+
+    def __init__(self, zones: Dict[str, Any], version: int = 0):
+        self.version = version
+        self.ids: List[str] = list(zones)
+        self.index: Dict[str, int] = {z: i for i, z in enumerate(self.ids)}
+        index = self.index
+        indptr = array("q", [0])
+        indices = array("q")
+        dangling: Dict[str, List[int]] = {}
+        for i, z in enumerate(zones.values()):
+            links = z.get("links") if hasattr(z, "get") else None
+            row: Dict[int, None] = {}
+            for n in links or ():
+                j = index.get(n)
+                if j is None:
+                    if isinstance(n, str):
+                        dangling.setdefault(n, []).append(i)
+                elif j != i:
+                    row[j] = None
+            indices.extend(row)
+            indptr.append(len(indices))
+        self.indptr, self.indices = indptr, indices
+        self.dangling = dangling
+        self.rindptr, self.rindices = _transpose(len(self.ids), indptr, indices)
+        self._hops: "OrderedDict[Tuple[Tuple[str, ...], int, bool], Dict[str, int]]" = OrderedDict()
+        self._labels: Optional[List[int]] = None
+        self._np: Optional[Tuple[Any, Any]] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def edges(self) -> int:
+        return len(self.indices)
+
+    # -------- neighbors --------
+    def _row(self, i: int, reverse: bool = False) -> Any:
+        if reverse:
+            return self.rindices[self.rindptr[i]:self.rindptr[i + 1]]
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def neighbors(self, zid: str) -> List[str]:
+        i = self.index.get(zid)
+        return [] if i is None else [self.ids[j] for j in self._row(i)]
+
+    def predecessors(self, zid: str) -> List[str]:
+        i = self.index.get(zid)
+        srcs = self._row(i, True) if i is not None else self.dangling.get(zid, ())
+        return [self.ids[j] for j in srcs]
+
+    def degree(self, zid: str) -> int:
+        i = self.index.get(zid)
+        return 0 if i is None else self.indptr[i + 1] - self.indptr[i]
+
+    def in_degree(self, zid: str) -> int:
+        i = self.index.get(zid)
+        if i is None:
+            return len(self.dangling.get(zid, ()))
+        return self.rindptr[i + 1] - self.rindptr[i]
+
+    def csr(self, numpy: bool = False) -> Tuple[Any, Any]:
+        """(indptr, indices) of the out-links; numpy=True gives zero-copy int64 arrays."""
+        if not numpy:
+            return self.indptr, self.indices
+        if self._np is None:
+            import numpy as np
+            self._np = (np.frombuffer(self.indptr, dtype=np.int64), np.frombuffer(self.indices, dtype=np.int64))
+        return self._np
+
+    # -------- k-hop neighborhoods --------
+    def hops(self, sources: Union[str, Iterable[str]], max_hops: int, *, reverse: bool = False) -> Dict[str, int]:
+        """
+        {zone: hops from the nearest source} for everything within max_hops, in
+        BFS order (sources first, each level in link order). reverse=True walks
+        links backwards (who reaches the sources). Unknown sources are kept at
+        0; backwards walks start from their dangling links. Cached per call.
+        """
+        srcs = (sources,) if isinstance(sources, str) else tuple(sources)
+        key = (srcs, int(max_hops), bool(reverse))
+        with self._lock:
+            hit = self._hops.get(key)
+            if hit is not None:
+                self._hops.move_to_end(key)
+                return hit
+        out = self._bfs(srcs, int(max_hops), bool(reverse))
+        with self._lock:
+            self._hops[key] = out
+            if len(self._hops) > HOPS_CACHE_SIZE:
+                self._hops.popitem(last=False)
+        return out
+
+    def _bfs(self, srcs: Tuple[str, ...], max_hops: int, reverse: bool) -> Dict[str, int]:
+        ids, index = self.ids, self.index
+        ptr, nbr = (self.rindptr, self.rindices) if reverse else (self.indptr, self.indices)
+        dist: Dict[str, int] = {}
+        seen = bytearray(len(ids))
+        q: deque = deque()
+        for s in srcs:
+            if s in dist:
+                continue
+            dist[s] = 0
+            i = index.get(s)
+            if i is not None:
+                seen[i] = 1
+                q.append((i, 0))
+            elif reverse and max_hops > 0:
+                for j in self.dangling.get(s, ()):
+                    if not seen[j]:
+                        seen[j] = 1
+                        dist[ids[j]] = 1
+                        q.append((j, 1))
+        while q:
+            i, d = q.popleft()
+            if d >= max_hops:
+                continue
+            d += 1
+            for j in nbr[ptr[i]:ptr[i + 1]]:
+                if not seen[j]:
+                    seen[j] = 1
+                    dist[ids[j]] = d
+                    q.append((j, d))
+        return dist
+
+    # -------- components --------
+    def components(self) -> List[int]:
+        """Weakly connected component label per zone int (labels 0.. in first-seen order)."""
+        labels = self._labels
+        if labels is None:
+            n = len(self.ids)
+            parent = list(range(n))
+            def find(x: int) -> int:
+                while parent[x] != x:
+                    parent[x] = parent[parent[x]]
+                    x = parent[x]
+                return x
+            indptr, indices = self.indptr, self.indices
+            for i in range(n):
+                ri = find(i)
+                for j in indices[indptr[i]:indptr[i + 1]]:
+                    rj = find(j)
+                    if rj != ri:
+                        parent[rj] = ri
+            names: Dict[int, int] = {}
+            labels = [names.setdefault(find(i), len(names)) for i in range(n)]
+            self._labels = labels
+        return labels
+
+    def component_of(self, zid: str) -> Optional[int]:
+        i = self.index.get(zid)
+        return None if i is None else self.components()[i]
+
+    def component_members(self) -> List[List[str]]:
+        """Zone ids per component, largest first."""
+        groups: Dict[int, List[str]] = {}
+        for zid, c in zip(self.ids, self.components()):
+            groups.setdefault(c, []).append(zid)
+        return sorted(groups.values(), key=len, reverse=True)
+
+
+def _transpose(n: int, indptr: array, indices: array) -> Tuple[array, array]:
+    counts = [0] * (n + 1)
+    for j in indices:
+        counts[j + 1] += 1
+    for i in range(n):
+        counts[i + 1] += counts[i]
+    rptr = array("q", counts)
+    fill = counts[:-1]
+    rind = array("q", bytes(8 * len(indices)))
+    for i in range(n):
+        for j in indices[indptr[i]:indptr[i + 1]]:
+            rind[fill[j]] = i
+            fill[j] += 1
+    return rptr, rind
+
+
+# ---------- per-zones-dict cache ----------
+# id(zones) -> (zones, (version, links signature), graph); holding `zones` keeps its
+# id from being reused, and the signature holds each links list for the same reason
+_GRAPHS: Dict[int, Tuple[Any, Tuple[int, Tuple[Any, ...]], ZoneGraph]] = {}
+_VERSIONS: Dict[int, int] = {}
+_LOCK = threading.Lock()
+_STATS = {"compiles": 0, "hits": 0}
+
+def links_version(zones: Dict[str, Any]) -> int:
+    return _VERSIONS.get(id(zones), 0)
+
+def _links_signature(zones: Dict[str, Any]) -> Tuple[Any, ...]:
+    # Zone ids, each zone's links list and its length. Sequence equality checks
+    # identity before value, so an unchanged world compares in one cheap pass;
+    # appends, removals, replaced lists and added/removed/renamed zones differ.
+    links = [z.get("links") if hasattr(z, "get") else None for z in zones.values()]
+    return (tuple(zones), links, [len(l) if isinstance(l, (list, tuple)) else -1 for l in links])
+
+def mark_links_changed(zones: Dict[str, Any]) -> None:
+    """
+    Call after an in-place links edit that keeps the list's length (e.g.
+    links[i] = other): the next graph_for(zones) recompiles. Appends, removals,
+    replaced links lists and added/removed zones are noticed without it.
+    """
+    with _LOCK:
+        _VERSIONS[id(zones)] = _VERSIONS.get(id(zones), 0) + 1
+
+def graph_for(zones: Dict[str, Any]) -> ZoneGraph:
+    """The compiled graph of a zones dict, recompiled when its version or links signature changed."""
+    zid = id(zones)
+    key = (_VERSIONS.get(zid, 0), _links_signature(zones))
+    hit = _GRAPHS.get(zid)
+    if hit is not None and hit[0] is zones and hit[1] == key:
+        _STATS["hits"] += 1
+        return hit[2]
+    with _LOCK:
+        hit = _GRAPHS.get(zid)
+        if hit is not None and hit[0] is zones and hit[1] == key:
+            return hit[2]
+        g = ZoneGraph(zones, version=key[0])
+        if len(_GRAPHS) >= GRAPH_CACHE_SIZE and zid not in _GRAPHS:
+            for k in [k for k in _GRAPHS if k != zid]:
+                _GRAPHS.pop(k, None)
+                _VERSIONS.pop(k, None)
+        _GRAPHS[zid] = (zones, key, g)
+        _STATS["compiles"] += 1
+        return g
+
+def graph_stats() -> Dict[str, int]:
+    return dict(_STATS, cached=len(_GRAPHS))
+
+
+# ---------------------- Quick self-test ----------------------
+if __name__ == "__main__":
+    import random
+    import time
+
+    rng = random.Random(1)
+    n = 30000
+    zones = {f"z{i}": {"links": [f"z{(i + 1) % n}", f"z{rng.randrange(n)}"]} for i in range(n - 10)}
+    zones.update({f"island{i}": {"links": [f"island{(i + 1) % 10}", "ghost"]} for i in range(10)})
+    t0 = time.perf_counter(); g = graph_for(zones); t1 = time.perf_counter()
+    assert graph_for(zones) is g
+    h = g.hops("z0", 3); t2 = time.perf_counter(); g.hops("z0", 3); t3 = time.perf_counter()
+    comps = g.component_members(); t4 = time.perf_counter()
+    print(f"zones={len(g)} edges={g.edges} compile {1000*(t1-t0):.1f} ms, 3-hop {1000*(t2-t1):.2f} ms "
+          f"(cached {1000*(t3-t2):.3f} ms, {len(h)} zones), components {1000*(t4-t3):.1f} ms "
+          f"-> sizes {[len(c) for c in comps][:3]}, ghost preds {len(g.predecessors('ghost'))}")
+    t5 = time.perf_counter(); assert graph_for(zones) is g; t6 = time.perf_counter()
+    print(f"cache check {1000*(t6-t5):.1f} ms")
+    zones["z0"]["links"].append("island0")        # noticed by the links signature
+    assert graph_for(zones) is not g and graph_for(zones).neighbors("z0")[-1] == "island0"
+    g = graph_for(zones)
+    zones["z0"]["links"][-1] = "island1"          # same length: needs an explicit mark
+    mark_links_changed(zones)
+    assert graph_for(zones) is not g and graph_for(zones).neighbors("z0")[-1] == "island1"
+    print("stats", graph_stats())
@@ -0,0 +1,281 @@
+# engine/resonance_store.py
+# Interned, array-backed mirror of world["resonance"] zone buckets for batch overlay queries.
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    import numpy as np
+except Exception:  # numpy is optional; the store falls back to per-bucket loops
+    np = None
+
+__all__ = [
+    "HAVE_NUMPY",
+    "MarkerTable",
+    "ResonanceStore",
+]
+
+HAVE_NUMPY = np is not None
+
+# --- Tunables (safe defaults) ---
+DENSE_MAX_CELLS: int = 16_000_000   # zones x markers above this -> per-bucket loops (memory guard)
+_MIN_ROWS: int = 64
+_MIN_COLS: int = 32
+
+class MarkerTable:
+    """Marker name <-> dense integer id. Ids are stable for the table's lifetime."""
+
+    __slots__ = ("ids", "names")
+
+    def __init__(self) -> None:
+        self.ids: Dict[str, int] = {}
+        self.names: List[str] = []
+
+    def intern(self, name: str) -> int:
+        i = self.ids.get(name)
+        if i is None:
+            i = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return i
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+class ResonanceStore:
+    """
+    Zone buckets of one world's resonance section as rows of a dense
+    (zones x markers) weight matrix, plus density and "at" stamp vectors.
+    The world's dict buckets stay authoritative (and JSON-shaped); the store
+    reloads only rows it was told about via touch(), or everything when the
+    section's zones dict is replaced (load, clear, copy).
+
+      store = ResonanceStore(lam=0.93)
+      store.touch("gate_1")                     # after a bucket changed
+      store.overlay_all(world["resonance"], now, zone_ids)   # {zone: {"markers", "density"}}
+
+    Weights follow the lazy-decay convention: a row holds its bucket's values
+    as of the bucket's "at" tick, and queries scale by lam ** (now - at).
+    Without numpy (or past DENSE_MAX_CELLS) queries loop over the buckets.
+    """
+
+    def __init__(self, lam: float, marker_floor: float = 1e-3) -> None:
+        self.lam = float(lam)
+        self.floor = float(marker_floor)
+        self.markers = MarkerTable()
+        self._lock = threading.Lock()
+        self._zones: Any = None           # identity of the mirrored zones dict
+        self._dirty: Set[str] = set()
+        self._dirty_all = True
+        self._rows: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._n = 0                       # rows handed out (incl. freed ones)
+        self._too_big = False             # matrix would pass DENSE_MAX_CELLS
+        self.W = None                     # (row cap, col cap) float64
+        self.dens = None
+        self.at = None
+
+    # -------- change notification --------
+    def touch(self, zone: str) -> None:
+        """A zone bucket was added, bumped or removed."""
+        self._dirty.add(zone)
+
+    def touch_all(self) -> None:
+        self._dirty_all = True
+
+    # -------- sync --------
+    def _dense(self) -> bool:
+        return np is not None and not self._too_big
+
+    def _grow(self, rows: int, cols: int) -> bool:
+        W = self.W
+        r0, c0 = (0, 0) if W is None else W.shape
+        if rows <= r0 and cols <= c0:
+            return True
+        r1 = max(r0, _MIN_ROWS)
+        while r1 < rows:
+            r1 *= 2
+        c1 = max(c0, _MIN_COLS)
+        while c1 < cols:
+            c1 *= 2
+        if r1 * c1 > DENSE_MAX_CELLS:
+            self._too_big = True
+            self.W = self.dens = self.at = None
+            return False
+        nw = np.zeros((r1, c1), dtype=np.float64)
+        nd = np.zeros(r1, dtype=np.float64)
+        na = np.zeros(r1, dtype=np.int64)
+        if W is not None:
+            nw[:r0, :c0] = W
+            nd[:r0] = self.dens
+            na[:r0] = self.at
+        self.W, self.dens, self.at = nw, nd, na
+        return True
+
+    def _load(self, zone: str, b: Dict[str, Any], now: int) -> None:
+        row = self._rows.get(zone)
+        if row is None:
+            row = self._free.pop() if self._free else self._n
+            if row == self._n:
+                self._n += 1
+            self._rows[zone] = row
+        m = b.get("m", {}) if isinstance(b.get("m"), dict) else {}
+        cols = [self.markers.intern(k) for k in m]
+        if not self._grow(self._n, len(self.markers)):
+            return
+        self.W[row, :] = 0.0
+        if cols:
+            self.W[row, cols] = [float(v) for v in m.values()]
+        self.dens[row] = float(b.get("density", 0.0) or 0.0)
+        self.at[row] = int(b.get("at", now))
+
+    def _release(self, zone: str) -> None:
+        row = self._rows.pop(zone, None)
+        if row is not None:
+            self.W[row, :] = 0.0
+            self.dens[row] = 0.0
+            self._free.append(row)
+
+    def _sync(self, zones: Dict[str, Any], now: int) -> None:
+        if zones is not self._zones or self._dirty_all:
+            self._zones = zones
+            self._rows, self._free, self._n = {}, [], 0
+            self.W = self.dens = self.at = None
+            self._too_big = False
+            self._dirty = set(zones)
+            self._dirty_all = False
+        if not self._dirty or self._too_big:
+            return
+        dirty, self._dirty = self._dirty, set()
+        for z in dirty:
+            b = zones.get(z)
+            if isinstance(b, dict):
+                self._load(z, b, now)
+            else:
+                self._release(z)
+            if self._too_big:
+                return
+
+    # -------- queries --------
+    def _global_view(self, g: Dict[str, Any], now: int) -> Tuple[Dict[str, float], float]:
+        k = now - int(g.get("at", now))
+        f = self.lam ** k if k > 0 else 1.0
+        m = {n: v * f for n, v in g.get("m", {}).items() if k <= 0 or v * f > self.floor}
+        return m, float(g.get("density", 0.0) or 0.0) * f
+
+    def overlay_all(
+        self,
+        section: Dict[str, Any],
+        now: int,
+        zone_ids: Optional[Iterable[str]] = None,
+        beta: float = 0.15,
+        gamma: float = 0.35,
+        thresh: float = 0.5,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        {zone: {"markers": [...], "density": float}} for every zone in zone_ids
+        (default: every zone with a bucket), same values as a per-zone overlay.
+        Marker order within a zone is not significant.
+        """
+        zones = section.get("zones", {})
+        ids = list(zones) if zone_ids is None else list(zone_ids)
+        gm, gd = self._global_view(section.get("global", {}), now)
+        with self._lock:
+            if np is not None:
+                self._sync(zones, now)
+            out = self._overlay_dense(ids, gm, gd, now, beta, gamma, thresh) if self._dense() else None
+            if out is None:
+                out = self._overlay_loop(zones, ids, now, gm, gd, beta, gamma, thresh)
+            return out
+
+    def _overlay_dense(self, ids: List[str], gm: Dict[str, float], gd: float, now: int,
+                       beta: float, gamma: float, thresh: float) -> Optional[Dict[str, Dict[str, Any]]]:
+        names = self.markers.names
+        gcols = [self.markers.intern(k) for k in gm]
+        C = len(self.markers)
+        if not self._grow(self._n, C):
+            return None
+        G = np.zeros(C, dtype=np.float64)
+        if gcols:
+            G[gcols] = list(gm.values())
+        G *= beta
+        g_markers = [names[i] for i in np.nonzero(G >= thresh)[0].tolist()]
+        g_density = float(beta * gd)
+
+        # every live row in one pass (a contiguous slice beats gathering requested rows)
+        n = self._n
+        K = np.maximum(now - self.at[:n], 0)
+        ku, inv = np.unique(K, return_inverse=True)
+        f = np.array([self.lam ** int(k) for k in ku.tolist()], dtype=np.float64)[inv]
+        Z = self.W[:n, :C] * f[:, None]
+        O = Z * gamma
+        O += G
+        vis = O >= thresh
+        # weights decayed to <= floor count as gone; that only decides visibility
+        # where the global part alone sits just under the threshold
+        near = np.nonzero((G < thresh) & (G >= thresh - 2.0 * gamma * self.floor))[0]
+        if len(near):
+            vis[:, near] &= ~((Z[:, near] <= self.floor) & (K > 0)[:, None])
+        dens = (beta * gd + gamma * (self.dens[:n] * f)).tolist()
+        rr, cc = np.nonzero(vis)
+        bounds = np.searchsorted(rr, np.arange(n + 1)).tolist()
+        cc = cc.tolist()
+
+        rows = self._rows
+        out: Dict[str, Dict[str, Any]] = {}
+        for z in ids:
+            row = rows.get(z)
+            if row is None:
+                out[z] = {"markers": list(g_markers), "density": g_density}
+            else:
+                out[z] = {"markers": [names[c] for c in cc[bounds[row]:bounds[row + 1]]], "density": dens[row]}
+        return out
+
+    def _overlay_loop(self, zones: Dict[str, Any], ids: List[str], now: int, gm: Dict[str, float],
+                      gd: float, beta: float, gamma: float, thresh: float) -> Dict[str, Dict[str, Any]]:
+        base = {k: beta * v for k, v in gm.items()}
+        g_markers = [k for k, v in base.items() if v >= thresh]
+        g_density = float(beta * gd)
+        lam, floor = self.lam, self.floor
+        out: Dict[str, Dict[str, Any]] = {}
+        for z in ids:
+            b = zones.get(z)
+            if not isinstance(b, dict):
+                out[z] = {"markers": list(g_markers), "density": g_density}
+                continue
+            k = now - int(b.get("at", now))
+            f = lam ** k if k > 0 else 1.0
+            ov = dict(base)
+            for m, v in b.get("m", {}).items():
+                v = v * f
+                if k <= 0 or v > floor:
+                    ov[m] = ov.get(m, 0.0) + gamma * v
+            out[z] = {"markers": [m for m, v in ov.items() if v >= thresh],
+                      "density": float(beta * gd + gamma * (float(b.get("density", 0.0) or 0.0) * f))}
+        return out
+
+
+# ---------------------- Quick self-test ----------------------
+if __name__ == "__main__":
+    import random
+    import time
+
+    rng = random.Random(3)
+    lam = 0.93
+    section = {"global": {"m": {"echo": 4.0}, "density": 0.2, "at": 0}, "zones": {}}
+    for i in range(5000):
+        section["zones"][f"z{i}"] = {
+            "m": {f"m{rng.randrange(200)}": rng.random() * 3 for _ in range(20)},
+            "density": rng.random(), "at": rng.randrange(10),
+        }
+    zone_ids = [f"z{i}" for i in range(6000)]
+    store = ResonanceStore(lam)
+    t0 = time.perf_counter(); a = store.overlay_all(section, 12, zone_ids); t1 = time.perf_counter()
+    b = store.overlay_all(section, 12, zone_ids); t2 = time.perf_counter()
+    dense = np
+    np = None
+    c = store.overlay_all(section, 12, zone_ids); t3 = time.perf_counter()
+    np = dense
+    same = all(sorted(a[z]["markers"]) == sorted(c[z]["markers"]) and a[z]["density"] == c[z]["density"] for z in zone_ids)
+    print(f"numpy={HAVE_NUMPY} first {1000*(t1-t0):.1f} ms, cached {1000*(t2-t1):.1f} ms, loop {1000*(t3-t2):.1f} ms, same={same}")
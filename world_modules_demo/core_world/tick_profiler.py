@@ -0,0 +1,295 @@
+# engine/tick_profiler.py
+# Per-stage tick profiler: wall/CPU timings, log-linear latency histograms, optional allocs.
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+__all__ = [
+    "LatencyHistogram",
+    "TickProfiler",
+]
+
+# --- Tunables (safe defaults) ---
+PROFILE_DUMP_EVERY: int = 0          # ticks between dumps to PROFILE_DUMP_FILE (0 = off)
+PROFILE_DUMP_FILE: Path = Path("world_state") / "tick_profile.json"
+HIST_SUB_BUCKET_BITS: int = 5        # 32 sub-buckets per power of two -> ~3% relative error
+PERCENTILES = (50.0, 95.0, 99.0)
+
+def _utcnow_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+# ---------- Histogram ----------
+class LatencyHistogram:
+    """
+    HDR-style log-linear histogram over non-negative integers (µs, bytes...).
+    Values below 2**bits are exact; above, each power of two is split into
+    2**bits sub-buckets, so percentiles carry a bounded relative error.
+    Constant memory, O(1) record.
+    """
+
+    __slots__ = ("bits", "counts", "count", "total", "min", "max")
+
+    def __init__(self, bits: int = HIST_SUB_BUCKET_BITS):
+        self.bits = int(bits)
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.min: Optional[int] = None
+        self.max: Optional[int] = None
+
+    def _index(self, v: int) -> int:
+        shift = v.bit_length() - self.bits - 1
+        if shift <= 0:
+            return v
+        return ((shift + 1) << self.bits) + ((v >> shift) & ((1 << self.bits) - 1))
+
+    def _value_of(self, idx: int) -> int:
+        sub = (1 << self.bits)
+        if idx < 2 * sub:
+            return idx
+        shift = (idx >> self.bits) - 1
+        return ((sub + (idx & (sub - 1))) << shift) + (1 << shift) // 2   # bucket midpoint
+
+    def record(self, v: int) -> None:
+        v = max(0, int(v))
+        i = self._index(v)
+        self.counts[i] = self.counts.get(i, 0) + 1
+        self.count += 1
+        self.total += v
+        self.min = v if self.min is None or v < self.min else self.min
+        self.max = v if self.max is None or v > self.max else self.max
+
+    def percentile(self, p: float) -> int:
+        if not self.count:
+            return 0
+        rank = max(1, int(round(p / 100.0 * self.count + 0.4999)))
+        seen = 0
+        for i in sorted(self.counts):
+            seen += self.counts[i]
+            if seen >= rank:
+                return min(self._value_of(i), self.max or 0)
+        return self.max or 0
+
+    def summary(self, scale: float = 1.0) -> Dict[str, float]:
+        out = {
+            "count": self.count,
+            "mean": round(self.total / self.count * scale, 3) if self.count else 0.0,
+            "min": round((self.min or 0) * scale, 3),
+            "max": round((self.max or 0) * scale, 3),
+        }
+        for p in PERCENTILES:
+            out[f"p{p:g}"] = round(self.percentile(p) * scale, 3)
+        return out
+
+# ---------- Profiler ----------
+class _StageStats:
+    __slots__ = ("wall", "cpu", "alloc", "last_wall_us", "last_cpu_us", "last_alloc_b", "errors")
+
+    def __init__(self) -> None:
+        self.wall = LatencyHistogram()
+        self.cpu = LatencyHistogram()
+        self.alloc = LatencyHistogram()
+        self.last_wall_us = 0
+        self.last_cpu_us = 0
+        self.last_alloc_b = 0
+        self.errors = 0
+
+
+class TickProfiler:
+    """
+    with prof.tick():
+        with prof.stage("weather"):
+            ...
+    Stages keep wall (perf_counter) and thread-CPU time histograms in µs.
+    With trace_allocs=True, tracemalloc's peak per stage (bytes) is recorded
+    too; tracing slows the tick, so it is off by default.
+    """
+
+    def __init__(
+        self,
+        *,
+        trace_allocs: bool = False,
+        dump_every: int = PROFILE_DUMP_EVERY,
+        dump_file: Path = PROFILE_DUMP_FILE,
+    ):
+        self._lock = threading.Lock()
+        self._stages: Dict[str, _StageStats] = {}
+        self._order: List[str] = []
+        self._tick = _StageStats()
+        self.ticks = 0
+        self.since = _utcnow_iso()
+        self.dump_every = int(dump_every)
+        self.dump_file = Path(dump_file)
+        self.trace_allocs = False
+        self._started_tracemalloc = False
+        self.set_trace_allocs(trace_allocs)
+
+    # -------- options --------
+    def set_trace_allocs(self, on: bool) -> None:
+        on = bool(on)
+        if on and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        elif not on and self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        self.trace_allocs = on
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages.clear()
+            self._order.clear()
+            self._tick = _StageStats()
+            self.ticks = 0
+            self.since = _utcnow_iso()
+
+    # -------- recording --------
+    def _record(self, st: _StageStats, wall_ns: int, cpu_ns: int, alloc_b: Optional[int], failed: bool) -> None:
+        st.last_wall_us = wall_ns // 1000
+        st.last_cpu_us = cpu_ns // 1000
+        st.wall.record(st.last_wall_us)
+        st.cpu.record(st.last_cpu_us)
+        if alloc_b is not None:
+            st.last_alloc_b = alloc_b
+            st.alloc.record(alloc_b)
+        if failed:
+            st.errors += 1
+
+    def record(self, name: str, wall_ns: int, cpu_ns: int, *, alloc_b: Optional[int] = None, failed: bool = False) -> None:
+        """Record a stage timed elsewhere (e.g. in a worker process)."""
+        with self._lock:
+            st = self._stages.get(name)
+            if st is None:
+                st = self._stages[name] = _StageStats()
+                self._order.append(name)
+            self._record(st, int(wall_ns), int(cpu_ns), alloc_b, failed)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        tracing = self.trace_allocs and tracemalloc.is_tracing()
+        if tracing:
+            base = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        c0 = time.thread_time_ns()
+        t0 = time.perf_counter_ns()
+        failed = False
+        try:
+            yield
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            wall = time.perf_counter_ns() - t0
+            cpu = time.thread_time_ns() - c0
+            alloc = max(0, tracemalloc.get_traced_memory()[1] - base) if tracing else None
+            self.record(name, wall, cpu, alloc_b=alloc, failed=failed)
+
+    @contextmanager
+    def tick(self) -> Iterator[None]:
+        """Wrap a whole tick (adds the 'tick' totals and drives periodic dumps)."""
+        tracing = self.trace_allocs and tracemalloc.is_tracing()
+        base = tracemalloc.get_traced_memory()[0] if tracing else 0
+        c0 = time.thread_time_ns()
+        t0 = time.perf_counter_ns()
+        failed = False
+        try:
+            yield
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            wall = time.perf_counter_ns() - t0
+            cpu = time.thread_time_ns() - c0
+            # stage-level reset_peak() makes a whole-tick peak meaningless; report net growth
+            alloc = max(0, tracemalloc.get_traced_memory()[0] - base) if tracing else None
+            with self._lock:
+                self._record(self._tick, wall, cpu, alloc, failed)
+                self.ticks += 1
+                due = self.dump_every > 0 and self.ticks % self.dump_every == 0
+            if due:
+                self.dump()
+
+    # -------- queries --------
+    @staticmethod
+    def _stage_view(st: _StageStats) -> Dict[str, Any]:
+        out: Dict[str, Any] = {
+            "wall_ms": st.wall.summary(1e-3),
+            "cpu_ms": st.cpu.summary(1e-3),
+            "last_wall_ms": round(st.last_wall_us / 1000.0, 3),
+            "last_cpu_ms": round(st.last_cpu_us / 1000.0, 3),
+            "errors": st.errors,
+        }
+        if st.alloc.count:
+            out["alloc_kb"] = st.alloc.summary(1.0 / 1024)
+            out["last_alloc_kb"] = round(st.last_alloc_b / 1024.0, 1)
+        return out
+
+    def profile(self) -> Dict[str, Any]:
+        """
+        {"ticks", "since", "trace_allocs", "tick": {...},
+         "stages": {name: {"wall_ms": {count, mean, min, max, p50, p95, p99}, "cpu_ms": {...},
+                           "last_wall_ms", "last_cpu_ms", "errors", ["alloc_kb", "last_alloc_kb"],
+                           "share": fraction of mean tick wall time}}}
+        Stages appear in first-seen (pipeline) order.
+        """
+        with self._lock:
+            tick = self._stage_view(self._tick)
+            tick_mean = tick["wall_ms"]["mean"] or 0.0
+            stages: Dict[str, Any] = {}
+            for name in self._order:
+                v = self._stage_view(self._stages[name])
+                v["share"] = round(v["wall_ms"]["mean"] / tick_mean, 4) if tick_mean else 0.0
+                stages[name] = v
+            return {
+                "ticks": self.ticks,
+                "since": self.since,
+                "trace_allocs": self.trace_allocs,
+                "tick": tick,
+                "stages": stages,
+            }
+
+    def dump(self, path: Optional[Path] = None) -> Path:
+        """Write profile() as JSON (atomic replace)."""
+        path = Path(path or self.dump_file)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = self.profile()
+        data["dumped_at"] = _utcnow_iso()
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        os.replace(tmp, path)
+        return path
+
+
+# ---------------------- Quick self-test ----------------------
+if __name__ == "__main__":
+    import random
+
+    h = LatencyHistogram()
+    vals = [random.randint(0, 200_000) for _ in range(50_000)]
+    for v in vals:
+        h.record(v)
+    vals.sort()
+    exact = vals[int(0.99 * len(vals)) - 1]
+    print("P99 hist:", h.percentile(99), "exact:", exact, "err:", round(abs(h.percentile(99) - exact) / exact, 4))
+
+    prof = TickProfiler(trace_allocs=True)
+    for _ in range(20):
+        with prof.tick():
+            with prof.stage("fast"):
+                sum(range(1000))
+            with prof.stage("slow"):
+                time.sleep(0.002)
+            with prof.stage("alloc"):
+                junk = [{"i": i} for i in range(5000)]
+    p = prof.profile()
+    print("STAGES:", list(p["stages"]))
+    print("SLOW p95 ms:", p["stages"]["slow"]["wall_ms"]["p95"], "ALLOC peak kb:", p["stages"]["alloc"]["alloc_kb"]["p50"])
+    prof.set_trace_allocs(False)
@@ -0,0 +1,435 @@
+# engine/tick_recorder.py
+# Deterministic tick traces: per-tick inputs + periodic snapshots, replay, and cross-build bisect.
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Callable, Container, Dict, Iterator, List, Optional, Tuple
+
+try:
+    from engine.zone_record import json_default as _zone_json_default
+except Exception:
+    _zone_json_default = None
+
+__all__ = [
+    "TickRecorder",
+    "world_digest",
+    "world_metrics",
+    "load_trace",
+    "replay",
+    "bisect",
+]
+
+# --- Tunables (safe defaults) ---
+TRACE_VERSION = 1
+TRACE_SNAPSHOT_EVERY: int = 64     # full world snapshot every this many ticks
+# Wall-clock stamps (string values under these keys) are left out of digests
+TRACE_VOLATILE_KEYS = frozenset({"last_update", "last_weather_update", "timestamp", "t"})
+# world_util mutators whose calls between ticks are recorded as tick inputs
+TRACE_INPUT_OPS = ("apply_world_delta", "add_resonance", "update_zone_density", "modify_symbolic_energy")
+
+_HEADER = "header.json"
+_TICKS = "ticks.jsonl"
+_SEED_MASK = (1 << 63) - 1
+
+Metrics = Callable[[Dict[str, Any]], Dict[str, float]]
+
+def _default(o: Any) -> Any:
+    if _zone_json_default is not None:
+        try:
+            return _zone_json_default(o)
+        except TypeError:
+            pass
+    if isinstance(o, Mapping):
+        return dict(o)
+    if isinstance(o, (set, frozenset, tuple)):
+        return list(o)
+    return repr(o)
+
+def _dumps(obj: Any, **kw: Any) -> str:
+    return json.dumps(obj, ensure_ascii=False, default=_default, **kw)
+
+def _snap_path(trace_dir: Path, tick: int) -> Path:
+    return trace_dir / f"snap-{tick:08d}.json"
+
+def _f(x: Any) -> float:
+    try:
+        return float(x)
+    except Exception:
+        return 0.0
+
+def tick_seed(base_seed: int, tick: int) -> int:
+    """Seed for the global random at a tick; stable across processes and builds."""
+    h = hashlib.blake2b(f"{int(base_seed)}:{int(tick)}".encode("ascii"), digest_size=8)
+    return int.from_bytes(h.digest(), "big") & _SEED_MASK
+
+# ---------- Digest & metrics ----------
+def _scrub(x: Any) -> Any:
+    if isinstance(x, Mapping):
+        return {str(k): _scrub(v) for k, v in x.items()
+                if not (k in TRACE_VOLATILE_KEYS and isinstance(v, str))}
+    if isinstance(x, (list, tuple)):
+        return [_scrub(v) for v in x]
+    return x
+
+def world_digest(world: Dict[str, Any]) -> str:
+    """sha1 of the canonical JSON of the world, wall-clock stamps excluded."""
+    text = _dumps(_scrub(world), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+def world_metrics(world: Dict[str, Any]) -> Dict[str, float]:
+    """Cheap per-tick scalars: clock tick, world age, global density, zone count, summed zone energy."""
+    t = world.get("time")
+    zones = world.get("zones")
+    zones = zones if isinstance(zones, dict) else {}
+    energy = 0.0
+    for z in zones.values():
+        if isinstance(z, Mapping):
+            energy += _f(z.get("energy", 0.0))
+    return {
+        "time": _f(t.get("tick", 0) if isinstance(t, dict) else t),
+        "world_age": _f(world.get("world_age", 0)),
+        "symbolic_density": _f(world.get("symbolic_density", 0.0)),
+        "zones": float(len(zones)),
+        "zone_energy": energy,
+    }
+
+# ---------- Recording ----------
+class TickRecorder:
+    """
+    Writes a replayable trace of one world's ticks to trace_dir:
+
+      header.json          base seed, PYTHONHASHSEED, snapshot cadence, config
+      ticks.jsonl          one line per tick: prompt, skip, random seed, the
+                           inputs injected since the previous tick, and the
+                           world's digest + metrics after the tick
+      snap-<tick>.json     the world as the tick began (every snapshot_every)
+
+    world_util drives it (start_recording): begin_tick() reseeds the global
+    random from (seed, tick), so engines drawing from it (world expansion)
+    repeat exactly; note() captures mutator calls made between ticks. Calls
+    made while a tick runs are part of the tick and are not recorded.
+    """
+
+    def __init__(
+        self,
+        trace_dir: Path | str,
+        *,
+        seed: Optional[int] = None,
+        snapshot_every: int = TRACE_SNAPSHOT_EVERY,
+        digest: bool = True,
+        metrics: Optional[Metrics] = world_metrics,
+        config: Optional[Dict[str, Any]] = None,
+    ):
+        self.dir = Path(trace_dir)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.seed = int(seed) if seed is not None else int.from_bytes(os.urandom(6), "big")
+        self.snapshot_every = max(1, int(snapshot_every))
+        self.digest = bool(digest)
+        self.metrics = metrics
+        self.tick = 0
+        self.world_id: Optional[int] = None
+        self._pending: List[Dict[str, Any]] = []
+        self._cur: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+        for old in self.dir.glob("snap-*.json"):
+            old.unlink()
+        self.header: Dict[str, Any] = {
+            "version": TRACE_VERSION,
+            "seed": self.seed,
+            "hash_seed": os.environ.get("PYTHONHASHSEED"),
+            "snapshot_every": self.snapshot_every,
+            "digest": self.digest,
+            "volatile_keys": sorted(TRACE_VOLATILE_KEYS),
+            "config": dict(config or {}),
+        }
+        (self.dir / _HEADER).write_text(_dumps(self.header, indent=2), encoding="utf-8")
+        self._fh = (self.dir / _TICKS).open("w", encoding="utf-8")
+
+    def bind(self, world: Dict[str, Any]) -> None:
+        """Record this world only (default: the first world ticked)."""
+        self.world_id = id(world)
+
+    @property
+    def closed(self) -> bool:
+        return self._fh.closed
+
+    def note(self, world: Dict[str, Any], op: str, args: Dict[str, Any]) -> None:
+        """Capture a mutator call made between ticks (args are copied now)."""
+        if op not in TRACE_INPUT_OPS:
+            raise ValueError(f"not a recordable input: {op!r}")
+        with self._lock:
+            if self._cur is not None or self.closed:
+                return
+            if self.world_id is not None and id(world) != self.world_id:
+                return
+            self._pending.append({"op": op, "args": json.loads(_dumps(args))})
+
+    def begin_tick(self, world: Dict[str, Any], prompt: str = "", *, skip: Container[str] = ()) -> bool:
+        """Start recording a tick of `world`; False (nothing recorded) for other worlds."""
+        with self._lock:
+            if self.closed:
+                return False
+            if self.world_id is None:
+                self.world_id = id(world)
+            elif id(world) != self.world_id:
+                return False
+            k = self.tick
+            snap = k % self.snapshot_every == 0
+            if snap:   # the snapshot already holds the pending inputs; replays from it skip them
+                _snap_path(self.dir, k).write_text(_dumps(world), encoding="utf-8")
+            seed = tick_seed(self.seed, k)
+            self._cur = {
+                "tick": k,
+                "prompt": prompt or "",
+                "skip": sorted(skip) if skip else [],
+                "seed": seed,
+                "snapshot": snap,
+                "inputs": self._pending,
+            }
+            self._pending = []
+        random.seed(seed)
+        return True
+
+    def end_tick(self, world: Dict[str, Any]) -> None:
+        """Close the tick begun by begin_tick() with the resulting world."""
+        with self._lock:
+            rec, self._cur = self._cur, None
+            if rec is None or self.closed:
+                return
+            self.world_id = id(world)   # hydration may hand back a new dict
+            if self.digest:
+                rec["digest"] = world_digest(world)
+            if self.metrics is not None:
+                rec["metrics"] = self.metrics(world)
+            self._fh.write(_dumps(rec) + "\n")
+            self._fh.flush()
+            self.tick += 1
+
+    def close(self) -> None:
+        with self._lock:
+            if not self.closed:
+                self._fh.close()
+
+# ---------- Reading & replay ----------
+def load_trace(trace_dir: Path | str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """(header, tick records); a torn last line (recorder killed mid-write) is dropped."""
+    d = Path(trace_dir)
+    header = json.loads((d / _HEADER).read_text(encoding="utf-8"))
+    records: List[Dict[str, Any]] = []
+    with (d / _TICKS).open("r", encoding="utf-8") as fh:
+        for line in fh:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                break
+    return header, records
+
+def _snapshot_ticks(trace_dir: Path) -> List[int]:
+    out = []
+    for p in trace_dir.glob("snap-*.json"):
+        try:
+            out.append(int(p.stem.split("-", 1)[1]))
+        except ValueError:
+            continue
+    return sorted(out)
+
+def _tick_fn(wu: Any) -> Callable[[Dict[str, Any], str, Container[str]], Dict[str, Any]]:
+    fn = getattr(wu, "replay_tick", None)
+    if fn is not None:
+        return lambda w, prompt, skip: fn(w, prompt, skip=skip)
+    # builds from before replay_tick: one fast-forward tick is the same computation
+    return lambda w, prompt, skip: wu.autorun_world_ticks(w, 1, prompt, save=False)
+
+def replay(
+    trace_dir: Path | str,
+    start: int = 0,
+    end: Optional[int] = None,
+    *,
+    segmented: bool = False,
+) -> Iterator[Tuple[int, Dict[str, Any], Dict[str, Any]]]:
+    """
+    Re-run recorded ticks [start, end) with the engine.world_util importable
+    here, yielding (tick, world after it, recorded record). Starts from the
+    nearest snapshot at or before start (earlier ticks are re-run, not
+    yielded). segmented=True reloads the recorded snapshot at every snapshot
+    boundary, so each segment starts from recorded state rather than from the
+    replay's own (possibly diverged) world.
+    Configure the process like the recording (header["config"]: LOD opts).
+    """
+    import engine.world_util as wu
+
+    d = Path(trace_dir)
+    _header, records = load_trace(d)
+    end = len(records) if end is None else min(int(end), len(records))
+    snaps = _snapshot_ticks(d)
+    base = max((s for s in snaps if s <= start), default=None)
+    if base is None:
+        raise ValueError(f"no snapshot at or before tick {start} in {d}")
+    snapset = set(snaps)
+    tick = _tick_fn(wu)
+    world: Optional[Dict[str, Any]] = None
+    for k in range(base, end):
+        rec = records[k]
+        if world is None or (segmented and k in snapset):
+            world = json.loads(_snap_path(d, k).read_text(encoding="utf-8"))
+        else:
+            for inp in rec.get("inputs") or []:
+                if inp["op"] in TRACE_INPUT_OPS:
+                    getattr(wu, inp["op"])(world, **inp["args"])
+        random.seed(rec["seed"])
+        world = tick(world, rec.get("prompt", ""), tuple(rec.get("skip") or ()))
+        if k >= start:
+            yield k, world, rec
+
+def _configure(wu: Any, header: Dict[str, Any]) -> None:
+    config = header.get("config") or {}
+    lod = config.get("lod")
+    if lod and hasattr(wu, "enable_lod"):
+        wu.enable_lod(**lod)
+    diffusion = config.get("resonance_diffusion")
+    if diffusion and hasattr(wu, "enable_resonance_diffusion"):
+        wu.enable_resonance_diffusion(**diffusion)
+
+def _replay_main(argv: List[str]) -> None:
+    """Subprocess driver for bisect: stream {tick, digest, metrics} lines."""
+    import engine.world_util as wu
+
+    trace, start, end = argv[0], int(argv[1]), (int(argv[2]) if argv[2] != "-" else None)
+    header, _ = load_trace(trace)
+    _configure(wu, header)
+    out = sys.stdout
+    for k, world, _rec in replay(trace, start, end, segmented=True):
+        row: Dict[str, Any] = {"tick": k, "metrics": world_metrics(world)}
+        if header.get("digest", True):
+            row["digest"] = world_digest(world)
+        out.write(_dumps(row) + "\n")
+        out.flush()
+
+_DRIVER = (
+    "import importlib.util, sys\n"
+    "spec = importlib.util.spec_from_file_location('_tick_recorder_driver', sys.argv[1])\n"
+    "mod = importlib.util.module_from_spec(spec)\n"
+    "spec.loader.exec_module(mod)\n"
+    "mod._replay_main(sys.argv[2:])\n"
+)
+
+def _spawn(build: Path | str, trace: Path, start: int, end: Optional[int], header: Dict[str, Any],
+           cwd: str) -> subprocess.Popen:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([str(Path(build).resolve())] + [p for p in [env.get("PYTHONPATH")] if p])
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+    if header.get("hash_seed") is not None:
+        env["PYTHONHASHSEED"] = str(header["hash_seed"])
+    return subprocess.Popen(
+        [sys.executable, "-c", _DRIVER, str(Path(__file__).resolve()), str(trace.resolve()),
+         str(start), "-" if end is None else str(end)],
+        cwd=cwd, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+    )
+
+def _value(row: Dict[str, Any], metric: str) -> Any:
+    if metric == "digest":
+        return row.get("digest")
+    return (row.get("metrics") or {}).get(metric)
+
+def _differs(a: Any, b: Any, tol: float) -> bool:
+    if isinstance(a, (int, float)) and isinstance(b, (int, float)):
+        return abs(float(a) - float(b)) > tol
+    return a != b
+
+def _stop(proc: Optional[subprocess.Popen]) -> str:
+    if proc is None:
+        return ""
+    if proc.poll() is None:
+        proc.kill()
+    try:
+        _out, err = proc.communicate(timeout=5)
+    except Exception:
+        return ""
+    return "\n".join((err or "").strip().splitlines()[-5:])
+
+def bisect(
+    trace_dir: Path | str,
+    build_a: Path | str,
+    build_b: Optional[Path | str] = None,
+    *,
+    metric: str = "digest",
+    start: int = 0,
+    end: Optional[int] = None,
+    tol: float = 0.0,
+) -> Optional[Dict[str, Any]]:
+    """
+    First tick in [start, end) where `metric` ("digest" or a world_metrics key)
+    differs between two engine builds, or between build_a and the recorded
+    values when build_b is None. A build is a directory holding the `engine`
+    package; each replays in its own interpreter (PYTHONHASHSEED as recorded).
+
+    Replays are segmented: every snapshot boundary restarts both builds from
+    the recorded world, so the reported tick is the first one that diverges
+    from identical input state, not a later echo of it. Both streams are
+    compared as they arrive and the replays stop at the first difference.
+    Returns None when nothing diverges, else {"tick", "metric", "a", "b",
+    "segment"} (plus "error" if a replay crashed at that tick).
+    """
+    d = Path(trace_dir)
+    header, records = load_trace(d)
+    end = len(records) if end is None else min(int(end), len(records))
+    snaps = _snapshot_ticks(d)
+    tmp = tempfile.mkdtemp(prefix="tick-bisect-")
+    procs: List[Optional[subprocess.Popen]] = [None, None]
+    try:
+        procs[0] = _spawn(build_a, d, start, end, header, tmp)
+        if build_b is not None:
+            procs[1] = _spawn(build_b, d, start, end, header, tmp)
+        for k in range(start, end):
+            segment = max((s for s in snaps if s <= k), default=0)
+            rows: List[Optional[Dict[str, Any]]] = []
+            for i, proc in enumerate(procs):
+                if proc is None:
+                    rows.append({"tick": k, "digest": records[k].get("digest"),
+                                 "metrics": records[k].get("metrics")})
+                    continue
+                line = proc.stdout.readline() if proc.stdout is not None else ""
+                rows.append(json.loads(line) if line else None)
+            if rows[0] is None or rows[1] is None:
+                crashed = 0 if rows[0] is None else 1
+                return {"tick": k, "metric": metric, "segment": segment,
+                        "a": None if rows[0] is None else _value(rows[0], metric),
+                        "b": None if rows[1] is None else _value(rows[1], metric),
+                        "error": f"{'ab'[crashed]}: {_stop(procs[crashed]) or 'replay ended early'}"}
+            va, vb = _value(rows[0], metric), _value(rows[1], metric)
+            if _differs(va, vb, tol):
+                return {"tick": k, "metric": metric, "a": va, "b": vb, "segment": segment}
+        return None
+    finally:
+        for proc in procs:
+            _stop(proc)
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+# ---------------------- CLI ----------------------
+# python tick_recorder.py replay TRACE [START [END]]       -> tick, digest per line (in-process)
+# python tick_recorder.py bisect TRACE BUILD_A [BUILD_B] [METRIC]
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if len(args) >= 2 and args[0] == "replay":
+        rng = [int(a) for a in args[2:4]]
+        import engine.world_util as _wu
+        _configure(_wu, load_trace(args[1])[0])
+        for _k, _w, _rec in replay(args[1], *rng):
+            _d = world_digest(_w)
+            print(_k, _d, "ok" if _rec.get("digest") in (None, _d) else "DIVERGED")
+    elif len(args) >= 3 and args[0] == "bisect":
+        b = args[3] if len(args) > 3 and args[3] != "-" else None
+        print(_dumps(bisect(args[1], args[2], b, metric=args[4] if len(args) > 4 else "digest")))
+    else:
+        print("usage: tick_recorder.py replay TRACE [START [END]] | bisect TRACE BUILD_A [BUILD_B] [METRIC]")
@@ -0,0 +1,477 @@
+# engine/tick_scheduler.py
+# Declarative tick stage registry + dependency-aware (optionally parallel) scheduler.
+from __future__ import annotations
+
+import os
+import pickle
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+from typing import Any, Callable, Container, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    from engine.world_serializer import mark_dirty as _mark_dirty
+except Exception:
+    def _mark_dirty(world, section=None, zone=None):  # fallback no-op
+        return None
+
+__all__ = [
+    "Stage",
+    "StageRegistry",
+    "EXECUTORS",
+    "engine_marks",
+    "engine_sections",
+    "sections_overlap",
+]
+
+# --- Tunables (safe defaults) ---
+EXECUTORS = ("serial", "thread", "process")
+ALL = "*"                           # section wildcard: the whole world (or any key at that level)
+SECTION_ATTRS = ("TICK_READS", "TICK_WRITES")   # module attributes engines may declare
+MARKS_ATTR = "TICK_MARKS_DIRTY"     # module attribute: True if the engine calls mark_dirty itself
+
+# ---------- Section algebra ----------
+def _split(section: str) -> Tuple[str, ...]:
+    return tuple(p for p in str(section).split(".") if p)
+
+def sections_overlap(a: str, b: str) -> bool:
+    """
+    True if two section paths can touch the same data. Paths are dotted
+    ("zones", "zones.*.weather"); "*" matches any key at its level and a
+    path overlaps everything underneath it ("zones" vs "zones.*.micro").
+    """
+    pa, pb = _split(a), _split(b)
+    for x, y in zip(pa, pb):
+        if x != y and x != ALL and y != ALL:
+            return False
+    return True
+
+def _any_overlap(xs: Iterable[str], ys: Iterable[str]) -> bool:
+    ys = tuple(ys)
+    return any(sections_overlap(x, y) for x in xs for y in ys)
+
+def _top(sections: Iterable[str]) -> Tuple[str, ...]:
+    """Coarsen to top-level keys (what a process worker ships back)."""
+    out: List[str] = []
+    for s in sections:
+        p = _split(s)
+        k = p[0] if p else ALL
+        if k not in out:
+            out.append(k)
+    return tuple(out)
+
+def engine_sections(fn: Callable[..., Any]) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """
+    Read the TICK_READS / TICK_WRITES declared by the module that defines fn.
+    Undeclared engines are assumed to touch the whole world ("*").
+    """
+    import sys
+    mod = sys.modules.get(getattr(fn, "__module__", "") or "")
+    reads = tuple(getattr(mod, SECTION_ATTRS[0], (ALL,)) or ())
+    writes = tuple(getattr(mod, SECTION_ATTRS[1], (ALL,)) or ())
+    return reads, writes
+
+def engine_marks(fn: Callable[..., Any]) -> bool:
+    """True if fn's module declares TICK_MARKS_DIRTY (it marks what it changes)."""
+    import sys
+    mod = sys.modules.get(getattr(fn, "__module__", "") or "")
+    return bool(getattr(mod, MARKS_ATTR, False))
+
+def _mark_writes(world: Dict[str, Any], writes: Sequence[str]) -> None:
+    # Dirty-mark a stage's declared writes for the incremental encoder
+    tops = _top(writes)
+    if ALL in tops:
+        _mark_dirty(world)
+        return
+    for k in tops:
+        _mark_dirty(world, k)
+
+# ---------- Stage ----------
+class Stage:
+    """
+    One tick step: fn(world) / fn(world, prompt) / fn(world, prompt=prompt),
+    returning the world. reads/writes are section paths (see sections_overlap).
+    local=True keeps the stage in this process even under the process executor.
+    marks=True: fn dirty-marks what it changes; otherwise every declared write
+    is marked after it runs.
+    """
+
+    __slots__ = ("name", "fn", "reads", "writes", "prompt", "local", "marks", "_shippable")
+
+    def __init__(
+        self,
+        name: str,
+        fn: Callable[..., Any],
+        *,
+        reads: Sequence[str] = (ALL,),
+        writes: Sequence[str] = (ALL,),
+        prompt: Optional[str] = None,
+        local: bool = False,
+        marks: bool = False,
+    ):
+        if prompt not in (None, "arg", "kw"):
+            raise ValueError(f"prompt must be None, 'arg' or 'kw', not {prompt!r}")
+        self.name = str(name)
+        self.fn = fn
+        self.reads = tuple(reads)
+        self.writes = tuple(writes)
+        self.prompt = prompt
+        self.local = bool(local)
+        self.marks = bool(marks)
+        self._shippable: Optional[bool] = None
+
+    @property
+    def exclusive(self) -> bool:
+        """Writes the whole world: runs alone, and may replace the world object."""
+        return ALL in self.writes or any(_split(s)[:1] == (ALL,) for s in self.writes)
+
+    def conflicts(self, other: "Stage", *, coarse: bool = False) -> bool:
+        """Write/write, write/read or read/write overlap (coarse: top-level keys only)."""
+        r1, w1, r2, w2 = self.reads, self.writes, other.reads, other.writes
+        if coarse:
+            r1, w1, r2, w2 = _top(r1), _top(w1), _top(r2), _top(w2)
+        return _any_overlap(w1, w2) or _any_overlap(w1, r2) or _any_overlap(r1, w2)
+
+    def call(self, world: Dict[str, Any], prompt: str = "") -> Dict[str, Any]:
+        if self.prompt == "kw":
+            return self.fn(world, prompt=prompt)
+        if self.prompt == "arg":
+            return self.fn(world, prompt)
+        return self.fn(world)
+
+    def shippable(self) -> bool:
+        """Can be sent to a worker process (picklable fn, not pinned local/exclusive)."""
+        if self._shippable is None:
+            ok = not self.local and not self.exclusive
+            if ok:
+                try:
+                    pickle.dumps(self.fn)
+                except Exception:
+                    ok = False
+            self._shippable = ok
+        return self._shippable
+
+    def __repr__(self) -> str:
+        return f"Stage({self.name!r}, reads={self.reads}, writes={self.writes})"
+
+def _run_remote(stage: Stage, sub: Dict[str, Any], prompt: str, keys: Tuple[str, ...]) -> Tuple[Dict[str, Any], List[str], int, int]:
+    """Worker side of the process executor: run on a section subset, ship back written keys."""
+    c0 = time.thread_time_ns()
+    t0 = time.perf_counter_ns()
+    out = stage.call(sub, prompt)
+    if not isinstance(out, dict):
+        out = sub
+    written = {k: out[k] for k in keys if k in out}
+    removed = [k for k in keys if k not in out]
+    return written, removed, time.perf_counter_ns() - t0, time.thread_time_ns() - c0
+
+# ---------- Registry / scheduler ----------
+class StageRegistry:
+    """
+    Ordered tick stages plus the scheduler that runs them.
+
+    A later stage depends on every earlier stage it conflicts with, so the
+    declared order is both the dependency direction and the tie-breaker:
+    stages that become ready together are started in declared order, and
+    results are merged in declared order. Executors:
+      serial  - declared order, one after another (exactly the legacy pipeline)
+      thread  - non-conflicting stages overlap on a thread pool; pays off when
+                stages release the GIL (I/O, numpy) or run under free-threading
+      process - shippable stages run on a process pool against a copy of the
+                top-level sections they touch; written sections are swapped
+                back in. Conflicts are judged per top-level key in this mode.
+    Exclusive stages (writing "*") always run alone on the calling thread.
+    """
+
+    def __init__(self, *, executor: str = "serial", workers: Optional[int] = None):
+        self._lock = threading.RLock()
+        self._stages: List[Stage] = []
+        self._plans: Dict[bool, List[List[int]]] = {}
+        self._pool: Optional[Executor] = None
+        self._pool_kind: Optional[str] = None
+        self.executor = "serial"
+        self.workers = workers
+        self.set_executor(executor, workers)
+
+    # -------- registration --------
+    def register(
+        self,
+        name: str,
+        fn: Callable[..., Any],
+        *,
+        reads: Optional[Sequence[str]] = None,
+        writes: Optional[Sequence[str]] = None,
+        prompt: Optional[str] = None,
+        local: bool = False,
+        marks: Optional[bool] = None,
+        before: Optional[str] = None,
+        after: Optional[str] = None,
+    ) -> Stage:
+        """
+        Add (or replace, keeping its slot) a stage. reads/writes default to the
+        engine module's TICK_READS/TICK_WRITES, else "*"; marks to its
+        TICK_MARKS_DIRTY. before/after place a new stage relative to an
+        existing one; otherwise it is appended.
+        """
+        if reads is None or writes is None:
+            er, ew = engine_sections(fn)
+            reads = er if reads is None else reads
+            writes = ew if writes is None else writes
+        if marks is None:
+            marks = engine_marks(fn)
+        st = Stage(name, fn, reads=reads, writes=writes, prompt=prompt, local=local, marks=marks)
+        with self._lock:
+            idx = self._index(name)
+            if idx is not None and before is None and after is None:
+                self._stages[idx] = st
+            else:
+                if idx is not None:
+                    del self._stages[idx]
+                pos = len(self._stages)
+                anchor = before if before is not None else after
+                if anchor is not None:
+                    a = self._index(anchor)
+                    if a is None:
+                        raise KeyError(f"no stage named {anchor!r}")
+                    pos = a if before is not None else a + 1
+                self._stages.insert(pos, st)
+            self._plans.clear()
+        return st
+
+    def unregister(self, name: str) -> bool:
+        with self._lock:
+            idx = self._index(name)
+            if idx is None:
+                return False
+            del self._stages[idx]
+            self._plans.clear()
+            return True
+
+    def _index(self, name: str) -> Optional[int]:
+        for i, st in enumerate(self._stages):
+            if st.name == name:
+                return i
+        return None
+
+    def names(self) -> List[str]:
+        with self._lock:
+            return [st.name for st in self._stages]
+
+    def __contains__(self, name: object) -> bool:
+        return self._index(str(name)) is not None
+
+    def __len__(self) -> int:
+        return len(self._stages)
+
+    # -------- planning --------
+    def _deps(self, stages: List[Stage], coarse: bool) -> List[List[int]]:
+        plan = self._plans.get(coarse)
+        if plan is None:
+            plan = [[j for j in range(i) if stages[i].conflicts(stages[j], coarse=coarse)] for i in range(len(stages))]
+            self._plans[coarse] = plan
+        return plan
+
+    def plan(self, *, coarse: bool = False) -> List[List[str]]:
+        """
+        Stage names grouped into waves (longest dependency path). Stages in one
+        wave never conflict; useful to check what a tick can overlap.
+        """
+        with self._lock:
+            stages = list(self._stages)
+            deps = self._deps(stages, coarse)
+        level: List[int] = []
+        for i in range(len(stages)):
+            level.append(1 + max((level[j] for j in deps[i]), default=-1))
+        waves: List[List[str]] = [[] for _ in range(max(level, default=-1) + 1)]
+        for i, st in enumerate(stages):
+            waves[level[i]].append(st.name)
+        return waves
+
+    # -------- executors --------
+    def set_executor(self, executor: str = "serial", workers: Optional[int] = None) -> str:
+        """Pick "serial", "thread" or "process". Changing kind shuts the old pool down."""
+        if executor not in EXECUTORS:
+            raise ValueError(f"executor must be one of {EXECUTORS}, not {executor!r}")
+        with self._lock:
+            if executor != self._pool_kind or workers != self.workers:
+                self.close()
+            self.executor = executor
+            self.workers = workers
+        return self.executor
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            n = self.workers or max(2, min(8, os.cpu_count() or 2))
+            if self.executor == "process":
+                self._pool = ProcessPoolExecutor(max_workers=n)
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=n, thread_name_prefix="tick-stage")
+            self._pool_kind = self.executor
+        return self._pool
+
+    def close(self) -> None:
+        """Shut the worker pool down (it is recreated on demand)."""
+        with self._lock:
+            pool, self._pool, self._pool_kind = self._pool, None, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    # -------- running --------
+    @staticmethod
+    def _timed(profiler: Any, name: str):
+        return profiler.stage(name) if profiler is not None else nullcontext()
+
+    def _run_local(self, st: Stage, world: Dict[str, Any], prompt: str, profiler: Any) -> Dict[str, Any]:
+        with self._timed(profiler, st.name):
+            out = st.call(world, prompt)
+        out = out if isinstance(out, dict) else world
+        if not st.marks:
+            _mark_writes(out, st.writes)
+        return out
+
+    @staticmethod
+    def _merge(st: Stage, world: Dict[str, Any], out: Dict[str, Any]) -> None:
+        """A non-exclusive stage that returned a different dict: adopt its written sections."""
+        if out is world:
+            return
+        for k in _top(st.writes):
+            if k in out:
+                world[k] = out[k]
+
+    def run(
+        self,
+        world: Dict[str, Any],
+        prompt: str = "",
+        *,
+        profiler: Any = None,
+        executor: Optional[str] = None,
+        skip: Container[str] = (),
+    ) -> Dict[str, Any]:
+        """
+        Run every stage once and return the (possibly replaced) world.
+        profiler: optional TickProfiler; each stage is timed under its name.
+        skip: stage names to leave out this run (dependents are not held back).
+        The first stage exception is re-raised after running stages finish.
+        """
+        mode = executor or self.executor
+        with self._lock:
+            stages = list(self._stages)
+            deps = self._deps(stages, mode == "process")
+        if mode == "serial" or len(stages) < 2:
+            for st in stages:
+                if st.name not in skip:
+                    world = self._run_local(st, world, prompt, profiler)
+            return world
+
+        n = len(stages)
+        waiting = [len(d) for d in deps]
+        children: List[List[int]] = [[] for _ in range(n)]
+        for i, d in enumerate(deps):
+            for j in d:
+                children[j].append(i)
+        ready = [i for i in range(n) if not waiting[i]]
+        running: Dict[Future, int] = {}
+        shipped: Dict[int, Tuple[str, ...]] = {}
+        error: Optional[BaseException] = None
+        pool = None
+
+        def _finish(i: int) -> None:
+            for c in children[i]:
+                waiting[c] -= 1
+                if not waiting[c]:
+                    ready.append(c)
+            ready.sort()
+
+        while ready or running:
+            if error is None:
+                while ready:
+                    # Exclusive stages (and a lone ready stage with nothing in flight) run inline
+                    i = ready[0]
+                    st = stages[i]
+                    if st.name in skip:
+                        ready.pop(0)
+                        _finish(i)
+                        continue
+                    if st.exclusive or (len(ready) == 1 and not running):
+                        if running:
+                            break
+                        ready.pop(0)
+                        try:
+                            world = self._run_local(st, world, prompt, profiler)
+                        except BaseException as e:
+                            error = e
+                            ready.clear()
+                            break
+                        _finish(i)
+                        continue
+                    ready.pop(0)
+                    pool = pool or self._get_pool()
+                    if mode == "process" and st.shippable():
+                        keys = _top(st.reads + st.writes)
+                        sub = {k: world[k] for k in keys if k in world}
+                        shipped[i] = _top(st.writes)
+                        fut = pool.submit(_run_remote, st, sub, prompt, shipped[i])
+                    elif mode == "process":
+                        fut = Future()
+                        try:
+                            fut.set_result(self._run_local(st, world, prompt, profiler))
+                        except BaseException as e:
+                            fut.set_exception(e)
+                    else:
+                        fut = pool.submit(self._run_local, st, world, prompt, profiler)
+                    running[fut] = i
+            else:
+                ready.clear()
+            if not running:
+                continue
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for fut in sorted(done, key=lambda f: running[f]):
+                i = running.pop(fut)
+                st = stages[i]
+                try:
+                    res = fut.result()
+                except BaseException as e:
+                    if i in shipped and profiler is not None:
+                        profiler.record(st.name, 0, 0, failed=True)
+                    error = error or e
+                    continue
+                if i in shipped:
+                    written, removed, wall_ns, cpu_ns = res
+                    world.update(written)
+                    for k in removed:
+                        world.pop(k, None)
+                    for k in written:
+                        _mark_dirty(world, k)
+                    if profiler is not None:
+                        profiler.record(st.name, wall_ns, cpu_ns)
+                else:
+                    self._merge(st, world, res)
+                if error is None:
+                    _finish(i)
+        if error is not None:
+            raise error
+        return world
+
+
+# ---------------------- Quick self-test ----------------------
+if __name__ == "__main__":
+    def _slow(key, delay):
+        def f(w):
+            time.sleep(delay)
+            w[key] = w.get(key, 0) + 1
+            return w
+        return f
+
+    reg = StageRegistry()
+    reg.register("a", _slow("a", 0.05), reads=("time",), writes=("a",))
+    reg.register("b", _slow("b", 0.05), reads=("time",), writes=("b",))
+    reg.register("c", _slow("c", 0.05), reads=("a", "b"), writes=("c",))
+    reg.register("zones_w", _slow("zw", 0.0), reads=("zones.*.micro",), writes=("zones.*.weather",))
+    reg.register("zones_m", _slow("zm", 0.0), reads=(), writes=("zones.*.micro",))
+    print("PLAN:", reg.plan())
+    for mode in ("serial", "thread"):
+        t0 = time.perf_counter()
+        w = reg.run({"time": 1}, executor=mode)
+        print(mode, "ms:", round((time.perf_counter() - t0) * 1000, 1), {k: w[k] for k in ("a", "b", "c")})
+    reg.close()
@@ -0,0 +1,339 @@
+# engine/tick_service.py
+# Fixed-rate asyncio tick driver: one tick thread, catch-up policies, bounded inputs, backpressure.
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import engine.world_util as _wu
+except Exception:
+    import world_util as _wu  # flat layout
+
+__all__ = ["TickService", "TICK_POLICIES"]
+
+# --- Tunables (safe defaults) ---
+TICK_RATE_HZ: float = 1.0
+TICK_POLICY: str = "burst"
+TICK_BURST_MAX: int = 4          # "burst": at most this many ticks per wake-up
+TICK_FF_MAX: int = 256           # "fast_forward": at most this many missed ticks folded into one batch
+TICK_BUDGET: float = 0.8         # a tick overruns when it takes longer than this share of the period
+TICK_PRESSURE_AFTER: int = 3     # consecutive overruns before the service reports backpressure
+TICK_QUEUE_HIGH: float = 0.8     # ...or when an input queue is this full
+TICK_PROMPT_QUEUE: int = 64
+TICK_DELTA_QUEUE: int = 256
+
+# skip:         drop missed ticks, stay on the grid
+# burst:        run missed ticks back to back, up to burst_max per wake-up, drop the rest
+# fast_forward: fold missed ticks into one autorun_world_ticks batch (no per-tick save)
+TICK_POLICIES = ("skip", "burst", "fast_forward")
+
+PressureHook = Callable[[bool, Dict[str, Any]], None]
+
+def _copy_world(w: Dict[str, Any]) -> Dict[str, Any]:
+    return json.loads(json.dumps(w, default=_wu._json_default))
+
+class TickService:
+    """
+    Drives autorun_world_tick at a fixed rate from an asyncio loop.
+
+      svc = TickService(world, rate_hz=2.0, policy="burst")
+      await svc.start()
+      await svc.submit_prompt("storm over the gate")   # waits while the queue is full
+      world_view = await svc.snapshot()                 # consistent, read-only copy
+      await svc.stop()
+
+    Ticks run one at a time on a dedicated thread, so they never overlap and
+    nothing else in the service mutates the world concurrently. Deadlines sit on a
+    fixed grid (start + k * period), so pacing does not drift with tick cost.
+    When the loop falls behind, `policy` decides what happens to missed ticks
+    (see TICK_POLICIES).
+
+    Each tick consumes at most one queued prompt. Before the tick it applies
+    every queued delta through apply_world_delta. Both queues are bounded:
+    - submit_*() waits for room (backpressure).
+    - submit_*(wait=False) returns False instead.
+    `overloaded` is set when ticks overrun their budget for pressure_after
+    ticks in a row, or when a queue passes TICK_QUEUE_HIGH. It clears once
+    ticks fit and the queues drain. on_pressure(state, info) is called on
+    each change.
+    """
+
+    def __init__(
+        self,
+        world: Dict[str, Any],
+        *,
+        rate_hz: float = TICK_RATE_HZ,
+        policy: str = TICK_POLICY,
+        burst_max: int = TICK_BURST_MAX,
+        ff_max: int = TICK_FF_MAX,
+        budget: float = TICK_BUDGET,
+        pressure_after: int = TICK_PRESSURE_AFTER,
+        prompt_queue: int = TICK_PROMPT_QUEUE,
+        delta_queue: int = TICK_DELTA_QUEUE,
+        on_pressure: Optional[PressureHook] = None,
+    ):
+        if policy not in TICK_POLICIES:
+            raise ValueError(f"policy must be one of {TICK_POLICIES}, got {policy!r}")
+        if rate_hz <= 0:
+            raise ValueError("rate_hz must be > 0")
+        self.world = world
+        self.period = 1.0 / float(rate_hz)
+        self.policy = policy
+        self.burst_max = max(1, int(burst_max))
+        self.ff_max = max(1, int(ff_max))
+        self.budget = max(0.0, float(budget))
+        self.pressure_after = max(1, int(pressure_after))
+        self.on_pressure = on_pressure
+        self._prompts_max = max(1, int(prompt_queue))
+        self._deltas_max = max(1, int(delta_queue))
+        self._prompts: Optional[asyncio.Queue] = None
+        self._deltas: Optional[asyncio.Queue] = None
+        self._stop_evt: Optional[asyncio.Event] = None
+        self._ticked: Optional[asyncio.Condition] = None
+        self.overloaded: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._gen = 0                  # world generation: bumped by the tick thread
+        self._snap: Optional[Tuple[int, Dict[str, Any]]] = None
+        self._overruns = 0
+        self.stats: Dict[str, Any] = {
+            "ticks": 0, "skipped": 0, "burst": 0, "fast_forwarded": 0, "deltas": 0,
+            "overruns": 0, "errors": 0, "tick_ms_avg": 0.0, "tick_ms_max": 0.0,
+            "lag_ms_max": 0.0, "jitter_ms_avg": 0.0,
+        }
+
+    # -------- lifecycle --------
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._prompts = asyncio.Queue(self._prompts_max)
+        self._deltas = asyncio.Queue(self._deltas_max)
+        self._stop_evt = asyncio.Event()
+        self._ticked = asyncio.Condition()
+        self.overloaded = asyncio.Event()
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="world-tick")
+        self._task = asyncio.get_running_loop().create_task(self._run(), name="world-tick-service")
+
+    async def stop(self) -> None:
+        """Finish the tick in flight, then stop (queued inputs are dropped)."""
+        if self._task is None:
+            return
+        self._stop_evt.set()
+        try:
+            await self._task
+        finally:
+            self._task = None
+            pool, self._pool = self._pool, None
+            if pool is not None:
+                pool.shutdown(wait=True)
+
+    # -------- inputs --------
+    async def submit_prompt(self, prompt: str, *, wait: bool = True) -> bool:
+        return await self._submit(self._prompts, str(prompt or ""), wait)
+
+    async def submit_delta(self, delta: Dict[str, Any], *, wait: bool = True) -> bool:
+        return await self._submit(self._deltas, delta, wait)
+
+    async def _submit(self, q: Optional[asyncio.Queue], item: Any, wait: bool) -> bool:
+        if q is None or self._stop_evt.is_set():
+            raise RuntimeError("TickService is not running")
+        if wait:
+            await q.put(item)
+        else:
+            try:
+                q.put_nowait(item)
+            except asyncio.QueueFull:
+                return False
+        self._check_pressure()
+        return True
+
+    # -------- readers --------
+    @property
+    def tick_count(self) -> int:
+        return self._gen
+
+    async def wait_tick(self, after: Optional[int] = None) -> int:
+        """Wait until the world generation passes `after` (default: now); returns it."""
+        target = self._gen if after is None else int(after)
+        async with self._ticked:
+            await self._ticked.wait_for(lambda: self._gen > target or not self.running)
+        return self._gen
+
+    async def snapshot(self, *, fresh: bool = False) -> Dict[str, Any]:
+        """
+        A JSON-shaped copy of the world between ticks (shared by readers until the
+        next tick: treat it as read-only). fresh=True waits for the next tick first.
+        """
+        if fresh:
+            await self.wait_tick()
+        snap = self._snap
+        if snap is not None and snap[0] == self._gen:
+            return snap[1]
+        loop = asyncio.get_running_loop()
+        # the tick thread runs the copy, so it always lands between two ticks
+        self._snap = snap = await loop.run_in_executor(self._pool, self._copy_job)
+        return snap[1]
+
+    def _copy_job(self) -> Tuple[int, Dict[str, Any]]:
+        with _wu.world_read_lock():
+            return self._gen, _copy_world(self.world)
+
+    # -------- tick thread --------
+    def _tick_job(self, prompt: str, deltas: List[Dict[str, Any]], n: int, ff: int) -> Tuple[int, float]:
+        w = self.world
+        if deltas:
+            with _wu._WORLD_LOCK:
+                for d in deltas:
+                    w = _wu.apply_world_delta(w, d)
+        if ff:
+            w = _wu.autorun_world_ticks(w, ff, save=False)
+        t0 = time.perf_counter()
+        for i in range(n):
+            w = _wu.autorun_world_tick(w, prompt if i == 0 else "")
+        self.world = w
+        self._gen += n + ff
+        return n + ff, (time.perf_counter() - t0) / max(1, n)
+
+    # -------- pacing --------
+    def _take_inputs(self) -> Tuple[str, List[Dict[str, Any]]]:
+        prompt = ""
+        if not self._prompts.empty():
+            prompt = self._prompts.get_nowait()
+        deltas = []
+        while not self._deltas.empty():
+            deltas.append(self._deltas.get_nowait())
+        return prompt, deltas
+
+    def _plan(self, behind: int) -> Tuple[int, int]:
+        """(ticks to run one by one, ticks folded into a batch); drops the rest."""
+        if behind <= 0:
+            return 1, 0
+        if self.policy == "burst":
+            n = min(1 + behind, self.burst_max)
+            self.stats["burst"] += n - 1
+            self.stats["skipped"] += 1 + behind - n
+            return n, 0
+        if self.policy == "fast_forward":
+            ff = min(behind, self.ff_max)
+            self.stats["fast_forwarded"] += ff
+            self.stats["skipped"] += behind - ff
+            return 1, ff
+        self.stats["skipped"] += behind
+        return 1, 0
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        period = self.period
+        due = loop.time() + period
+        while not self._stop_evt.is_set():
+            delay = due - loop.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._stop_evt.wait(), delay)
+                    break
+                except asyncio.TimeoutError:
+                    pass
+            now = loop.time()
+            lag = max(0.0, now - due)
+            behind = int(lag // period)            # whole periods missed beyond the due tick
+            n, ff = self._plan(behind)
+            prompt, deltas = self._take_inputs()
+            try:
+                ran, tick_s = await loop.run_in_executor(self._pool, self._tick_job, prompt, deltas, n, ff)
+            except Exception as e:
+                self.stats["errors"] += 1
+                print("[WARN] tick_service: tick failed:", e)
+                ran, tick_s = 0, loop.time() - now
+            self._account(ran, tick_s, lag, len(deltas))
+            due += (1 + behind) * period             # back onto the grid
+            async with self._ticked:
+                self._ticked.notify_all()
+        async with self._ticked:
+            self._ticked.notify_all()
+
+    def _account(self, ran: int, tick_s: float, lag: float, n_deltas: int) -> None:
+        st = self.stats
+        k = st["ticks"]
+        st["ticks"] = k + ran
+        st["deltas"] += n_deltas
+        ms = tick_s * 1000.0
+        st["tick_ms_avg"] = round((st["tick_ms_avg"] * k + ms * max(1, ran)) / max(1, k + ran), 3)
+        st["tick_ms_max"] = round(max(st["tick_ms_max"], ms), 3)
+        st["lag_ms_max"] = round(max(st["lag_ms_max"], lag * 1000.0), 3)
+        st["jitter_ms_avg"] = round(0.9 * st["jitter_ms_avg"] + 0.1 * lag * 1000.0, 3)
+        if tick_s > self.budget * self.period:
+            st["overruns"] += 1
+            self._overruns += 1
+        else:
+            self._overruns = 0
+        self._check_pressure()
+
+    def pressure(self) -> Dict[str, Any]:
+        """Current backpressure inputs: consecutive overruns and queue fill (0..1)."""
+        return {
+            "overruns": self._overruns,
+            "prompt_fill": self._prompts.qsize() / self._prompts_max if self._prompts else 0.0,
+            "delta_fill": self._deltas.qsize() / self._deltas_max if self._deltas else 0.0,
+            "tick_ms_avg": self.stats["tick_ms_avg"],
+            "budget_ms": round(self.budget * self.period * 1000.0, 3),
+        }
+
+    def _check_pressure(self) -> None:
+        if self.overloaded is None:
+            return
+        info = self.pressure()
+        hot = (self._overruns >= self.pressure_after
+               or info["prompt_fill"] >= TICK_QUEUE_HIGH or info["delta_fill"] >= TICK_QUEUE_HIGH)
+        if hot == self.overloaded.is_set():
+            return
+        if hot:
+            self.overloaded.set()
+        else:
+            self.overloaded.clear()
+        if self.on_pressure is not None:
+            try:
+                self.on_pressure(hot, info)
+            except Exception as e:
+                print("[WARN] tick_service: on_pressure hook failed:", e)
+
+
+# ---------------------- Quick self-test ----------------------
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    os.chdir(tempfile.mkdtemp(prefix="tick-service-"))   # autorun_world_tick saves into ./world_state
+    os.makedirs("world_state")
+    N = 600
+    zones = {f"z{i}": {"name": f"z{i}", "links": [f"z{(i - 1) % N}", f"z{(i + 1) % N}"], "energy": 0.5}
+             for i in range(N)}
+
+    async def main() -> None:
+        for policy in TICK_POLICIES:
+            events: List[Tuple[bool, Dict[str, Any]]] = []
+            svc = TickService({"zones": json.loads(json.dumps(zones)), "session_seed": 7},
+                              rate_hz=20.0, policy=policy, on_pressure=lambda s, i: events.append((s, i)))
+            await svc.start()
+            for k in range(5):
+                await svc.submit_prompt("rain" if k % 2 else "")
+                await svc.submit_delta({"zones": {f"z{k}": {"markers": ["echo"]}}})
+            t0 = time.perf_counter()
+            await asyncio.sleep(2.0)
+            snap = await svc.snapshot(fresh=True)
+            await svc.stop()
+            wall = time.perf_counter() - t0
+            st = svc.stats
+            print(f"{policy:>12}: {st['ticks']} ticks in {wall:.1f}s (target {int(wall * 20)}), "
+                  f"skipped {st['skipped']}, burst {st['burst']}, ff {st['fast_forwarded']}, "
+                  f"tick {st['tick_ms_avg']} ms, pressure events {[e[0] for e in events]}, "
+                  f"snapshot zones {len(snap['zones'])}")
+
+    asyncio.run(main())
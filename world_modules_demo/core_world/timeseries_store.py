@@ -0,0 +1,270 @@
+# engine/timeseries_store.py
+# Memory-mapped, fixed-width ring-buffer store for numeric world histories.
+from __future__ import annotations
+
+import math
+import mmap
+import os
+import re
+import struct
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+__all__ = [
+    "Series",
+    "SeriesStore",
+]
+
+# --- Tunables (safe defaults) ---
+SERIES_CAPACITY: int = 1 << 16     # points kept per series (16 bytes each -> 1 MiB)
+
+# File layout (little-endian):
+#   header (64 B): magic, version, capacity, total appended, floor (first valid index)
+#   ticks  int64[capacity]    column
+#   values float64[capacity]  column
+_MAGIC = b"GRTS"
+_VERSION = 1
+_HDR = struct.Struct("<4sHxxIQQ")
+_HDR_SIZE = 64
+
+_SAFE_NAME = re.compile(r"[^A-Za-z0-9_.-]+")
+
+class Series:
+    """
+    One ring buffer. Logical index 0 is the oldest retained point.
+
+    append() writes the point, then bumps the header count, so a crash
+    leaves at most one unreferenced slot. Reads return plain lists built
+    from memoryview casts (no per-point struct unpacking).
+    """
+
+    def __init__(self, path: Path, capacity: int = SERIES_CAPACITY):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        new = not self.path.exists() or self.path.stat().st_size < _HDR_SIZE
+        if new:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            cap = max(1, int(capacity))
+            with self.path.open("wb") as f:
+                f.truncate(_HDR_SIZE + 16 * cap)
+                f.seek(0)
+                f.write(_HDR.pack(_MAGIC, _VERSION, cap, 0, 0))
+        self._f = self.path.open("r+b")
+        self._mm = mmap.mmap(self._f.fileno(), 0)
+        magic, ver, cap, total, floor = _HDR.unpack_from(self._mm, 0)
+        if magic != _MAGIC or ver != _VERSION or len(self._mm) < _HDR_SIZE + 16 * cap:
+            self.close()
+            raise ValueError(f"not a series file: {self.path}")
+        self.capacity = cap
+        self._total = total
+        self._floor = floor
+        self._ticks = memoryview(self._mm)[_HDR_SIZE:_HDR_SIZE + 8 * cap].cast("q")
+        self._values = memoryview(self._mm)[_HDR_SIZE + 8 * cap:_HDR_SIZE + 16 * cap].cast("d")
+
+    # -------- bookkeeping --------
+    @property
+    def total(self) -> int:
+        """Points ever appended (monotonic)."""
+        return self._total
+
+    def _start(self) -> int:
+        return max(self._floor, self._total - self.capacity)
+
+    def __len__(self) -> int:
+        return self._total - self._start()
+
+    def _write_header(self) -> None:
+        _HDR.pack_into(self._mm, 0, _MAGIC, _VERSION, self.capacity, self._total, self._floor)
+
+    # -------- writes --------
+    def append(self, value: float, tick: Optional[int] = None) -> int:
+        """Append one point; tick defaults to last tick + 1. Returns the new total."""
+        with self._lock:
+            if tick is None:
+                tick = self._ticks[(self._total - 1) % self.capacity] + 1 if len(self) else 0
+            slot = self._total % self.capacity
+            self._ticks[slot] = int(tick)
+            self._values[slot] = float(value)
+            self._total += 1
+            self._write_header()
+            return self._total
+
+    def extend(self, points: Iterable[Tuple[Optional[int], float]]) -> int:
+        for tick, value in points:
+            self.append(value, tick)
+        return self._total
+
+    def truncate_to(self, total: int) -> None:
+        """
+        Roll back to `total` points ever appended (undo appends that the
+        owning world never saved). Slots reused by the undone points are
+        excluded from the retained range.
+        """
+        with self._lock:
+            total = int(total)
+            if total >= self._total:
+                return
+            self._floor = min(total, max(self._floor, self._total - self.capacity))
+            self._total = max(total, self._floor)
+            self._write_header()
+
+    def flush(self) -> None:
+        self._mm.flush()
+
+    def close(self) -> None:
+        try:
+            if hasattr(self, "_ticks"):
+                self._ticks.release()
+                self._values.release()
+            self._mm.close()
+        except Exception:
+            pass
+        try:
+            self._f.close()
+        except Exception:
+            pass
+
+    # -------- reads --------
+    def _column(self, col: memoryview, start: int, stop: int) -> list:
+        n = len(self)
+        start, stop, _ = slice(start, stop).indices(n)
+        if stop <= start:
+            return []
+        a = (self._start() + start) % self.capacity
+        b = a + (stop - start)
+        if b <= self.capacity:
+            return col[a:b].tolist()
+        return col[a:].tolist() + col[:b - self.capacity].tolist()
+
+    def values(self, start: Optional[int] = None, stop: Optional[int] = None) -> List[float]:
+        """Values by logical index (negative indices count from the newest)."""
+        return self._column(self._values, start, stop)
+
+    def ticks(self, start: Optional[int] = None, stop: Optional[int] = None) -> List[int]:
+        return self._column(self._ticks, start, stop)
+
+    def last(self, n: int) -> List[float]:
+        return self.values(-n, None) if n > 0 else []
+
+    def points(self, start: Optional[int] = None, stop: Optional[int] = None) -> List[Tuple[int, float]]:
+        return list(zip(self.ticks(start, stop), self.values(start, stop)))
+
+    def _tick_at(self, i: int) -> int:
+        return self._ticks[(self._start() + i) % self.capacity]
+
+    def index_of_tick(self, tick: int) -> int:
+        """First logical index with point tick >= `tick` (ticks are non-decreasing)."""
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._tick_at(mid) < tick:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def range_by_tick(self, t0: int, t1: int) -> List[Tuple[int, float]]:
+        """Points with t0 <= tick < t1."""
+        return self.points(self.index_of_tick(t0), self.index_of_tick(t1))
+
+    def downsample(
+        self,
+        points: int,
+        start: Optional[int] = None,
+        stop: Optional[int] = None,
+        *,
+        how: str = "mean",
+    ) -> List[Tuple[int, float]]:
+        """
+        Reduce a range to about `points` buckets for charting.
+          how="mean"   -> (first tick, mean) per bucket
+          how="last"   -> (last tick, last value) per bucket
+          how="minmax" -> (tick, min) and (tick, max) per bucket, in time order
+        """
+        vals = self.values(start, stop)
+        ticks = self.ticks(start, stop)
+        n = len(vals)
+        if n == 0 or points <= 0:
+            return []
+        if n <= points:
+            return list(zip(ticks, vals))
+        size = math.ceil(n / points)
+        out: List[Tuple[int, float]] = []
+        for i in range(0, n, size):
+            chunk = vals[i:i + size]
+            if how == "last":
+                out.append((ticks[i + len(chunk) - 1], chunk[-1]))
+            elif how == "minmax":
+                lo = min(range(len(chunk)), key=chunk.__getitem__)
+                hi = max(range(len(chunk)), key=chunk.__getitem__)
+                for j in sorted({lo, hi}):
+                    out.append((ticks[i + j], chunk[j]))
+            else:
+                out.append((ticks[i], math.fsum(chunk) / len(chunk)))
+        return out
+
+
+class SeriesStore:
+    """
+    Directory of named series (<root>/<name>.ts). Worlds reference a series
+    by name (the handle) instead of embedding the list.
+    """
+
+    def __init__(self, root: Path, *, capacity: int = SERIES_CAPACITY):
+        self.root = Path(root)
+        self.capacity = int(capacity)
+        self._open: Dict[str, Series] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def handle_for(key: str) -> str:
+        return _SAFE_NAME.sub("_", key).strip("_") or "series"
+
+    def exists(self, handle: str) -> bool:
+        return handle in self._open or (self.root / f"{handle}.ts").exists()
+
+    def series(self, handle: str) -> Series:
+        with self._lock:
+            s = self._open.get(handle)
+            if s is None:
+                s = self._open[handle] = Series(self.root / f"{handle}.ts", self.capacity)
+            return s
+
+    def handles(self) -> List[str]:
+        if not self.root.is_dir():
+            return []
+        return sorted(p.stem for p in self.root.glob("*.ts"))
+
+    def flush(self) -> None:
+        for s in list(self._open.values()):
+            s.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            for s in self._open.values():
+                s.close()
+            self._open.clear()
+
+
+# ---------------------- Quick self-test ----------------------
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    with tempfile.TemporaryDirectory() as d:
+        st = SeriesStore(d, capacity=1000)
+        s = st.series(SeriesStore.handle_for("metrics.symbolic_density_history"))
+        for t in range(2500):
+            s.append(math.sin(t / 50.0), tick=t)
+        print("LEN:", len(s), "TOTAL:", s.total, "FIRST TICK:", s.ticks(0, 1), "LAST:", s.last(2))
+        print("RANGE:", s.range_by_tick(2497, 2600))
+        print("DOWNSAMPLE:", len(s.downsample(50)), s.downsample(4, how="last"))
+        s.truncate_to(2490)
+        print("ROLLBACK LEN:", len(s), "LAST TICK:", s.ticks(-1))
+        st.close()
+
+        s2 = SeriesStore(d, capacity=1000).series("metrics.symbolic_density_history")
+        t = time.perf_counter()
+        vals = s2.values()
+        print("REOPEN LEN:", len(vals), f"read {1e3 * (time.perf_counter() - t):.2f}ms")
@@ -0,0 +1,285 @@
+"""
+world_archive.py
+Content-addressed version archive for world_save_api.
+
+Features:
+- World split into chunks (one per zone, one per other top-level key)
+- Each chunk stored once, keyed by its SHA-256 (zlib-compressed)
+- Zone hashes grouped into pages (also chunks), so a version's manifest
+  stays small and only pages with a changed zone are rewritten
+- Each version recorded as a small manifest of chunk hashes
+- Restore any version (exact key order preserved)
+- Retention policy (last N / hourly / daily) + mark-and-sweep GC
+
+Layout:
+    <root>/objects/ab/abcdef....z     compressed chunk
+    <root>/manifests/<version>.json  {"keys": [...], "chunks": {...}, "zone_pages": [hash, ...]}
+    zone page chunk                  [[zid, hash], ...]   (ARCHIVE_ZONE_PAGE entries)
+"""
+
+import hashlib
+import json
+import os
+import time
+import zlib
+from datetime import datetime, timezone
+
+# --- Tunables (safe defaults) ---
+ARCHIVE_KEEP_LAST = 20        # newest versions always kept
+ARCHIVE_KEEP_HOURLY = 24      # + newest version of each of the last N hours
+ARCHIVE_KEEP_DAILY = 30       # + newest version of each of the last N days
+ARCHIVE_GC_GRACE_S = 300      # never sweep objects younger than this (in-flight saves)
+ARCHIVE_ZLIB_LEVEL = 6
+ARCHIVE_ZONE_PAGE = 64        # zone hashes per page chunk
+
+
+def _encode_chunk(value):
+    # Compact, order-preserving: restore returns the exact same structure
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _atomic_write_bytes(path, data):
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class WorldArchive:
+    """
+    Deduplicating archive for one world.
+
+    put(world) writes only chunks not already stored, then the manifest, and
+    returns the new version id. A crash mid-put leaves orphan chunks at most;
+    they are never referenced and the next gc() removes them.
+    """
+
+    def __init__(self, root):
+        self.root = str(root)
+        self._objects = os.path.join(self.root, "objects")
+        self._manifests = os.path.join(self.root, "manifests")
+        self._known = None      # hashes known to be on disk (lazy)
+        self._last_id = ""
+        self.stats = {"versions": 0, "chunks_written": 0, "chunks_reused": 0, "bytes_written": 0}
+
+    # -------------------------------------------------------
+    # Objects
+    # -------------------------------------------------------
+
+    def _ensure_dirs(self):
+        os.makedirs(self._objects, exist_ok=True)
+        os.makedirs(self._manifests, exist_ok=True)
+
+    def _object_path(self, h):
+        return os.path.join(self._objects, h[:2], h[2:] + ".z")
+
+    def _known_hashes(self):
+        if self._known is None:
+            known = set()
+            if os.path.isdir(self._objects):
+                for sub in os.listdir(self._objects):
+                    d = os.path.join(self._objects, sub)
+                    if not os.path.isdir(d):
+                        continue
+                    for name in os.listdir(d):
+                        if name.endswith(".z"):
+                            known.add(sub + name[:-2])
+            self._known = known
+        return self._known
+
+    def _put_chunk(self, value):
+        raw = _encode_chunk(value)
+        h = hashlib.sha256(raw).hexdigest()
+        known = self._known_hashes()
+        if h in known:
+            self.stats["chunks_reused"] += 1
+            return h
+        path = self._object_path(h)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = zlib.compress(raw, ARCHIVE_ZLIB_LEVEL)
+        _atomic_write_bytes(path, data)
+        known.add(h)
+        self.stats["chunks_written"] += 1
+        self.stats["bytes_written"] += len(data)
+        return h
+
+    def _read_chunk(self, h):
+        with open(self._object_path(h), "rb") as f:
+            return zlib.decompress(f.read()).decode("utf-8")
+
+    # -------------------------------------------------------
+    # Versions
+    # -------------------------------------------------------
+
+    def _new_version_id(self):
+        vid = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+        if vid <= self._last_id:
+            # same microsecond / clock step back: keep ids strictly increasing
+            vid = self._last_id + "_"
+        self._last_id = vid
+        return vid
+
+    def put(self, world, extra=None):
+        """
+        Archive `world` and return its version id.
+        `extra` keys missing from world are added (e.g. WORLD_VERSION).
+        """
+        self._ensure_dirs()
+        pairs = list(world.items())
+        if extra:
+            pairs += [(k, v) for k, v in extra.items() if k not in world]
+
+        keys, chunks, zones = [], {}, None
+        for k, v in pairs:
+            k = str(k)
+            keys.append(k)
+            if k == "zones" and isinstance(v, dict):
+                index = [[str(zid), self._put_chunk(z)] for zid, z in v.items()]
+                zones = [self._put_chunk(index[i:i + ARCHIVE_ZONE_PAGE])
+                         for i in range(0, len(index), ARCHIVE_ZONE_PAGE)]
+            else:
+                chunks[k] = self._put_chunk(v)
+
+        vid = self._new_version_id()
+        manifest = {
+            "version": vid,
+            "created": datetime.now(timezone.utc).isoformat(),
+            "tick": world.get("time"),
+            "keys": keys,
+            "chunks": chunks,
+        }
+        if zones is not None:
+            manifest["zone_pages"] = zones
+        data = json.dumps(manifest, separators=(",", ":")).encode("utf-8")
+        _atomic_write_bytes(os.path.join(self._manifests, vid + ".json"), data)
+        self.stats["versions"] += 1
+        self.stats["bytes_written"] += len(data)
+        return vid
+
+    def list_versions(self):
+        """Version ids, oldest first."""
+        if not os.path.isdir(self._manifests):
+            return []
+        return sorted(n[:-5] for n in os.listdir(self._manifests) if n.endswith(".json"))
+
+    def manifest(self, version):
+        with open(os.path.join(self._manifests, f"{version}.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def restore(self, version=None):
+        """Rebuild a world dict (latest version if None)."""
+        if version is None:
+            versions = self.list_versions()
+            if not versions:
+                raise FileNotFoundError(f"No archived versions in '{self.root}'.")
+            version = versions[-1]
+        m = self.manifest(version)
+        cache = {}
+
+        def chunk(h):
+            # identical chunks decode once, but each use gets its own copy
+            if h not in cache:
+                cache[h] = self._read_chunk(h)
+            return json.loads(cache[h])
+
+        world = {}
+        for k in m.get("keys", []):
+            if k == "zones" and "zone_pages" in m:
+                world[k] = {zid: chunk(h) for page in m["zone_pages"] for zid, h in chunk(page)}
+            else:
+                world[k] = chunk(m["chunks"][k])
+        return world
+
+    # -------------------------------------------------------
+    # Retention / GC
+    # -------------------------------------------------------
+
+    def select_retained(self, versions, keep_last=ARCHIVE_KEEP_LAST,
+                        keep_hourly=ARCHIVE_KEEP_HOURLY, keep_daily=ARCHIVE_KEEP_DAILY):
+        """Which of `versions` (oldest first) the retention policy keeps."""
+        keep = set(versions[-keep_last:]) if keep_last > 0 else set()
+        hours, days = [], []
+        for vid in reversed(versions):
+            hour, day = vid[:11], vid[:8]       # YYYYMMDDTHH / YYYYMMDD
+            if keep_hourly > 0 and (not hours or hours[-1] != hour) and len(hours) < keep_hourly:
+                hours.append(hour)
+                keep.add(vid)
+            if keep_daily > 0 and (not days or days[-1] != day) and len(days) < keep_daily:
+                days.append(day)
+                keep.add(vid)
+        return keep
+
+    def gc(self, keep_last=ARCHIVE_KEEP_LAST, keep_hourly=ARCHIVE_KEEP_HOURLY,
+           keep_daily=ARCHIVE_KEEP_DAILY, grace_s=ARCHIVE_GC_GRACE_S):
+        """
+        Apply retention, then sweep chunks no kept manifest references.
+        Returns {"versions_removed": n, "chunks_removed": n, "bytes_freed": n}.
+        """
+        out = {"versions_removed": 0, "chunks_removed": 0, "bytes_freed": 0}
+        versions = self.list_versions()
+        keep = self.select_retained(versions, keep_last, keep_hourly, keep_daily)
+
+        live = set()
+        for vid in versions:
+            path = os.path.join(self._manifests, f"{vid}.json")
+            if vid not in keep:
+                out["bytes_freed"] += os.path.getsize(path)
+                os.remove(path)
+                out["versions_removed"] += 1
+                continue
+            m = self.manifest(vid)
+            live.update(m.get("chunks", {}).values())
+            for page in m.get("zone_pages", []):
+                if page not in live:
+                    live.add(page)
+                    live.update(h for _, h in json.loads(self._read_chunk(page)))
+
+        cutoff = time.time() - grace_s
+        known = self._known_hashes()
+        for h in list(known):
+            if h in live:
+                continue
+            path = self._object_path(h)
+            try:
+                st = os.stat(path)
+                if st.st_mtime > cutoff:
+                    continue
+                os.remove(path)
+                out["chunks_removed"] += 1
+                out["bytes_freed"] += st.st_size
+            except FileNotFoundError:
+                pass
+            known.discard(h)
+        return out
+
+    def disk_usage(self):
+        total = 0
+        for base, _, files in os.walk(self.root):
+            for name in files:
+                total += os.path.getsize(os.path.join(base, name))
+        return total
+
+
+# -----------------------------------------------------------
+# Quick self-test
+# -----------------------------------------------------------
+
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as d:
+        arc = WorldArchive(d)
+        w = {"time": 0, "zones": {f"z{i}": {"energy": 0.1, "links": [f"z{i + 1}"]} for i in range(500)}}
+        full_bytes, first = 0, None
+        for t in range(20):
+            w["time"] = t
+            w["zones"][f"z{t}"]["energy"] = t
+            full_bytes += len(json.dumps(w, indent=2))
+            vid = arc.put(w, extra={"WORLD_VERSION": "1.0.0"})
+            first = first or vid
+        print("RESTORE LATEST:", arc.restore() == {**w, "WORLD_VERSION": "1.0.0"})
+        print("RESTORE FIRST tick:", arc.restore(first)["time"])
+        print("DISK:", arc.disk_usage(), "vs full copies:", full_bytes)
+        print("GC:", arc.gc(keep_last=5, keep_hourly=0, keep_daily=0, grace_s=0))
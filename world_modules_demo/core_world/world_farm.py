@@ -0,0 +1,459 @@
+# engine/world_farm.py
+# Headless simulation farm: many independent worlds sharded across a process pool.
+from __future__ import annotations
+
+import json
+import math
+import multiprocessing
+import os
+import queue
+import random
+import re
+import statistics
+import tempfile
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, Union
+
+try:
+    import engine.world_util as _wu
+except Exception:
+    import world_util as _wu  # flat layout
+
+__all__ = [
+    "SimFarm",
+    "load_worlds",
+    "normalize_world",
+    "clone_worlds",
+]
+
+# --- Tunables (safe defaults) ---
+FARM_SLICE_TICKS: int = 8          # ticks a lane gives one world before rotating / reading its inbox
+FARM_CHECKPOINT_EVERY: int = 64    # farm ticks between checkpoints (also written on handoff and finish)
+FARM_KEY: str = "farm"             # world section: {"id": world id, "tick": farm ticks run}
+FARM_POLL_S: float = 0.5           # parent wakes this often to notice crashed lanes
+
+Metrics = Callable[[Dict[str, Any]], None]
+
+def _slug(s: Any) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", str(s).lower()).strip("_") or "zone"
+
+def _write_json_atomic(path: Path, data: Dict[str, Any]) -> None:
+    text = json.dumps(data, ensure_ascii=False, default=_wu._json_default)
+    fd, tmp = tempfile.mkstemp(prefix=path.name + ".", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except Exception:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+# ---------- World sources ----------
+def normalize_world(data: Dict[str, Any], world_id: str) -> Dict[str, Any]:
+    """
+    Make a multiverse world file tickable: region-style worlds (world_traits +
+    regions, no zones) get one zone per region linked in a ring, numeric
+    world_traits seed features/world scalars, a scalar symbolic_energy becomes
+    {"baseline": x}, and every zone gets the loader's defaults.
+    """
+    src = dict(data)
+    src.setdefault("session_seed", zlib.crc32(world_id.encode("utf-8")))
+    w = _wu._hydrate_world(src)
+    zones = w["zones"]
+    regions = data.get("regions")
+    if not zones and isinstance(regions, list):
+        for r in regions:
+            if not isinstance(r, dict) or not r.get("name"):
+                continue
+            zid = _slug(r["name"])
+            zones[zid] = {
+                "name": zid,
+                "label": str(r["name"]),
+                "type": str(r.get("symbolic_state") or "wild"),
+                "region_traits": dict(r.get("traits") or {}),
+                "known_events": list(r.get("known_events") or []),
+            }
+    for zid in list(zones):
+        z = zones[zid]
+        zones[zid] = _wu._zone_defaults(z if isinstance(z, _wu._ZONE_TYPES) else {}, str(zid))
+    _wu._autolink_ring(zones)
+
+    traits = data.get("world_traits")
+    if isinstance(traits, dict):
+        for k, v in traits.items():
+            if isinstance(v, (int, float)) and not isinstance(v, bool):
+                w["features"].setdefault(k, float(v))
+                if k in ("spiritual_noise", "media_signal") and not w.get(k):
+                    w[k] = float(v)
+    if not isinstance(w.get("symbolic_energy"), dict):
+        w["symbolic_energy"] = {"baseline": _wu._safe_float(w.get("symbolic_energy"), 0.0)}
+    if isinstance(w.get("location"), str) and w["location"] in zones:
+        w.setdefault("active_zone", w["location"])
+    w[FARM_KEY] = {"id": world_id, "tick": int(_wu._as_dict(w.get(FARM_KEY)).get("tick", 0))}
+    return w
+
+def load_worlds(directory: Union[str, Path], pattern: str = "*.json") -> Dict[str, Dict[str, Any]]:
+    """{file stem: normalized world} for every readable world file in directory."""
+    out: Dict[str, Dict[str, Any]] = {}
+    for p in sorted(Path(directory).glob(pattern)):
+        try:
+            data = json.loads(p.read_text(encoding="utf-8"))
+        except (OSError, UnicodeDecodeError, ValueError) as e:
+            print(f"[WARN] load_worlds: skipping {p.name}: {e}")
+            continue
+        if isinstance(data, dict):
+            out[p.stem] = normalize_world(data, p.stem)
+    return out
+
+def clone_worlds(worlds: Dict[str, Dict[str, Any]], copies: int) -> Dict[str, Dict[str, Any]]:
+    """copies variants of each world ("<id>.<i>"), each with its own session_seed (tuning sweeps)."""
+    out: Dict[str, Dict[str, Any]] = {}
+    for wid, w in worlds.items():
+        text = json.dumps(w, default=_wu._json_default)
+        for i in range(max(1, int(copies))):
+            cid = f"{wid}.{i}"
+            c = json.loads(text)
+            c["session_seed"] = zlib.crc32(cid.encode("utf-8"))
+            c[FARM_KEY] = {"id": cid, "tick": 0}
+            out[cid] = c
+    return out
+
+# ---------- Lane (one per pool process) ----------
+def _metric_row(w: Dict[str, Any], wid: str, tick: int, dt: float) -> Dict[str, Any]:
+    wx = _wu._as_dict(w.get("weather"))
+    return {
+        "world": wid,
+        "tick": tick,
+        "ms": round(dt * 1000.0, 3),
+        "density": _wu._safe_float(w.get("symbolic_density"), 0.0),
+        "weather": {
+            "dominant": wx.get("dominant", "clear"),
+            "avg_intensity": _wu._safe_float(wx.get("avg_intensity"), 0.0),
+            "fronts": len(wx.get("fronts") or []),
+        },
+    }
+
+def _lane_main(lane: int, inbox: Any, results: Any, opts: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Runs in a pool process for the whole farm run. Owns the worlds assigned
+    to it (in memory), ticks them round-robin in slices, and between slices
+    serves the parent: assign (load from checkpoint), release (checkpoint
+    the last-queued worlds and hand them back: work stealing), stop.
+    """
+    slice_ticks = int(opts["slice_ticks"])
+    every = int(opts["checkpoint_every"])
+    prompt, seed = opts.get("prompt", ""), opts.get("seed")
+    tick = getattr(_wu, "replay_tick", None) or (lambda w, p: _wu.autorun_world_ticks(w, 1, p, save=False))
+    owned: Dict[str, Dict[str, Any]] = {}
+    paths: Dict[str, Path] = {}
+    until: Dict[str, int] = {}
+    order: Deque[str] = deque()
+    stats = {"lane": lane, "pid": os.getpid(), "ticks": 0, "busy_s": 0.0, "worlds": 0, "released": 0}
+    idle_sent = True   # the parent assigns every lane a shard up front
+
+    def checkpoint(wid: str) -> None:
+        _write_json_atomic(paths[wid], owned[wid])
+
+    while True:
+        if not order and not idle_sent:
+            results.put(("idle", lane))
+            idle_sent = True
+        try:
+            msg = inbox.get() if not order else inbox.get_nowait()
+        except queue.Empty:
+            msg = None
+        if msg is not None:
+            kind = msg[0]
+            if kind == "stop":
+                for wid in owned:
+                    checkpoint(wid)
+                return stats
+            if kind == "assign":
+                for wid, path, target, ticks in msg[1]:
+                    paths[wid] = Path(path)
+                    w = json.loads(paths[wid].read_text(encoding="utf-8"))
+                    farm = w.setdefault(FARM_KEY, {"id": wid, "tick": 0})
+                    until[wid] = int(target) if target is not None else int(farm.get("tick", 0)) + int(ticks)
+                    owned[wid] = w
+                    stats["worlds"] += 1
+                    if int(farm.get("tick", 0)) < until[wid]:
+                        order.append(wid)
+                    else:
+                        owned.pop(wid)
+                        results.put(("tick", lane, wid, [], 0))
+                idle_sent = False
+            elif kind == "release":
+                give: List[Tuple[str, str, int]] = []
+                while len(order) > 1 and len(give) < int(msg[1]):
+                    wid = order.pop()          # steal from the tail: the worlds this lane would reach last
+                    checkpoint(wid)
+                    owned.pop(wid)
+                    give.append((wid, str(paths[wid]), until[wid]))
+                stats["released"] += len(give)
+                results.put(("released", lane, give))
+            continue
+
+        wid = order.popleft()
+        w = owned[wid]
+        rows: List[Dict[str, Any]] = []
+        t_slice = time.perf_counter()
+        try:
+            farm = w[FARM_KEY]
+            for _ in range(min(slice_ticks, until[wid] - int(farm["tick"]))):
+                t = int(farm["tick"])
+                if seed is not None:
+                    random.seed(f"{seed}:{wid}:{t}")
+                t0 = time.perf_counter()
+                w = tick(w, prompt)
+                dt = time.perf_counter() - t0
+                farm = w[FARM_KEY]
+                farm["tick"] = t + 1
+                rows.append(_metric_row(w, wid, t + 1, dt))
+                if (t + 1) % every == 0:
+                    owned[wid] = w
+                    checkpoint(wid)
+        except Exception as e:
+            owned.pop(wid, None)
+            results.put(("failed", lane, wid, f"{type(e).__name__}: {e}"))
+            continue
+        finally:
+            stats["busy_s"] += time.perf_counter() - t_slice
+        stats["ticks"] += len(rows)
+        owned[wid] = w
+        remaining = until[wid] - int(w[FARM_KEY]["tick"])
+        if remaining > 0:
+            order.append(wid)
+        else:
+            checkpoint(wid)
+            owned.pop(wid)
+        results.put(("tick", lane, wid, rows, remaining))
+
+# ---------- Parent ----------
+class SimFarm:
+    """
+    Tick many independent worlds on every core.
+
+      farm = SimFarm(load_worlds("multiverse"), "farm_state", workers=8)
+      summary = farm.run(500, on_metrics=print)   # each world advances 500 ticks
+
+    Each pool process runs one lane that owns a shard of worlds in memory and
+    ticks them with world_util.replay_tick (autorun_world_tick's computation;
+    per-tick world.json saves are replaced by per-world checkpoints in
+    checkpoint_dir/<id>.json). Compact metric rows (density, weather summary,
+    tick latency) stream back per slice. Worlds are first spread by size
+    (largest first onto the least-loaded lane); a lane that runs dry steals
+    about half of the busiest lane's queued worlds, handed over through their
+    checkpoints. Existing checkpoints are resumed (resume=False restarts).
+    Lanes fork from this process, so engine settings made here (enable_lod,
+    enable_zone_records) carry over; keep the tick executor serial.
+    """
+
+    def __init__(
+        self,
+        worlds: Union[Dict[str, Dict[str, Any]], str, Path],
+        checkpoint_dir: Union[str, Path],
+        *,
+        workers: Optional[int] = None,
+        slice_ticks: int = FARM_SLICE_TICKS,
+        checkpoint_every: int = FARM_CHECKPOINT_EVERY,
+        prompt: str = "",
+        seed: Optional[int] = None,
+        resume: bool = True,
+    ):
+        if not isinstance(worlds, dict):
+            worlds = load_worlds(worlds)
+        self.dir = Path(checkpoint_dir)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.workers = max(1, int(workers or os.cpu_count() or 1))
+        self.opts = {
+            "slice_ticks": max(1, int(slice_ticks)),
+            "checkpoint_every": max(1, int(checkpoint_every)),
+            "prompt": prompt or "",
+            "seed": seed,
+        }
+        self.paths: Dict[str, Path] = {}
+        for wid, w in worlds.items():
+            p = self.dir / f"{wid}.json"
+            if not (resume and p.exists()):
+                w.setdefault(FARM_KEY, {"id": wid, "tick": 0})
+                _write_json_atomic(p, w)
+            self.paths[wid] = p
+        self.stats: Dict[str, Any] = {}
+
+    def _assign_initial(self, lanes: int) -> List[List[str]]:
+        shards: List[List[str]] = [[] for _ in range(lanes)]
+        load = [0.0] * lanes
+        for wid in sorted(self.paths, key=lambda k: self.paths[k].stat().st_size, reverse=True):
+            i = min(range(lanes), key=load.__getitem__)
+            shards[i].append(wid)
+            load[i] += self.paths[wid].stat().st_size
+        return shards
+
+    def run(
+        self,
+        ticks: int,
+        *,
+        on_metrics: Optional[Metrics] = None,
+        metrics_file: Optional[Union[str, Path]] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Advance every world `ticks` ticks from its checkpoint. on_metrics gets
+        each metric row as it arrives; metrics_file (JSONL) keeps them all.
+        Returns {world id: {"tick", "ticks", "ms_mean", "ms_p95", "density",
+        "weather", "lanes", "error"}}; farm totals land in self.stats.
+        """
+        ticks = int(ticks)
+        lanes = min(self.workers, len(self.paths))
+        summary: Dict[str, Dict[str, Any]] = {
+            wid: {"tick": None, "ticks": 0, "ms": [], "density": None, "weather": None, "lanes": [], "error": None}
+            for wid in self.paths
+        }
+        if lanes == 0 or ticks <= 0:
+            return {wid: self._finish(s) for wid, s in summary.items()}
+
+        remaining: Dict[str, int] = {wid: ticks for wid in self.paths}
+        owner: Dict[str, int] = {}
+        ewma: Dict[str, float] = {}
+        idle: List[int] = []
+        stealing: Dict[int, int] = {}   # victim lane -> thief lane
+        steals = moved = 0
+        sink = open(metrics_file, "a", encoding="utf-8") if metrics_file else None
+        t_start = time.perf_counter()
+
+        def lane_cost(lane: int) -> Tuple[int, float]:
+            live = [wid for wid, ln in owner.items() if ln == lane and remaining[wid] > 0]
+            default = statistics.median(ewma.values()) if ewma else 1.0
+            return len(live), sum(remaining[wid] * ewma.get(wid, default) for wid in live)
+
+        ctx = multiprocessing.get_context()
+        with ctx.Manager() as mgr, ProcessPoolExecutor(max_workers=lanes, mp_context=ctx) as pool:
+            results = mgr.Queue()
+            inboxes = [mgr.Queue() for _ in range(lanes)]
+            futures = [pool.submit(_lane_main, i, inboxes[i], results, self.opts) for i in range(lanes)]
+            try:
+                for i, shard in enumerate(self._assign_initial(lanes)):
+                    for wid in shard:
+                        owner[wid] = i
+                    if shard:
+                        inboxes[i].put(("assign", [(wid, str(self.paths[wid]), None, ticks) for wid in shard]))
+
+                while any(n > 0 for n in remaining.values()):
+                    try:
+                        msg = results.get(timeout=FARM_POLL_S)
+                    except queue.Empty:
+                        for f in futures:
+                            if f.done() and f.exception() is not None:
+                                raise RuntimeError("farm lane crashed; rerun to resume from checkpoints") from f.exception()
+                        continue
+                    kind, lane = msg[0], msg[1]
+                    if kind == "tick":
+                        _, _, wid, rows, left = msg
+                        remaining[wid] = left
+                        if lane in idle:
+                            idle.remove(lane)
+                        s = summary[wid]
+                        if lane not in s["lanes"]:
+                            s["lanes"].append(lane)
+                        for row in rows:
+                            s["ms"].append(row["ms"])
+                            ewma[wid] = row["ms"] if wid not in ewma else 0.8 * ewma[wid] + 0.2 * row["ms"]
+                            if on_metrics is not None:
+                                on_metrics(row)
+                            if sink is not None:
+                                sink.write(json.dumps(row) + "\n")
+                        if rows:
+                            s["tick"], s["density"], s["weather"] = rows[-1]["tick"], rows[-1]["density"], rows[-1]["weather"]
+                            s["ticks"] += len(rows)
+                    elif kind == "failed":
+                        _, _, wid, err = msg
+                        remaining[wid] = 0
+                        summary[wid]["error"] = err
+                    elif kind == "idle":
+                        if lane not in idle:
+                            idle.append(lane)
+                    elif kind == "released":
+                        thief = stealing.pop(lane)
+                        if msg[2]:
+                            for wid, _path, _until in msg[2]:
+                                owner[wid] = thief
+                            inboxes[thief].put(("assign", [(wid, path, until, None) for wid, path, until in msg[2]]))
+                            idle.remove(thief)
+                            steals += 1
+                            moved += len(msg[2])
+
+                    # hand idle lanes work from the lane with the most estimated work left
+                    for thief in [ln for ln in idle if ln not in stealing.values()]:
+                        busy = [(lane_cost(ln), ln) for ln in range(lanes)
+                                if ln not in idle and ln not in stealing]
+                        busy = [(c, ln) for c, ln in busy if c[0] >= 2]
+                        if not busy:
+                            break
+                        (n_live, _cost), victim = max(busy, key=lambda x: x[0][1])
+                        stealing[victim] = thief
+                        inboxes[victim].put(("release", max(1, n_live // 2)))
+            finally:
+                for box in inboxes:
+                    box.put(("stop",))
+                lane_stats = []
+                for f in futures:
+                    try:
+                        lane_stats.append(f.result())
+                    except Exception as e:
+                        lane_stats.append({"error": f"{type(e).__name__}: {e}"})
+                if sink is not None:
+                    sink.close()
+
+        wall = time.perf_counter() - t_start
+        total = sum(s["ticks"] for s in summary.values())
+        self.stats = {
+            "worlds": len(self.paths),
+            "lanes": lane_stats,
+            "ticks": total,
+            "wall_s": round(wall, 3),
+            "ticks_per_s": round(total / wall, 1) if wall > 0 else None,
+            "steals": steals,
+            "moved_worlds": moved,
+        }
+        return {wid: self._finish(s) for wid, s in summary.items()}
+
+    @staticmethod
+    def _finish(s: Dict[str, Any]) -> Dict[str, Any]:
+        ms = sorted(s.pop("ms"))
+        s["ms_mean"] = round(sum(ms) / len(ms), 3) if ms else None
+        s["ms_p95"] = ms[min(len(ms) - 1, math.ceil(0.95 * len(ms)) - 1)] if ms else None
+        return s
+
+
+# ---------------------- Quick self-test / throughput ----------------------
+# python world_farm.py MULTIVERSE_DIR [COPIES [TICKS]]
+if __name__ == "__main__":
+    import shutil
+    import sys
+
+    src = sys.argv[1] if len(sys.argv) > 1 else "multiverse"
+    copies = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    n_ticks = int(sys.argv[3]) if len(sys.argv) > 3 else 32
+    base = load_worlds(src)
+    # one oversized world so lanes finish unevenly and stealing has something to do
+    ring = {f"r{i}": {"links": [f"r{(i - 1) % 400}", f"r{(i + 1) % 400}"], "energy": 0.5} for i in range(400)}
+    base["big_ring"] = normalize_world({"zones": ring}, "big_ring")
+    worlds = clone_worlds(base, copies)
+    print(f"{len(worlds)} worlds from {sorted(base)}; {n_ticks} ticks each")
+
+    for workers in sorted({1, os.cpu_count() or 1}):
+        tmp = tempfile.mkdtemp(prefix="farm-")
+        try:
+            farm = SimFarm(worlds, tmp, workers=workers, seed=7)
+            out = farm.run(n_ticks)
+            errs = {k: v["error"] for k, v in out.items() if v["error"]}
+            print(f"workers={workers}: {farm.stats['ticks_per_s']} ticks/s, wall {farm.stats['wall_s']} s, "
+                  f"steals {farm.stats['steals']} ({farm.stats['moved_worlds']} worlds), errors {errs or 0}")
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
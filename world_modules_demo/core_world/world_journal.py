@@ -0,0 +1,340 @@
+# engine/world_journal.py
+# Append-only tick journal for world.json (write-ahead log + checkpoints).
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime, timezone
+
+__all__ = [
+    "WorldJournal",
+    "apply_journal_record",
+    "diff_sections",
+    "read_journal",
+    "record_from_changes",
+    "replay_journal",
+]
+
+# --- Tunables (safe defaults) ---
+JOURNAL_CHECKPOINT_EVERY: int = 64             # records between full world.json rewrites
+JOURNAL_MAX_BYTES: int = 8 * 1024 * 1024       # ...or once the log grows past this size
+JOURNAL_FSYNC: bool = True                     # fsync each appended record
+JOURNAL_PUSH_SCAN: int = 8                     # max appended items probed for ring-buffer lists
+JOURNAL_SEQ_KEY: str = "journal_seq"           # world key stamped by checkpoints
+JOURNAL_EPOCH_KEY: str = "journal_epoch"       # id of the checkpoint a log belongs to
+
+# Keys never journaled (bookkeeping that changes every write)
+_SKIP_KEYS = (JOURNAL_SEQ_KEY, JOURNAL_EPOCH_KEY)
+_ANY_EPOCH = object()
+
+def _utcnow_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+def _json_default(o: Any) -> Any:
+    # Mapping-like values (typed zone records) encode as plain objects
+    to_dict = getattr(o, "to_dict", None)
+    if callable(to_dict):
+        return to_dict()
+    if isinstance(o, Mapping):
+        return dict(o)
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+def _encode(rec: Dict[str, Any]) -> str:
+    return json.dumps(rec, ensure_ascii=False, separators=(",", ":"), default=_json_default)
+
+# ---------- Diffing ----------
+def _list_push(old: List[Any], new: List[Any]) -> Optional[Tuple[int, List[Any]]]:
+    """
+    Detect the sliding-window pattern (trim head, append tail) used by
+    density_log, histories and event feeds. Returns (drop, added) or None.
+    """
+    n = len(new)
+    for a in range(0, min(n, JOURNAL_PUSH_SCAN) + 1):
+        keep = n - a
+        drop = len(old) - keep
+        if drop < 0:
+            continue
+        if old[drop:] == new[:keep]:
+            return drop, new[keep:]
+    return None
+
+def diff_sections(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Section-level diff of two worlds. Only changed top-level keys (and, for
+    'zones', only changed zones) are emitted. Values are referenced, not copied.
+    """
+    rec: Dict[str, Any] = {}
+    sets: Dict[str, Any] = {}
+    pushes: Dict[str, Any] = {}
+    zsets: Dict[str, Any] = {}
+
+    dels = [k for k in old.keys() if k not in new and k not in _SKIP_KEYS]
+    for k, v in new.items():
+        if k in _SKIP_KEYS:
+            continue
+        if k in old and old[k] == v:
+            continue
+        prev = old.get(k)
+        if k == "zones" and isinstance(prev, dict) and isinstance(v, dict):
+            for zn, z in v.items():
+                if zn not in prev or prev[zn] != z:
+                    zsets[zn] = z
+            zdels = [zn for zn in prev.keys() if zn not in v]
+            if zdels:
+                rec["zdel"] = zdels
+            continue
+        if isinstance(prev, list) and isinstance(v, list):
+            push = _list_push(prev, v)
+            if push is not None:
+                pushes[k] = {"drop": push[0], "add": push[1]}
+                continue
+        sets[k] = v
+
+    if sets:
+        rec["set"] = sets
+    if dels:
+        rec["del"] = dels
+    if pushes:
+        rec["push"] = pushes
+    if zsets:
+        rec["zset"] = zsets
+    return rec
+
+def record_from_changes(changes: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Section record from IncrementalWorldEncoder text changes (see
+    world_serializer.merge_changes). Only the changed fragments are decoded, so
+    the cost follows what changed rather than the size of the world.
+    """
+    rec: Dict[str, Any] = {}
+    sets: Dict[str, Any] = {}
+    pushes: Dict[str, Any] = {}
+    prevs = changes.get("prev") or {}
+    for k, frag in (changes.get("set") or {}).items():
+        if k in _SKIP_KEYS:
+            continue
+        v = json.loads(frag)
+        old = prevs.get(k)
+        if isinstance(v, list) and old is not None and old.startswith("["):
+            push = _list_push(json.loads(old), v)
+            if push is not None:
+                pushes[k] = {"drop": push[0], "add": push[1]}
+                continue
+        sets[k] = v
+    dels = [k for k in changes.get("del") or () if k not in _SKIP_KEYS]
+
+    if sets:
+        rec["set"] = sets
+    if dels:
+        rec["del"] = dels
+    if pushes:
+        rec["push"] = pushes
+    if changes.get("zdel"):
+        rec["zdel"] = list(changes["zdel"])
+    if changes.get("zset"):
+        rec["zset"] = {zn: json.loads(frag) for zn, frag in changes["zset"].items()}
+    return rec
+
+# ---------- Apply / replay ----------
+def apply_journal_record(world: Dict[str, Any], rec: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply one journal record to `world` in place and return it."""
+    for k in rec.get("del", []) or []:
+        world.pop(k, None)
+    for k, v in (rec.get("set") or {}).items():
+        world[k] = v
+    for k, p in (rec.get("push") or {}).items():
+        cur = world.get(k)
+        if not isinstance(cur, list):
+            cur = []
+        drop = int(p.get("drop", 0))
+        if drop:
+            del cur[:drop]
+        cur.extend(p.get("add") or [])
+        world[k] = cur
+    if "zset" in rec or "zdel" in rec:
+        zones = world.get("zones")
+        if not isinstance(zones, dict):
+            zones = {}
+            world["zones"] = zones
+        for zn in rec.get("zdel", []) or []:
+            zones.pop(zn, None)
+        for zn, z in (rec.get("zset") or {}).items():
+            zones[zn] = z
+    if "seq" in rec:
+        world[JOURNAL_SEQ_KEY] = int(rec["seq"])
+    return world
+
+def read_journal(path: Path, after_seq: int = 0, epoch: Any = _ANY_EPOCH) -> List[Dict[str, Any]]:
+    """
+    Read records with seq > after_seq (and, if `epoch` is given, written on
+    top of that checkpoint; None matches records from before epochs existed).
+    Stops at the first torn/invalid line (a crash mid-append leaves at most
+    one partial record at the tail).
+    """
+    out: List[Dict[str, Any]] = []
+    if not path.exists() or path.is_dir():
+        return out
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rec = json.loads(line)
+            except Exception:
+                print(f"[WARN] world_journal: torn record in {path}; ignoring tail")
+                break
+            if not isinstance(rec, dict):
+                break
+            if epoch is not _ANY_EPOCH and rec.get("ep") != epoch:
+                continue
+            if int(rec.get("seq", 0)) > int(after_seq):
+                out.append(rec)
+    return out
+
+def replay_journal(world: Dict[str, Any], path: Path) -> Tuple[Dict[str, Any], int]:
+    """
+    Replay every record written after the world's last checkpoint. Records
+    of another epoch (a log the checkpoint superseded but a crash left
+    untruncated) are skipped. Returns (world, records_applied).
+    """
+    after = int(world.get(JOURNAL_SEQ_KEY, 0) or 0)
+    recs = read_journal(path, after_seq=after, epoch=world.get(JOURNAL_EPOCH_KEY))
+    for rec in recs:
+        apply_journal_record(world, rec)
+    return world, len(recs)
+
+# ---------- Writer ----------
+class WorldJournal:
+    """
+    Tick journal writer.
+
+    append(rec) appends one section record (record_from_changes, or
+    diff_sections against the last persisted state) as a compact JSON line.
+    The journal keeps no copy of the world. When needs_checkpoint() turns True
+    the caller writes world.json in full (stamped via mark_checkpoint) and calls
+    reset(world) to truncate the log. Each checkpoint gets a fresh epoch id
+    that its records carry, so a log left over from before a checkpoint is
+    never replayed onto it.
+
+    An unprimed journal (fresh process, or after a load) returns None from
+    append(); callers should checkpoint instead so the log always has a base.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        checkpoint_every: int = JOURNAL_CHECKPOINT_EVERY,
+        max_bytes: int = JOURNAL_MAX_BYTES,
+        fsync: bool = JOURNAL_FSYNC,
+    ):
+        self.path = Path(path)
+        self.checkpoint_every = max(1, int(checkpoint_every))
+        self.max_bytes = int(max_bytes)
+        self.fsync = bool(fsync)
+        self._primed = False
+        self._seq = 0
+        self._epoch: Optional[str] = None
+        self._since_checkpoint = 0
+        self._bytes = 0
+
+    @property
+    def seq(self) -> int:
+        return self._seq
+
+    @property
+    def primed(self) -> bool:
+        return self._primed
+
+    def needs_checkpoint(self) -> bool:
+        return (
+            not self._primed
+            or self._since_checkpoint >= self.checkpoint_every
+            or self._bytes >= self.max_bytes
+        )
+
+    def mark_checkpoint(self, world: Dict[str, Any]) -> Dict[str, Any]:
+        """Stamp the seq and a new epoch for the full write (call before writing world.json)."""
+        # Never go backwards: a replayed world already carries the highest seq on disk.
+        # The new epoch keeps records still in the log (if we crash before reset()
+        # truncates it) from replaying onto this checkpoint, whatever their seq.
+        self._seq = max(self._seq, int(world.get(JOURNAL_SEQ_KEY, 0) or 0))
+        world[JOURNAL_SEQ_KEY] = self._seq
+        world[JOURNAL_EPOCH_KEY] = os.urandom(8).hex()
+        return world
+
+    def reset(self, world: Dict[str, Any]) -> None:
+        """Truncate the log after a successful checkpoint of `world` (the stamped copy)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("w", encoding="utf-8") as f:
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        self._primed = True
+        self._seq = int(world.get(JOURNAL_SEQ_KEY, self._seq) or 0)
+        self._epoch = world.get(JOURNAL_EPOCH_KEY)
+        self._since_checkpoint = 0
+        self._bytes = 0
+
+    def invalidate(self) -> None:
+        """Unprime so the next persist is a full checkpoint."""
+        self._primed = False
+
+    def append(self, rec: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Append a section record describing the change since the last persisted state.
+        Returns the record written, {} if it was empty, or None if unprimed.
+        """
+        if not self._primed:
+            return None
+        if not rec:
+            return {}
+        rec = dict(rec)
+        rec["seq"] = self._seq + 1
+        if self._epoch is not None:
+            rec["ep"] = self._epoch
+        rec["ts"] = _utcnow_iso()
+        line = _encode(rec) + "\n"
+
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(line)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+
+        self._seq = rec["seq"]
+        self._since_checkpoint += 1
+        self._bytes += len(line)
+        return rec
+
+
+# ---------------------- Quick self-test ----------------------
+if __name__ == "__main__":
+    import copy
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as d:
+        jp = Path(d) / "world.journal"
+        base = {"time": 0, "density_log": [0.1, 0.2],
+                "zones": {"a": {"energy": 0.1}, "b": {"energy": 0.2}}}
+        j = WorldJournal(jp, checkpoint_every=10, fsync=False)
+        disk = copy.deepcopy(j.mark_checkpoint(base))
+        j.reset(base)
+
+        live = copy.deepcopy(base)
+        for t in range(1, 4):
+            prev = copy.deepcopy(live)
+            live["time"] = t
+            live["density_log"] = (live["density_log"] + [0.1 * t])[-3:]
+            live["zones"]["a"]["energy"] += 0.05
+            print("RECORD:", j.append(diff_sections(prev, live)))
+
+        restored, n = replay_journal(disk, jp)
+        for k in _SKIP_KEYS:
+            restored.pop(k, None)
+            live.pop(k, None)
+        print("REPLAYED:", n, "MATCH:", restored == live)
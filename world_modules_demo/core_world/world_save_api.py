@@ -5,9 +5,9 @@ Robust persistence layer for the Erbe System.
 Features:
 - Full world save/load
 - Schema validation
-- Versioned saves
+- Versioned saves (deduplicated chunk archive, or legacy timestamped copies)
 - Auto-backups
-- Differential delta saves
+- Differential delta saves (+ keyframe/delta history with restore by tick)
 - Safe writes
 - Migration support
 - Multi-world cluster save/load
@@ -15,7 +15,6 @@ Features:
 
 import json
 import os
-import copy
 from datetime import datetime
 
 try:
@@ -28,8 +27,33 @@ try:
 except:
     def migrate_world(w): return w
 
+try:
+    from engine.world_archive import WorldArchive
+except Exception:
+    try:
+        from world_archive import WorldArchive   # flat layout
+    except Exception:
+        WorldArchive = None              # fallback: timestamped full copies
+
+try:
+    from engine.world_history import WorldHistory
+except Exception:
+    try:
+        from world_history import WorldHistory   # flat layout
+    except Exception:
+        WorldHistory = None              # fallback: no tick history
+        print("[WARN] world_save_api: world_history unavailable; save_world_delta keeps no tick history")
+
 SAVE_DIR = "world_state"
 
+# Versioned saves: "chunked" = content-addressed archive, "full" = timestamped copies
+ARCHIVE_MODE = "chunked"
+ARCHIVE_GC_EVERY = 50     # run retention/GC every N archived saves (0 = manual only)
+
+_ARCHIVES = {}
+_ARCHIVE_PUTS = {}
+_HISTORIES = {}
+
 
 # -----------------------------------------------------------
 # Ensure directory exists
@@ -54,14 +78,37 @@ def _timestamp_path(world_name):
     ts = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
     return os.path.join(SAVE_DIR, f"{world_name}_{ts}.json")
 
+def _archive(world_name):
+    if ARCHIVE_MODE != "chunked" or WorldArchive is None:
+        return None
+    arc = _ARCHIVES.get(world_name)
+    if arc is None:
+        arc = _ARCHIVES[world_name] = WorldArchive(os.path.join(SAVE_DIR, "archive", world_name))
+    return arc
+
+def _history(world_name):
+    if WorldHistory is None:
+        return None
+    hist = _HISTORIES.get(world_name)
+    if hist is None:
+        hist = _HISTORIES[world_name] = WorldHistory(os.path.join(SAVE_DIR, "history", world_name))
+    return hist
+
 
 # -----------------------------------------------------------
 # Save World (FULL)
 # -----------------------------------------------------------
 
+def _encode_world(world):
+    # Full encode: callers of this API don't mark_dirty() their edits, so the
+    # incremental encoder's cached fragments could go stale here
+    wcopy = dict(world)
+    wcopy.setdefault("WORLD_VERSION", "1.0.0")
+    return json.dumps(wcopy, indent=2)
+
 def save_world(world, world_name=None):
     """
-    Saves a full world copy with backups and timestamped versions.
+    Saves a full world copy with a backup and a versioned archive entry.
     """
 
     _ensure_dir()
@@ -69,23 +116,25 @@ def save_world(world, world_name=None):
     if world_name is None:
         world_name = world.get("WORLD_NAME", "unnamed_world")
 
-    # make deep copy
-    wcopy = copy.deepcopy(world)
-
-    # assign version if missing
-    wcopy.setdefault("WORLD_VERSION", "1.0.0")
+    # encode once (WORLD_VERSION assigned if missing, caller's dict untouched)
+    text = _encode_world(world)
 
-    # write main
-    with open(_path(world_name), "w", encoding="utf-8") as f:
-        json.dump(wcopy, f, indent=2)
+    # write main, backup
+    for path in (_path(world_name), _backup_path(world_name)):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
 
-    # write backup
-    with open(_backup_path(world_name), "w", encoding="utf-8") as f:
-        json.dump(wcopy, f, indent=2)
+    # versioned archive: only changed chunks + a small manifest
+    arc = _archive(world_name)
+    if arc is None:
+        with open(_timestamp_path(world_name), "w", encoding="utf-8") as f:
+            f.write(text)
+        return True
 
-    # write timestamped archive
-    with open(_timestamp_path(world_name), "w", encoding="utf-8") as f:
-        json.dump(wcopy, f, indent=2)
+    arc.put(world, extra={"WORLD_VERSION": "1.0.0"})
+    n = _ARCHIVE_PUTS[world_name] = _ARCHIVE_PUTS.get(world_name, 0) + 1
+    if ARCHIVE_GC_EVERY and n % ARCHIVE_GC_EVERY == 0:
+        arc.gc()
 
     return True
 
@@ -122,6 +171,51 @@ def load_world(world_name):
     return world
 
 
+# -----------------------------------------------------------
+# Versioned Archive
+# -----------------------------------------------------------
+
+def list_world_versions(world_name):
+    """
+    Archived version ids for a world, oldest first.
+    """
+
+    arc = _archive(world_name)
+    return arc.list_versions() if arc is not None else []
+
+
+def load_world_version(world_name, version=None):
+    """
+    Restores an archived version (latest if None). Auto-migrates and validates.
+    """
+
+    arc = _archive(world_name)
+    if arc is None:
+        raise FileNotFoundError(f"No version archive for world '{world_name}'.")
+
+    world = migrate_world(arc.restore(version))
+
+    ok, errors = validate_world_schema(world)
+    if not ok:
+        print("[WORLD_LOAD] Schema warnings:")
+        for e in errors:
+            print("  -", e)
+
+    return world
+
+
+def prune_world_archive(world_name, **policy):
+    """
+    Applies the retention policy and deletes unreferenced chunks.
+    policy: keep_last, keep_hourly, keep_daily, grace_s (see world_archive).
+    """
+
+    arc = _archive(world_name)
+    if arc is None:
+        return {"versions_removed": 0, "chunks_removed": 0, "bytes_freed": 0}
+    return arc.gc(**policy)
+
+
 # -----------------------------------------------------------
 # Differential Saves (Delta Packs)
 # -----------------------------------------------------------
@@ -130,6 +224,7 @@ def save_world_delta(world, prev_world, world_name):
     """
     Saves only what changed between prev_world and world.
     Returns delta dict and writes to "worldname_delta.json".
+    Also appends world to the tick history (see restore_world_at).
     """
 
     _ensure_dir()
@@ -144,9 +239,28 @@ def save_world_delta(world, prev_world, world_name):
     with open(delta_path, "w", encoding="utf-8") as f:
         json.dump(delta, f, indent=2)
 
+    hist = _history(world_name)
+    if hist is not None:
+        try:
+            hist.record(world)
+        except Exception as e:
+            # The delta file is already written; a history failure must not fail the save
+            print(f"[WARN] save_world_delta: could not record history for '{world_name}': {e}")
+
     return delta
 
 
+def restore_world_at(world_name, tick):
+    """
+    Rebuilds the world as of `tick` from the nearest keyframe plus deltas.
+    """
+
+    hist = _history(world_name)
+    if hist is None:
+        raise FileNotFoundError(f"No tick history for world '{world_name}'.")
+    return hist.restore_world_at(tick)
+
+
 # -----------------------------------------------------------
 # Cluster Save / Load
 # -----------------------------------------------------------
@@ -0,0 +1,139 @@
+# engine/world_saver.py
+# Background write-behind saver: coalesces save requests, group-commits to disk.
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Optional
+
+__all__ = ["WorldSaver"]
+
+# --- Tunables (safe defaults) ---
+SAVER_LINGER_S: float = 0.02        # wait this long after a wake-up so bursts coalesce
+SAVER_MIN_INTERVAL_S: float = 0.0   # optional floor between writes (throttle on slow disks)
+
+
+class WorldSaver:
+    """
+    Single background writer thread.
+
+    submit(snapshot) hands off an already-detached world snapshot and returns a
+    generation number immediately. Only the newest pending snapshot is kept, so
+    back-to-back requests collapse into one write (and one fsync) — on slow
+    storage the saver simply writes less often instead of slowing the caller.
+    merge(pending, newer) -> snapshot, when given, decides what a coalesced
+    pair becomes (e.g. keep a full-checkpoint flag from the older one).
+
+    flush() waits until everything submitted so far is on disk;
+    wait_durable(gen) waits for a specific generation.
+    """
+
+    def __init__(
+        self,
+        write_fn: Callable[[Any], None],
+        *,
+        merge: Optional[Callable[[Any, Any], Any]] = None,
+        linger_s: float = SAVER_LINGER_S,
+        min_interval_s: float = SAVER_MIN_INTERVAL_S,
+        name: str = "world-saver",
+    ):
+        self._write_fn = write_fn
+        self._merge = merge
+        self.linger_s = max(0.0, float(linger_s))
+        self.min_interval_s = max(0.0, float(min_interval_s))
+        self._cv = threading.Condition()
+        self._pending: Optional[Any] = None
+        self._pending_gen = 0
+        self._submitted_gen = 0
+        self._done_gen = 0       # highest generation attempted
+        self._durable_gen = 0    # highest generation written successfully
+        self._stopping = False
+        self._last_write = 0.0
+        self.stats = {"submitted": 0, "written": 0, "coalesced": 0, "errors": 0}
+        self.last_error: Optional[Exception] = None
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    # -------- public API --------
+    @property
+    def durable_gen(self) -> int:
+        return self._durable_gen
+
+    def submit(self, snapshot: Any) -> int:
+        """Queue a snapshot for writing (replaces any not-yet-written one)."""
+        with self._cv:
+            if self._stopping:
+                raise RuntimeError("WorldSaver is stopped")
+            if self._pending is not None:
+                self.stats["coalesced"] += 1
+                if self._merge is not None:
+                    snapshot = self._merge(self._pending, snapshot)
+            self._submitted_gen += 1
+            self._pending = snapshot
+            self._pending_gen = self._submitted_gen
+            self.stats["submitted"] += 1
+            self._cv.notify_all()
+            return self._submitted_gen
+
+    def wait_durable(self, gen: Optional[int] = None, timeout: Optional[float] = None) -> bool:
+        """Block until generation `gen` (default: latest submitted) is written."""
+        with self._cv:
+            target = self._submitted_gen if gen is None else int(gen)
+            self._cv.wait_for(
+                lambda: self._done_gen >= target or not self._thread.is_alive(),
+                timeout=timeout,
+            )
+            return self._durable_gen >= target
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every snapshot submitted so far is on disk."""
+        return self.wait_durable(None, timeout=timeout)
+
+    def stop(self, *, flush: bool = True, timeout: Optional[float] = None) -> None:
+        """Stop the thread (optionally writing the last pending snapshot first)."""
+        if flush:
+            self.flush(timeout=timeout)
+        with self._cv:
+            self._stopping = True
+            self._cv.notify_all()
+        self._thread.join(timeout=timeout)
+
+    # -------- internals --------
+    def _run(self) -> None:
+        while True:
+            with self._cv:
+                self._cv.wait_for(lambda: self._pending is not None or self._stopping)
+                if self._pending is None and self._stopping:
+                    return
+
+            # Let a burst of submits land before committing (group commit)
+            if self.linger_s:
+                time.sleep(self.linger_s)
+            wait_more = self.min_interval_s - (time.perf_counter() - self._last_write)
+            if wait_more > 0:
+                time.sleep(wait_more)
+
+            with self._cv:
+                snap, gen = self._pending, self._pending_gen
+                self._pending = None
+            if snap is None:
+                continue
+
+            ok = False
+            try:
+                self._write_fn(snap)
+                self.stats["written"] += 1
+                ok = True
+            except Exception as e:
+                self.last_error = e
+                self.stats["errors"] += 1
+                print("[WARN] world_saver: background save failed:", e)
+            self._last_write = time.perf_counter()
+
+            with self._cv:
+                # A failed write still completes its generation so flush() can't hang;
+                # it just doesn't count as durable (wait_durable returns False).
+                self._done_gen = max(self._done_gen, gen)
+                if ok:
+                    self._durable_gen = max(self._durable_gen, gen)
+                self._cv.notify_all()
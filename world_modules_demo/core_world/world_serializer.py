@@ -0,0 +1,314 @@
+# engine/world_serializer.py
+# Incremental world JSON encoder: caches encoded sections/zones, re-encodes only dirty ones.
+from __future__ import annotations
+
+import json
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+__all__ = [
+    "IncrementalWorldEncoder",
+    "mark_dirty",
+    "mark_zones_dirty",
+    "is_tracked",
+    "merge_changes",
+]
+
+# ---------- Dirty registry ----------
+# Engines call mark_dirty()/mark_zones_dirty() after mutating a world in place.
+# Marks are only recorded for worlds some encoder is tracking. Plain dicts can't
+# be weakly referenced, so each entry holds its world until release(): the id
+# can't be recycled while the entry exists, and lookups also check identity.
+# Untracked worlds cost one dict lookup per mark.
+
+class _DirtySet:
+    __slots__ = ("all", "sections", "zones", "zones_all")
+
+    def __init__(self) -> None:
+        self.all = True          # first encode is always full
+        self.sections: Set[str] = set()
+        self.zones: Set[str] = set()
+        self.zones_all = True
+
+    def clear(self) -> None:
+        self.all = False
+        self.sections.clear()
+        self.zones.clear()
+        self.zones_all = False
+
+_TRACKED: Dict[int, Tuple[Any, List[_DirtySet]]] = {}   # id(world) -> (world, dirty sets)
+
+def _dirty_sets(world: Any) -> List[_DirtySet]:
+    entry = _TRACKED.get(id(world))
+    return entry[1] if entry is not None and entry[0] is world else []
+
+def is_tracked(world: Dict[str, Any]) -> bool:
+    return bool(_dirty_sets(world))
+
+def mark_dirty(world: Dict[str, Any], section: Optional[str] = None, zone: Optional[str] = None) -> None:
+    """
+    Mark part of a world as changed since the last encode.
+      mark_dirty(w)                     -> everything
+      mark_dirty(w, "features")         -> one top-level section
+      mark_dirty(w, "zones")            -> every zone
+      mark_dirty(w, "zones", "gate_1")  -> one zone
+    """
+    sets = _dirty_sets(world)
+    if not sets:
+        return
+    for ds in sets:
+        if section is None:
+            ds.all = True
+        elif section == "zones":
+            if zone is None:
+                ds.zones_all = True
+            else:
+                ds.zones.add(str(zone))
+        else:
+            ds.sections.add(section)
+
+def mark_zones_dirty(world: Dict[str, Any], zone_ids: Iterable[str]) -> None:
+    """Bulk variant of mark_dirty(world, 'zones', zid)."""
+    sets = _dirty_sets(world)
+    if not sets:
+        return
+    ids = [str(z) for z in zone_ids]
+    for ds in sets:
+        ds.zones.update(ids)
+
+# ---------- Encoder ----------
+def _json_default(o: Any) -> Any:
+    # Mapping-like values (typed zone records) encode as plain objects
+    to_dict = getattr(o, "to_dict", None)
+    if callable(to_dict):
+        return to_dict()
+    if isinstance(o, Mapping):
+        return dict(o)
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+class IncrementalWorldEncoder:
+    """
+    Produces the same text as json.dumps(world, indent=indent, ensure_ascii=ensure_ascii)
+    by splicing cached per-section and per-zone fragments.
+
+    A cached fragment is reused when the value is the same object as last time
+    (identity) and it was not marked dirty. Replacing a section/zone object
+    (e.g. w["density_log"] = dl[-300:]) therefore invalidates it automatically.
+    Scalars are always re-encoded (cheap). In-place edits must be marked
+    (mark_dirty / mark_zones_dirty); the tick scheduler marks each stage's
+    declared writes for engines that do not mark themselves.
+
+    verify=True (debug/tests) keeps a decoded shadow of every fragment and
+    compares unmarked values against it, catching writers that forgot to mark
+    at the cost of a second in-memory copy of the world and O(world) per encode.
+
+    encode(..., changes=True) also leaves the text-level difference to the
+    previous encode in last_changes (see merge_changes for the layout); only
+    re-encoded fragments are compared, so this adds no O(world) work.
+    """
+
+    def __init__(self, *, indent: Optional[int] = 2, verify: bool = False, ensure_ascii: bool = False):
+        self.indent = indent
+        self.ensure_ascii = bool(ensure_ascii)
+        self.verify = bool(verify)
+        self._world: Optional[Dict[str, Any]] = None
+        self._dirty: Optional[_DirtySet] = None
+        self._sections: Dict[str, tuple] = {}   # key -> (obj, fragment, shadow)
+        self._zones: Dict[str, tuple] = {}      # zid -> (obj, fragment, shadow)
+        self._zones_obj: Any = None
+        self._keys: Set[str] = set()            # top-level keys of the last encode
+        self.last_changes: Optional[Dict[str, Any]] = None
+        self.stats = {"encodes": 0, "sections_encoded": 0, "zones_encoded": 0, "zones_reused": 0}
+
+    # -------- tracking --------
+    def track(self, world: Dict[str, Any]) -> None:
+        """Start tracking `world` (drops caches of any previously tracked world)."""
+        if world is self._world:
+            return
+        self.release()
+        self._world = world
+        self._dirty = _DirtySet()
+        _TRACKED.setdefault(id(world), (world, []))[1].append(self._dirty)
+
+    def release(self) -> None:
+        if self._world is not None:
+            sets = _dirty_sets(self._world)
+            if self._dirty in sets:
+                sets.remove(self._dirty)
+            if not sets:
+                _TRACKED.pop(id(self._world), None)
+        self._world = None
+        self._dirty = None
+        self._sections.clear()
+        self._zones.clear()
+        self._zones_obj = None
+        self._keys = set()
+
+    def __del__(self):
+        try:
+            self.release()
+        except Exception:
+            pass
+
+    # -------- encoding --------
+    def _dump(self, v: Any) -> str:
+        return json.dumps(v, indent=self.indent, ensure_ascii=self.ensure_ascii, default=_json_default)
+
+    def _nest(self, frag: str, level: int) -> str:
+        # Re-indent a fragment encoded at level 0 (raw newlines never occur inside JSON strings)
+        if self.indent is None or "\n" not in frag:
+            return frag
+        return frag.replace("\n", "\n" + " " * (self.indent * level))
+
+    def _entry(self, v: Any, level: int) -> tuple:
+        frag = self._nest(self._dump(v), level)
+        return (v, frag, json.loads(frag) if self.verify else None)
+
+    def _reusable(self, hit: Optional[tuple], v: Any, marked: bool) -> bool:
+        if marked or hit is None or hit[0] is not v or not isinstance(v, (dict, list, Mapping)):
+            return False
+        return not self.verify or v == hit[2]
+
+    def _obj(self, items: List[str], level: int) -> str:
+        if not items:
+            return "{}"
+        if self.indent is None:
+            return "{" + ", ".join(items) + "}"
+        pad = "\n" + " " * (self.indent * (level + 1))
+        return "{" + pad + ("," + pad).join(items) + "\n" + " " * (self.indent * level) + "}"
+
+    def _encode_zones(self, zones: Dict[str, Any], ds: _DirtySet, ch: Optional[Dict[str, Any]]) -> str:
+        full = ds.all or ds.zones_all or zones is not self._zones_obj
+        cache = self._zones
+        items: List[str] = []
+        for zid, z in zones.items():
+            hit = cache.get(zid)
+            if self._reusable(hit, z, full or zid in ds.zones):
+                frag = hit[1]
+                self.stats["zones_reused"] += 1
+            else:
+                old = hit[1] if hit is not None else None
+                hit = cache[zid] = self._entry(z, 2)
+                frag = hit[1]
+                self.stats["zones_encoded"] += 1
+                if ch is not None and frag != old:
+                    ch["zset"][str(zid)] = frag
+            items.append(json.dumps(zid if isinstance(zid, str) else str(zid), ensure_ascii=self.ensure_ascii) + ": " + frag)
+        if len(cache) > len(zones):
+            for zid in [k for k in cache if k not in zones]:
+                cache.pop(zid, None)
+                if ch is not None:
+                    ch["zdel"].append(str(zid))
+        self._zones_obj = zones
+        return self._obj(items, 1)
+
+    def encode(self, world: Dict[str, Any], *, extra: Optional[Dict[str, Any]] = None, changes: bool = False) -> str:
+        """
+        Encode `world`, reusing fragments for unchanged sections and zones.
+        `extra` keys missing from world are appended (like a setdefault on a copy).
+        changes=True records what changed since the previous encode in last_changes.
+        """
+        ch: Optional[Dict[str, Any]] = None
+        if changes:
+            ch = {"full": world is not self._world, "set": {}, "prev": {}, "del": [], "zset": {}, "zdel": []}
+        self.track(world)
+        ds = self._dirty
+        assert ds is not None
+        items: List[str] = []
+        pairs = list(world.items())
+        if extra:
+            pairs += [(k, v) for k, v in extra.items() if k not in world]
+        for k, v in pairs:
+            key = json.dumps(k if isinstance(k, str) else str(k), ensure_ascii=self.ensure_ascii) + ": "
+            if k == "zones" and isinstance(v, dict):
+                fresh = self._zones_obj is None
+                text = self._encode_zones(v, ds, None if fresh else ch)
+                if ch is not None and fresh:
+                    # No per-zone baseline (zones were absent or not a dict): send them whole
+                    ch["set"][k], ch["prev"][k] = text, None
+                items.append(key + text)
+                continue
+            if k == "zones" and self._zones_obj is not None:
+                self._zones.clear()
+                self._zones_obj = None
+            hit = self._sections.get(k)
+            if not self._reusable(hit, v, ds.all or k in ds.sections):
+                old = hit[1] if hit is not None else None
+                hit = self._sections[k] = self._entry(v, 1)
+                self.stats["sections_encoded"] += 1
+                if ch is not None and hit[1] != old:
+                    ch["set"][str(k)], ch["prev"][str(k)] = hit[1], old
+            items.append(key + hit[1])
+        if len(self._sections) > len(pairs):
+            live = {k for k, _ in pairs}
+            for k in [k for k in self._sections if k not in live]:
+                self._sections.pop(k, None)
+        live_keys = {str(k) for k, _ in pairs}
+        if "zones" not in live_keys and self._zones_obj is not None:
+            self._zones.clear()
+            self._zones_obj = None
+        if ch is not None:
+            ch["del"] = [k for k in self._keys if k not in live_keys]
+            self.last_changes = ch
+        self._keys = live_keys
+        ds.clear()
+        self.stats["encodes"] += 1
+        return self._obj(items, 0)
+
+
+def merge_changes(a: Optional[Dict[str, Any]], b: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Combine two consecutive encoder change sets (a, then b) into one.
+
+    Layout: {"full": bool, "set": {key: fragment}, "prev": {key: fragment before
+    the first change, or None}, "del": [key], "zset": {zone: fragment},
+    "zdel": [zone]}. "full" means there was no baseline (the encoder switched
+    worlds), so the changes do not describe a delta. None (unknown) is absorbing.
+    """
+    if a is None or b is None:
+        return None
+    out = {
+        "full": a["full"] or b["full"],
+        "set": dict(a["set"]),
+        "prev": dict(a["prev"]),
+        "del": [k for k in a["del"] if k not in b["set"]],
+        "zset": dict(a["zset"]),
+        "zdel": [z for z in a["zdel"] if z not in b["zset"]],
+    }
+    for k in b["del"]:
+        out["set"].pop(k, None)
+        if k not in out["del"]:
+            out["del"].append(k)
+    for k, frag in b["set"].items():
+        if k not in out["set"] and k not in a["del"]:
+            out["prev"][k] = b["prev"].get(k)
+        out["set"][k] = frag
+    if "zones" in b["set"] or "zones" in b["del"]:
+        out["zset"], out["zdel"] = {}, []     # superseded by the whole-section write
+    for z in b["zdel"]:
+        out["zset"].pop(z, None)
+        if z not in out["zdel"]:
+            out["zdel"].append(z)
+    out["zset"].update(b["zset"])
+    for k in out["del"]:
+        out["prev"].pop(k, None)
+    return out
+
+
+# ---------------------- Quick self-test ----------------------
+if __name__ == "__main__":
+    w = {"time": 1, "features": {"individualism": 0.2},
+         "zones": {f"z{i}": {"energy": 0.1 * i, "links": [f"z{i + 1}"]} for i in range(1000)},
+         "density_log": [0.1, 0.2]}
+    enc = IncrementalWorldEncoder(indent=2, verify=True)
+    assert enc.encode(w) == json.dumps(w, indent=2, ensure_ascii=False)
+
+    w["time"] = 2
+    w["zones"]["z3"]["energy"] = 9.0
+    mark_dirty(w, "zones", "z3")
+    w["zones"]["z7"]["energy"] = 7.0          # unmarked: caught by verify (debug mode)
+    w["density_log"] = w["density_log"] + [0.3]
+    before = dict(enc.stats)
+    out = enc.encode(w)
+    print("MATCH:", out == json.dumps(w, indent=2, ensure_ascii=False))
+    print("ZONES RE-ENCODED:", enc.stats["zones_encoded"] - before["zones_encoded"])
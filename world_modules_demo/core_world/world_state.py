@@ -0,0 +1,543 @@
+# engine/world_state.py
+# Mutation-tracking world container: diffs cost O(changes), not O(world).
+from __future__ import annotations
+
+import copy
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from engine.world_delta_map import _fmt_path, _is_num, _walk_numeric_deltas, DeltaMap
+except Exception:
+    from world_delta_map import _fmt_path, _is_num, _walk_numeric_deltas, DeltaMap  # flat layout
+
+try:
+    from engine.world_delta import _deep_diff as _wd_deep_diff
+except Exception:
+    try:
+        from world_delta import _deep_diff as _wd_deep_diff  # flat layout
+    except Exception:
+        _wd_deep_diff = None
+
+__all__ = [
+    "WorldState",
+    "TrackedDict",
+    "TrackedList",
+    "track_world",
+    "to_plain",
+]
+
+Key = Any                     # str for dict keys, int for list indices
+PathT = Tuple[Key, ...]
+
+class _Missing:
+    __slots__ = ()
+    def __repr__(self) -> str:
+        return "<missing>"
+
+_MISSING = _Missing()
+
+# ---------------------- Tracker ----------------------
+
+class _Tracker:
+    """
+    Baseline store shared by every container of one WorldState.
+
+    orig maps the top-most changed paths to their value at the last
+    mark_clean() (plain copies; _MISSING if the key did not exist).
+    A write under an already-recorded path costs one prefix lookup.
+
+    watched holds plain dicts/lists that were assigned into the tree and kept
+    as the caller's object. Their writes cannot be intercepted, so each epoch
+    records them up front against a fresh snapshot (see rebase).
+    """
+
+    __slots__ = ("orig", "prefixes", "watched")
+
+    def __init__(self) -> None:
+        self.orig: Dict[PathT, Any] = {}
+        self.prefixes: Dict[PathT, int] = {}   # proper prefixes of recorded paths -> refcount
+        self.watched: Dict[PathT, Any] = {}
+
+    def covered(self, path: PathT) -> bool:
+        orig = self.orig
+        for i in range(len(path) + 1):
+            if path[:i] in orig:
+                return True
+        return False
+
+    def record(self, path: PathT, old: Any) -> None:
+        if self.covered(path):
+            return
+        snap = to_plain(old)
+        if path in self.prefixes:
+            # Descendants were changed first: restore their originals into the snapshot
+            n = len(path)
+            for p in [p for p in self.orig if len(p) > n and p[:n] == path]:
+                _patch(snap, p[n:], self.orig[p])
+                self._drop(p)
+        self.orig[path] = snap
+        for i in range(len(path)):
+            pre = path[:i]
+            self.prefixes[pre] = self.prefixes.get(pre, 0) + 1
+
+    def _drop(self, path: PathT) -> None:
+        self.orig.pop(path, None)
+        for i in range(len(path)):
+            pre = path[:i]
+            c = self.prefixes.get(pre, 0) - 1
+            if c <= 0:
+                self.prefixes.pop(pre, None)
+            else:
+                self.prefixes[pre] = c
+
+    def clear(self) -> None:
+        self.orig.clear()
+        self.prefixes.clear()
+
+    def watch(self, path: PathT, obj: Any) -> None:
+        self.watched[path] = obj
+
+    def rebase(self, root: "WorldState") -> None:
+        """Start a new epoch; plain containers still in place stay recorded."""
+        self.clear()
+        for path in sorted(self.watched, key=len):
+            obj = self.watched[path]
+            if root._get_path(path) is obj:
+                self.record(path, obj)
+            else:
+                del self.watched[path]   # replaced, removed or moved since
+
+
+def _patch(snap: Any, rel: PathT, value: Any) -> None:
+    cur = snap
+    for k in rel[:-1]:
+        cur = cur[k]
+    if value is _MISSING:
+        if isinstance(cur, dict):
+            cur.pop(rel[-1], None)
+        return
+    cur[rel[-1]] = value
+
+
+def to_plain(value: Any) -> Any:
+    """Deep copy into plain dicts/lists (drops tracking)."""
+    if isinstance(value, dict):
+        return {k: to_plain(v) for k, v in dict.items(value)}
+    if isinstance(value, list):
+        return [to_plain(v) for v in list.__iter__(value)]
+    if value is _MISSING:
+        return value
+    return copy.deepcopy(value) if not isinstance(value, (str, int, float, bool, type(None))) else value
+
+# ---------------------- Tracked containers ----------------------
+
+def _wrap(value: Any, tracker: Optional[_Tracker], path: PathT) -> Any:
+    if isinstance(value, (TrackedDict, TrackedList)) and value._tracker is tracker and value._path == path:
+        return value
+    if isinstance(value, dict):
+        return TrackedDict._adopt(value, tracker, path)
+    if isinstance(value, list):
+        return TrackedList._adopt(value, tracker, path)
+    return value
+
+def _store(value: Any, tracker: Optional[_Tracker], path: PathT) -> Any:
+    # What an assignment keeps at `path`. Plain containers stay the caller's
+    # object (writes through their reference must land in the world) and are
+    # watched; a detached tracked subtree is re-attached in place. Only a
+    # container already live elsewhere in a tree is copied.
+    if isinstance(value, (TrackedDict, TrackedList)):
+        if value._tracker is tracker and value._path == path:
+            return value
+        if value._tracker is None and tracker is not None:
+            value._attach(tracker, path)
+            return value
+        return _wrap(value, tracker, path)
+    if tracker is not None and isinstance(value, (dict, list)):
+        tracker.watch(path, value)
+    return value
+
+def _watch_children(tracker: Optional[_Tracker], path: PathT, items: Iterable[Tuple[Key, Any]]) -> None:
+    for k, v in items:
+        if isinstance(v, (TrackedDict, TrackedList)):
+            v._attach(tracker, path + (k,))
+        elif tracker is not None and isinstance(v, (dict, list)):
+            tracker.watch(path + (k,), v)
+
+def _detach(value: Any) -> None:
+    # Containers cut out of the tree stop recording (their paths are stale)
+    if isinstance(value, TrackedDict):
+        value._tracker = None
+        for v in dict.values(value):
+            _detach(v)
+    elif isinstance(value, TrackedList):
+        value._tracker = None
+        for v in list.__iter__(value):
+            _detach(v)
+
+
+class TrackedDict(dict):
+    """dict that reports writes to its WorldState. Assigned plain containers are kept as-is and watched."""
+
+    __slots__ = ("_tracker", "_path")
+
+    @classmethod
+    def _adopt(cls, src: Dict[Any, Any], tracker: Optional[_Tracker], path: PathT) -> "TrackedDict":
+        d = cls.__new__(cls)
+        d._tracker = tracker
+        d._path = path
+        for k, v in dict.items(src):
+            dict.__setitem__(d, k, _wrap(v, tracker, path + (k,)))
+        return d
+
+    def _attach(self, tracker: Optional[_Tracker], path: PathT) -> None:
+        self._tracker = tracker
+        self._path = path
+        _watch_children(tracker, path, dict.items(self))
+
+    # -------- writes --------
+    def __setitem__(self, k: Any, v: Any) -> None:
+        old = dict.get(self, k, _MISSING)
+        if old is v:
+            return
+        if self._tracker is not None:
+            self._tracker.record(self._path + (k,), old)
+        _detach(old)
+        dict.__setitem__(self, k, _store(v, self._tracker, self._path + (k,)))
+
+    def __delitem__(self, k: Any) -> None:
+        old = dict.__getitem__(self, k)
+        if self._tracker is not None:
+            self._tracker.record(self._path + (k,), old)
+        _detach(old)
+        dict.__delitem__(self, k)
+
+    def pop(self, k: Any, *default: Any) -> Any:
+        if k not in self:
+            if default:
+                return default[0]
+            raise KeyError(k)
+        v = dict.__getitem__(self, k)
+        self.__delitem__(k)
+        return v
+
+    def popitem(self) -> Tuple[Any, Any]:
+        if not self:
+            raise KeyError("popitem(): dictionary is empty")
+        k = next(reversed(dict.keys(self)))
+        return k, self.pop(k)
+
+    def setdefault(self, k: Any, default: Any = None) -> Any:
+        if k not in self:
+            self[k] = default
+        return dict.__getitem__(self, k)
+
+    def update(self, *args: Any, **kw: Any) -> None:
+        for k, v in dict(*args, **kw).items():
+            self[k] = v
+
+    def __ior__(self, other: Any) -> "TrackedDict":
+        self.update(other)
+        return self
+
+    def clear(self) -> None:
+        for k in list(dict.keys(self)):
+            del self[k]
+
+    # -------- copies come out plain --------
+    def __copy__(self) -> Dict[Any, Any]:
+        return dict(dict.items(self))
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> Dict[Any, Any]:
+        return to_plain(self)
+
+    def __reduce_ex__(self, protocol: Any) -> Any:
+        return (dict, (to_plain(self),))
+
+
+class TrackedList(list):
+    """list that reports writes to its WorldState. Structural edits record the whole list."""
+
+    __slots__ = ("_tracker", "_path")
+
+    @classmethod
+    def _adopt(cls, src: List[Any], tracker: Optional[_Tracker], path: PathT) -> "TrackedList":
+        lst = cls.__new__(cls)
+        list.__init__(lst, (_wrap(v, tracker, path + (i,)) for i, v in enumerate(list.__iter__(src))))
+        lst._tracker = tracker
+        lst._path = path
+        return lst
+
+    def _attach(self, tracker: Optional[_Tracker], path: PathT) -> None:
+        self._tracker = tracker
+        self._path = path
+        _watch_children(tracker, path, enumerate(list.__iter__(self)))
+
+    def _structural(self) -> List[Any]:
+        if self._tracker is not None:
+            self._tracker.record(self._path, self)
+        return [v for v in list.__iter__(self) if isinstance(v, (TrackedDict, TrackedList))]
+
+    def _rewrap_all(self, before: List[Any] = ()) -> None:
+        # After a structural edit element indices move: store new items, re-path
+        # kept ones (watched plain items too), detach the ones that left the list
+        if before:
+            kept = {id(v) for v in list.__iter__(self)}
+            for v in before:
+                if id(v) not in kept:
+                    _detach(v)
+        for i, v in enumerate(list.__iter__(self)):
+            path = self._path + (i,)
+            if isinstance(v, (TrackedDict, TrackedList)) and v._tracker is self._tracker:
+                if v._path != path:
+                    v._attach(self._tracker, path)
+            elif isinstance(v, (dict, list)):
+                stored = _store(v, self._tracker, path)
+                if stored is not v:
+                    list.__setitem__(self, i, stored)
+
+    # -------- writes --------
+    def __setitem__(self, i: Any, v: Any) -> None:
+        if isinstance(i, slice):
+            before = self._structural()
+            list.__setitem__(self, i, v)
+            self._rewrap_all(before)
+            return
+        n = len(self)
+        idx = i + n if i < 0 else i
+        if not 0 <= idx < n:
+            raise IndexError("list assignment index out of range")
+        old = list.__getitem__(self, idx)
+        if old is v:
+            return
+        if self._tracker is not None:
+            self._tracker.record(self._path + (idx,), old)
+        _detach(old)
+        list.__setitem__(self, idx, _store(v, self._tracker, self._path + (idx,)))
+
+    def __delitem__(self, i: Any) -> None:
+        before = self._structural()
+        list.__delitem__(self, i)
+        self._rewrap_all(before)
+
+    def append(self, v: Any) -> None:
+        self._structural()
+        list.append(self, _store(v, self._tracker, self._path + (len(self),)))
+
+    def extend(self, vs: Iterable[Any]) -> None:
+        self._structural()
+        list.extend(self, vs)
+        self._rewrap_all()
+
+    def __iadd__(self, vs: Iterable[Any]) -> "TrackedList":
+        self.extend(vs)
+        return self
+
+    def __imul__(self, n: int) -> "TrackedList":
+        before = self._structural()
+        list.__imul__(self, n)
+        self._rewrap_all(before)
+        return self
+
+    def insert(self, i: int, v: Any) -> None:
+        before = self._structural()
+        list.insert(self, i, v)
+        self._rewrap_all(before)
+
+    def pop(self, i: int = -1) -> Any:
+        before = self._structural()
+        v = list.pop(self, i)
+        self._rewrap_all(before)
+        return v
+
+    def remove(self, v: Any) -> None:
+        before = self._structural()
+        list.remove(self, v)
+        self._rewrap_all(before)
+
+    def clear(self) -> None:
+        before = self._structural()
+        list.clear(self)
+        self._rewrap_all(before)
+
+    def sort(self, *a: Any, **kw: Any) -> None:
+        before = self._structural()
+        list.sort(self, *a, **kw)
+        self._rewrap_all(before)
+
+    def reverse(self) -> None:
+        before = self._structural()
+        list.reverse(self)
+        self._rewrap_all(before)
+
+    # -------- copies come out plain --------
+    def __copy__(self) -> List[Any]:
+        return list(list.__iter__(self))
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> List[Any]:
+        return to_plain(self)
+
+    def __reduce_ex__(self, protocol: Any) -> Any:
+        return (list, (to_plain(self),))
+
+# ---------------------- WorldState ----------------------
+
+class WorldState(TrackedDict):
+    """
+    Drop-in world dict that remembers what changed since mark_clean().
+
+      ws = track_world(world)
+      ... engines mutate ws like a normal world dict ...
+      ws.changed_paths()    -> ['/zones/gate_1/energy', '/density_log', ...]
+      ws.numeric_deltas()   == map_world_deltas(<world at mark_clean>, ws)
+      ws.calculate_delta()  == calculate_world_delta(<world at mark_clean>, ws)
+      ws.mark_clean()       -> start the next epoch
+
+    Only changed subtrees are walked. A plain dict/list assigned into the
+    state is kept as that same object, so `ws["x"] = d; d["k"] = 1` is seen;
+    such containers count as changed in every epoch while they stay in place.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None):
+        dict.__init__(self)
+        self._tracker = _Tracker()
+        self._path = ()
+        for k, v in dict.items(data or {}):
+            dict.__setitem__(self, k, _wrap(v, self._tracker, (k,)))
+
+    def _baseline(self) -> List[Tuple[PathT, Any, Any]]:
+        """(path, old, new) for every top-most changed path, sorted by pointer."""
+        out = []
+        for path, old in self._tracker.orig.items():
+            out.append((path, old, self._get_path(path)))
+        out.sort(key=lambda t: _pointer(t[0]))
+        return out
+
+    def _get_path(self, path: PathT) -> Any:
+        cur: Any = self
+        for k in path:
+            if isinstance(cur, dict):
+                cur = dict.get(cur, k, _MISSING)
+            elif isinstance(cur, list) and isinstance(k, int) and 0 <= k < len(cur):
+                cur = list.__getitem__(cur, k)
+            else:
+                return _MISSING
+            if cur is _MISSING:
+                return cur
+        return cur
+
+    # -------- public API --------
+    def is_dirty(self) -> bool:
+        # watched plain containers are always recorded; they count only if they differ
+        watched = self._tracker.watched
+        return any(p not in watched or not _same(old, self._get_path(p))
+                   for p, old in self._tracker.orig.items())
+
+    def mark_clean(self) -> None:
+        """Forget recorded changes (current state becomes the new baseline)."""
+        self._tracker.rebase(self)
+
+    def recorded_paths(self) -> List[PathT]:
+        """Top-most key paths written since mark_clean(), unfiltered (cheap: no diffing)."""
+        return list(self._tracker.orig)
+
+    def changed_paths(self, *, path_style: str = "pointer") -> List[str]:
+        """Top-most paths written since mark_clean() (a changed list is reported once)."""
+        return [_fmt_tuple(p, path_style) for p, old, new in self._baseline() if not _same(old, new)]
+
+    def numeric_deltas(
+        self,
+        *,
+        epsilon: float = 1e-3,
+        path_style: str = "pointer",
+        include_top_level_only: bool = False
+    ) -> DeltaMap:
+        """Same result as map_world_deltas(baseline, self, ...), walking only changed subtrees."""
+        # A recorded path's ancestors were never added, removed or re-shaped
+        # (that would have recorded the ancestor instead), so map_world_deltas
+        # reaches exactly these paths; added/removed keys have no delta there either.
+        out: DeltaMap = {}
+        for path, old, new in self._baseline():
+            if old is _MISSING or new is _MISSING:
+                continue
+            if include_top_level_only:
+                if len(path) == 1 and _is_num(old) and _is_num(new):
+                    d = float(new) - float(old)
+                    if abs(d) > epsilon:
+                        out[_fmt_tuple(path, path_style)] = d
+                continue
+            _walk_numeric_deltas(old, new, _fmt_tuple(path, path_style), out,
+                                 epsilon=epsilon, path_style=path_style)
+        return out
+
+    def calculate_delta(self, *, epsilon: float = 1e-6) -> List[Dict[str, Any]]:
+        """world_delta-style op list (add/remove/replace/shift/keyed) for the changed subtrees."""
+        if _wd_deep_diff is None:
+            raise RuntimeError("world_delta not available")
+        ops: List[Dict[str, Any]] = []
+        for path, old, new in self._baseline():
+            ptr = _pointer(path)
+            if old is _MISSING and new is _MISSING:
+                continue
+            if old is _MISSING:
+                ops.append({"op": "add", "path": ptr, "new": new})
+            elif new is _MISSING:
+                ops.append({"op": "remove", "path": ptr, "old": old})
+            else:
+                ops.extend(_wd_deep_diff(old, new, ptr if path else "", epsilon=epsilon, ignore_keys=()))
+        return ops
+
+    def to_plain(self) -> Dict[str, Any]:
+        return to_plain(self)
+
+
+def track_world(world: Dict[str, Any]) -> WorldState:
+    """Wrap a world dict (returned as-is if already tracked)."""
+    if isinstance(world, WorldState):
+        return world
+    return WorldState(world)
+
+# ---------------------- helpers ----------------------
+
+def _pointer(path: PathT) -> str:
+    return _fmt_tuple(path, "pointer") if path else "/"
+
+def _fmt_tuple(path: PathT, style: str) -> str:
+    out = ""
+    for k in path:
+        out = _fmt_path(out, k, style)
+    return out
+
+def _same(a: Any, b: Any) -> bool:
+    try:
+        return a == b
+    except Exception:
+        return False
+
+
+# ---------------------- Quick self-test ----------------------
+if __name__ == "__main__":
+    try:
+        from engine.world_delta_map import map_world_deltas
+    except Exception:
+        from world_delta_map import map_world_deltas
+
+    base = {
+        "symbolic_density": 0.30,
+        "zones": {f"z{i}": {"energy": 0.1 * i, "markers": []} for i in range(2000)},
+        "density_log": [0.28, 0.30, 0.33],
+    }
+    ws = track_world(copy.deepcopy(base))
+    ws["symbolic_density"] = 0.35
+    ws["zones"]["z5"]["energy"] += 0.5
+    ws["zones"]["z7"]["markers"].append("mist")
+    z = ws["zones"].setdefault("z_new", {})
+    z["energy"] = 1.0
+    dl = ws["density_log"]
+    del dl[:1]
+    dl.append(0.4)
+    ws["density_log"][0] = 0.31
+
+    print("CHANGED:", ws.changed_paths())
+    print("MATCH:", ws.numeric_deltas() == map_world_deltas(base, ws))
@@ -1,141 +1,293 @@
 # engine/world_util.py
 from __future__ import annotations
 
+import atexit
+import heapq
 import json
+import math
 import os
+import sys
 import tempfile
 import threading
 import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
 from pathlib import Path
-from typing import Dict, Any, Optional, Tuple, List, Union
+from typing import Dict, Any, Optional, Tuple, List, Union, Container, Iterable
 from datetime import datetime, timezone
 
-# ---- Time/clock integration (safe import) ----
 try:
-    from engine.world_clock import init_clock as _time_init, advance_time as _time_advance
-    _CLOCK_OK = True
+    from engine.engine_registry import EngineRegistry, LazyEngine
 except Exception:
-    _CLOCK_OK = False
+    from engine_registry import EngineRegistry, LazyEngine  # flat layout
 
-# ---- Optional autonomy (safe import) ----
-try:
-    from autonomy_engine import update_character_goal as _autonomy_update
-    _AUTO_OK = True
-except Exception:
-    _AUTO_OK = False
-
-# ---- Optional AGI progress (safe import) ----
-try:
-    from engine.character_util import update_agi_progress as _update_agi_progress
-    _AGI_OK = True
-except Exception:
-    _AGI_OK = False
+# ---- Optional engines: imported on first use, failures cached (see engine_status) ----
+# Importing world_util stays cheap for persistence-only tools and workers; an
+# engine's module loads the first time a tick (or caller) needs it.
+_ENGINES = EngineRegistry()
 
-# ---- UI/Panel memory + timeseries metrics (safe import) ----
-try:
-    from engine.memory_util import ensure_memory as _ensure_memory  # no-op if already present
-except Exception:
-    def _ensure_memory(world):  # fallback no-op
-        return world
-
-try:
-    from engine.metrics_util import (
-        ensure_metrics as _ensure_metrics,
-        update_density as _metrics_update_density,
-    )
-except Exception:
-    def _ensure_metrics(world):
-        return world
-    def _metrics_update_density(world, v):
-        return world
+def _noop_world(w: Dict[str, Any], *a, **k) -> Dict[str, Any]:
+    return w
 
-# Optional validator hook (no-op if not present)
-try:
-    from engine.validator.world_validator import validate_world_data  # type: ignore
-except Exception:
-    def validate_world_data(data: Dict[str, Any]) -> list[str]:  # type: ignore
-        return []
+def _no_corrections(data: Dict[str, Any]) -> list[str]:
+    return []
 
-Number = Union[int, float]
+# Time/clock integration
+_time_init = _ENGINES.lazy("clock_init", "engine.world_clock", "init_clock")
+_time_advance = _ENGINES.lazy("clock_advance", "engine.world_clock", "advance_time")
 
-WORLD_DIR = Path("world_state")
-WORLD_FILE = WORLD_DIR / "world.json"
-ZONES_DIR = Path("zones")  # folder with standalone zone JSONs
+# Optional autonomy / AGI progress
+_autonomy_update = _ENGINES.lazy("autonomy", "autonomy_engine", "update_character_goal")
+_update_agi_progress = _ENGINES.lazy("agi", "engine.character_util", "update_agi_progress")
 
-# Process-wide lock to serialize world reads/writes across timers/threads
-_WORLD_LOCK = threading.Lock()
+# UI/Panel memory + timeseries metrics (no-ops if missing)
+_ensure_memory = _ENGINES.lazy("memory", "engine.memory_util", "ensure_memory", fallback=_noop_world)
+_ensure_metrics = _ENGINES.lazy("metrics", "engine.metrics_util", "ensure_metrics", fallback=_noop_world)
+_metrics_update_density = _ENGINES.lazy("metrics_density", "engine.metrics_util", "update_density",
+                                        fallback=_noop_world)
 
-# ---------- Resonance (shared overlay) tunables ----------
-RESONANCE_DECAY_LAM: float = 0.93     # per-tick decay (0.90–0.96 good)
-RESONANCE_MAX_MARKERS: int = 50       # cap to keep JSON small
-RESONANCE_VIS_THRESH: float = 0.5     # visibility threshold for viewer helpers
-RESONANCE_DEFAULT_W: float = 1.0      # default weight bump per call
-RESONANCE_DEFAULT_D: float = 0.02     # default density bump per call
+# Optional validator hook
+validate_world_data = _ENGINES.lazy("validator", "engine.validator.world_validator", "validate_world_data",
+                                    fallback=_no_corrections)
 
-# -------- Optional world-step modules (safe fallbacks) --------
-def _noop_world(w: Dict[str, Any], *a, **k) -> Dict[str, Any]:
-    return w
+# Tick infrastructure that only ticking needs
+_SCHEDULER = _ENGINES.lazy("tick_scheduler", "engine.tick_scheduler")
+_ZONE_LOD = _ENGINES.lazy("zone_lod", "engine.zone_lod", "ZoneLOD")
+_TICK_RECORDER = _ENGINES.lazy("tick_recorder", "engine.tick_recorder", "TickRecorder")
 
-# Terrain micro-features
+# ---- Tick journal (safe import; enables WORLD_PERSIST_MODE="journal") ----
 try:
-    from engine.terrain_noise import step as _terrain_step
+    from engine.world_journal import (
+        WorldJournal,
+        record_from_changes as _record_from_changes,
+        replay_journal as _replay_journal,
+    )
+    _JOURNAL_OK = True
 except Exception:
-    _terrain_step = _noop_world
+    _JOURNAL_OK = False
 
-# Weather (zone→regional drift); accepts prompt
+# ---- Background write-behind saver (safe import; opt-in) ----
 try:
-    from engine.weather_engine import step as _weather_step
+    from engine.world_saver import WorldSaver
+    _SAVER_OK = True
 except Exception:
-    _weather_step = _noop_world
+    _SAVER_OK = False
 
-# Symbolic diffusion across links; accepts prompt
+# ---- Incremental JSON encoder + dirty-marking hooks (safe import) ----
 try:
-    from engine.symbolic_diffusion import step as _diffuse_step
+    from engine.world_serializer import (
+        IncrementalWorldEncoder,
+        mark_dirty as _mark_dirty,
+        mark_zones_dirty as _mark_zones_dirty,
+        merge_changes as _merge_changes,
+    )
+    _SERIALIZER_OK = True
 except Exception:
-    _diffuse_step = _noop_world
+    _SERIALIZER_OK = False
+    def _mark_dirty(world, section=None, zone=None):  # fallback no-op
+        return None
+    def _mark_zones_dirty(world, zone_ids):  # fallback no-op
+        return None
 
-# Factions (presence per zone; affinity)
+# ---- Mutation-tracking worlds (safe import; their changed paths drive tick marking) ----
 try:
-    from engine.faction_engine import step as _faction_step
+    from engine.world_state import WorldState as _WorldState
 except Exception:
-    _faction_step = _noop_world
+    _WorldState = None
 
-# Economy (scarcity & prices)
-try:
-    from engine.economy_engine import step as _economy_step
-except Exception:
-    _economy_step = _noop_world
+# ---- Cached / parallel zone directory loader (lazy: pulls in concurrent.futures) ----
+_ZONE_DIR_LOADER = _ENGINES.lazy("zone_pack", "engine.zone_pack", "ZoneDirLoader")
 
-# Quest/event hooks
-try:
-    from engine.quest_hooks import apply_quest_hooks as _quest_hooks_apply
-except Exception:
-    _quest_hooks_apply = _noop_world
+# ---- Interned/array resonance mirror for batch overlays (lazy: pulls in numpy if present) ----
+_RESONANCE_STORE = _ENGINES.lazy("resonance_store", "engine.resonance_store", "ResonanceStore")
+_RESONANCE_DIFFUSION = _ENGINES.lazy("resonance_diffusion", "engine.resonance_diffusion", "ResonanceDiffusion")
 
-# Spawn/apply (if you have a spawn pipeline)
+# ---- Compiled zone-link graph (safe import; shared with weather/LOD) ----
 try:
-    from engine.spawn_engine import apply_spawns as _spawn_apply
+    from engine.graph_util import graph_for as _graph_for, mark_links_changed as _mark_links_changed
 except Exception:
-    _spawn_apply = _noop_world
+    _graph_for = None
+    def _mark_links_changed(zones: Dict[str, Any]) -> None:
+        pass
 
-# Zone updaters / traits (if present elsewhere)
+# ---- Memory-mapped history store (safe import; opt-in via enable_timeseries) ----
 try:
-    from engine.zone_engine import update_zones as _update_zones
+    from engine.timeseries_store import SeriesStore
+    _SERIES_OK = True
 except Exception:
-    def _update_zones(w: Dict[str, Any], prompt: str = "") -> Dict[str, Any]:
-        return w
+    _SERIES_OK = False
 
+# ---- Per-stage tick profiler (safe import; see get_tick_profile) ----
 try:
-    from engine.feature_engine import update_features as _update_features
+    from engine.tick_profiler import TickProfiler
+    _PROFILER_OK = True
 except Exception:
-    def _update_features(w: Dict[str, Any], prompt: str = "") -> Dict[str, Any]:
-        return w
+    _PROFILER_OK = False
 
+# ---- Typed zone records (safe import; opt-in via enable_zone_records) ----
 try:
-    from engine.expansion_engine import expand_world as _expand_world
+    from engine.zone_record import (
+        ZoneRecord,
+        compact_zones as _compact_zones,
+        expand_zones as _expand_zones,
+        json_default as _json_default,
+    )
+    _ZONE_RECORD_OK = True
+    _ZONE_TYPES: tuple = (dict, ZoneRecord)
 except Exception:
-    def _expand_world(w: Dict[str, Any], prompt: str = "") -> Dict[str, Any]:
-        return w
+    _ZONE_RECORD_OK = False
+    ZoneRecord = None  # type: ignore
+    _ZONE_TYPES = (dict,)
+    _json_default = None
+
+Number = Union[int, float]
+
+WORLD_DIR = Path("world_state")
+WORLD_FILE = WORLD_DIR / "world.json"
+ZONES_DIR = Path("zones")  # folder with standalone zone JSONs
+ZONE_PACK_FILE: Optional[Path] = None  # e.g. WORLD_DIR / "zones.pack" for fast cold starts
+_ZONE_LOADERS: Dict[str, Any] = {}
+
+# Numeric histories spill into a SeriesStore once enabled; world.json keeps a short tail
+TIMESERIES_TAIL = 32
+_SERIES: Optional[Any] = None
+
+# LOD scheduler (None = every zone every tick) and the zones due in the running tick
+_LOD: Optional["ZoneLOD"] = None
+_LOD_DUE: Optional[List[str]] = None
+
+# Resonance spreading along zone links (None = off; see enable_resonance_diffusion)
+_RES_DIFFUSION: Optional[Any] = None
+
+# Hydrate zones into ZoneRecords (compact, typed) instead of plain dicts
+_ZONE_RECORDS = False
+
+# Tick trace recorder (opt-in via start_recording)
+_RECORDER: Optional["TickRecorder"] = None
+
+class _RWLock:
+    """
+    Writer-preferring reader/writer lock. `with lock:` is exclusive (ticks, saves);
+    `with lock.read():` is shared, so readers only wait for writers, not each other.
+    read() nests, and is free for the thread holding the write side (so viewers
+    work from inside a tick). The write side is not reentrant: do not take it
+    while holding either side.
+    """
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+        self._owner: Optional[int] = None
+        self._local = threading.local()
+
+    def acquire(self) -> None:
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+            self._owner = threading.get_ident()
+
+    def release(self) -> None:
+        with self._cond:
+            self._writer = False
+            self._owner = None
+            self._cond.notify_all()
+
+    def __enter__(self) -> "_RWLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.release()
+
+    @contextmanager
+    def read(self):
+        depth = getattr(self._local, "depth", 0)
+        if depth or self._owner == threading.get_ident():
+            # Nested read: waiting here could deadlock behind a queued writer
+            self._local.depth = depth + 1
+            try:
+                yield
+            finally:
+                self._local.depth = depth
+            return
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        self._local.depth = 1
+        try:
+            yield
+        finally:
+            self._local.depth = 0
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+# Process-wide lock over in-memory world state. Ticks and saves hold the write side
+# only while they mutate/encode; disk I/O happens after it is released.
+_WORLD_LOCK = _RWLock()
+# Serializes disk writes of world.json + journal. Never held together with the
+# write side of _WORLD_LOCK, so a slow fsync does not stall ticks or readers.
+_IO_LOCK = threading.Lock()
+# Snapshot generations: taken under _WORLD_LOCK, persisted in order under _IO_LOCK
+_SNAP_GEN = 0
+_WRITTEN_GEN = 0
+# Journal mode: (gen, encoder changes) per snapshot, folded into one record when written
+_CHANGE_LOG: "deque[Tuple[int, Optional[Dict[str, Any]]]]" = deque()
+
+# ---------- Persistence mode ----------
+# "full":    rewrite world.json on every save/tick (legacy behavior)
+# "journal": append a compact per-tick delta to JOURNAL_FILE and fold it back
+#            into world.json every few ticks (see engine/world_journal.py)
+WORLD_PERSIST_MODE: str = "full"
+JOURNAL_FILE = WORLD_DIR / "world.journal"
+_JOURNAL: Optional["WorldJournal"] = None
+_SAVER: Optional["WorldSaver"] = None
+_PROFILER: Optional["TickProfiler"] = TickProfiler(dump_file=WORLD_DIR / "tick_profile.json") if _PROFILER_OK else None
+# Encoder for the live world; used only by callers holding _WORLD_LOCK
+_ENCODER: Optional["IncrementalWorldEncoder"] = IncrementalWorldEncoder(indent=2) if _SERIALIZER_OK else None
+# The tick save re-encodes only what was marked dirty. Edits made between ticks
+# (UI, scripts) are usually not marked, so by default each tick marks the whole
+# world first (a WorldState marks only its changed paths); set True only if
+# every out-of-tick writer calls mark_dirty.
+TICK_TRUSTS_MARKS: bool = False
+
+# ---------- Resonance (shared overlay) tunables ----------
+RESONANCE_DECAY_LAM: float = 0.93     # per-tick decay (0.90–0.96 good)
+RESONANCE_MAX_MARKERS: int = 50       # cap to keep JSON small
+RESONANCE_VIS_THRESH: float = 0.5     # visibility threshold for viewer helpers
+RESONANCE_DEFAULT_W: float = 1.0      # default weight bump per call
+RESONANCE_DEFAULT_D: float = 0.02     # default density bump per call
+
+# -------- Optional world-step modules (lazy; no-op fallbacks) --------
+_terrain_step = _ENGINES.lazy("terrain", "engine.terrain_noise", "step", fallback=_noop_world)
+_weather_step = _ENGINES.lazy("weather", "engine.weather_engine", "step", fallback=_noop_world)
+_diffuse_step = _ENGINES.lazy("diffusion", "engine.symbolic_diffusion", "step", fallback=_noop_world)
+_faction_step = _ENGINES.lazy("faction", "engine.faction_engine", "step", fallback=_noop_world)
+_economy_step = _ENGINES.lazy("economy", "engine.economy_engine", "step", fallback=_noop_world)
+_quest_hooks_apply = _ENGINES.lazy("quest_hooks", "engine.quest_hooks", "apply_quest_hooks", fallback=_noop_world)
+_spawn_apply = _ENGINES.lazy("spawn", "engine.spawn_engine", "apply_spawns", fallback=_noop_world)
+_update_zones = _ENGINES.lazy("zones", "engine.zone_engine", "update_zones", fallback=_noop_world)
+_update_features = _ENGINES.lazy("features", "engine.feature_engine", "update_features", fallback=_noop_world)
+_expand_world = _ENGINES.lazy("expansion", "engine.expansion_engine", "expand_world", fallback=_noop_world)
+
+def engine_status() -> Dict[str, Dict[str, Any]]:
+    """
+    Optional engines and whether they were resolved yet (nothing is imported):
+    {name: {"target": "module:attr", "state": "pending"|"loaded"|"missing",
+            "import_ms", "error"}}.
+    """
+    return _ENGINES.status()
+
+def resolve_engines() -> Dict[str, bool]:
+    """Import every optional engine now (e.g. to warm a long-running server); {name: available}."""
+    return _ENGINES.resolve_all()
 
 # ---------- Time & small helpers ----------
 def _utcnow_iso() -> str:
@@ -163,7 +315,7 @@ def _zones_as_dict(w: Dict[str, Any]) -> Dict[str, Any]:
     if isinstance(z, list):
         out: Dict[str, Any] = {}
         for i, entry in enumerate(z):
-            if not isinstance(entry, dict):
+            if not isinstance(entry, _ZONE_TYPES):
                 continue
             name = entry.get("name") or f"zone_{i}"
             entry["name"] = name
@@ -180,6 +332,7 @@ def _features_as_dict(w: Dict[str, Any]) -> Dict[str, Any]:
     # legacy carry-over of top-level individualism
     if "individualism" not in feats and isinstance(w.get("individualism"), (int, float)):
         feats["individualism"] = _safe_float(w["individualism"], 0.0)
+        _mark_dirty(w, "features")
     w["features"] = feats
     return feats
 
@@ -196,22 +349,105 @@ def _weather_as_dict(w: Dict[str, Any]) -> Dict[str, Any]:
     return w["weather"]
 
 # ---------- Resonance helpers ----------
-def _resonance_bucket() -> Dict[str, Any]:
-    # marker weights in "m", overlay density, timestamp counter, provenance
-    return {"m": {}, "density": 0.0, "t": 0, "prov": []}
+# Decay is lazy: every decay step only advances world["resonance_clock"]. Each
+# bucket keeps its values as of its own stamp "at" and is settled by
+# lam ** (clock - at) when it is next written or read, so a tick costs
+# O(touched buckets). Zone buckets are dropped when an expiry estimate (kept in
+# a per-world heap) comes due instead of by scanning every zone.
+RESONANCE_MARKER_FLOOR: float = 1e-3   # marker weights at/below this are dropped
+RESONANCE_DENSITY_FLOOR: float = 1e-5  # empty zone buckets below this density expire
+
+_RES_EXPIRY: Dict[int, Tuple[Any, List[Tuple[int, str]]]] = {}  # id(world) -> (zones dict, heap)
+_RES_STORES: Dict[int, Any] = {}   # id(world) -> ResonanceStore (re-syncs itself if the world changed)
+
+def _res_touch(world: Dict[str, Any], zone: Optional[str] = None) -> None:
+    st = _RES_STORES.get(id(world))
+    if st is not None:
+        if zone is None:
+            st.touch_all()
+        else:
+            st.touch(zone)
+
+def _resonance_bucket(at: int = 0) -> Dict[str, Any]:
+    # marker weights in "m", overlay density, timestamp counter, provenance,
+    # resonance clock tick the values are current at
+    return {"m": {}, "density": 0.0, "t": 0, "prov": [], "at": at}
 
 def _resonance_as_dict(w: Dict[str, Any]) -> Dict[str, Any]:
     r = w.get("resonance")
     if not isinstance(r, dict):
-        r = {"global": _resonance_bucket(), "zones": {}}
+        r = {"global": _resonance_bucket(_resonance_clock(w)), "zones": {}}
         w["resonance"] = r
         return r
     if "global" not in r or not isinstance(r["global"], dict):
-        r["global"] = _resonance_bucket()
+        r["global"] = _resonance_bucket(_resonance_clock(w))
+        _mark_dirty(w, "resonance")
     if "zones" not in r or not isinstance(r["zones"], dict):
         r["zones"] = {}
+        _mark_dirty(w, "resonance")
     return r
 
+def _resonance_clock(w: Dict[str, Any]) -> int:
+    return int(_safe_float(w.get("resonance_clock", 0), 0.0))
+
+def _settle_bucket(b: Dict[str, Any], now: int) -> None:
+    """Apply the decay steps a bucket has missed since its stamp (legacy buckets: none)."""
+    at = int(_safe_float(b.get("at", now), float(now)))
+    if at < now:
+        _decay_bucket(b, RESONANCE_DECAY_LAM ** (now - at))
+    b["at"] = now
+
+def _settled_view(b: Dict[str, Any], now: int) -> Tuple[Dict[str, float], float]:
+    """(markers, density) of a bucket as of `now`, without mutating it."""
+    k = now - int(_safe_float(b.get("at", now), float(now)))
+    density = _safe_float(b.get("density", 0.0), 0.0)
+    if k <= 0:
+        return b.get("m", {}), density
+    f = RESONANCE_DECAY_LAM ** k
+    return {m: v * f for m, v in b.get("m", {}).items() if v * f > RESONANCE_MARKER_FLOOR}, density * f
+
+def _steps_below(v: float, floor: float, strict: bool) -> int:
+    """Fewest decay steps k >= 1 after which v * lam**k drops below floor (<= unless strict)."""
+    lam = RESONANCE_DECAY_LAM
+    if not 0.0 < lam < 1.0:
+        return 1 << 62  # no decay: never expires
+    def below(k: int) -> bool:
+        x = v * lam ** k
+        return x < floor if strict else x <= floor
+    k = 1
+    if v > floor:
+        k = max(1, int(math.log(floor / v) / math.log(lam)))
+    while k > 1 and below(k - 1):
+        k -= 1
+    while not below(k):
+        k += 1
+    return k
+
+def _bucket_expiry(b: Dict[str, Any]) -> int:
+    """Clock tick at which a zone bucket (settled at b["at"]) becomes empty."""
+    m = b.get("m", {})
+    k = _steps_below(_safe_float(b.get("density", 0.0), 0.0), RESONANCE_DENSITY_FLOOR, True)
+    if m:
+        k = max(k, _steps_below(max(m.values()), RESONANCE_MARKER_FLOOR, False))
+    return int(b.get("at", 0)) + k
+
+def _expiry_heap(world: Dict[str, Any], zones: Dict[str, Any]) -> List[Tuple[int, str]]:
+    """Per-world expiry heap; rebuilt by one scan after a load/copy or a zones reset."""
+    hit = _RES_EXPIRY.get(id(world))
+    if hit is not None and hit[0] is zones:
+        return hit[1]
+    now = _resonance_clock(world)
+    heap = []
+    for zid, zb in zones.items():
+        if isinstance(zb, dict):
+            zb.setdefault("at", now)
+            heap.append((_bucket_expiry(zb), zid))
+    heapq.heapify(heap)
+    if len(_RES_EXPIRY) > 16:
+        _RES_EXPIRY.clear()
+    _RES_EXPIRY[id(world)] = (zones, heap)
+    return heap
+
 def add_resonance(
     world: Dict[str, Any],
     scope: str = "global",
@@ -228,12 +464,31 @@ def add_resonance(
     - d: density bump
     - provenance: optional {actor,item,zone,extra...} (kept compact & decayed)
     """
+    if _RECORDER is not None:
+        _RECORDER.note(world, "add_resonance", {"scope": scope, "zone": zone, "markers": markers,
+                                                "w": w, "d": d, "provenance": provenance})
+    _add_resonance(world, scope, zone, markers, w, d, provenance)
+
+def _add_resonance(
+    world: Dict[str, Any],
+    scope: str = "global",
+    zone: Optional[str] = None,
+    markers: Optional[List[str]] = None,
+    w: float = RESONANCE_DEFAULT_W,
+    d: float = RESONANCE_DEFAULT_D,
+    provenance: Optional[Dict[str, Any]] = None,
+) -> None:
     r = _resonance_as_dict(world)
+    now = _resonance_clock(world)
     bucket: Dict[str, Any]
     if scope == "zone" and zone:
-        bucket = r["zones"].setdefault(zone, _resonance_bucket())
+        _lod_touch(world, zone)
+        bucket = r["zones"].get(zone)
+        if not isinstance(bucket, dict):
+            bucket = r["zones"][zone] = _resonance_bucket(now)
     else:
         bucket = r["global"]
+    _settle_bucket(bucket, now)
 
     for k in (markers or []):
         bucket["m"][k] = bucket["m"].get(k, 0.0) + float(w)
@@ -247,33 +502,93 @@ def add_resonance(
         if len(prov) > 32:
             del prov[:-32]  # cap provenance list
 
-    # Trim least-significant markers if over cap
-    if len(bucket["m"]) > RESONANCE_MAX_MARKERS:
-        for k, _ in sorted(bucket["m"].items(), key=lambda kv: kv[1])[: len(bucket["m"]) - RESONANCE_MAX_MARKERS]:
-            bucket["m"].pop(k, None)
+    _trim_markers(bucket["m"])
+
+    if bucket is not r["global"]:
+        heapq.heappush(_expiry_heap(world, r["zones"]), (_bucket_expiry(bucket), zone))
+        _res_touch(world, zone)
+    _mark_dirty(world, "resonance")
+
+def _trim_markers(m: Dict[str, float]) -> None:
+    """Drop least-significant markers over the cap (partial selection: usually 1-2 go)."""
+    if len(m) > RESONANCE_MAX_MARKERS:
+        for k, _ in heapq.nsmallest(len(m) - RESONANCE_MAX_MARKERS, m.items(), key=lambda kv: kv[1]):
+            m.pop(k, None)
 
-def decay_resonance(world: Dict[str, Any], lam: float = RESONANCE_DECAY_LAM) -> None:
-    """Exponential decay of resonance weights/density across all buckets."""
+def _decay_bucket(b: Dict[str, Any], lam: float) -> None:
+    b["density"] = float(_safe_float(b.get("density", 0.0), 0.0) * lam)
+    b["m"] = {k: float(v * lam) for k, v in b.get("m", {}).items() if v * lam > RESONANCE_MARKER_FLOOR}
+
+def decay_resonance(world: Dict[str, Any], lam: float = RESONANCE_DECAY_LAM,
+                    zone_ids: Optional[List[str]] = None) -> None:
+    """
+    One exponential decay step of resonance weights/density across all buckets.
+    With the default lam this only advances the resonance clock and drops zone
+    buckets whose expiry came due; any other lam is applied eagerly to every
+    bucket. zone_ids is accepted for LOD callers but no longer needed: cold
+    buckets decay lazily like every other one.
+    """
     r = _resonance_as_dict(world)
-    def _decay_bucket(b: Dict[str, Any]) -> None:
-        b["density"] = float(_safe_float(b.get("density", 0.0), 0.0) * lam)
-        b["m"] = {k: float(v * lam) for k, v in b.get("m", {}).items() if v * lam > 1e-3}
-    _decay_bucket(r["global"])
-    for zname, zb in list(r["zones"].items()):
-        _decay_bucket(zb)
-        if zb["density"] < 1e-5 and not zb["m"]:
-            r["zones"].pop(zname, None)
+    zones = r["zones"]
+    heap = _expiry_heap(world, zones)
+    now = _resonance_clock(world)
+    if lam != RESONANCE_DECAY_LAM:
+        _settle_bucket(r["global"], now)
+        _decay_bucket(r["global"], lam)
+        for zname in list(zones):
+            zb = zones[zname]
+            _settle_bucket(zb, now)
+            _decay_bucket(zb, lam)
+            if zb["density"] < RESONANCE_DENSITY_FLOOR and not zb["m"]:
+                zones.pop(zname, None)
+        _RES_EXPIRY.pop(id(world), None)   # expiries moved; rescan on next use
+        _res_touch(world)
+        _mark_dirty(world, "resonance")
+        return
+    now += 1
+    world["resonance_clock"] = now
+    _mark_dirty(world, "resonance_clock")
+    dropped = False
+    while heap and heap[0][0] <= now:
+        _, zname = heapq.heappop(heap)
+        zb = zones.get(zname)
+        # stale entries (bucket bumped since, or already gone) are skipped;
+        # the bump pushed the bucket's new expiry
+        if isinstance(zb, dict) and _bucket_expiry(zb) <= now:
+            zones.pop(zname, None)
+            _res_touch(world, zname)
+            dropped = True
+    if dropped:
+        _mark_dirty(world, "resonance")
 
 def clear_resonance(world: Dict[str, Any], scope: Optional[str] = None, zone: Optional[str] = None) -> None:
     """Clear overlay (all, global, or specific zone)."""
     r = _resonance_as_dict(world)
+    now = _resonance_clock(world)
     if scope == "zone" and zone:
         r["zones"].pop(zone, None)
+        _res_touch(world, zone)
+        _mark_dirty(world, "resonance")
         return
     if scope == "global":
-        r["global"] = _resonance_bucket()
+        r["global"] = _resonance_bucket(now)
+        _mark_dirty(world, "resonance")
         return
-    world["resonance"] = {"global": _resonance_bucket(), "zones": {}}
+    world["resonance"] = {"global": _resonance_bucket(now), "zones": {}}
+
+def resonance_bucket(world: Dict[str, Any], zone: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Decayed-to-now copy of a bucket ({"m", "density", "t", "prov"}): the global
+    one, or a zone's (empty if it has none). Stored weights are only current as
+    of the bucket's "at" stamp, so readers should go through this or the overlay.
+    """
+    r = _resonance_as_dict(world)
+    b = r["global"] if zone is None else r["zones"].get(zone)
+    if not isinstance(b, dict):
+        return _resonance_bucket(_resonance_clock(world))
+    m, density = _settled_view(b, _resonance_clock(world))
+    return {"m": dict(m), "density": float(density), "t": int(b.get("t", 0)),
+            "prov": list(b.get("prov", [])), "at": _resonance_clock(world)}
 
 def resonance_overlay(world: Dict[str, Any], zone: Optional[str] = None, beta: float = 0.15, gamma: float = 0.35) -> Dict[str, Any]:
     """
@@ -281,21 +596,42 @@ def resonance_overlay(world: Dict[str, Any], zone: Optional[str] = None, beta: f
     for a given zone, without mutating world.
     """
     r = _resonance_as_dict(world)
-    G = r.get("global", _resonance_bucket())
-    Z = r.get("zones", {}).get(zone or "", _resonance_bucket())
+    now = _resonance_clock(world)
+    Gm, Gd = _settled_view(r.get("global", _resonance_bucket(now)), now)
+    Zm, Zd = _settled_view(r.get("zones", {}).get(zone or "", _resonance_bucket(now)), now)
     overlay: Dict[str, float] = {}
-    for k, v in G["m"].items(): overlay[k] = overlay.get(k, 0.0) + beta * v
-    for k, v in Z["m"].items(): overlay[k] = overlay.get(k, 0.0) + gamma * v
+    for k, v in Gm.items(): overlay[k] = overlay.get(k, 0.0) + beta * v
+    for k, v in Zm.items(): overlay[k] = overlay.get(k, 0.0) + gamma * v
     markers = [k for k, v in overlay.items() if v >= RESONANCE_VIS_THRESH]
-    density = beta * _safe_float(G.get("density", 0.0), 0.0) + gamma * _safe_float(Z.get("density", 0.0), 0.0)
+    density = beta * Gd + gamma * Zd
     return {"markers": markers, "density": float(density)}
 
+def resonance_overlay_all(world: Dict[str, Any], zone_ids: Optional[List[str]] = None,
+                          beta: float = 0.15, gamma: float = 0.35) -> Dict[str, Dict[str, Any]]:
+    """
+    resonance_overlay for many zones at once (default: every zone in the world),
+    as {zone: {"markers", "density"}}. Uses an interned, array-backed mirror of
+    the buckets (numpy when installed) that reloads only bumped/expired ones,
+    so a map view can ask for every zone each frame. Does not mutate world.
+    """
+    r = _resonance_as_dict(world)
+    ids = list(_zones_as_dict(world)) if zone_ids is None else list(zone_ids)
+    if not _RESONANCE_STORE.available():
+        return {z: resonance_overlay(world, z, beta, gamma) for z in ids}
+    st = _RES_STORES.get(id(world))
+    if st is None:
+        if len(_RES_STORES) > 16:
+            _RES_STORES.clear()
+        st = _RES_STORES.setdefault(id(world), _RESONANCE_STORE(RESONANCE_DECAY_LAM, RESONANCE_MARKER_FLOOR))
+    return st.overlay_all(r, _resonance_clock(world), ids, beta, gamma, RESONANCE_VIS_THRESH)
+
 # ---------- Defaults & hydration ----------
 def get_default_world() -> Dict[str, Any]:
     """Safe default world structure."""
     return {
         "session_seed": int(time.time()) & 0xFFFFFFFF,
         "time": 0,  # integer tick counter (back-compat; clock will upgrade to dict)
+        "resonance_clock": 0,        # resonance decay steps applied (buckets settle lazily)
         "zones": {},
         "symbolic_density": 0.0,     # global index (smoothed)
         "symbolic_flux": {"rising": [], "falling": []},
@@ -339,12 +675,15 @@ def _hydrate_world(data: Optional[Dict[str, Any]]) -> Dict[str, Any]:
     """Ensure required keys exist without clobbering existing ones."""
     w = _as_dict(data)
     _zones_as_dict(w)
+    if _ZONE_RECORDS:
+        _compact_zones(w)   # records pass through: each zone is normalized once
     _features_as_dict(w)
     _weather_as_dict(w)
     _resonance_as_dict(w)
 
     w.setdefault("session_seed", int(time.time()) & 0xFFFFFFFF)
     w.setdefault("time", 0)
+    w.setdefault("resonance_clock", 0)
     w.setdefault("symbolic_density", 0.0)
     w.setdefault("symbolic_flux", {"rising": [], "falling": []})
     w.setdefault("symbolic_energy", {})
@@ -377,6 +716,14 @@ def _hydrate_world(data: Optional[Dict[str, Any]]) -> Dict[str, Any]:
     w["last_update"] = _utcnow_iso()
     return w
 
+def world_read_lock():
+    """
+    Shared side of the world lock for readers of a live world dict (viewers, UI
+    panels): `with world_read_lock(): render(world)`. Readers run concurrently and
+    only wait for an in-progress tick/save encode, never for disk writes.
+    """
+    return _WORLD_LOCK.read()
+
 # ---------- Salvage / atomic I/O ----------
 def _salvage_first_json(text: str) -> Optional[Dict[str, Any]]:
     """Keep the first valid top-level JSON object; drop trailing garbage if present."""
@@ -392,15 +739,15 @@ def _salvage_first_json(text: str) -> Optional[Dict[str, Any]]:
     except Exception:
         return None
 
-def _atomic_write_json(path: Path, data: Dict[str, Any], *, retries: int = 2, delay_s: float = 0.01) -> None:
-    """Atomic JSON write with small retry loop."""
+def _atomic_write_text(path: Path, text: str, *, retries: int = 2, delay_s: float = 0.01) -> None:
+    """Atomic write of pre-encoded JSON text with small retry loop."""
     attempt = 0
     last_err: Optional[Exception] = None
     while attempt <= retries:
         tmp_fd, tmp_path = tempfile.mkstemp(prefix=path.name + ".", dir=str(path.parent))
         try:
             with os.fdopen(tmp_fd, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+                f.write(text)
                 f.write("\n")
                 f.flush()
                 os.fsync(f.fileno())
@@ -418,6 +765,20 @@ def _atomic_write_json(path: Path, data: Dict[str, Any], *, retries: int = 2, de
     if last_err:
         raise last_err
 
+def _atomic_write_json(path: Path, data: Dict[str, Any], *, retries: int = 2, delay_s: float = 0.01) -> None:
+    """Atomic JSON write with small retry loop."""
+    _atomic_write_text(path, json.dumps(data, indent=2, ensure_ascii=False, default=_json_default),
+                       retries=retries, delay_s=delay_s)
+
+def _encode_world(w: Dict[str, Any], *, cached: bool = True) -> str:
+    """
+    world.json text. cached=True reuses fragments of unchanged sections/zones via
+    the shared encoder (caller must hold _WORLD_LOCK); cached=False encodes from scratch.
+    """
+    if cached and _ENCODER is not None:
+        return _ENCODER.encode(w)
+    return json.dumps(w, indent=2, ensure_ascii=False, default=_json_default)
+
 def _rotate_corrupt_backup(src: Path) -> None:
     """Keep a single .corrupt backup; if exists, add timestamped one."""
     corrupt = src.with_suffix(".corrupt")
@@ -433,6 +794,8 @@ def _rotate_corrupt_backup(src: Path) -> None:
 # ---------- Standalone zone loader ----------
 def _zone_defaults(z: Dict[str, Any], fallback_name: str) -> Dict[str, Any]:
     # Ensure minimal shape and sensible defaults
+    if not isinstance(z, dict):
+        return z   # ZoneRecord: normalized when it was built
     name = str(z.get("name") or z.get("id") or fallback_name)
     z["name"] = name
     z.setdefault("label", name.replace("_", " ").title())
@@ -453,11 +816,22 @@ def _zone_defaults(z: Dict[str, Any], fallback_name: str) -> Dict[str, Any]:
     z.setdefault("version", "1.0.0")
     return z
 
-def _load_zones_from_dir(directory: Path) -> Dict[str, Dict[str, Any]]:
+def _load_zones_from_dir(directory: Path, *, skip: Optional[Container[str]] = None) -> Dict[str, Dict[str, Any]]:
     """
     Reads *.json from `directory` and returns {zone_name: zone_dict}.
     Non-crashing: skips files that aren’t valid dicts.
+    Names in `skip` may be left out. Unchanged files are served from a
+    per-directory cache (see engine/zone_pack.py) when available.
     """
+    if _ZONE_DIR_LOADER.available():
+        key = str(Path(directory).resolve())
+        loader = _ZONE_LOADERS.get(key)
+        if loader is None:
+            loader = _ZONE_LOADERS[key] = _ZONE_DIR_LOADER(
+                Path(directory), lambda z, stem: _zone_defaults(z, fallback_name=stem), pack_path=ZONE_PACK_FILE
+            )
+        return loader.load(skip=skip)
+
     out: Dict[str, Dict[str, Any]] = {}
     if not directory.exists() or not directory.is_dir():
         return out
@@ -471,6 +845,11 @@ def _load_zones_from_dir(directory: Path) -> Dict[str, Dict[str, Any]]:
             print(f"[WARN] Could not load zone '{p}': {e}")
     return out
 
+def _zone_dir_count(directory: Path) -> int:
+    """Zones found by the last cached load of `directory` (0 without the cache)."""
+    loader = _ZONE_LOADERS.get(str(Path(directory).resolve()))
+    return loader.last_count if loader is not None else 0
+
 def _autolink_ring(zones: Dict[str, Dict[str, Any]]) -> None:
     """
     Create a simple ring of links among all zones that currently have none.
@@ -480,6 +859,7 @@ def _autolink_ring(zones: Dict[str, Dict[str, Any]]) -> None:
     n = len(keys)
     if n <= 1:
         return
+    changed = False
     for i, k in enumerate(keys):
         z = zones[k]
         z.setdefault("links", [])
@@ -490,6 +870,9 @@ def _autolink_ring(zones: Dict[str, Dict[str, Any]]) -> None:
         for t in (a, b):
             if t != k and t not in z["links"]:
                 z["links"].append(t)
+                changed = True
+    if changed:
+        _mark_links_changed(zones)
 
 def _merge_loaded_zones(world: Dict[str, Any], loaded: Dict[str, Dict[str, Any]], *, overwrite: bool = False) -> None:
     """
@@ -501,30 +884,223 @@ def _merge_loaded_zones(world: Dict[str, Any], loaded: Dict[str, Dict[str, Any]]
         if name in zones and not overwrite:
             continue
         zones[name] = z
+    _mark_links_changed(zones)
 
 # ---------- Persistence ----------
-def save_world(world_data: Dict[str, Any]) -> None:
-    """Atomic write with locking to avoid races between timers."""
-    if not _ensure_paths():
-        return
-    hydrated = _hydrate_world(world_data)
+def set_persist_mode(mode: str = "full", **journal_opts: Any) -> str:
+    """
+    Select how ticks are persisted: "full" (rewrite world.json) or "journal"
+    (append deltas, checkpoint periodically). journal_opts are passed to
+    WorldJournal (checkpoint_every, max_bytes, fsync). Returns the active mode;
+    falls back to "full" if the journal (or serializer, which supplies the
+    per-tick changes) is unavailable.
+    The switch happens under _WORLD_LOCK only; writes already handed off finish
+    under the mode they started with (each write reads _JOURNAL once), and a new
+    journal starts unprimed, so its first write is a checkpoint. Queued
+    background saves are drained after the lock is released.
+    """
+    global WORLD_PERSIST_MODE, _JOURNAL
+    if mode == "journal" and not (_JOURNAL_OK and _SERIALIZER_OK):
+        print("[WARN] set_persist_mode: world_journal or world_serializer unavailable; using full saves")
+        mode = "full"
     with _WORLD_LOCK:
-        _atomic_write_json(WORLD_FILE, hydrated)
+        if mode == "journal":
+            _JOURNAL = WorldJournal(JOURNAL_FILE, **journal_opts)
+            WORLD_PERSIST_MODE = "journal"
+        else:
+            _JOURNAL = None
+            WORLD_PERSIST_MODE = "full"
+        active = WORLD_PERSIST_MODE
+    saver = _SAVER
+    if saver is not None:
+        saver.flush()
+    return active
+
+def _truncate_stale_journal() -> None:
+    """Full mode: drop any log left over from an earlier journal session."""
+    try:
+        if JOURNAL_FILE.exists() and JOURNAL_FILE.stat().st_size > 0:
+            JOURNAL_FILE.write_text("", encoding="utf-8")
+    except Exception as e:
+        print(f"[WARN] could not truncate {JOURNAL_FILE}: {e}")
+
+def _checkpoint_locked(w: Dict[str, Any], journal: Optional["WorldJournal"], *, cached: bool = True) -> None:
+    """Full world.json write that supersedes the journal. Caller holds _IO_LOCK."""
+    if journal is not None:
+        journal.mark_checkpoint(w)
+    _atomic_write_text(WORLD_FILE, _encode_world(w, cached=cached))
+    if journal is not None:
+        journal.reset(w)
+        return
+    _truncate_stale_journal()
 
-def load_world() -> Dict[str, Any]:
+def _persist_tick_locked(journal: "WorldJournal", text: str, changes: Optional[Dict[str, Any]]) -> None:
     """
-    Load, salvage if needed, hydrate, validate, and (if needed) auto-save world data.
-    Guarantees presence of density_log and other required keys.
+    Per-tick persistence: a journal record built from the snapshot's encoder
+    changes when possible, else a full checkpoint. Caller holds _IO_LOCK.
     """
-    if not _ensure_paths():
-        print("[WARN] Using default world due to path issue.")
-        return get_default_world()
+    if changes is not None and not changes["full"] and not journal.needs_checkpoint():
+        if journal.append(_record_from_changes(changes)) is not None:
+            return
+    _checkpoint_locked(json.loads(text), journal, cached=False)
+
+def _take_changes(gen: int) -> Optional[Dict[str, Any]]:
+    """Merged changes of the snapshots up to `gen` (None if unknown). Caller holds _IO_LOCK."""
+    merged: Optional[Dict[str, Any]] = None
+    first = True
+    while _CHANGE_LOG and _CHANGE_LOG[0][0] <= gen:
+        _, ch = _CHANGE_LOG.popleft()
+        merged = ch if first else _merge_changes(merged, ch)
+        first = False
+    return merged
+
+def _snapshot(w: Dict[str, Any]) -> Tuple[str, int]:
+    """
+    Immutable hand-off for persistence: the encoded world text plus its generation.
+    Only dirty sections/zones are re-encoded, so this stays cheap on the tick thread.
+    In journal mode the encoder's changes are logged for the journal record.
+    Caller holds _WORLD_LOCK (write side).
+    """
+    global _SNAP_GEN
+    _SNAP_GEN += 1
+    if _JOURNAL is None or _ENCODER is None:
+        return _encode_world(w), _SNAP_GEN
+    text = _ENCODER.encode(w, changes=True)
+    _CHANGE_LOG.append((_SNAP_GEN, _ENCODER.last_changes))
+    return text, _SNAP_GEN
+
+def _write_snapshot(text: str, full: bool, gen: int) -> bool:
+    """
+    Persist an encoded snapshot outside _WORLD_LOCK (tick, save_world, saver thread).
+    A snapshot older than one already on disk is dropped, so writers racing for
+    _IO_LOCK can never roll world.json back. Returns True if it was written.
+    """
+    global _WRITTEN_GEN
+    with _IO_LOCK:
+        if gen <= _WRITTEN_GEN:
+            return False
+        changes = _take_changes(gen)
+        journal = _JOURNAL   # read once: set_persist_mode may swap it mid-write
+        if journal is None:
+            _atomic_write_text(WORLD_FILE, text)
+            _truncate_stale_journal()
+        else:
+            try:
+                if full:
+                    _checkpoint_locked(json.loads(text), journal, cached=False)
+                else:
+                    _persist_tick_locked(journal, text, changes)
+            except Exception:
+                journal.invalidate()   # these changes are consumed: checkpoint next time
+                raise
+        _WRITTEN_GEN = gen
+    return True
+
+def _saver_write(job: Tuple[str, bool, int]) -> None:
+    """Background saver write: same journal/checkpoint policy as the tick path."""
+    _write_snapshot(*job)
+
+def _saver_merge(old: Tuple[str, bool, int], new: Tuple[str, bool, int]) -> Tuple[str, bool, int]:
+    """Coalesced jobs write the newest text, still as a checkpoint if either asked for one."""
+    return (new[0], old[1] or new[1], new[2])
 
+# ---------- Background saver (opt-in) ----------
+def start_background_saver(**saver_opts: Any) -> Optional["WorldSaver"]:
+    """
+    Move save_world and the save-on-tick write onto a background thread.
+    Requests are coalesced (only the latest snapshot is written) and each write
+    is one fsync, so slow storage means fewer writes rather than slower ticks.
+    saver_opts go to WorldSaver (linger_s, min_interval_s). Returns the saver,
+    or None if the module is unavailable (saves stay synchronous).
+    """
+    global _SAVER
+    if not _SAVER_OK:
+        print("[WARN] start_background_saver: world_saver unavailable; saves stay synchronous")
+        return None
+    if _SAVER is None:
+        _SAVER = WorldSaver(_saver_write, merge=_saver_merge, **saver_opts)
+    return _SAVER
+
+def stop_background_saver(*, flush: bool = True, timeout: Optional[float] = None) -> None:
+    """Stop the background saver (writing any pending snapshot first when flush=True)."""
+    global _SAVER
+    saver, _SAVER = _SAVER, None
+    if saver is not None:
+        saver.stop(flush=flush, timeout=timeout)
+
+def flush_world(timeout: Optional[float] = None) -> bool:
+    """Wait until every queued background save is on disk (True if durable)."""
+    return _SAVER.flush(timeout=timeout) if _SAVER is not None else True
+
+def wait_world_durable(gen: Optional[int] = None, timeout: Optional[float] = None) -> bool:
+    """Wait for a save generation returned by save_world (default: latest)."""
+    return _SAVER.wait_durable(gen, timeout=timeout) if _SAVER is not None else True
+
+@atexit.register
+def _flush_saver_at_exit() -> None:
+    try:
+        stop_background_saver(flush=True, timeout=10.0)
+    except Exception:
+        pass
+
+def save_world(world_data: Dict[str, Any]) -> Optional[int]:
+    """
+    Atomic write with locking to avoid races between timers (also folds the journal).
+    The world is encoded under _WORLD_LOCK and written after releasing it.
+    With the background saver running this only hands off a snapshot and returns
+    its generation (see wait_world_durable); otherwise it writes synchronously.
+    """
+    if not _ensure_paths():
+        return None
+    hydrated = _hydrate_world(world_data)
     with _WORLD_LOCK:
+        _mark_dirty(hydrated)   # callers may have edited in place without marking
+        text, gen = _snapshot(hydrated)
+        if _SAVER is not None:
+            return _SAVER.submit((text, True, gen))
+    _write_snapshot(text, True, gen)
+    return None
+
+def _world_file_id() -> Optional[Tuple[int, int]]:
+    try:
+        st = WORLD_FILE.stat()
+        return (st.st_ino, st.st_mtime_ns)
+    except OSError:
+        return None
+
+def _read_world_files(retries: int = 3) -> Any:
+    """
+    Read world.json (+ journal replay) without blocking on writers.
+    world.json is only ever swapped atomically, so a read is retried if the file
+    was replaced mid-read (checkpoint raced the journal read); after `retries`
+    attempts, or when the file must be created/repaired, fall back to _IO_LOCK.
+    """
+    for _ in range(max(0, retries)):
+        before = _world_file_id()
+        if before is None:
+            break
+        try:
+            data = _salvage_first_json(WORLD_FILE.read_text(encoding="utf-8"))
+        except Exception:
+            break
+        if data is None:
+            break
+        n = 0
+        if isinstance(data, dict) and _JOURNAL_OK:
+            try:
+                data, n = _replay_journal(data, JOURNAL_FILE)
+            except Exception as e:
+                print(f"[WARN] load_world: journal replay failed: {e}")
+        if _world_file_id() == before:
+            if n:
+                print(f"[INFO] load_world: replayed {n} journaled tick(s)")
+            return data
+
+    with _IO_LOCK:
         if not WORLD_FILE.exists():
             print(f"[WARN] {WORLD_FILE} not found. Creating default world.")
             w = get_default_world()
-            _atomic_write_json(WORLD_FILE, w)
+            _checkpoint_locked(w, _JOURNAL, cached=False)
 
         # Load JSON (with salvage)
         try:
@@ -533,11 +1109,33 @@ def load_world() -> Dict[str, Any]:
             if data is None:
                 _rotate_corrupt_backup(WORLD_FILE)
                 data = get_default_world()
-                _atomic_write_json(WORLD_FILE, data)
+                _checkpoint_locked(data, _JOURNAL, cached=False)
         except Exception as e:
             print(f"[ERROR] Failed to read {WORLD_FILE}: {e}")
             data = get_default_world()
-            _atomic_write_json(WORLD_FILE, data)
+            _checkpoint_locked(data, _JOURNAL, cached=False)
+
+        # Replay journaled ticks written after the last checkpoint
+        if isinstance(data, dict) and _JOURNAL_OK:
+            try:
+                data, n = _replay_journal(data, JOURNAL_FILE)
+                if n:
+                    print(f"[INFO] load_world: replayed {n} journaled tick(s)")
+            except Exception as e:
+                print(f"[WARN] load_world: journal replay failed: {e}")
+    return data
+
+def load_world() -> Dict[str, Any]:
+    """
+    Load, salvage if needed, hydrate, validate, and (if needed) auto-save world data.
+    Guarantees presence of density_log and other required keys.
+    Reads never wait on ticks or on an in-flight fsync (see _read_world_files).
+    """
+    if not _ensure_paths():
+        print("[WARN] Using default world due to path issue.")
+        return get_default_world()
+
+    data = _read_world_files()
 
     if not isinstance(data, dict):
         print("[WARNING] world.json is not a dict. Resetting to default.")
@@ -576,9 +1174,10 @@ def load_world() -> Dict[str, Any]:
 
     # ---- Load standalone zones (./zones/*.json) and merge (no overwrite by default) ----
     try:
-        loaded = _load_zones_from_dir(ZONES_DIR)
+        loaded = _load_zones_from_dir(ZONES_DIR, skip=_zones_as_dict(w))
         if loaded:
             _merge_loaded_zones(w, loaded, overwrite=False)
+        if loaded or _zone_dir_count(ZONES_DIR):
             _autolink_ring(_zones_as_dict(w))
     except Exception as e:
         print(f"[WARN] load_world: could not load zones from {ZONES_DIR}: {e}")
@@ -605,17 +1204,26 @@ def _feature_add(world_features: Dict[str, Any], key: str, amount: Number) -> No
 # ---------- World mutation helpers (public API kept) ----------
 def update_zone_density(world_data: Dict[str, Any], zone_name: str, delta: float) -> None:
     """Adjusts the symbolic density of a given zone (kept for backward compat)."""
+    if _RECORDER is not None:
+        _RECORDER.note(world_data, "update_zone_density", {"zone_name": zone_name, "delta": delta})
     zones = _zones_as_dict(world_data)
     zone = zones.setdefault(zone_name, {})
     sd = _safe_float(zone.get("symbolic_density", zone.get("density", 0.0)), 0.0)
     zone["symbolic_density"] = float(sd + float(delta))
     if "density" in zone:
         zone["density"] = zone["symbolic_density"]
+    _mark_dirty(world_data, "zones", zone_name)
 
 def modify_symbolic_energy(world_data: Dict[str, Any], key: str, amount: float) -> None:
     """Modifies the symbolic energy value for a specific key."""
+    if _RECORDER is not None:
+        _RECORDER.note(world_data, "modify_symbolic_energy", {"key": key, "amount": amount})
+    _modify_symbolic_energy(world_data, key, amount)
+
+def _modify_symbolic_energy(world_data: Dict[str, Any], key: str, amount: float) -> None:
     se = world_data.setdefault("symbolic_energy", {})
     se[key] = float(_safe_float(se.get(key, 0.0), 0.0) + float(amount))
+    _mark_dirty(world_data, "symbolic_energy")
 
 # ---------- Delta calculation (compat) ----------
 def calculate_world_delta(character: Dict[str, Any], world: Dict[str, Any], interpretation: Dict[str, Any]) -> Dict[str, Any]:
@@ -674,11 +1282,15 @@ def apply_world_delta(world: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str,
     Apply symbolic deltas to the world state.
     - merges zones entries
     - adds to numeric features or to 'value' if feature is a dict
-    - writes a lightweight snapshot into symbolic_energy_history
+    - records changed zone energies/features into symbolic_energy_history
     - updates last_update
     - integrates shared resonance overlay if present
     """
+    if _RECORDER is not None:
+        _RECORDER.note(world, "apply_world_delta", {"delta": delta})
     _features_as_dict(world)
+    # zone ids whose energy the delta may have changed (None: rescan every zone)
+    touched: Optional[List[str]] = [] if isinstance(world.get("zones"), dict) else None
     _zones_as_dict(world)
     _weather_as_dict(world)
     _resonance_as_dict(world)
@@ -688,11 +1300,16 @@ def apply_world_delta(world: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str,
         if key == "features" and isinstance(change, dict):
             for f_key, f_val in change.items():
                 _feature_add(world["features"], f_key, _safe_float(f_val, 0.0))
+            _mark_dirty(world, "features")
             continue
 
         # Zones merge (+ pick up marker hints for resonance)
         if key == "zones" and isinstance(change, dict):
             for zone_name, zone_data in change.items():
+                _mark_dirty(world, "zones", zone_name)
+                _lod_touch(world, zone_name)
+                if touched is not None:
+                    touched.append(zone_name)
                 z = world["zones"].setdefault(zone_name, {})
                 if isinstance(zone_data, dict):
                     for k, v in zone_data.items():
@@ -700,6 +1317,8 @@ def apply_world_delta(world: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str,
                             z[k] = float(v)
                         else:
                             z[k] = v
+                    if "links" in zone_data:
+                        _mark_links_changed(world["zones"])
                     # if caller included markers/marker_add, feed resonance
                     markers = []
                     if isinstance(zone_data.get("markers"), list):
@@ -707,9 +1326,10 @@ def apply_world_delta(world: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str,
                     if isinstance(zone_data.get("markers_added"), list):
                         markers += [str(m) for m in zone_data["markers_added"]]
                     if markers:
-                        add_resonance(world, scope="zone", zone=zone_name, markers=markers, w=1.0, d=0.02)
+                        _add_resonance(world, scope="zone", zone=zone_name, markers=markers, w=1.0, d=0.02)
                 else:
                     world["zones"][zone_name] = zone_data
+                    _mark_links_changed(world["zones"])
             continue
 
         # Global scalar fields we know
@@ -721,7 +1341,7 @@ def apply_world_delta(world: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str,
         if key == "resonance" and isinstance(change, dict):
             g = change.get("global")
             if isinstance(g, dict):
-                add_resonance(
+                _add_resonance(
                     world,
                     scope="global",
                     markers=[str(m) for m in g.get("markers", [])],
@@ -733,7 +1353,7 @@ def apply_world_delta(world: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str,
                 for zn, zc in zs.items():
                     if not isinstance(zc, dict):
                         continue
-                    add_resonance(
+                    _add_resonance(
                         world,
                         scope="zone",
                         zone=str(zn),
@@ -744,7 +1364,8 @@ def apply_world_delta(world: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str,
             continue
 
         # Fallback: treat as symbolic_energy component bump
-        modify_symbolic_energy(world, key, _safe_float(change, 0.0))
+        _modify_symbolic_energy(world, key, _safe_float(change, 0.0))
+        _mark_dirty(world, "symbolic_energy")
 
     # Maintain legacy density_log (only if global density present)
     if isinstance(world.get("symbolic_density"), (int, float)):
@@ -753,17 +1374,9 @@ def apply_world_delta(world: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str,
             dl.append(float(world["symbolic_density"]))
             world["density_log"] = dl[-300:]
 
-    # Append a compact history entry
-    se_hist = world.setdefault("symbolic_energy_history", [])
+    # Append a compact (sparse) history entry
     try:
-        se_hist.append({
-            "timestamp": _utcnow_iso(),
-            "zones": {k: {"energy": _safe_float(v.get("energy", 0.0), 0.0)}
-                      for k, v in _zones_as_dict(world).items() if isinstance(v, dict)},
-            "features": world.get("features", {}),
-        })
-        if len(se_hist) > 300:
-            del se_hist[:-300]
+        _record_energy_history(world, touched)
     except Exception:
         pass
 
@@ -783,38 +1396,723 @@ def _record_agency(world: Dict[str, Any], effects: Any) -> None:
     log.append({"t": _utcnow_iso(), "effects": effects})
     if len(log) > 300:
         del log[:-300]
+    _mark_dirty(world, "agency_log")
+
+# ---------- History store (density_log & metrics histories) ----------
+def enable_timeseries(root: Optional[Path] = None, *, tail: int = TIMESERIES_TAIL) -> bool:
+    """
+    Move numeric histories (density_log, metrics.*_history, world_traits_history)
+    into memory-mapped ring buffers under `root` (default world_state/series).
+    world.json keeps the newest `tail` points plus world["series"] handles.
+    Returns False if the store module is unavailable.
+    """
+    global _SERIES, TIMESERIES_TAIL
+    if not _SERIES_OK:
+        print("[WARN] enable_timeseries: timeseries_store unavailable; histories stay in JSON")
+        return False
+    with _WORLD_LOCK:
+        if _SERIES is not None:
+            _SERIES.close()
+        _SERIES = SeriesStore(Path(root) if root else WORLD_DIR / "series")
+        TIMESERIES_TAIL = max(1, int(tail))
+    return True
+
+def disable_timeseries() -> None:
+    global _SERIES
+    with _WORLD_LOCK:
+        if _SERIES is not None:
+            _SERIES.close()
+        _SERIES = None
+
+def _history_lists(world: Dict[str, Any]):
+    """Yield (series key, owning dict, field) for every spillable history list."""
+    yield "density_log", world, "density_log"
+    m = world.get("metrics")
+    if isinstance(m, dict):
+        yield "metrics.symbolic_density_history", m, "symbolic_density_history"
+        yield "metrics.agi_index_history", m, "agi_index_history"
+    th = world.get("world_traits_history")
+    if isinstance(th, dict):
+        for path in list(th.keys()):
+            yield f"world_traits_history.{path}", th, path
+
+def _history_point(item: Any) -> Optional[Tuple[Optional[int], float]]:
+    """(tick or None, value) for a float or a {"t"/"tick", "v"/"value"} record; None if not numeric."""
+    if isinstance(item, (int, float)) and not isinstance(item, bool):
+        return None, float(item)
+    if not isinstance(item, dict):
+        return None
+    v = item.get("v", item.get("value"))
+    if not isinstance(v, (int, float)) or isinstance(v, bool):
+        return None
+    t = item.get("tick", item.get("time"))
+    if isinstance(t, (int, float)) and not isinstance(t, bool):
+        return int(t), float(v)
+    ts = item.get("t", item.get("timestamp"))
+    if isinstance(ts, str):
+        try:
+            return int(datetime.fromisoformat(ts).timestamp() * 1000), float(v)
+        except Exception:
+            return None
+    return None, float(v)
+
+def _spill_histories(world: Dict[str, Any]) -> None:
+    """Append history points older than the JSON tail to the store, then trim."""
+    store = _SERIES
+    if store is None:
+        return
+    handles = world.setdefault("series", {})
+    for key, owner, field in _history_lists(world):
+        lst = owner.get(field)
+        if not isinstance(lst, list) or len(lst) <= TIMESERIES_TAIL:
+            continue
+        overflow = lst[:len(lst) - TIMESERIES_TAIL]
+        points = [_history_point(x) for x in overflow]
+        if any(p is None for p in points):
+            continue  # non-numeric records: leave to the regular caps
+        ref = handles.get(key)
+        if not isinstance(ref, dict):
+            ref = handles[key] = {"handle": SeriesStore.handle_for(key), "total": 0}
+        s = store.series(ref["handle"])
+        # Store ahead of the saved world (crash/rollback before save): drop the unsaved points
+        if s.total > int(ref.get("total", 0)):
+            s.truncate_to(int(ref.get("total", 0)))
+        s.extend(points)
+        ref["total"] = s.total
+        del lst[:len(lst) - TIMESERIES_TAIL]
+        _mark_dirty(world, key.split(".", 1)[0])
+    _mark_dirty(world, "series")
+
+def read_history(world: Dict[str, Any], key: str, last: Optional[int] = None) -> List[float]:
+    """
+    Full numeric history for `key` ("density_log", "metrics.symbolic_density_history",
+    "world_traits_history.<path>"): store points followed by the JSON tail.
+    """
+    owner_field = {k: (o, f) for k, o, f in _history_lists(world)}.get(key)
+    tail: List[float] = []
+    if owner_field:
+        o, f = owner_field
+        for x in (o.get(f) or []):
+            p = _history_point(x)
+            if p is not None:
+                tail.append(p[1])
+    ref = (world.get("series") or {}).get(key)
+    if _SERIES is None or not isinstance(ref, dict):
+        return tail[-last:] if last else tail
+    s = _SERIES.series(ref["handle"])
+    if last:
+        need = max(0, last - len(tail))
+        return (s.last(need) if need else []) + tail[-last:]
+    return s.values() + tail
+
+def downsample_history(world: Dict[str, Any], key: str, points: int, *, how: str = "mean") -> List[Tuple[int, float]]:
+    """
+    Chart-ready (tick, value) pairs for the stored part of a history
+    (see Series.downsample); the short JSON tail is not included.
+    """
+    ref = (world.get("series") or {}).get(key)
+    if _SERIES is None or not isinstance(ref, dict):
+        return []
+    return _SERIES.series(ref["handle"]).downsample(points, how=how)
+
+# ---------- Energy history (sparse entries + periodic full snapshots) ----------
+# Full entry:   {"timestamp", "zones": {zid: {"energy": e}}, "features": {...}}   (legacy shape)
+# Sparse entry: {"timestamp", "sparse": True, "zones": {changed zid: {"energy": e}},
+#                "zones_removed": [zid], "features": {changed key: v}, "features_removed": [key]}
+SE_HISTORY_CAP = 300
+SE_HISTORY_FULL_EVERY = 50           # entries between full snapshots
+_SE_DENSE: Dict[int, Tuple[Any, Dict[str, float], Dict[str, Any], int]] = {}
+
+def _apply_energy_entry(zones: Dict[str, float], feats: Dict[str, Any], entry: Dict[str, Any]) -> None:
+    if not entry.get("sparse"):
+        zones.clear()
+        feats.clear()
+    for zid in entry.get("zones_removed", []) or []:
+        zones.pop(zid, None)
+    for zid, z in (entry.get("zones") or {}).items():
+        zones[zid] = _safe_float((z or {}).get("energy", 0.0), 0.0)
+    for k in entry.get("features_removed", []) or []:
+        feats.pop(k, None)
+    feats.update(entry.get("features") or {})
+
+def _dense_energy_state(hist: List[Dict[str, Any]], upto: int) -> Tuple[Dict[str, float], Dict[str, Any], int]:
+    """(zone energies, features, entries since last full) as of hist[upto]."""
+    base = upto
+    while base > 0 and hist[base].get("sparse"):
+        base -= 1
+    zones: Dict[str, float] = {}
+    feats: Dict[str, Any] = {}
+    for i in range(base, upto + 1):
+        _apply_energy_entry(zones, feats, hist[i])
+    return zones, feats, upto - base
+
+def energy_history_entry(world: Dict[str, Any], index: int) -> Dict[str, Any]:
+    """Dense view of symbolic_energy_history[index] (negative indices allowed)."""
+    hist = world.get("symbolic_energy_history") or []
+    i = range(len(hist))[index]
+    zones, feats, _ = _dense_energy_state(hist, i)
+    return {"timestamp": hist[i].get("timestamp"),
+            "zones": {k: {"energy": e} for k, e in zones.items()},
+            "features": json.loads(json.dumps(feats))}
+
+def iter_energy_history(world: Dict[str, Any]):
+    """Yield dense views of every entry, oldest first (one pass, O(total changes))."""
+    zones: Dict[str, float] = {}
+    feats: Dict[str, Any] = {}
+    for entry in world.get("symbolic_energy_history") or []:
+        _apply_energy_entry(zones, feats, entry)
+        yield {"timestamp": entry.get("timestamp"),
+               "zones": {k: {"energy": e} for k, e in zones.items()},
+               "features": json.loads(json.dumps(feats))}
+
+def _zone_energy(v: Any) -> float:
+    return v.energy if type(v) is ZoneRecord else _safe_float(v.get("energy", 0.0), 0.0)
+
+def _record_energy_history(world: Dict[str, Any], zone_ids: Optional[Iterable[str]] = None) -> None:
+    """
+    Append one history entry. zone_ids limits a sparse entry to the zones a
+    delta touched (energy changes made elsewhere show up at the next full
+    snapshot); None, and every full snapshot, scans all zones.
+    """
+    hist = world.setdefault("symbolic_energy_history", [])
+    all_zones = _zones_as_dict(world)
+    cur_feats = world.get("features", {}) or {}
+
+    # Last dense state: cached per history list, rebuilt if the list was replaced/edited
+    cached = _SE_DENSE.get(id(hist))
+    if cached is not None and hist and hist[-1] is cached[0]:
+        zones, feats, since_full = cached[1], cached[2], cached[3]
+    elif hist:
+        zones, feats, since_full = _dense_energy_state(hist, len(hist) - 1)
+    else:
+        zones, feats, since_full = {}, {}, SE_HISTORY_FULL_EVERY
+
+    snap_feats = json.loads(json.dumps(cur_feats))   # detached copy (entries used to alias world["features"])
+    full = since_full + 1 >= SE_HISTORY_FULL_EVERY
+    if full or zone_ids is None:
+        cur_zones = {k: _zone_energy(v) for k, v in all_zones.items() if isinstance(v, _ZONE_TYPES)}
+        gone = [k for k in zones if k not in cur_zones]
+    else:
+        cur_zones, gone = {}, []
+        for k in dict.fromkeys(zone_ids):
+            v = all_zones.get(k)
+            if isinstance(v, _ZONE_TYPES):
+                cur_zones[k] = _zone_energy(v)
+            elif k in zones:
+                gone.append(k)
+    if full:
+        entry: Dict[str, Any] = {"timestamp": _utcnow_iso(),
+                                 "zones": {k: {"energy": e} for k, e in cur_zones.items()},
+                                 "features": snap_feats}
+        since_full = 0
+    else:
+        entry = {"timestamp": _utcnow_iso(), "sparse": True,
+                 "zones": {k: {"energy": e} for k, e in cur_zones.items() if zones.get(k) != e}}
+        if gone:
+            entry["zones_removed"] = gone
+        entry["features"] = {k: v for k, v in snap_feats.items() if feats.get(k, _SE_MISSING) != v}
+        fgone = [k for k in feats if k not in snap_feats]
+        if fgone:
+            entry["features_removed"] = fgone
+        since_full += 1
+    hist.append(entry)
+    _apply_energy_entry(zones, feats, entry)
+
+    if len(hist) > SE_HISTORY_CAP:
+        _trim_energy_history(hist, SE_HISTORY_CAP)
+    if len(_SE_DENSE) > 16:
+        _SE_DENSE.clear()
+    _SE_DENSE[id(hist)] = (entry, zones, feats, since_full)
+    _mark_dirty(world, "symbolic_energy_history")
+
+_SE_MISSING = object()
+
+def _trim_energy_history(hist: List[Dict[str, Any]], cap: int) -> bool:
+    """Drop the oldest entries; the new first entry is rebased to a full snapshot. True if trimmed."""
+    if len(hist) <= cap:
+        return False
+    first = len(hist) - cap
+    if hist[first].get("sparse"):
+        zones, feats, _ = _dense_energy_state(hist, first)
+        hist[first] = {"timestamp": hist[first].get("timestamp"),
+                       "zones": {k: {"energy": e} for k, e in zones.items()},
+                       "features": feats}
+    del hist[:first]
+    return True
 
 # ---------- Compaction (keep world.json small) ----------
 def _compact_world_inplace(world: Dict[str, Any]) -> None:
     try:
+        # Spill numeric histories into the mmap store (no-op unless enabled)
+        try:
+            _spill_histories(world)
+        except Exception as e:
+            print("[WARN] history spill failed:", e)
+
         # Cap sizes to keep disk small and UI snappy
-        for k, cap in (("events", 400), ("world_events", 800), ("quest_events", 400)):
+        if isinstance(world.get("symbolic_energy_history"), list):
+            if _trim_energy_history(world["symbolic_energy_history"], SE_HISTORY_CAP):
+                _mark_dirty(world, "symbolic_energy_history")
+        for k, cap in (("events", 400), ("world_events", 800), ("quest_events", 400),
+                       ("density_log", 300), ("agency_log", 300)):
             if isinstance(world.get(k), list) and len(world[k]) > cap:
                 del world[k][:-cap]
-        if isinstance(world.get("density_log"), list) and len(world["density_log"]) > 300:
-            del world["density_log"][:-300]
-        if isinstance(world.get("symbolic_energy_history"), list) and len(world["symbolic_energy_history"]) > 300:
-            del world["symbolic_energy_history"][:-300]
-        if isinstance(world.get("agency_log"), list) and len(world["agency_log"]) > 300:
-            del world["agency_log"][:-300]
+                _mark_dirty(world, k)
 
         # NEW: cap metrics histories
         if isinstance(world.get("metrics"), dict):
             mh = int(world["metrics"].get("max_history", 800) or 800)
-            if isinstance(world["metrics"].get("symbolic_density_history"), list):
-                if len(world["metrics"]["symbolic_density_history"]) > mh:
-                    del world["metrics"]["symbolic_density_history"][:-mh]
-            if isinstance(world["metrics"].get("agi_index_history"), list):
-                if len(world["metrics"]["agi_index_history"]) > mh:
-                    del world["metrics"]["agi_index_history"][:-mh]
+            for hk in ("symbolic_density_history", "agi_index_history"):
+                h = world["metrics"].get(hk)
+                if isinstance(h, list) and len(h) > mh:
+                    del h[:-mh]
+                    _mark_dirty(world, "metrics")
+    except Exception:
+        pass
+
+# ---------- Tick profiling ----------
+def _stage(name: str):
+    """Time one pipeline stage (no-op context if the profiler is unavailable)."""
+    return _PROFILER.stage(name) if _PROFILER is not None else nullcontext()
+
+def configure_tick_profiler(
+    *,
+    trace_allocs: Optional[bool] = None,
+    dump_every: Optional[int] = None,
+    dump_file: Optional[Path] = None,
+    reset: bool = False,
+) -> bool:
+    """
+    Adjust the autorun tick profiler. trace_allocs records tracemalloc peaks per
+    stage (slows ticks); dump_every writes get_tick_profile() to dump_file every
+    N ticks (0 = off). Returns False if the profiler module is unavailable.
+    """
+    if _PROFILER is None:
+        return False
+    if trace_allocs is not None:
+        _PROFILER.set_trace_allocs(trace_allocs)
+    if dump_every is not None:
+        _PROFILER.dump_every = max(0, int(dump_every))
+    if dump_file is not None:
+        _PROFILER.dump_file = Path(dump_file)
+    if reset:
+        _PROFILER.reset()
+    return True
+
+def get_tick_profile() -> Dict[str, Any]:
+    """
+    Per-stage wall/CPU timings of autorun_world_tick: count, mean, min, max and
+    p50/p95/p99 in ms, last-tick values, error counts, share of tick time and,
+    with trace_allocs on, allocation peaks in KB. Empty dict if unavailable.
+    """
+    return _PROFILER.profile() if _PROFILER is not None else {}
+
+def dump_tick_profile(path: Optional[Path] = None) -> Optional[Path]:
+    """Write get_tick_profile() as JSON now (default: the configured dump_file)."""
+    return _PROFILER.dump(path) if _PROFILER is not None else None
+
+# ---------- Tick stages ----------
+def _autonomy_stage(w: Dict[str, Any]) -> Dict[str, Any]:
+    """Optional autonomy: refresh character goal each tick."""
+    try:
+        pc = w.get("primary_character") or w.get("character")
+        if isinstance(pc, dict):
+            _autonomy_update(pc, w)
+    except Exception:
+        pass
+    return w
+
+def _agi_stage(w: Dict[str, Any]) -> Dict[str, Any]:
+    """Optional AGI progress: update momentum/streak."""
+    try:
+        pc = w.get("primary_character") or w.get("character")
+        if isinstance(pc, dict):
+            _update_agi_progress(pc, w)
     except Exception:
         pass
+    return w
+
+def _resonance_diffusion_stage(w: Dict[str, Any]) -> Dict[str, Any]:
+    """Resonance spreading one hop along zone links (no-op unless enabled)."""
+    diff = _RES_DIFFUSION
+    if diff is None or _graph_for is None:
+        return w
+    try:
+        r = _resonance_as_dict(w)
+        buckets = r["zones"]
+        now = _resonance_clock(w)
+        graph = _graph_for(_zones_as_dict(w))
+        updates = diff.step(buckets, graph, now, RESONANCE_DECAY_LAM, RESONANCE_MARKER_FLOOR)
+        for zid, (m, density) in updates.items():
+            _trim_markers(m)
+            if density < RESONANCE_DENSITY_FLOOR and not m:
+                buckets.pop(zid, None)
+            else:
+                b = buckets.get(zid)
+                if not isinstance(b, dict):
+                    b = buckets[zid] = _resonance_bucket(now)
+                b["m"], b["density"], b["at"] = m, density, now
+            _res_touch(w, zid)
+        if updates:
+            _mark_dirty(w, "resonance")
+    except Exception as e:
+        print("[WARN] autorun_world_tick: resonance diffusion failed:", e)
+    return w
+
+def _resonance_stage(w: Dict[str, Any]) -> Dict[str, Any]:
+    """Resonance decay heartbeat."""
+    try:
+        decay_resonance(w, lam=RESONANCE_DECAY_LAM)
+    except Exception as e:
+        print("[WARN] autorun_world_tick: resonance decay failed:", e)
+    return w
+
+def _metrics_stage(w: Dict[str, Any]) -> Dict[str, Any]:
+    """density_log + metrics heartbeat for the Symbolic Density Graph."""
+    # Persist legacy density_log heartbeat for graphs if global index present
+    try:
+        dl = w.setdefault("density_log", [])
+        dl.append(float(w.get("symbolic_density", 0.0)))
+        w["density_log"] = dl[-300:]
+    except Exception:
+        pass
+
+    # NEW: metrics heartbeat for Symbolic Density Graph
+    try:
+        _ensure_metrics(w)  # ensure exists without reinit
+        _metrics_update_density(w, float(w.get("symbolic_density", 0.0)))
+    except Exception as e:
+        print("[WARN] autorun_world_tick: metrics update failed:", e)
+    return w
+
+# Default pipeline, in tie-break order (early signals feed later systems).
+# reads/writes=None -> the engine module's TICK_READS/TICK_WRITES, else "*".
+# prompt: how the stage receives the tick prompt (None, "arg" or "kw").
+# Lazy engines resolve when the stages are first built; needs: a lazy engine
+# the stage wrapper calls (the stage is dropped if it is missing).
+_CHAR_KEYS = ("primary_character", "character")
+_DEFAULT_STAGES: List[Dict[str, Any]] = [
+    {"name": "terrain", "fn": _terrain_step},
+    {"name": "weather", "fn": _weather_step, "prompt": "kw"},
+    {"name": "diffusion", "fn": _diffuse_step, "prompt": "kw"},
+    {"name": "faction", "fn": _faction_step},
+    {"name": "economy", "fn": _economy_step},
+    {"name": "spawn", "fn": _spawn_apply},
+    {"name": "zones", "fn": _update_zones, "prompt": "arg"},
+    {"name": "features", "fn": _update_features, "prompt": "arg"},
+    {"name": "expansion", "fn": _expand_world, "prompt": "arg"},
+    {"name": "quest_hooks", "fn": _quest_hooks_apply},
+    {"name": "autonomy", "fn": _autonomy_stage, "reads": ("*",), "writes": _CHAR_KEYS, "needs": _autonomy_update},
+    {"name": "agi", "fn": _agi_stage, "reads": ("*",), "writes": _CHAR_KEYS, "needs": _update_agi_progress},
+    {"name": "resonance_diffusion", "fn": _resonance_diffusion_stage, "local": True, "marks": True,
+     "reads": ("zones", "resonance", "resonance_clock"), "writes": ("resonance",)},
+    {"name": "resonance_decay", "fn": _resonance_stage, "marks": True,
+     "reads": ("resonance", "resonance_clock"), "writes": ("resonance", "resonance_clock")},
+    {"name": "metrics", "fn": _metrics_stage,
+     "reads": ("symbolic_density", "density_log", "metrics"), "writes": ("density_log", "metrics")},
+]
+
+def _lod_aware(fn: Any) -> bool:
+    return bool(getattr(sys.modules.get(getattr(fn, "__module__", "") or ""), "LOD_AWARE", False))
+
+def _marks_dirty(spec: Dict[str, Any], fn: Any) -> bool:
+    """True if the stage dirty-marks what it changes (spec "marks" or the engine's TICK_MARKS_DIRTY)."""
+    if spec.get("marks"):
+        return True
+    return bool(getattr(sys.modules.get(getattr(fn, "__module__", "") or ""), "TICK_MARKS_DIRTY", False))
+
+def _lod_shim(fn: Any) -> Any:
+    """Pass the running tick's LOD zone selection to an LOD-aware engine step."""
+    def run(w: Dict[str, Any], *a: Any, **k: Any) -> Dict[str, Any]:
+        due = _LOD_DUE
+        return fn(w, *a, zone_ids=due, **k) if due is not None else fn(w, *a, **k)
+    run.__name__ = getattr(fn, "__name__", "step")
+    return run
+
+def _spec_target(spec: Dict[str, Any]) -> Any:
+    """The stage's callable with lazy engines resolved; None if it has nothing to run."""
+    fn = spec["fn"]
+    if isinstance(fn, LazyEngine):
+        fn = fn.resolve()
+    if fn is _noop_world or not spec.get("enabled", True):
+        return None
+    needs = spec.get("needs")
+    if needs is not None and not needs.available():
+        return None
+    return fn
+
+def _stage_fn(fn: Any) -> Any:
+    return _lod_shim(fn) if _lod_aware(fn) else fn
+
+def _build_tick_stages() -> Optional["StageRegistry"]:
+    sched = _SCHEDULER.resolve()
+    if sched is None:
+        return None
+    reg = sched.StageRegistry()
+    for spec in _DEFAULT_STAGES:
+        fn = _spec_target(spec)
+        if fn is None:
+            continue  # engine missing: nothing to schedule
+        reads, writes = sched.engine_sections(fn)
+        # LOD shims read module state, so they stay in this process (local=True)
+        reg.register(spec["name"], _stage_fn(fn), reads=spec.get("reads") or reads,
+                     writes=spec.get("writes") or writes, prompt=spec.get("prompt"),
+                     local=spec.get("local", False) or _lod_aware(fn), marks=_marks_dirty(spec, fn))
+    return reg
+
+# Built on first use (_tick_stages), which is when the stage engines get imported
+TICK_STAGES: Optional[Any] = None
+_TICK_STAGES_BUILT = False
+_TICK_STAGES_BUILD_LOCK = threading.Lock()
+
+def _tick_stages() -> Optional[Any]:
+    global TICK_STAGES, _TICK_STAGES_BUILT
+    if not _TICK_STAGES_BUILT:
+        with _TICK_STAGES_BUILD_LOCK:
+            if not _TICK_STAGES_BUILT:
+                TICK_STAGES = _build_tick_stages()
+                _TICK_STAGES_BUILT = True
+    return TICK_STAGES
+
+def register_tick_stage(name: str, fn: Any, **opts: Any) -> Optional[Any]:
+    """
+    Add or replace a stage of autorun_world_tick. opts go to
+    StageRegistry.register (reads, writes, prompt, local, marks, before, after);
+    undeclared reads/writes fall back to the engine module's TICK_READS /
+    TICK_WRITES, else "*" (runs alone). Unless the stage marks its own edits
+    (marks=True or TICK_MARKS_DIRTY), its declared writes are dirty-marked after
+    it runs. Returns the Stage, or None if the scheduler module is unavailable.
+    """
+    stages = _tick_stages()
+    if stages is None:
+        print("[WARN] register_tick_stage: tick_scheduler unavailable; pipeline is fixed")
+        return None
+    return stages.register(name, fn, **opts)
+
+def set_tick_executor(executor: str = "serial", workers: Optional[int] = None) -> str:
+    """
+    How autorun_world_tick runs its stages: "serial" (declared order, default),
+    "thread" or "process" (non-conflicting stages overlap on a pool).
+    Returns the active executor ("serial" if the scheduler is unavailable).
+    """
+    stages = _tick_stages()
+    if stages is None:
+        return "serial"
+    with _WORLD_LOCK:
+        return stages.set_executor(executor, workers)
+
+def tick_plan() -> List[List[str]]:
+    """Stage names grouped into waves that may run concurrently."""
+    stages = _tick_stages()
+    if stages is not None:
+        return stages.plan(coarse=stages.executor == "process")
+    return [[spec["name"]] for spec in _DEFAULT_STAGES if _spec_target(spec) is not None]
+
+@atexit.register
+def _close_tick_pool_at_exit() -> None:
+    if TICK_STAGES is not None:   # never built: nothing to close
+        try:
+            TICK_STAGES.close()
+        except Exception:
+            pass
+
+def _run_stages(w: Dict[str, Any], prompt: str, skip: Container[str] = ()) -> Dict[str, Any]:
+    global _LOD_DUE
+    if _LOD is not None:
+        with _stage("lod"):
+            _LOD_DUE = _LOD.begin_tick(w)
+            _mark_dirty(w, "lod")
+            if _LOD_DUE is not None:
+                _mark_zones_dirty(w, _LOD_DUE)
+    try:
+        stages = _tick_stages()
+        if stages is not None:
+            return stages.run(w, prompt, profiler=_PROFILER, skip=skip)
+        for spec in _DEFAULT_STAGES:  # scheduler unavailable: legacy serial pipeline
+            target = _spec_target(spec)
+            if target is None or spec["name"] in skip:
+                continue
+            with _stage(spec["name"]):
+                fn, mode = _stage_fn(target), spec.get("prompt")
+                if mode == "kw":
+                    w = fn(w, prompt=prompt)
+                elif mode == "arg":
+                    w = fn(w, prompt)
+                else:
+                    w = fn(w)
+                if not _marks_dirty(spec, target):
+                    _mark_dirty(w)   # no declared writes on this path: re-encode everything
+        return w
+    finally:
+        _LOD_DUE = None
+
+# ---------- Level-of-detail (opt-in) ----------
+def enable_lod(**lod_opts: Any) -> Optional["ZoneLOD"]:
+    """
+    Tick LOD-aware engines (terrain, weather) only on zones near
+    activity: hot zones every tick, warm every few ticks, cold ones in staggered
+    buckets, with closed-form catch-up for skipped ticks. lod_opts go to ZoneLOD
+    (hot_hops, warm_hops, warm_every, cold_every, active_ticks, min_zones, seeds).
+    Returns the scheduler, or None if the module is unavailable.
+    """
+    global _LOD
+    if not _ZONE_LOD.available():
+        print("[WARN] enable_lod: zone_lod unavailable; every zone ticks every tick")
+        return None
+    lod = _ZONE_LOD(**lod_opts)
+    # reverse pipeline order: the earliest stage replays last, so bounds it
+    # applies (terrain clamps energy to 0..1) cap drift integrated by later ones
+    for spec in reversed(_DEFAULT_STAGES):
+        fn = _spec_target(spec)
+        mod = sys.modules.get(getattr(fn, "__module__", "") or "")
+        if fn is not None and _lod_aware(fn) and callable(getattr(mod, "lod_catch_up", None)):
+            lod.add_catch_up(mod.lod_catch_up)
+    with _WORLD_LOCK:
+        _LOD = lod
+    return lod
+
+def disable_lod(world: Optional[Dict[str, Any]] = None) -> None:
+    """Back to full sweeps; pass the live world to bring lagging zones current first."""
+    global _LOD
+    with _WORLD_LOCK:
+        lod, _LOD = _LOD, None
+        if lod is not None and isinstance(world, dict):
+            lod.catch_up_all(world)
+            _mark_dirty(world, "zones")
+
+# ---------- Resonance diffusion (opt-in) ----------
+def enable_resonance_diffusion(rate: Optional[float] = None, leak: Optional[float] = None) -> Optional[Any]:
+    """
+    Spread zone resonance (density and marker weights) one hop along zone
+    `links` every tick, before decay: each bucket sends `rate` of itself,
+    split evenly over its linked zones, and `leak` of that is lost on the way.
+    Uses the compiled zone graph (engine/graph_util.py), recompiled when zones
+    or their links lists change (same-length in-place edits need
+    mark_links_changed()).
+    Returns the ResonanceDiffusion, or None if it is unavailable.
+    """
+    global _RES_DIFFUSION
+    opts = {k: v for k, v in (("rate", rate), ("leak", leak)) if v is not None}
+    try:
+        ok = _graph_for is not None and _RESONANCE_DIFFUSION.available()
+        diff = _RESONANCE_DIFFUSION(**opts) if ok else None
+    except RuntimeError as e:   # numpy missing
+        print(f"[WARN] enable_resonance_diffusion: {e}; resonance stays put")
+        return None
+    if diff is None:
+        print("[WARN] enable_resonance_diffusion: resonance_diffusion unavailable; resonance stays put")
+        return None
+    with _WORLD_LOCK:
+        _RES_DIFFUSION = diff
+    return diff
+
+def disable_resonance_diffusion() -> None:
+    global _RES_DIFFUSION
+    with _WORLD_LOCK:
+        _RES_DIFFUSION = None
+        _RES_EXPIRY.clear()   # diffused buckets carry no expiry entries; rescan on next decay
+
+# ---------- Typed zone records (opt-in) ----------
+def enable_zone_records(world: Optional[Dict[str, Any]] = None) -> bool:
+    """
+    Hold zones as ZoneRecords (engine/zone_record.py): __slots__ with float
+    fields and lazily allocated containers, about half the memory of a zone
+    dict. Engines keep using mapping access; z.energy-style attribute reads
+    are the fast path. Pass the live world to convert it now (otherwise the
+    next hydrate does). Returns False if the module is unavailable.
+    """
+    global _ZONE_RECORDS
+    if not _ZONE_RECORD_OK:
+        print("[WARN] enable_zone_records: zone_record unavailable; zones stay dicts")
+        return False
+    with _WORLD_LOCK:
+        _ZONE_RECORDS = True
+        if isinstance(world, dict):
+            _compact_zones(world)
+            _mark_dirty(world, "zones")
+    return True
+
+def disable_zone_records(world: Optional[Dict[str, Any]] = None) -> None:
+    """Back to plain zone dicts; pass the live world to convert its zones now."""
+    global _ZONE_RECORDS
+    with _WORLD_LOCK:
+        _ZONE_RECORDS = False
+        if _ZONE_RECORD_OK and isinstance(world, dict):
+            _expand_zones(world)
+            _mark_dirty(world, "zones")
+
+# ---------- Tick traces (opt-in) ----------
+_LOD_TRACE_OPTS = ("hot_hops", "warm_hops", "warm_every", "cold_every", "active_ticks", "min_zones")
+
+def start_recording(trace_dir: Union[str, Path], world: Optional[Dict[str, Any]] = None,
+                    **rec_opts: Any) -> Optional["TickRecorder"]:
+    """
+    Record ticks to trace_dir for deterministic replay (engine/tick_recorder.py):
+    each tick's prompt and random seed, the apply_world_delta / add_resonance /
+    update_zone_density / modify_symbolic_energy calls made between ticks, and
+    a world snapshot every snapshot_every ticks. Only `world` is recorded
+    (default: the first world ticked). While recording, the global random is
+    reseeded every tick. rec_opts go to TickRecorder (seed, snapshot_every,
+    digest, metrics). Replays are exact for the serial executor; thread and
+    process pools may interleave global-random draws differently.
+    Returns the recorder, or None if the module is unavailable.
+    """
+    global _RECORDER
+    if not _TICK_RECORDER.available():
+        print("[WARN] start_recording: tick_recorder unavailable; ticks are not recorded")
+        return None
+    config: Dict[str, Any] = {"lod": None, "zone_records": _ZONE_RECORDS}
+    if _LOD is not None:
+        config["lod"] = {k: getattr(_LOD, k) for k in _LOD_TRACE_OPTS}
+    if _RES_DIFFUSION is not None:
+        config["resonance_diffusion"] = {"rate": _RES_DIFFUSION.rate, "leak": _RES_DIFFUSION.leak}
+    if TICK_STAGES is not None:
+        config["executor"] = TICK_STAGES.executor
+    rec = _TICK_RECORDER(trace_dir, config=config, **rec_opts)
+    with _WORLD_LOCK:
+        if isinstance(world, dict):
+            rec.bind(world)
+        old, _RECORDER = _RECORDER, rec
+    if old is not None:
+        old.close()
+    return rec
+
+def stop_recording() -> Optional[Path]:
+    """Stop and close the active trace; returns its directory (None if not recording)."""
+    global _RECORDER
+    with _WORLD_LOCK:
+        rec, _RECORDER = _RECORDER, None
+    if rec is None:
+        return None
+    rec.close()
+    return rec.dir
+
+def replay_tick(world_state: Dict[str, Any], prompt: str = "", *, skip: Container[str] = ()) -> Dict[str, Any]:
+    """
+    One tick computed exactly as autorun_world_tick does it (clock, stages,
+    compaction) but never persisted or recorded. Used by trace replays and the
+    simulation farm (engine/world_farm.py).
+    """
+    with _WORLD_LOCK:
+        w = _tick(world_state)
+        w = _run_stages(w, prompt, skip=skip)
+        w = _hydrate_world(w)   # autorun_world_tick's save step hydrates before compacting
+        _compact_world_inplace(w)
+    return w
+
+def _lod_touch(world: Dict[str, Any], zid: str) -> None:
+    if _LOD is not None:
+        _LOD.touch(world, zid)
 
 # ---------- Tick helpers & autorun pipeline ----------
 def _tick(world: Dict[str, Any]) -> Dict[str, Any]:
     """Advance world time via the clock and ensure structure."""
-    w = _hydrate_world(world)
-    if _CLOCK_OK:
+    w = _advance_clock(_hydrate_world(world))
+    w["last_update"] = _utcnow_iso()
+    return w
+
+def _advance_clock(w: Dict[str, Any]) -> Dict[str, Any]:
+    if _time_init.available() and _time_advance.available():
         try:
             w = _time_init(w)
             w = _time_advance(w, steps=1.0)
@@ -823,92 +2121,128 @@ def _tick(world: Dict[str, Any]) -> Dict[str, Any]:
             w["time"] = int(w.get("time", 0)) + 1
     else:
         w["time"] = int(w.get("time", 0)) + 1
-    w["last_update"] = _utcnow_iso()
+    _mark_dirty(w, "time")   # the clock advances its dict in place
     return w
 
+def _mark_unsaved_edits(w: Dict[str, Any]) -> None:
+    """
+    Mark edits made since the last tick for the save encoder. A WorldState
+    reports what it recorded since its last mark_clean(); any other world is
+    marked whole unless TICK_TRUSTS_MARKS.
+    """
+    if _WorldState is not None and isinstance(w, _WorldState):
+        for path in w.recorded_paths():
+            if not path:
+                _mark_dirty(w)
+                return
+            if path[0] == "zones" and len(path) > 1:
+                _mark_dirty(w, "zones", path[1])
+            else:
+                _mark_dirty(w, str(path[0]))
+    elif not TICK_TRUSTS_MARKS:
+        _mark_dirty(w)
+
 def autorun_world_tick(world_state: Dict[str, Any], prompt: str = "") -> Dict[str, Any]:
     """
     One full world tick with safe fallbacks.
     Order matters (early signals feed later systems):
       1) _tick (time/structure)
-      2) terrain micro-features
-      3) weather (prompt-coupled)
-      4) symbolic diffusion (prompt-coupled)
-      5) factions
-      6) economy
-      7) spawns (optional)
-      8) zone updates / feature updates / expansion
-      9) quest hooks (after most fields stabilized)
-      10) autonomy refresh (optional)
-      11) AGI progress update (optional)
-      12) resonance decay
-      13) metrics heartbeat (append density)
+      2..13) TICK_STAGES in declared order: terrain micro-features, weather
+         (prompt-coupled), symbolic diffusion (prompt-coupled), factions,
+         economy, spawns, zone/feature updates, expansion, quest hooks,
+         autonomy, AGI progress, resonance decay, metrics heartbeat
+      14) persist (full rewrite or journal append, per WORLD_PERSIST_MODE); the
+          snapshot is encoded under _WORLD_LOCK and written after releasing it
+    Stages run serially unless set_tick_executor() picks a pool, in which case
+    stages whose declared sections do not conflict overlap; the declared order
+    stays the dependency direction and tie-breaker.
+    Each stage is timed by the tick profiler (see get_tick_profile); with
+    start_recording() active the tick is also written to the trace.
+    Edits made between ticks are marked dirty first (see _mark_unsaved_edits),
+    so they reach the save even if the caller never called mark_dirty.
     """
-    with _WORLD_LOCK:
-        w = _tick(world_state)
-
-        # Early passes
-        w = _terrain_step(w)
-        w = _weather_step(w, prompt=prompt) if _weather_step is not _noop_world else _weather_step(w)
-        w = _diffuse_step(w, prompt=prompt) if _diffuse_step is not _noop_world else _diffuse_step(w)
-
-        # Mid passes
-        w = _faction_step(w)
-        w = _economy_step(w)
-        w = _spawn_apply(w)
-
-        # Late passes (react to most-updated fields)
-        w = _update_zones(w, prompt)
-        w = _update_features(w, prompt)
-        w = _expand_world(w, prompt)
-
-        # Quest/event hooks
-        w = _quest_hooks_apply(w)
-
-        # Optional autonomy: refresh character goal each tick
-        if _AUTO_OK:
-            try:
-                pc = w.get("primary_character") or w.get("character")
-                if isinstance(pc, dict):
-                    _autonomy_update(pc, w)
-            except Exception:
-                pass
-
-        # Optional AGI progress: update momentum/streak
-        if _AGI_OK:
-            try:
-                pc = w.get("primary_character") or w.get("character")
-                if isinstance(pc, dict):
-                    _update_agi_progress(pc, w)
-            except Exception:
-                pass
-
-        # Resonance decay heartbeat
-        try:
-            decay_resonance(w, lam=RESONANCE_DECAY_LAM)
-        except Exception as e:
-            print("[WARN] autorun_world_tick: resonance decay failed:", e)
-
-        # Persist legacy density_log heartbeat for graphs if global index present
-        try:
-            dl = w.setdefault("density_log", [])
-            dl.append(float(w.get("symbolic_density", 0.0)))
-            w["density_log"] = dl[-300:]
-        except Exception:
-            pass
-
-        # NEW: metrics heartbeat for Symbolic Density Graph
-        try:
-            _ensure_metrics(w)  # ensure exists without reinit
-            _metrics_update_density(w, float(w.get("symbolic_density", 0.0)))
-        except Exception as e:
-            print("[WARN] autorun_world_tick: metrics update failed:", e)
-
-        # Save-on-tick (optional—comment out if you prefer external control)
-        try:
-            _atomic_write_json(WORLD_FILE, _hydrate_world(w))
-        except Exception as e:
-            print("[WARN] autorun_world_tick: could not save world:", e)
+    job: Optional[Tuple[str, bool, int]] = None
+    # The profiler's tick wraps the persist write too, so tick totals include it;
+    # _WORLD_LOCK covers only the in-memory part.
+    with (_PROFILER.tick() if _PROFILER is not None else nullcontext()):
+        with _WORLD_LOCK:
+            rec = _RECORDER
+            recording = rec is not None and rec.begin_tick(world_state, prompt)
+            _mark_unsaved_edits(world_state)
+            with _stage("clock"):
+                w = _tick(world_state)
+
+            w = _run_stages(w, prompt)
+
+            # Save-on-tick (optional—comment out if you prefer external control)
+            # Only the encode happens under the lock; the write follows after release.
+            # In "journal" mode this appends a delta record instead of rewriting world.json;
+            # with the background saver running the tick only hands off a snapshot.
+            with _stage("save"):
+                try:
+                    text, gen = _snapshot(_hydrate_world(w))
+                    if _SAVER is not None:
+                        _SAVER.submit((text, False, gen))
+                    else:
+                        job = (text, False, gen)
+                except Exception as e:
+                    print("[WARN] autorun_world_tick: could not save world:", e)
+
+            with _stage("compact"):
+                _compact_world_inplace(w)
+            if recording:
+                rec.end_tick(w)
+
+        if job is not None:
+            with _stage("persist"):
+                try:
+                    _write_snapshot(*job)
+                except Exception as e:
+                    print("[WARN] autorun_world_tick: could not save world:", e)
+    return w
 
-        _compact_world_inplace(w)
-        return w
+# Fast-forward batches compact every this many ticks (caps keep the last N, so the
+# cadence does not change the result; it only bounds memory between compactions).
+FAST_FORWARD_COMPACT_EVERY = 64
+
+def autorun_world_ticks(
+    world_state: Dict[str, Any],
+    n: int,
+    prompt: str = "",
+    *,
+    save: bool = True,
+    record_every: int = 1,
+    compact_every: int = FAST_FORWARD_COMPACT_EVERY,
+) -> Dict[str, Any]:
+    """
+    Fast-forward n ticks (catch-up after downtime, offline runs).
+    Same stages and order as n autorun_world_tick calls, but the world is
+    hydrated once, nothing is persisted per tick, history caps are applied
+    every compact_every ticks, and last_update is stamped once. With save=True
+    the result is checkpointed once at the end (via save_world). The world
+    equals n single ticks apart from wall-clock stamps.
+    record_every > 1 runs the metrics heartbeat (density_log / metrics
+    graphs) only on every k-th tick: sparser UI feeds, no longer identical.
+    """
+    n = int(n)
+    record_every = max(1, int(record_every))
+    compact_every = max(1, int(compact_every))
+    with _WORLD_LOCK:
+        w = _hydrate_world(world_state)
+    for i in range(n):
+        with _WORLD_LOCK, (_PROFILER.tick() if _PROFILER is not None else nullcontext()):
+            skip = ("metrics",) if (i + 1) % record_every else ()
+            rec = _RECORDER
+            recording = rec is not None and rec.begin_tick(w, prompt, skip=skip)
+            with _stage("clock"):
+                w = _advance_clock(w)
+            w = _run_stages(w, prompt, skip=skip)
+            if recording or (i + 1) % compact_every == 0 or i == n - 1:
+                with _stage("compact"):
+                    _compact_world_inplace(w)
+            if recording:
+                rec.end_tick(w)
+    w["last_update"] = _utcnow_iso()
+    if save and n > 0:
+        save_world(w)
+    return w
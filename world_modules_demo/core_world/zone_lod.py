@@ -0,0 +1,235 @@
+# engine/zone_lod.py
+# Level-of-detail zone scheduling: hot/warm/cold tiers by link distance from activity.
+from __future__ import annotations
+
+import zlib
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    from engine.graph_util import graph_for as _graph_for   # compiled zone graph (cached per zones dict)
+except Exception:
+    _graph_for = None
+
+try:
+    from engine.zone_record import ZoneRecord as _ZoneRecord
+    _ZONE_TYPES: tuple = (dict, _ZoneRecord)   # zones may be typed records
+except Exception:
+    _ZONE_TYPES = (dict,)
+
+__all__ = [
+    "ZoneLOD",
+    "active_seeds",
+]
+
+# --- Tunables (safe defaults) ---
+LOD_HOT_HOPS: int = 1          # zones this many link hops from a seed tick every tick
+LOD_WARM_HOPS: int = 3         # ...up to this many hops tick every LOD_WARM_EVERY ticks
+LOD_WARM_EVERY: int = 2
+LOD_COLD_EVERY: int = 32       # everything else: one staggered bucket per tick
+LOD_ACTIVE_TICKS: int = 8      # zones touched this recently count as activity seeds
+LOD_MIN_ZONES: int = 256       # smaller worlds always tick every zone
+LOD_KEY: str = "lod"           # world section holding LOD bookkeeping
+LOD_ZONE_KEY: str = "lod_t"    # per-zone: LOD tick the zone was last simulated at
+
+# catch_up(world, zone_id, zone, missed_ticks): advance a zone in closed form
+CatchUp = Callable[[Dict[str, Any], str, Dict[str, Any], int], None]
+
+def _bucket(zid: str, n: int) -> int:
+    """Stable across processes (unlike hash())."""
+    return zlib.crc32(zid.encode("utf-8")) % n
+
+def _lod_section(world: Dict[str, Any]) -> Dict[str, Any]:
+    lod = world.get(LOD_KEY)
+    if not isinstance(lod, dict):
+        lod = world[LOD_KEY] = {}
+    lod.setdefault("tick", 0)
+    lod.setdefault("since", 0)
+    lod.setdefault("touched", {})
+    return lod
+
+def active_seeds(world: Dict[str, Any]) -> List[str]:
+    """Zones holding characters (primary/character/characters) plus world['active_zone']."""
+    out: List[str] = []
+    chars: List[Any] = [world.get("primary_character"), world.get("character")]
+    extra = world.get("characters")
+    if isinstance(extra, dict):
+        chars.extend(extra.values())
+    elif isinstance(extra, list):
+        chars.extend(extra)
+    for c in chars:
+        if isinstance(c, dict) and c.get("zone"):
+            out.append(str(c["zone"]))
+    if world.get("active_zone"):
+        out.append(str(world["active_zone"]))
+    return out
+
+class ZoneLOD:
+    """
+    Per-tick zone selection for LOD-aware engines.
+
+    begin_tick(world) classifies zones by link hops from the seeds (character
+    zones, active_zone, recently touched zones): hot (<= hot_hops) every tick,
+    warm (<= warm_hops) every warm_every ticks, cold in one of cold_every
+    stable buckets per tick. Each returned zone first gets closed-form catch-up
+    for the ticks it skipped, so engines only simulate the current step.
+    Cost per tick is the BFS over the active frontier plus ~N/cold_every.
+    """
+
+    def __init__(
+        self,
+        *,
+        hot_hops: int = LOD_HOT_HOPS,
+        warm_hops: int = LOD_WARM_HOPS,
+        warm_every: int = LOD_WARM_EVERY,
+        cold_every: int = LOD_COLD_EVERY,
+        active_ticks: int = LOD_ACTIVE_TICKS,
+        min_zones: int = LOD_MIN_ZONES,
+        seeds: Optional[Callable[[Dict[str, Any]], Iterable[str]]] = None,
+    ):
+        self.hot_hops = max(0, int(hot_hops))
+        self.warm_hops = max(self.hot_hops, int(warm_hops))
+        self.warm_every = max(1, int(warm_every))
+        self.cold_every = max(1, int(cold_every))
+        self.active_ticks = max(0, int(active_ticks))
+        self.min_zones = max(0, int(min_zones))
+        self.seeds = seeds or active_seeds
+        self.catch_ups: List[CatchUp] = []
+        self._buckets: Optional[Tuple[int, int, List[List[str]]]] = None
+
+    def add_catch_up(self, fn: CatchUp) -> None:
+        if fn not in self.catch_ups:
+            self.catch_ups.append(fn)
+
+    def _last(self, z: Dict[str, Any], since: int) -> int:
+        last = z.get(LOD_ZONE_KEY)
+        return since if not isinstance(last, int) or last < since else last
+
+    def touch(self, world: Dict[str, Any], zid: str) -> None:
+        """
+        Record activity in a zone (deltas, resonance): it stays hot for
+        active_ticks. A lagging zone is caught up first, so the change lands
+        on current state.
+        """
+        if not zid:
+            return
+        lod = _lod_section(world)
+        t = int(lod["tick"])
+        lod["touched"][str(zid)] = t
+        zones = world.get("zones")
+        z = zones.get(zid) if isinstance(zones, dict) and lod.get("active") else None
+        if isinstance(z, _ZONE_TYPES):
+            missed = t - self._last(z, int(lod["since"]))
+            if missed > 0:
+                for fn in self.catch_ups:
+                    fn(world, zid, z, missed)
+            z[LOD_ZONE_KEY] = t
+
+    # -------- classification --------
+    def _seed_set(self, world: Dict[str, Any], zones: Dict[str, Any], lod: Dict[str, Any]) -> List[str]:
+        t = int(lod["tick"])
+        touched: Dict[str, int] = lod["touched"]
+        for zid in [z for z, at in touched.items() if t - int(at) > self.active_ticks]:
+            del touched[zid]
+        out: List[str] = []
+        seen: Set[str] = set()
+        for zid in list(self.seeds(world)) + list(touched):
+            if zid in zones and zid not in seen:
+                seen.add(zid)
+                out.append(zid)
+        return out
+
+    def classify(self, world: Dict[str, Any]) -> Dict[str, int]:
+        """{zone_id: hops from nearest seed} for zones within warm_hops (BFS order; read-only)."""
+        zones = world.get("zones")
+        if not isinstance(zones, dict):
+            return {}
+        frontier = self._seed_set(world, zones, _lod_section(world))
+        if _graph_for is not None:
+            return _graph_for(zones).hops(frontier, self.warm_hops)   # cached while seeds/links hold
+        dist: Dict[str, int] = {}
+        for zid in frontier:
+            dist[zid] = 0
+        d = 0
+        while frontier and d < self.warm_hops:
+            d += 1
+            nxt: List[str] = []
+            for zid in frontier:
+                z = zones.get(zid)
+                for n in (z.get("links") or []) if isinstance(z, _ZONE_TYPES) else []:
+                    if n in zones and n not in dist:
+                        dist[n] = d
+                        nxt.append(n)
+            frontier = nxt
+        return dist
+
+    def _cold_buckets(self, zones: Dict[str, Any]) -> List[List[str]]:
+        key = (id(zones), len(zones))
+        if self._buckets is None or self._buckets[:2] != key or len(self._buckets[2]) != self.cold_every:
+            buckets: List[List[str]] = [[] for _ in range(self.cold_every)]
+            for zid in zones:
+                buckets[_bucket(zid, self.cold_every)].append(zid)
+            self._buckets = (key[0], key[1], buckets)
+        return self._buckets[2]
+
+    # -------- per tick --------
+    def begin_tick(self, world: Dict[str, Any]) -> Optional[List[str]]:
+        """
+        Advance the LOD clock and return the zone ids to simulate this tick
+        (already caught up), or None when LOD is inactive (small world: tick all).
+        """
+        zones = world.get("zones")
+        lod = _lod_section(world)
+        lod["tick"] = t = int(lod["tick"]) + 1
+        if not isinstance(zones, dict) or len(zones) < self.min_zones:
+            lod["active"] = False
+            return None
+        if not lod.get("active"):
+            lod["active"] = True
+            lod["since"] = t - 1   # every zone is current as of the previous tick
+
+        dist = self.classify(world)
+        due: List[str] = []
+        hot = warm = 0
+        for zid, d in dist.items():
+            if d <= self.hot_hops:
+                hot += 1
+                due.append(zid)
+            else:
+                warm += 1
+                if (t + _bucket(zid, self.cold_every)) % self.warm_every == 0:
+                    due.append(zid)
+        for zid in self._cold_buckets(zones)[t % self.cold_every]:
+            if zid not in dist and zid in zones:
+                due.append(zid)
+
+        since = int(lod["since"])
+        for zid in due:
+            z = zones[zid]
+            if not isinstance(z, _ZONE_TYPES):
+                continue
+            missed = t - self._last(z, since) - 1
+            if missed > 0:
+                for fn in self.catch_ups:
+                    fn(world, zid, z, missed)
+            z[LOD_ZONE_KEY] = t
+        lod["last"] = {"hot": hot, "warm": warm, "due": len(due), "zones": len(zones)}
+        return due
+
+    def catch_up_all(self, world: Dict[str, Any]) -> int:
+        """Bring every zone current (e.g. before disabling LOD). Returns zones advanced."""
+        zones = world.get("zones")
+        lod = world.get(LOD_KEY)
+        if not isinstance(zones, dict) or not isinstance(lod, dict) or not lod.get("active"):
+            return 0
+        t, since, n = int(lod["tick"]), int(lod.get("since", 0)), 0
+        for zid, z in zones.items():
+            if not isinstance(z, _ZONE_TYPES):
+                continue
+            missed = t - self._last(z, since)
+            if missed > 0:
+                for fn in self.catch_ups:
+                    fn(world, zid, z, missed)
+                n += 1
+            z[LOD_ZONE_KEY] = t
+        lod["active"] = False
+        return n
@@ -0,0 +1,267 @@
+# engine/zone_pack.py
+# Cached, parallel loader for zones/*.json + optional indexed pack file.
+from __future__ import annotations
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Container, Dict, List, Optional, Tuple
+
+__all__ = [
+    "ZoneDirLoader",
+    "ZonePack",
+]
+
+# --- Tunables (safe defaults) ---
+ZONE_LOAD_WORKERS: int = min(8, (os.cpu_count() or 2) + 2)
+ZONE_PARALLEL_MIN: int = 64        # files to (re)parse before the thread pool is used
+
+Prepare = Callable[[Dict[str, Any], str], Dict[str, Any]]   # (raw zone, file stem) -> zone
+_Entry = Tuple[int, int, str, str]                          # (mtime_ns, size, zone name, json text)
+
+def _compact(z: Dict[str, Any]) -> str:
+    return json.dumps(z, ensure_ascii=False, separators=(",", ":"))
+
+# ---------- Pack file ----------
+class ZonePack:
+    """
+    Single-file zone store with random access by name.
+
+      <pack>       concatenated compact-JSON zones (utf-8)
+      <pack>.idx   {"files": {fname: [mtime_ns, size, name, offset, length]}, "order": [fname, ...]}
+
+    The index records which source file (and which mtime/size of it) each
+    record came from, so a loader can trust unchanged entries without
+    touching the source files' contents.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.idx_path = self.path.with_name(self.path.name + ".idx")
+        self._files: Dict[str, List[Any]] = {}
+        self._by_name: Dict[str, Tuple[int, int]] = {}
+        self._load_index()
+
+    def _load_index(self) -> None:
+        self._files, self._by_name = {}, {}
+        try:
+            idx = json.loads(self.idx_path.read_text(encoding="utf-8"))
+            size = self.path.stat().st_size
+        except Exception:
+            return
+        for fname in idx.get("order", []):
+            ent = idx.get("files", {}).get(fname)
+            if not ent or len(ent) != 5 or ent[3] + ent[4] > size:
+                continue
+            self._files[fname] = ent
+            self._by_name[ent[2]] = (ent[3], ent[4])   # later files win, like the dir loader
+
+    def names(self) -> List[str]:
+        return list(self._by_name.keys())
+
+    def entry_for(self, fname: str, mtime_ns: int, size: int) -> Optional[Tuple[str, int, int]]:
+        ent = self._files.get(fname)
+        if ent and ent[0] == mtime_ns and ent[1] == size:
+            return ent[2], ent[3], ent[4]
+        return None
+
+    def read_text(self, offset: int, length: int) -> str:
+        with self.path.open("rb") as f:
+            f.seek(offset)
+            return f.read(length).decode("utf-8")
+
+    def read_many(self, spans: List[Tuple[int, int]]) -> List[str]:
+        out: List[str] = []
+        with self.path.open("rb") as f:
+            for off, ln in spans:
+                f.seek(off)
+                out.append(f.read(ln).decode("utf-8"))
+        return out
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        """Random access: one seek + one json.loads."""
+        span = self._by_name.get(name)
+        if span is None:
+            return None
+        return json.loads(self.read_text(*span))
+
+    def write(self, order: List[str], entries: Dict[str, _Entry]) -> None:
+        """Rewrite pack + index atomically from loader entries."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        files: Dict[str, List[Any]] = {}
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        off = 0
+        with tmp.open("wb") as f:
+            for fname in order:
+                mt, sz, name, text = entries[fname]
+                data = text.encode("utf-8")
+                f.write(data)
+                files[fname] = [mt, sz, name, off, len(data)]
+                off += len(data)
+            f.flush()
+            os.fsync(f.fileno())
+        itmp = self.idx_path.with_name(self.idx_path.name + ".tmp")
+        itmp.write_text(json.dumps({"files": files, "order": order}, separators=(",", ":")), encoding="utf-8")
+        # Index last: a crash in between leaves an index whose spans are checked against the pack size
+        os.replace(tmp, self.path)
+        os.replace(itmp, self.idx_path)
+        self._load_index()
+
+# ---------- Directory loader ----------
+class ZoneDirLoader:
+    """
+    Loads <directory>/*.json as {zone_name: zone}.
+
+    - Files are stat'ed every call; only new/changed (mtime_ns, size) files
+      are read and parsed. Unchanged zones come from the in-memory manifest.
+    - Cold starts parse on a thread pool once ZONE_PARALLEL_MIN files need it.
+    - With pack_path set, unchanged files are served from the pack (one
+      sequential read instead of thousands of opens) and the pack is
+      rewritten whenever files had to be parsed.
+
+    Returned zones are fresh objects (decoded from cached compact JSON), so
+    callers may mutate them freely.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        prepare: Prepare,
+        *,
+        pack_path: Optional[Path] = None,
+        workers: int = ZONE_LOAD_WORKERS,
+    ):
+        self.directory = Path(directory)
+        self.prepare = prepare
+        self.pack = ZonePack(pack_path) if pack_path else None
+        self.workers = max(1, int(workers))
+        self._manifest: Dict[str, _Entry] = {}
+        self.last_count = 0        # zones found by the last load(), including skipped ones
+        self.stats = {"loads": 0, "parsed": 0, "cached": 0, "from_pack": 0, "errors": 0}
+
+    def _scan(self) -> List[Tuple[str, int, int]]:
+        out: List[Tuple[str, int, int]] = []
+        try:
+            it = os.scandir(self.directory)
+        except (FileNotFoundError, NotADirectoryError):
+            return out
+        with it:
+            for de in it:
+                if not de.name.endswith(".json"):
+                    continue
+                try:
+                    if not de.is_file():
+                        continue
+                    st = de.stat()
+                except OSError:
+                    continue
+                out.append((de.name, st.st_mtime_ns, st.st_size))
+        out.sort()
+        return out
+
+    def _parse(self, job: Tuple[str, int, int]) -> Tuple[str, Optional[_Entry]]:
+        fname, mt, sz = job
+        p = self.directory / fname
+        try:
+            data = json.loads(p.read_text(encoding="utf-8"))
+            if not isinstance(data, dict):
+                return fname, None
+            stem = p.stem
+            name = data.get("name") or data.get("id") or stem
+            z = self.prepare(data, stem)
+            return fname, (mt, sz, name, _compact(z))
+        except Exception as e:
+            print(f"[WARN] Could not load zone '{p}': {e}")
+            self.stats["errors"] += 1
+            return fname, None
+
+    def load(self, *, skip: Optional[Container[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Return {zone_name: zone}. Names in `skip` are left out (and not decoded),
+        e.g. zones the world already has when merging without overwrite.
+        """
+        self.stats["loads"] += 1
+        listing = self._scan()
+        manifest = self._manifest
+        fresh: Dict[str, _Entry] = {}
+        todo: List[Tuple[str, int, int]] = []
+        pack_spans: List[Tuple[str, int, int, str, int, int]] = []
+
+        for fname, mt, sz in listing:
+            ent = manifest.get(fname)
+            if ent is not None and ent[0] == mt and ent[1] == sz:
+                fresh[fname] = ent
+                self.stats["cached"] += 1
+                continue
+            hit = self.pack.entry_for(fname, mt, sz) if self.pack else None
+            if hit is not None:
+                pack_spans.append((fname, mt, sz, hit[0], hit[1], hit[2]))
+                continue
+            todo.append((fname, mt, sz))
+
+        if pack_spans:
+            texts = self.pack.read_many([(off, ln) for _, _, _, _, off, ln in pack_spans])
+            for (fname, mt, sz, name, _, _), text in zip(pack_spans, texts):
+                fresh[fname] = (mt, sz, name, text)
+            self.stats["from_pack"] += len(pack_spans)
+
+        if todo:
+            if len(todo) >= ZONE_PARALLEL_MIN and self.workers > 1:
+                with ThreadPoolExecutor(max_workers=self.workers) as ex:
+                    results = list(ex.map(self._parse, todo, chunksize=16))
+            else:
+                results = [self._parse(j) for j in todo]
+            for fname, ent in results:
+                if ent is not None:
+                    fresh[fname] = ent
+            self.stats["parsed"] += len(todo)
+
+        self._manifest = fresh
+
+        if self.pack is not None and todo:
+            try:
+                order = [f for f, _, _ in listing if f in fresh]
+                self.pack.write(order, fresh)
+            except Exception as e:
+                print(f"[WARN] zone_pack: could not write {self.pack.path}: {e}")
+
+        out: Dict[str, Dict[str, Any]] = {}
+        self.last_count = len(fresh)
+        for fname, _, _ in listing:
+            ent = fresh.get(fname)
+            if ent is None:
+                continue
+            name = ent[2]
+            if skip is not None and name in skip:
+                continue
+            out[name] = json.loads(ent[3])
+        return out
+
+
+# ---------------------- Quick self-test ----------------------
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    def _prep(z: Dict[str, Any], stem: str) -> Dict[str, Any]:
+        z.setdefault("name", stem)
+        z.setdefault("links", [])
+        return z
+
+    with tempfile.TemporaryDirectory() as d:
+        zd = Path(d) / "zones"
+        zd.mkdir()
+        for i in range(2000):
+            (zd / f"z{i:04d}.json").write_text(json.dumps({"name": f"z{i}", "energy": i * 0.001}), encoding="utf-8")
+
+        ld = ZoneDirLoader(zd, _prep, pack_path=Path(d) / "zones.pack")
+        t = time.perf_counter(); a = ld.load(); t_cold = time.perf_counter() - t
+        t = time.perf_counter(); b = ld.load(skip=a); t_warm = time.perf_counter() - t
+        (zd / "z0007.json").write_text(json.dumps({"name": "z7", "energy": 9.0}), encoding="utf-8")
+        c = ld.load()
+        ld2 = ZoneDirLoader(zd, _prep, pack_path=Path(d) / "zones.pack")   # new process, pack warm
+        t = time.perf_counter(); e = ld2.load(); t_pack = time.perf_counter() - t
+        print("ZONES:", len(a), "WARM SKIP:", len(b), "CHANGED:", c["z7"]["energy"], "PACK MATCH:", e == c)
+        print(f"cold {t_cold * 1e3:.1f}ms  warm {t_warm * 1e3:.1f}ms  pack-start {t_pack * 1e3:.1f}ms")
+        print("RANDOM ACCESS:", ld2.pack.get("z42"), ld2.stats)
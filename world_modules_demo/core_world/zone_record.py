@@ -0,0 +1,236 @@
+# engine/zone_record.py
+# Compact typed zone records: __slots__ fields, hydrated once, readable as a mapping.
+from __future__ import annotations
+
+from collections.abc import Mapping, MutableMapping
+from operator import attrgetter
+from typing import Any, Dict, Iterator, Optional
+
+__all__ = [
+    "ZoneRecord",
+    "ZONE_FIELDS",
+    "ZONE_NUMERIC",
+    "is_zone",
+    "compact_zones",
+    "expand_zones",
+    "json_default",
+]
+
+# Typed fields, in the key order _zone_defaults produces for a fresh zone.
+ZONE_NUMERIC = ("energy", "symbolic_density", "spiritual_noise", "media_signal")
+_ZONE_TEXT = {"name": "", "label": "", "type": "wild", "version": "1.0.0"}
+_ZONE_CONTAINERS = {
+    "items": list, "traits": list, "markers": list, "links": list,
+    "rules": dict, "weather": dict, "history": list, "timers": dict,
+}
+ZONE_FIELDS = (
+    "name", "label", "type", *ZONE_NUMERIC,
+    "items", "traits", "markers", "links", "rules", "weather", "history", "timers", "version",
+)
+_FIELD_SET = frozenset(ZONE_FIELDS)
+_NUMERIC_SET = frozenset(ZONE_NUMERIC)
+# slot per field; "items" would shadow Mapping.items()
+_SLOT = {k: ("items_" if k == "items" else k) for k in ZONE_FIELDS}
+_GET = {k: attrgetter(slot) for k, slot in _SLOT.items()}
+
+def _safe_float(x: Any, default: float = 0.0) -> float:
+    try:
+        if isinstance(x, bool):
+            return float(int(x))
+        return float(x)
+    except Exception:
+        return default
+
+def is_zone(z: Any) -> bool:
+    """True for plain zone dicts and ZoneRecords (engines' isinstance(z, dict) replacement)."""
+    return isinstance(z, (dict, ZoneRecord))
+
+class ZoneRecord(MutableMapping):
+    """
+    One zone as __slots__ instead of a dict: typed numeric fields are floats,
+    empty containers are not allocated until first read, other keys (seed,
+    micro, resonance, ...) live in a small overflow dict.
+
+    Mapping access (z["energy"], z.get("links"), setdefault, items) behaves like
+    the hydrated zone dict, so engines keep working; hot loops can read the
+    attributes directly (z.energy; z.items_ for "items"). Typed fields are always present: del/pop
+    resets them to their default instead of removing the key.
+    Build with ZoneRecord.from_mapping(); records are never re-normalized.
+    """
+
+    __slots__ = tuple(_SLOT.values()) + ("_extra",)
+
+    def __init__(self) -> None:
+        for k, v in _ZONE_TEXT.items():
+            setattr(self, k, v)
+        for k in ZONE_NUMERIC:
+            setattr(self, k, 0.0)
+        for k in _ZONE_CONTAINERS:
+            setattr(self, _SLOT[k], None)
+        self._extra: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_mapping(cls, src: Mapping, fallback_name: str = "") -> "ZoneRecord":
+        """Normalize once (same defaults as world_util._zone_defaults); records pass through."""
+        if isinstance(src, ZoneRecord):
+            return src
+        z = cls()
+        name = str(src.get("name") or src.get("id") or fallback_name)
+        z.name = name
+        z.label = str(src.get("label") or name.replace("_", " ").title())
+        en = _safe_float(src.get("energy", src.get("symbolic_density", 0.0)), 0.0)
+        z.energy = en
+        z.symbolic_density = _safe_float(src.get("symbolic_density", en), en)
+        z.spiritual_noise = _safe_float(src.get("spiritual_noise", 0.0), 0.0)
+        z.media_signal = _safe_float(src.get("media_signal", 0.0), 0.0)
+        for k, v in src.items():
+            if k in _FIELD_SET:
+                if k in _ZONE_CONTAINERS:
+                    setattr(z, _SLOT[k], v if v else None)   # share nothing, allocate lazily
+                elif k in _ZONE_TEXT and k not in ("name", "label"):
+                    setattr(z, k, v)
+            else:
+                if z._extra is None:
+                    z._extra = {}
+                z._extra[k] = v
+        return z
+
+    # -------- mapping protocol --------
+    def __getitem__(self, key: str) -> Any:
+        get = _GET.get(key)
+        if get is None:
+            extra = self._extra
+            if extra is None:
+                raise KeyError(key)
+            return extra[key]
+        v = get(self)
+        if v is None:                     # lazy container: materialize on first read
+            v = _ZONE_CONTAINERS[key]()
+            setattr(self, _SLOT[key], v)
+        return v
+
+    def get(self, key: str, default: Any = None) -> Any:
+        get = _GET.get(key)
+        if get is None:
+            extra = self._extra
+            return default if extra is None else extra.get(key, default)
+        v = get(self)
+        return self[key] if v is None else v
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in _NUMERIC_SET:
+            setattr(self, key, float(value))
+        elif key in _FIELD_SET:
+            setattr(self, _SLOT[key], value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key in _NUMERIC_SET:
+            setattr(self, key, 0.0)
+        elif key in _ZONE_CONTAINERS:
+            setattr(self, _SLOT[key], None)
+        elif key in _ZONE_TEXT:
+            setattr(self, key, _ZONE_TEXT[key])
+        elif self._extra is None:
+            raise KeyError(key)
+        else:
+            del self._extra[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in _FIELD_SET or (self._extra is not None and key in self._extra)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from ZONE_FIELDS
+        if self._extra:
+            yield from list(self._extra)
+
+    def __len__(self) -> int:
+        return len(ZONE_FIELDS) + (len(self._extra) if self._extra else 0)
+
+    # -------- conversions --------
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain zone dict (containers shared, not copied); used for JSON and legacy callers."""
+        out: Dict[str, Any] = {}
+        for k in ZONE_FIELDS:
+            v = getattr(self, _SLOT[k])
+            out[k] = _ZONE_CONTAINERS[k]() if v is None else v
+        if self._extra:
+            out.update(self._extra)
+        return out
+
+    def copy(self) -> "ZoneRecord":
+        z = ZoneRecord.__new__(ZoneRecord)
+        for k in _SLOT.values():
+            setattr(z, k, getattr(self, k))
+        z._extra = dict(self._extra) if self._extra else None
+        return z
+
+    def __repr__(self) -> str:
+        return f"ZoneRecord({self.to_dict()!r})"
+
+# ---------- World helpers ----------
+def compact_zones(world: Dict[str, Any]) -> int:
+    """Convert world['zones'] values to ZoneRecords in place. Returns zones converted."""
+    zones = world.get("zones")
+    if not isinstance(zones, dict):
+        return 0
+    n = 0
+    for zid, z in zones.items():
+        if isinstance(z, dict):
+            zones[zid] = ZoneRecord.from_mapping(z, fallback_name=str(zid))
+            n += 1
+    return n
+
+def expand_zones(world: Dict[str, Any]) -> int:
+    """Back to plain zone dicts in place. Returns zones converted."""
+    zones = world.get("zones")
+    if not isinstance(zones, dict):
+        return 0
+    n = 0
+    for zid, z in zones.items():
+        if isinstance(z, ZoneRecord):
+            zones[zid] = z.to_dict()
+            n += 1
+    return n
+
+def json_default(o: Any) -> Any:
+    """json.dumps(default=...) hook: records (and other mappings) encode as objects."""
+    if isinstance(o, ZoneRecord):
+        return o.to_dict()
+    if isinstance(o, Mapping):
+        return dict(o)
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+# ---------------------- Quick self-test ----------------------
+if __name__ == "__main__":
+    import json
+    import pickle
+    import tracemalloc
+
+    def _plain(i: int) -> Dict[str, Any]:
+        return {
+            "name": f"z{i}", "label": f"Z{i}", "type": "wild", "energy": 0.5 + i * 1e-6,
+            "symbolic_density": 0.4 + i * 1e-6, "spiritual_noise": 0.1, "media_signal": 0.1,
+            "items": [], "traits": [], "markers": [], "links": [f"z{i + 1}"], "rules": {},
+            "weather": {}, "history": [], "timers": {}, "version": "1.0.0", "seed": i,
+        }
+
+    for label, make in (("dict", _plain), ("record", lambda i: ZoneRecord.from_mapping(_plain(i)))):
+        tracemalloc.start()
+        zs = [make(i) for i in range(20000)]
+        print(label, "bytes/zone:", tracemalloc.get_traced_memory()[0] // len(zs))
+        tracemalloc.stop()
+        del zs
+
+    z = ZoneRecord.from_mapping(_plain(1))
+    z["energy"] = "0.75"
+    z.setdefault("micro", {})["elevation"] = 0.2
+    z["markers"].append("echo_pockets")
+    assert z.energy == 0.75 and z["seed"] == 1 and "micro" in z and "missing" not in z
+    assert json.loads(json.dumps(z, default=json_default)) == z
+    assert pickle.loads(pickle.dumps(z)) == z and z.copy() == z
+    print("ROUNDTRIP OK:", dict(z)["markers"], z.get("missing", "-"))
@@ -1,15 +1,42 @@
 # engine/weather_engine.py
 # Regional weather drift across linked zones; nudges markers & energy.
+#
+# Compatibility note: per-zone randomness is seeded with crc32 (see _rng), not
+# hash(), so it is the same in every process. Earlier builds used hash(), so
+# their weather differs from this one: saves and tick recordings made before
+# the switch will not replay identically under this module.
 from __future__ import annotations
-from typing import Dict, Any, List, Tuple, Optional
+from typing import Dict, Any, Iterable, List, Tuple, Optional
+from collections import deque
 from datetime import datetime, timezone
 import random
+import zlib
+
+try:
+    from engine.world_serializer import mark_dirty as _mark_dirty, mark_zones_dirty as _mark_zones_dirty
+except Exception:
+    def _mark_dirty(world, section=None, zone=None):  # fallback no-op
+        return None
+    def _mark_zones_dirty(world, zone_ids):  # fallback no-op
+        return None
+
+try:
+    from engine.graph_util import graph_for as _graph_for   # compiled zone graph (cached per zones dict)
+except Exception:
+    _graph_for = None
+
+try:
+    from engine.zone_record import ZoneRecord as _ZoneRecord
+    _ZONE_TYPES: tuple = (dict, _ZoneRecord)   # zones may be typed records
+except Exception:
+    _ZONE_TYPES = (dict,)
 
 # ---------------- Tunables ----------------
 BASE_DRIFT      = 0.08   # toward local “baseline” (from micro + type)
 LINK_PULL       = 0.22   # how much neighbors affect intensity
 FRONT_SPAWN_P   = 0.08   # chance per tick to seed a front in a random zone
 FRONT_PUSH      = 0.28   # push when a front exists
+FRONT_RANGE     = 3      # hops a front reaches; its push fades linearly to 0 at this distance
 INTENSITY_DECAY = 0.06   # decay toward 0 if no drivers
 PROMPT_COUPLING = 0.12   # (optional) prompt mentions rain/storm/… (world_util passes prompt)
 
@@ -37,8 +64,15 @@ MARKER_RULES = [
     ("soft_light", 0.6, "veil_light", True),
 ]
 
+# Tick scheduler declarations (engine/tick_scheduler.py): sections step() touches
+TICK_READS  = ("zones", "time", "session_seed", "weather")
+TICK_WRITES = ("zones.*.markers", "zones.*.energy", "zones.*.symbolic_density", "zones.*.weather",
+               "weather", "last_weather_update")
+LOD_AWARE = True   # step() accepts zone_ids; skipped ticks are replayed by lod_catch_up
+TICK_MARKS_DIRTY = True   # step() marks the zones it changes
+
 # ---------------- Public API ----------------
-def step(world: Dict[str, Any], prompt: str = "") -> Dict[str, Any]:
+def step(world: Dict[str, Any], prompt: str = "", zone_ids: Optional[Iterable[str]] = None) -> Dict[str, Any]:
     """
     Updates each zone's weather: {'state': str, 'intensity': 0..1}
       - Baseline per zone type + micro features
@@ -50,6 +84,9 @@ def step(world: Dict[str, Any], prompt: str = "") -> Dict[str, Any]:
       - Slightly nudges zone['energy'] (tiny, bounded) and mirrors into symbolic_density
       - world['weather'] summary written + last_weather_update stamped
     Deterministic per (session_seed, time, zone_id).
+    zone_ids restricts the pass (LOD scheduling): only those zones are stepped,
+    fronts spawn among them and the summary describes them; skipped ticks are
+    replayed by lod_catch_up.
     """
     w = world or {}
     zones: Dict[str, Dict[str, Any]] = _zones_as_dict(w)
@@ -59,7 +96,8 @@ def step(world: Dict[str, Any], prompt: str = "") -> Dict[str, Any]:
 
     t = int(w.get("time", 0))
     seed = int(w.get("session_seed", 0))
-    links = {zid: list((z or {}).get("links", []) or []) for zid, z in zones.items()}
+    ids: List[str] = list(zones) if zone_ids is None else [zid for zid in zone_ids if zid in zones]
+    links = _LazyLinks(zones)
     prev_summary = (w.get("weather") or {})
     fronts = list(prev_summary.get("fronts") or [])
 
@@ -69,14 +107,28 @@ def step(world: Dict[str, Any], prompt: str = "") -> Dict[str, Any]:
     # maybe start a new front
     rng_global = _rng(seed, t, "weather", "global")
     if rng_global.random() < FRONT_SPAWN_P or not fronts:
-        origin = _pick_any_zone(zones, rng_global)
+        origin = _pick_any_zone(zones if zone_ids is None else ids, rng_global)
         if origin:
             fronts = [{"origin": origin, "age": 0, "kind": _pick_front_kind(rng_global)}]
 
+    # front distance fields: once per front, then O(1) per zone. The compiled
+    # zone graph walks reversed links out from each origin (cached while the
+    # front and the links last). Without it: full sweeps reverse the links
+    # themselves, LOD subsets do one bounded forward walk per due zone.
+    fields: Optional[List[Dict[str, int]]] = None
+    if _graph_for is not None:
+        graph = _graph_for(zones)
+        fields = [graph.hops(fr.get("origin", ""), FRONT_RANGE - 1, reverse=True) if fr.get("origin") else {}
+                  for fr in fronts]
+    elif zone_ids is None:
+        rev = _reverse_links({zid: links.get(zid, []) for zid in zones})
+        fields = [_distance_field(fr.get("origin", ""), rev, FRONT_RANGE) for fr in fronts]
+
     # compute one step per zone
     new_fronts: List[Dict[str, Any]] = []
-    for zid, z in zones.items():
-        if not isinstance(z, dict):
+    for zid in ids:
+        z = zones[zid]
+        if not isinstance(z, _ZONE_TYPES):
             z = {}
             zones[zid] = z
         state, inten = _current(z)
@@ -90,11 +142,12 @@ def step(world: Dict[str, Any], prompt: str = "") -> Dict[str, Any]:
         # 3) fronts push if nearby
         front_push = 0.0
         front_kind: Optional[str] = None
-        for fr in fronts:
-            dist = _hop_distance(zid, fr.get("origin", ""), links, limit=3)
+        reach = _distance_field(zid, links, FRONT_RANGE) if fields is None and fronts else None
+        for i, fr in enumerate(fronts):
+            dist = fields[i].get(zid) if fields is not None else reach.get(fr.get("origin", ""))
             if dist is None:
                 continue
-            strength = max(0.0, (3 - dist) / 3) * FRONT_PUSH
+            strength = max(0.0, (FRONT_RANGE - dist) / FRONT_RANGE) * FRONT_PUSH
             if strength > front_push:
                 front_push = strength
                 front_kind = fr.get("kind")
@@ -136,18 +189,47 @@ def step(world: Dict[str, Any], prompt: str = "") -> Dict[str, Any]:
             new_fronts.append(fr)
 
     # Summarize world
-    summary = _summarize_world(zones, new_fronts)
+    summary = _summarize_world(zones if zone_ids is None else {zid: zones[zid] for zid in ids}, new_fronts)
     w["zones"] = zones
     w["weather"] = summary
     w["last_weather_update"] = _utcnow_iso()
+    if zone_ids is None:
+        _mark_dirty(w, "zones")   # every zone's weather/energy is rewritten
+    else:
+        _mark_zones_dirty(w, ids)
     return w
 
+def lod_catch_up(world: Dict[str, Any], zid: str, z: Dict[str, Any], steps: int) -> None:
+    """
+    Closed-form replay of `steps` skipped ticks for one zone, holding its state,
+    baseline and neighbor intensity fixed and ignoring fronts and jitter:
+    intensity follows x' = a*x + c (a = 1 - INTENSITY_DECAY), so
+    x_k = fp + (x0 - fp) * a**k with fp = c / (1 - a), and the energy nudge
+    integrates sum(x_1..x_k) in one step.
+    """
+    zones = _zones_as_dict(world)
+    state, x0 = _current(z)
+    _, bias = _type_micro_baseline(z)
+    _, neigh_i = _neighbor_weather(zid, zones, _LazyLinks(zones))
+    a = 1.0 - INTENSITY_DECAY
+    fp = min(1.0, (BASE_DRIFT * bias + LINK_PULL * neigh_i) / (1.0 - a))
+    ak = a ** steps
+    xk = max(0.0, min(1.0, fp + (x0 - fp) * ak))
+    total = fp * steps + (x0 - fp) * a * (1.0 - ak) / (1.0 - a)
+    e = _apply_energy_nudge(float(z.get("energy", 0.0)), state, total)
+    z["energy"] = e
+    z["symbolic_density"] = e
+    zw = _ensure_zone_weather(z)
+    zw["intensity"] = round(xk, 3)
+
 # ---------------- Internals ----------------
 def _utcnow_iso() -> str:
     return datetime.now(timezone.utc).isoformat(timespec="seconds")
 
 def _rng(seed: int, t: int, *salt_parts: str) -> random.Random:
-    return random.Random(seed ^ hash((seed, t) + tuple(salt_parts)))
+    # crc32, not hash(): str hashing is salted per process (PYTHONHASHSEED)
+    salt = "\x1f".join((str(seed), str(t)) + tuple(salt_parts))
+    return random.Random(seed ^ zlib.crc32(salt.encode("utf-8")))
 
 def _zones_as_dict(w: Dict[str, Any]) -> Dict[str, Any]:
     z = w.get("zones")
@@ -214,10 +296,24 @@ def _neighbor_weather(zid: str, zones: Dict[str, Any], links: Dict[str, List[str
     state = max(tally.items(), key=lambda kv: kv[1])[0]
     return state, (acc_i / n if n else 0.0)
 
-def _pick_any_zone(zones: Dict[str, Any], rng: random.Random) -> Optional[str]:
+class _LazyLinks:
+    """links-like view reading zone['links'] on demand (no per-tick links dict)."""
+
+    __slots__ = ("zones",)
+
+    def __init__(self, zones: Dict[str, Any]):
+        self.zones = zones
+
+    def get(self, zid: str, default: Any = None) -> Any:
+        z = self.zones.get(zid)
+        if not isinstance(z, _ZONE_TYPES):
+            return default
+        return list(z.get("links", []) or [])
+
+def _pick_any_zone(zones: Iterable[str], rng: random.Random) -> Optional[str]:
     if not zones:
         return None
-    return rng.choice(list(zones.keys()))
+    return rng.choice(list(zones))
 
 def _pick_front_kind(rng: random.Random) -> str:
     choices = ["rain", "storm", "haze", "dust", "gloom", "soft_light"]
@@ -235,34 +331,39 @@ def _vote_state(candidates: List[Optional[str]], default: str) -> str:
         return default
     return max(tally.items(), key=lambda kv: kv[1])[0]
 
-def _hop_distance(src: str, dst: str, links: Dict[str, List[str]], limit: int = 3) -> Optional[int]:
-    if not dst:
-        return None
-    if src == dst:
-        return 0
-    q = [(src, 0)]
-    seen = {src}
+def _reverse_links(links: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    rev: Dict[str, List[str]] = {}
+    for zid, out in links.items():
+        for n in out:
+            rev.setdefault(n, []).append(zid)
+    return rev
+
+def _distance_field(src: str, adj: Any, limit: int) -> Dict[str, int]:
+    """Bounded BFS: {node: hops from src} for nodes closer than `limit` (src included)."""
+    if not src:
+        return {}
+    dist = {src: 0}
+    q = deque([src])
     while q:
-        at, d = q.pop(0)
+        at = q.popleft()
+        d = dist[at] + 1
         if d >= limit:
             continue
-        for n in links.get(at, []) or []:
-            if n in seen:
-                continue
-            if n == dst:
-                return d + 1
-            seen.add(n); q.append((n, d + 1))
-    return None
+        for n in adj.get(at, ()) or ():
+            if n not in dist:
+                dist[n] = d
+                q.append(n)
+    return dist
 
 def _apply_markers(z: Dict[str, Any], state: str, inten: float) -> None:
-    ms = set((z.get("markers") or []))
+    ms = dict.fromkeys(z.get("markers") or [])   # ordered set (stable across processes)
     for rule in MARKER_RULES:
         kind, th, marker, add = (rule + (True,))[:4]
         if state == kind and inten >= float(th):
             if add:
-                ms.add(marker)
+                ms[marker] = None
             else:
-                ms.discard(marker)
+                ms.pop(marker, None)
     z["markers"] = _preserve_order(ms, (z.get("markers") or []))
 
 def _apply_energy_nudge(energy: float, state: str, inten: float) -> float:
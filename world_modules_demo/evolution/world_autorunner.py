@@ -1,9 +1,18 @@
 # engine/autorun_world_tick.py
 from __future__ import annotations
+from contextlib import nullcontext
+from pathlib import Path
 from typing import Dict, Any, Optional
 from datetime import datetime, timezone
 import time
 
+# --- Per-stage profiler (safe to miss; last_tick_ms is kept either way) ---
+try:
+    from engine.tick_profiler import TickProfiler
+    _PROFILER: Optional["TickProfiler"] = TickProfiler(dump_file=Path("world_state") / "autorun_profile.json")
+except Exception:
+    _PROFILER = None
+
 # --- Import the three stage engines (with soft fallbacks) ---
 try:
     from engine.world_expansion_engine import expand_world as _expand_world
@@ -23,6 +32,14 @@ except Exception:
     def _update_zones(world_state: Dict[str, Any], *_a, **_k) -> Dict[str, Any]:
         return world_state
 
+# --- Typed zone records (safe to miss) ---
+try:
+    from engine.zone_record import ZoneRecord as _ZoneRecord
+    _ZONE_TYPES: tuple = (dict, _ZoneRecord)
+except Exception:
+    _ZoneRecord = None
+    _ZONE_TYPES = (dict,)
+
 # --- Optional world util hooks (safe to miss) ---
 try:
     from engine.world_util import _safe_float as _wf_safe_float  # type: ignore
@@ -48,6 +65,13 @@ except Exception:
 def _utcnow_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
+def _stage(name: str):
+    return _PROFILER.stage(name) if _PROFILER is not None else nullcontext()
+
+def get_tick_profile() -> Dict[str, Any]:
+    """Per-stage wall/CPU percentiles of autorun_world_tick ({} if the profiler is unavailable)."""
+    return _PROFILER.profile() if _PROFILER is not None else {}
+
 def _append_event(world: Dict[str, Any], msg: str) -> None:
     world.setdefault("world_events", []).append({
         "timestamp": _utcnow_iso(),
@@ -73,7 +97,10 @@ def _smooth_symbolic_density(world: Dict[str, Any], alpha: float = 0.33) -> None
 
     vals = []
     for z in zones.values():
-        if not isinstance(z, dict):
+        if not isinstance(z, _ZONE_TYPES):
+            continue
+        if type(z) is _ZoneRecord:
+            vals.append(z.symbolic_density)   # typed field, always hydrated
             continue
         # prefer per-zone symbolic_density; fallback to energy
         zv = z.get("symbolic_density", z.get("energy", 0.0))
@@ -101,35 +128,41 @@ def autorun_world_tick(world_state: Dict[str, Any], prompt: str = "") -> Dict[st
     world = world_state if isinstance(world_state, dict) else {}
 
     t0 = time.perf_counter()
-    try:
-        world = _expand_world(world)
-    except Exception as e:
-        _append_event(world, f"[expand_world] error: {e!r}")
-
-    try:
-        world = _update_world_features(world, prompt)
-    except Exception as e:
-        _append_event(world, f"[update_world_features] error: {e!r}")
-
-    try:
-        world = _update_zones(world, prompt)
-    except Exception as e:
-        _append_event(world, f"[update_zones] error: {e!r}")
-
-    # Recompute global symbolic density & log history
-    try:
-        _smooth_symbolic_density(world, alpha=0.33)
-    except Exception as e:
-        _append_event(world, f"[symbolic_density] error: {e!r}")
-
-    # Age tick + last_update + optional non-neutral intent logging
-    try:
-        world = _apply_world_logic(world, {"name": "(system)"}, {"intent": "neutral"})
-    except Exception as e:
-        # Fallback if world_util is unavailable
-        world["world_age"] = int(world.get("world_age", 0)) + 1
-        world["last_update"] = _utcnow_iso()
-        _append_event(world, f"[apply_world_logic] error: {e!r}")
+    with (_PROFILER.tick() if _PROFILER is not None else nullcontext()):
+        with _stage("expand_world"):
+            try:
+                world = _expand_world(world)
+            except Exception as e:
+                _append_event(world, f"[expand_world] error: {e!r}")
+
+        with _stage("update_world_features"):
+            try:
+                world = _update_world_features(world, prompt)
+            except Exception as e:
+                _append_event(world, f"[update_world_features] error: {e!r}")
+
+        with _stage("update_zones"):
+            try:
+                world = _update_zones(world, prompt)
+            except Exception as e:
+                _append_event(world, f"[update_zones] error: {e!r}")
+
+        # Recompute global symbolic density & log history
+        with _stage("symbolic_density"):
+            try:
+                _smooth_symbolic_density(world, alpha=0.33)
+            except Exception as e:
+                _append_event(world, f"[symbolic_density] error: {e!r}")
+
+        # Age tick + last_update + optional non-neutral intent logging
+        with _stage("apply_world_logic"):
+            try:
+                world = _apply_world_logic(world, {"name": "(system)"}, {"intent": "neutral"})
+            except Exception as e:
+                # Fallback if world_util is unavailable
+                world["world_age"] = int(world.get("world_age", 0)) + 1
+                world["last_update"] = _utcnow_iso()
+                _append_event(world, f"[apply_world_logic] error: {e!r}")
 
     # Perf note
     dt = time.perf_counter() - t0
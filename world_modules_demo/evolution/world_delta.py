@@ -18,6 +18,109 @@ def _join(parent: Path, key: Union[str, int]) -> Path:
     esc = str(key).replace("~", "~0").replace("/", "~1")
     return parent + "/" + esc if parent else "/" + esc
 
+# ---------- LIST STRATEGIES ----------
+# Tried in order: shift (ring buffers), keyed (lists of records), index-by-index.
+
+LIST_SHIFT_SCAN = 64                         # max appended items probed for a shift
+LIST_KEY_FIELDS = ("id", "name", "timestamp")
+
+def _list_shift(old: List[Any], new: List[Any]) -> Optional[Tuple[int, int]]:
+    """
+    Detect "drop N from head, append M" (density_log, histories, event feeds).
+    Returns (drop, keep) with old[drop:] == new[:keep], or None.
+    """
+    n = len(new)
+    for added in range(0, min(n, LIST_SHIFT_SCAN) + 1):
+        keep = n - added
+        drop = len(old) - keep
+        if keep <= 0:
+            break
+        if drop < 0 or (drop == 0 and added == 0):
+            continue
+        if old[drop] == new[0] and old[drop:] == new[:keep]:
+            return drop, keep
+    return None
+
+def _list_key_field(old: List[Any], new: List[Any]) -> Optional[str]:
+    """
+    A field that identifies every item of both lists (all dicts, unique,
+    hashable values), with shared items in the same relative order.
+    """
+    if not old or not new:
+        return None
+    if not all(isinstance(x, dict) for x in old) or not all(isinstance(x, dict) for x in new):
+        return None
+    for field in LIST_KEY_FIELDS:
+        try:
+            ok = [x[field] for x in old]
+            nk = [x[field] for x in new]
+            if len(set(ok)) != len(ok) or len(set(nk)) != len(nk):
+                continue
+        except (KeyError, TypeError):
+            continue
+        nset = set(nk)
+        oset = set(ok)
+        if [k for k in ok if k in nset] == [k for k in nk if k in oset]:
+            return field
+    return None
+
+def _diff_list(
+    old: List[Any],
+    new: List[Any],
+    path: Path,
+    *,
+    epsilon: float,
+    ignore_keys: Iterable[str]
+) -> Delta:
+    ops: Delta = []
+
+    # 1) Sliding window: one op regardless of list length
+    shift = _list_shift(old, new)
+    if shift is not None:
+        drop, keep = shift
+        return [{"op": "shift", "path": path or "/", "drop": drop, "add": new[keep:], "old": old[:drop]}]
+
+    # 2) Records with an identity field: diff by key, not by position
+    field = _list_key_field(old, new)
+    if field is not None:
+        old_by_key = {x[field]: x for x in old}
+        new_keys = {x[field] for x in new}
+        removed = [x[field] for x in old if x[field] not in new_keys]
+        inserted: List[Any] = []
+        updated: List[Any] = []
+        for i, x in enumerate(new):
+            k = x[field]
+            prev = old_by_key.get(k)
+            if prev is None:
+                inserted.append([i, x])
+                continue
+            sub = _deep_diff(prev, x, "", epsilon=epsilon, ignore_keys=ignore_keys)
+            if sub:
+                updated.append([k, sub])
+        if removed or inserted or updated:
+            op: Op = {"op": "keyed", "path": path or "/", "key": field}
+            if removed:
+                op["remove"] = removed
+            if inserted:
+                op["insert"] = inserted
+            if updated:
+                op["update"] = updated
+            ops.append(op)
+        return ops
+
+    # 3) Index-by-index replace/add/remove
+    min_len = min(len(old), len(new))
+    for i in range(min_len):
+        ops.extend(_deep_diff(old[i], new[i], _join(path, i),
+                              epsilon=epsilon, ignore_keys=ignore_keys))
+    # Tail adds
+    for i in range(min_len, len(new)):
+        ops.append({"op": "add", "path": _join(path, i), "new": new[i]})
+    # Tail removes (from end to start to keep indices valid when applying)
+    for i in range(len(old) - 1, min_len - 1, -1):
+        ops.append({"op": "remove", "path": _join(path, i), "old": old[i]})
+    return ops
+
 def _deep_diff(
     old: Any,
     new: Any,
@@ -28,6 +131,10 @@ def _deep_diff(
 ) -> Delta:
     ops: Delta = []
 
+    # Same object: unchanged subtree
+    if old is new:
+        return ops
+
     # Dicts
     if isinstance(old, dict) and isinstance(new, dict):
         old_keys = set(old.keys()) - set(ignore_keys)
@@ -49,19 +156,7 @@ def _deep_diff(
 
     # Lists
     if isinstance(old, list) and isinstance(new, list):
-        # Simple list strategy: index-by-index replace/add/remove.
-        # (If you later need smarter diffs, we can switch to LCS.)
-        min_len = min(len(old), len(new))
-        for i in range(min_len):
-            ops.extend(_deep_diff(old[i], new[i], _join(path, i),
-                                  epsilon=epsilon, ignore_keys=ignore_keys))
-        # Tail adds
-        for i in range(min_len, len(new)):
-            ops.append({"op": "add", "path": _join(path, i), "new": new[i]})
-        # Tail removes (from end to start to keep indices valid when applying)
-        for i in range(len(old) - 1, min_len - 1, -1):
-            ops.append({"op": "remove", "path": _join(path, i), "old": old[i]})
-        return ops
+        return _diff_list(old, new, path, epsilon=epsilon, ignore_keys=ignore_keys)
 
     # Scalars or mismatched types
     if not _num_equal(old, new, eps=epsilon):
@@ -78,7 +173,10 @@ def calculate_world_delta(
 ) -> Delta:
     """
     Deep diff between two world states.
-    Returns a list of operations: add/remove/replace with JSON-pointer-like paths.
+    Returns a list of operations: add/remove/replace with JSON-pointer-like paths,
+    plus list ops:
+      shift  {"drop": n, "add": [...], "old": [...]}             ring-buffer trim+append
+      keyed  {"key": f, "remove": [k], "insert": [[i, item]], "update": [[k, ops]]}
     """
     return _deep_diff(old_world, new_world, "", epsilon=epsilon, ignore_keys=tuple(ignore_keys))
 
@@ -167,6 +265,41 @@ def _apply_replace(parent: Any, key: Optional[str], value: Any) -> None:
     else:
         raise TypeError(f"Cannot replace on parent type: {type(parent).__name__}")
 
+def _target_list(parent: Any, key: Optional[str]) -> List[Any]:
+    if key is None:
+        target = parent
+    elif isinstance(parent, dict):
+        target = parent.get(key)
+        if target is None:
+            target = parent[key] = []
+    elif isinstance(parent, list):
+        target = parent[int(key)]
+    else:
+        raise TypeError(f"Cannot navigate through type: {type(parent).__name__}")
+    if not isinstance(target, list):
+        raise TypeError(f"List op on non-list target: {type(target).__name__}")
+    return target
+
+def _apply_shift(lst: List[Any], op: Op) -> None:
+    drop = int(op.get("drop", 0))
+    if drop:
+        del lst[:drop]
+    lst.extend(op.get("add") or [])
+
+def _apply_keyed(lst: List[Any], op: Op) -> None:
+    field = op["key"]
+    removed = op.get("remove") or []
+    if removed:
+        gone = set(removed)
+        lst[:] = [x for x in lst if x.get(field) not in gone]
+    updates = op.get("update") or []
+    if updates:
+        by_key = {x.get(field): x for x in lst}
+        for k, sub in updates:
+            apply_world_delta(by_key[k], sub)
+    for i, item in op.get("insert") or []:
+        lst.insert(int(i), item)
+
 def apply_world_delta(world: Dict[str, Any], delta: Delta) -> Dict[str, Any]:
     """
     Applies the op list to 'world' in-place and returns it.
@@ -183,6 +316,10 @@ def apply_world_delta(world: Dict[str, Any], delta: Delta) -> Dict[str, Any]:
             _apply_remove(parent, last)
         elif op_type == "replace":
             _apply_replace(parent, last, op["new"])
+        elif op_type == "shift":
+            _apply_shift(_target_list(parent, last), op)
+        elif op_type == "keyed":
+            _apply_keyed(_target_list(parent, last), op)
         else:
             raise ValueError(f"Unknown op: {op_type}")
     return world
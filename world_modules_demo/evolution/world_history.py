@@ -0,0 +1,258 @@
+# engine/world_history.py
+# Keyframe + delta-chain world history with random access by tick.
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Tuple
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+import json
+import os
+
+try:
+    from engine.world_delta import calculate_world_delta, apply_world_delta
+except Exception:
+    from world_delta import calculate_world_delta, apply_world_delta  # flat layout
+
+# --- Tunables (safe defaults) ---
+HISTORY_KEYFRAME_EVERY = 50      # deltas between full keyframes (bounds replay cost)
+HISTORY_KEYFRAME_OPS = 2000      # a delta this large is written as a keyframe instead
+HISTORY_EPSILON = 0.0            # exact: replay must reproduce the recorded state
+HISTORY_FSYNC = False
+
+# Files:
+#   <base>.hist   one JSON record per line:
+#                 {"tick": t, "k": 1, "world": {...}}   keyframe
+#                 {"tick": t, "ops": [...]}             delta vs previous record
+#                 {"tick": t, "k": 1, "seg": 1, ...}    keyframe starting a new segment
+#   <base>.idx    one "tick offset length k|d|s" line per record (rebuilt from .hist if lost)
+#
+# A segment starts whenever a record's tick goes backwards (an older save was
+# reloaded and play continued from it). Ticks are non-decreasing within a
+# segment; lookups prefer the newest segment that covers the tick.
+
+def _encode(rec: Dict[str, Any]) -> bytes:
+    return (json.dumps(rec, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+def _world_tick(world: Dict[str, Any], default: int) -> int:
+    t = world.get("time")
+    if isinstance(t, dict):          # world_clock: {"tick": n, "day": ..., ...}
+        t = t.get("tick")
+    if isinstance(t, bool) or not isinstance(t, (int, float)):
+        return default
+    return int(t)
+
+
+class WorldHistory:
+    """
+    Append-only world history.
+
+    record(world) stores a delta (world_delta op list) against the previous
+    record, or a full keyframe every HISTORY_KEYFRAME_EVERY records (and
+    whenever time went backwards, which starts a new segment).
+    restore_world_at(tick) seeks to the nearest keyframe at or before `tick`
+    and replays only the deltas between it and the target.
+    """
+
+    def __init__(
+        self,
+        base: Path,
+        *,
+        keyframe_every: int = HISTORY_KEYFRAME_EVERY,
+        keyframe_ops: int = HISTORY_KEYFRAME_OPS,
+        epsilon: float = HISTORY_EPSILON,
+        fsync: bool = HISTORY_FSYNC,
+    ):
+        base = Path(base)
+        self.log_path = base.with_name(base.name + ".hist")
+        self.idx_path = base.with_name(base.name + ".idx")
+        self.keyframe_every = max(1, int(keyframe_every))
+        self.keyframe_ops = int(keyframe_ops)
+        self.epsilon = float(epsilon)
+        self.fsync = bool(fsync)
+
+        self._ticks: List[int] = []
+        self._offsets: List[Tuple[int, int]] = []   # (offset, length)
+        self._keys: List[int] = []                  # record indices of keyframes
+        self._segs: List[int] = []                  # record indices where segments start
+        self._shadow: Optional[Dict[str, Any]] = None
+        self._since_key = 0
+        self._load_index()
+
+    # -------- index --------
+    def _add_index(self, tick: int, off: int, ln: int, kind: str) -> None:
+        i = len(self._ticks)
+        if kind == "s" or not self._segs:
+            self._segs.append(i)
+        if kind != "d":
+            self._keys.append(i)
+        self._ticks.append(tick)
+        self._offsets.append((off, ln))
+
+    def _load_index(self) -> None:
+        size = self.log_path.stat().st_size if self.log_path.exists() else 0
+        end = 0
+        if self.idx_path.exists():
+            with self.idx_path.open("r", encoding="utf-8") as f:
+                for line in f:
+                    parts = line.split()
+                    if len(parts) != 4:
+                        break
+                    tick, off, ln = int(parts[0]), int(parts[1]), int(parts[2])
+                    if off != end or off + ln > size:
+                        break           # torn / stale entry
+                    self._add_index(tick, off, ln, parts[3])
+                    end = off + ln
+        if end < size:
+            self._rebuild_from(end, size)
+
+    def _rebuild_from(self, end: int, size: int) -> None:
+        # Index is behind the log (crash between the two appends): scan the tail
+        good = end
+        with self.log_path.open("rb") as f:
+            f.seek(end)
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except Exception:
+                    break               # torn tail record
+                if not line.endswith(b"\n") or not isinstance(rec, dict):
+                    break
+                kind = "s" if rec.get("seg") else ("k" if rec.get("k") else "d")
+                self._add_index(int(rec.get("tick", 0)), good, len(line), kind)
+                good += len(line)
+        if good < size:
+            print(f"[WARN] world_history: dropping {size - good} torn byte(s) from {self.log_path}")
+            with self.log_path.open("r+b") as f:
+                f.truncate(good)
+        with self.idx_path.open("w", encoding="utf-8") as f:
+            for i, (t, (off, ln)) in enumerate(zip(self._ticks, self._offsets)):
+                f.write(f"{t} {off} {ln} {self._kind(i)}\n")
+
+    def _is_key(self, i: int) -> bool:
+        j = bisect_left(self._keys, i)
+        return j < len(self._keys) and self._keys[j] == i
+
+    def _kind(self, i: int) -> str:
+        j = bisect_left(self._segs, i)
+        if i and j < len(self._segs) and self._segs[j] == i:
+            return "s"
+        return "k" if self._is_key(i) else "d"
+
+    # -------- writing --------
+    def __len__(self) -> int:
+        return len(self._ticks)
+
+    @property
+    def ticks(self) -> List[int]:
+        return list(self._ticks)
+
+    def record(self, world: Dict[str, Any], tick: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Append the state of `world` at `tick` (default: world['time'], or its
+        "tick" when time is a world_clock dict; else the record count).
+        A tick before the last recorded one starts a new segment with a
+        keyframe. Returns {"tick", "kind", "ops", "bytes"}.
+        """
+        if tick is None:
+            tick = _world_tick(world, len(self._ticks))
+        tick = int(tick)
+        new_seg = bool(self._ticks) and tick < self._ticks[-1]
+
+        if self._shadow is None and self._ticks:
+            # Reopened history: prime from disk so the chain continues
+            self._shadow = self._restore_index(len(self._ticks) - 1)
+            self._since_key = len(self._ticks) - 1 - self._keys[-1]
+
+        ops: Optional[List[Dict[str, Any]]] = None
+        if not new_seg and self._shadow is not None and self._since_key < self.keyframe_every:
+            ops = calculate_world_delta(self._shadow, world, epsilon=self.epsilon)
+            if len(ops) > self.keyframe_ops:
+                ops = None
+
+        if new_seg:
+            data = _encode({"tick": tick, "k": 1, "seg": 1, "world": world})
+        elif ops is None:
+            data = _encode({"tick": tick, "k": 1, "world": world})
+        else:
+            data = _encode({"tick": tick, "ops": ops})
+        key = ops is None
+        kind = "s" if new_seg else ("k" if key else "d")
+
+        off = self.log_path.stat().st_size if self.log_path.exists() else 0
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.log_path.open("ab") as f:
+            f.write(data)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        with self.idx_path.open("a", encoding="utf-8") as f:
+            f.write(f"{tick} {off} {len(data)} {kind}\n")
+        self._add_index(tick, off, len(data), kind)
+
+        # Advance the shadow from the encoded bytes (never aliases live objects)
+        if key:
+            self._shadow = json.loads(data)["world"]
+            self._since_key = 0
+        else:
+            apply_world_delta(self._shadow, json.loads(data)["ops"])
+            self._since_key += 1
+        out_kind = "segment" if new_seg else ("key" if key else "delta")
+        return {"tick": tick, "kind": out_kind, "ops": len(ops or []), "bytes": len(data)}
+
+    # -------- reading --------
+    def _restore_index(self, i: int) -> Dict[str, Any]:
+        k = self._keys[bisect_right(self._keys, i) - 1]
+        start = self._offsets[k][0]
+        end = self._offsets[i][0] + self._offsets[i][1]
+        with self.log_path.open("rb") as f:
+            f.seek(start)
+            blob = f.read(end - start)
+        lines = blob.splitlines()
+        world = json.loads(lines[0])["world"]
+        for line in lines[1:]:
+            apply_world_delta(world, json.loads(line)["ops"])
+        return world
+
+    def restore_world_at(self, tick: int) -> Dict[str, Any]:
+        """
+        State as of `tick`: the last record with record.tick <= tick, taken
+        from the newest segment that starts at or before `tick`.
+        Raises KeyError if nothing was recorded at or before it.
+        """
+        tick = int(tick)
+        ends = self._segs[1:] + [len(self._ticks)]
+        for start, end in zip(reversed(self._segs), reversed(ends)):
+            if self._ticks[start] <= tick:
+                return self._restore_index(bisect_right(self._ticks, tick, start, end) - 1)
+        raise KeyError(f"no history at or before tick {tick}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "records": len(self._ticks),
+            "keyframes": len(self._keys),
+            "segments": len(self._segs),
+            "bytes": self.log_path.stat().st_size if self.log_path.exists() else 0,
+            "first_tick": self._ticks[0] if self._ticks else None,
+            "last_tick": self._ticks[-1] if self._ticks else None,
+        }
+
+
+# ---------------------- Quick self-test ----------------------
+if __name__ == "__main__":
+    import copy
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as d:
+        h = WorldHistory(Path(d) / "world", keyframe_every=10)
+        w = {"time": 0, "density_log": [], "zones": {f"z{i}": {"energy": 0.0} for i in range(200)}}
+        states = {}
+        for t in range(1, 61):
+            w["time"] = t
+            w["zones"][f"z{t % 200}"]["energy"] += 0.25
+            w["density_log"] = (w["density_log"] + [t * 0.01])[-20:]
+            h.record(w)
+            states[t] = copy.deepcopy(w)
+
+        h2 = WorldHistory(Path(d) / "world")          # reopen from disk
+        ok = all(h2.restore_world_at(t) == states[t] for t in (1, 9, 10, 11, 37, 60))
+        full = len(json.dumps(w)) * 60
+        print("RESTORE OK:", ok, "STATS:", h2.stats(), "vs full snapshots:", full)
@@ -1,7 +1,14 @@
 # engine/zone_viewer.py
 from __future__ import annotations
+import sys
+from contextlib import nullcontext
 from typing import Dict, Any, Optional, List
 
+def _read_lock():
+    # Shared world lock while the engine may be ticking the dict we read (engine/world_util.py)
+    lock = getattr(sys.modules.get("engine.world_util"), "world_read_lock", None)
+    return lock() if lock is not None else nullcontext()
+
 def _fmt_zone_line(zid: str, z: Dict[str, Any]) -> str:
     """Format one zone entry for display."""
     name = z.get("name", zid)
@@ -17,15 +24,16 @@ def list_zones(world_data: Dict[str, Any], *, summary: bool = False) -> str:
     - summary=True: just the IDs/names
     - summary=False: full info per zone
     """
-    zones: Dict[str, Dict[str, Any]] = world_data.get("zones", {})
-    if not zones:
-        return "No zones defined."
+    with _read_lock():
+        zones: Dict[str, Dict[str, Any]] = world_data.get("zones", {})
+        if not zones:
+            return "No zones defined."
 
-    # sort by zone name for deterministic output
-    sorted_zones: List[tuple[str, Dict[str, Any]]] = sorted(zones.items(), key=lambda x: x[0])
+        # sort by zone name for deterministic output
+        sorted_zones: List[tuple[str, Dict[str, Any]]] = sorted(zones.items(), key=lambda x: x[0])
 
-    if summary:
-        return "\n".join(z.get("name", zid) for zid, z in sorted_zones)
+        if summary:
+            return "\n".join(z.get("name", zid) for zid, z in sorted_zones)
 
-    lines = [_fmt_zone_line(zid, z) for zid, z in sorted_zones]
+        lines = [_fmt_zone_line(zid, z) for zid, z in sorted_zones]
     return "\n".join(lines)
@@ -1,56 +1,67 @@
 # engine/terrain_noise.py
 # Seeded, deterministic micro-features per zone (no external deps).
 from __future__ import annotations
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Iterable, Optional, Tuple
+
+try:
+    from engine.world_serializer import mark_zones_dirty as _mark_zones_dirty
+except Exception:
+    def _mark_zones_dirty(world, zone_ids):  # fallback no-op
+        return None
 
 # Public API ---------------------------------------------------------------
 
-def step(world: Dict[str, Any]) -> Dict[str, Any]:
+# Tick scheduler declarations (engine/tick_scheduler.py): sections step() touches
+TICK_READS  = ("zones.*.seed", "zones.*.markers", "zones.*.energy", "session_seed")
+TICK_WRITES = ("zones.*.seed", "zones.*.micro", "zones.*.markers", "zones.*.energy")
+LOD_AWARE = True   # step() accepts zone_ids; skipped ticks are replayed by lod_catch_up
+TICK_MARKS_DIRTY = True   # step() marks the zones it changes
+
+def lod_catch_up(world: Dict[str, Any], zid: str, z: Dict[str, Any], steps: int) -> None:
+    """
+    Replay the energy drift of `steps` skipped ticks (micro/markers are tick-invariant).
+    Each tick rounds to 3 decimals, so the drift is applied per tick rather than
+    in closed form; it stops early once a bound is reached and nothing moves.
+    """
+    micro = _micro_features(zid, int(z.get("seed", _fallback_seed(world, zid))))
+    e = float(z.get("energy", 0.0))
+    for _ in range(int(steps)):
+        nxt = round(_soft_energy_adjust(e, micro), 3)
+        if nxt == e:
+            break
+        e = nxt
+    z["energy"] = e
+
+def step(world: Dict[str, Any], zone_ids: Optional[Iterable[str]] = None) -> Dict[str, Any]:
     """
     Compute stable micro-features for every zone based on zone id+seed.
     Writes to zone['micro'] and may add lightweight markers when thresholds cross.
     Pure & deterministic: same world/zones -> same outputs.
+    zone_ids restricts the pass to those zones (LOD scheduling; see lod_catch_up).
     """
     zones = world.get("zones", {}) or {}
     if not isinstance(zones, dict):
         return world
 
-    for zid, z in zones.items():
+    changed = []
+    items = zones.items() if zone_ids is None else [(zid, zones[zid]) for zid in zone_ids if zid in zones]
+    for zid, z in items:
+        before = (z.get("seed"), z.get("micro"), z.get("markers"), z.get("energy"))
         z.setdefault("seed", _fallback_seed(world, zid))
-        cx, cy = _zone_coords_from_id(zid)
-        s = int(z.get("seed", 0)) ^ _hash32(zid)
-
-        # Multi-octave value noise in 0..1
-        elev = _fbm(cx, cy, s ^ 0xE1, octaves=4, base_freq=0.015)  # elevation
-        damp = _fbm(cx, cy, s ^ 0xA5, octaves=3, base_freq=0.022)  # dampness
-        rough = _fbm(cx, cy, s ^ 0xC3, octaves=3, base_freq=0.035) # surface roughness
-        anomaly_raw = _fbm(cx+77.0, cy-33.0, s ^ 0x5B, octaves=2, base_freq=0.045)
-        anomaly = max(0.0, min(1.0, (anomaly_raw * 1.15) - 0.075))
-
-        # Normalize a touch for nicer spreads
-        elev = _remap(elev, 0.05, 0.95, clamp=True)
-        damp = _remap(damp, 0.05, 0.95, clamp=True)
-        rough = _remap(rough, 0.05, 0.95, clamp=True)
-        anomaly = _remap(anomaly, 0.00, 0.98, clamp=True)
-
-        micro = {
-            "elevation": round(elev, 3),
-            "dampness": round(damp, 3),
-            "roughness": round(rough, 3),
-            "anomaly": round(anomaly, 3),
-        }
+        micro = _micro_features(zid, int(z.get("seed", 0)))
         z["micro"] = micro
 
         # Optional: tag markers based on thresholds (non-destructive)
-        markers = set(z.get("markers", []) or [])
+        # (ordered set: a plain set's order varies with PYTHONHASHSEED)
+        markers = dict.fromkeys(z.get("markers", []) or [])
         if micro["dampness"] >= 0.75:
-            markers.add("sodden_floor")
+            markers["sodden_floor"] = None
         if micro["elevation"] <= 0.15 and micro["dampness"] >= 0.6:
-            markers.add("standing_pools")
+            markers["standing_pools"] = None
         if micro["roughness"] >= 0.8:
-            markers.add("jagged_passage")
+            markers["jagged_passage"] = None
         if micro["anomaly"] >= 0.85:
-            markers.add("echo_pockets")
+            markers["echo_pockets"] = None
         if markers:
             z["markers"] = _dedup_preserve_order(list(markers), keep_order_from=z.get("markers", []))
 
@@ -59,13 +70,51 @@ def step(world: Dict[str, Any]) -> Dict[str, Any]:
         base_energy = float(z.get("energy", 0.0))
         z["energy"] = round(_soft_energy_adjust(base_energy, micro), 3)
 
+        if before != (z.get("seed"), z.get("micro"), z.get("markers"), z.get("energy")):
+            changed.append(zid)
         zones[zid] = z
 
     world["zones"] = zones
+    _mark_zones_dirty(world, changed)
     return world
 
 # Internals ----------------------------------------------------------------
 
+# Micro-features depend only on (zone id, seed); memoized so repeated ticks
+# (and fast-forward batches) skip the fbm sampling. Callers get a fresh dict.
+_MICRO_CACHE: Dict[Tuple[str, int], Dict[str, float]] = {}
+_MICRO_CACHE_MAX = 65536
+
+def _micro_features(zid: str, seed: int) -> Dict[str, float]:
+    key = (zid, seed)
+    micro = _MICRO_CACHE.get(key)
+    if micro is None:
+        cx, cy = _zone_coords_from_id(zid)
+        s = seed ^ _hash32(zid)
+        # Multi-octave value noise in 0..1
+        elev = _fbm(cx, cy, s ^ 0xE1, octaves=4, base_freq=0.015)  # elevation
+        damp = _fbm(cx, cy, s ^ 0xA5, octaves=3, base_freq=0.022)  # dampness
+        rough = _fbm(cx, cy, s ^ 0xC3, octaves=3, base_freq=0.035) # surface roughness
+        anomaly_raw = _fbm(cx+77.0, cy-33.0, s ^ 0x5B, octaves=2, base_freq=0.045)
+        anomaly = max(0.0, min(1.0, (anomaly_raw * 1.15) - 0.075))
+
+        # Normalize a touch for nicer spreads
+        elev = _remap(elev, 0.05, 0.95, clamp=True)
+        damp = _remap(damp, 0.05, 0.95, clamp=True)
+        rough = _remap(rough, 0.05, 0.95, clamp=True)
+        anomaly = _remap(anomaly, 0.00, 0.98, clamp=True)
+
+        micro = {
+            "elevation": round(elev, 3),
+            "dampness": round(damp, 3),
+            "roughness": round(rough, 3),
+            "anomaly": round(anomaly, 3),
+        }
+        if len(_MICRO_CACHE) >= _MICRO_CACHE_MAX:
+            _MICRO_CACHE.clear()
+        _MICRO_CACHE[key] = micro
+    return dict(micro)
+
 def _fallback_seed(world: Dict[str, Any], zid: str) -> int:
     """Use world['session_seed'] and zone id hash when zone.seed is missing."""
     return int(world.get("session_seed", 0)) ^ _hash32(zid)
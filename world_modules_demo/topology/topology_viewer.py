@@ -2,6 +2,8 @@
 from __future__ import annotations
 
 import json
+import sys
+from contextlib import nullcontext
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
@@ -16,6 +18,12 @@ def _safe_dict(x: Any) -> Dict[str, Any]:
     return x if isinstance(x, dict) else {}
 
 
+def _read_lock():
+    # Shared world lock while the engine may be ticking the dict we read (engine/world_util.py)
+    lock = getattr(sys.modules.get("engine.world_util"), "world_read_lock", None)
+    return lock() if lock is not None else nullcontext()
+
+
 def _load_world_from_disk() -> Dict[str, Any]:
     if not WORLD_FILE.exists() or WORLD_FILE.is_dir():
         return {}
@@ -40,9 +48,10 @@ def get_topological_summary(world_data: Optional[Dict[str, Any]] = None) -> Dict
     """
     world = _safe_dict(world_data) or _load_world_from_disk()
 
-    active_markers = _safe_dict(world.get("active_markers"))
-    clusters = _safe_dict(world.get("clusters"))
-    density_log_full = _safe_list(world.get("density_log"))
+    with _read_lock():
+        active_markers = dict(_safe_dict(world.get("active_markers")))
+        clusters = dict(_safe_dict(world.get("clusters")))
+        density_log_full = list(_safe_list(world.get("density_log")))
 
     # keep it light: just the last 20 values
     density_log = density_log_full[-20:] if density_log_full else []